@@ -7,6 +7,8 @@ import platform
 import weakref
 import gc
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List, Tuple, Union
 from functools import lru_cache
 
@@ -36,11 +38,17 @@ except ImportError:
     THEMES_AVAILABLE = False
 
 try:
-    from data_operations import DataCleaner, DataAnalyzer, DataValidator
+    from data_operations import DataCleaner, DataAnalyzer, DataValidator, AnalyticsKernel, FilterEngine
     DATA_OPERATIONS_AVAILABLE = True
 except ImportError:
     DATA_OPERATIONS_AVAILABLE = False
 
+try:
+    from search_index import ProductSearchIndex
+    SEARCH_INDEX_AVAILABLE = True
+except ImportError:
+    SEARCH_INDEX_AVAILABLE = False
+
 
 class SafeFallbacks:
     """Güvenli fallback implementasyonları"""
@@ -101,6 +109,12 @@ class AnalyzDashboard:
     Güvenilirlik: 9/10
     """
     
+    # Canlı arama için tuş vuruşu sonrası bekleme süresi
+    LIVE_SEARCH_DELAY_MS = 120
+    
+    # Arka plan hesaplama sonuçlarının kontrol aralığı
+    SECTION_POLL_MS = 50
+    
     def __init__(self, parent_notebook: ttk.Notebook, df: pd.DataFrame):
         """
         Dashboard başlatıcı - Comprehensive error handling ile
@@ -126,8 +140,23 @@ class AnalyzDashboard:
         self.os_platform = platform.system()
         
         # Initialize systems with fallbacks
+        # VeriAnalizi veri boyutuyla ölçeklendiği için arka planda ilk bölüm hesaplanırken kurulur
         self._init_color_system()
-        self._init_analysis_system()
+        self.analiz = None
+        self._analysis_initialized = False
+        self._analysis_lock = threading.Lock()
+        
+        # Fallback bölümleri için tek geçişli analiz sonucu (tembel)
+        self._fallback_analytics = None
+        self._fallback_analytics_lock = threading.Lock()
+        
+        # Tembel bölüm kurulumu: key -> (parent, compute, build)
+        self._lazy_sections = {}
+        self._section_futures = {}
+        self._built_sections = set()
+        self._tab_section_keys = {}
+        self._section_poll_job = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard")
         
         # Dashboard frame - ANA DEĞİŞİKLİK: main_container'ı döndüreceğiz
         self.main_container = None
@@ -137,6 +166,11 @@ class AnalyzDashboard:
         self.scrollbar = None
         self.main_frame = None
         
+        # Yazarken arama durumu (indeks arka planda kurulur)
+        self._fallback_search_index = None
+        self._search_index_future = None
+        self._live_search_job = None
+        
         # Setup dashboard
         self._safe_setup_dashboard()
     
@@ -216,7 +250,15 @@ class AnalyzDashboard:
             self.colors = SafeFallbacks.get_default_colors()
     
     def _init_analysis_system(self):
-        """Analiz sistemi başlatma"""
+        """Analiz sistemi başlatma - arka plan işçisinde bir kez çalışır"""
+        with self._analysis_lock:
+            if self._analysis_initialized:
+                return
+            self._analysis_initialized = True
+            self._init_analysis_system_unlocked()
+    
+    def _init_analysis_system_unlocked(self):
+        """VeriAnalizi örneğini oluştur"""
         try:
             if VERI_ANALIZI_AVAILABLE and not self.df.empty:
                 self.analiz = VeriAnalizi(self.df)
@@ -232,7 +274,13 @@ class AnalyzDashboard:
             self.analiz = None
     
     def _safe_setup_dashboard(self):
-        """Dashboard kurulumunu güvenli şekilde yap"""
+        """
+        Dashboard iskeletini kur - veri hesaplamaları arka planda yapılır.
+        
+        Bölümler yer tutucu ile oluşturulur; KPI ve ilk sekme hemen, diğer
+        sekmeler ilk seçildiklerinde hesaplanıp doldurulur. Böylece
+        dashboard'un görünür olma süresi veri boyutundan bağımsız kalır.
+        """
         try:
             self._create_scrollable_frame()
             self._create_header()
@@ -240,12 +288,43 @@ class AnalyzDashboard:
             self._create_analysis_tabs()
             self._create_search_section()
             
+            # KPI ve görünen ilk sekme hemen kuyruğa alınır
+            self._activate_section('kpi')
+            self._on_analysis_tab_changed()
+            self._start_search_index_build()
+            
             self.logger.info("Dashboard setup completed successfully")
             
         except Exception as e:
             self.logger.error(f"Dashboard setup error: {e}")
             self._create_error_dashboard(str(e))
     
+    def _start_search_index_build(self):
+        """Arama indeksini arka plan işçisinde kur - ilk tuş vuruşu UI thread'inde beklemez"""
+        if not SEARCH_INDEX_AVAILABLE or self.df.empty:
+            return
+        
+        def job():
+            # VeriAnalizi kendi indeksini kurar; yedek indeks yalnızca analiz yoksa gerekir
+            self._init_analysis_system()
+            if self.analiz is not None:
+                return None
+            stok_col = self._find_stok_column()
+            return ProductSearchIndex.from_dataframe(self.df, stok_col) if stok_col else None
+        
+        try:
+            self._search_index_future = self._executor.submit(job)
+        except RuntimeError as e:
+            # Executor kapatılmış (cleanup sonrası)
+            self.logger.debug(f"Search index submit error: {e}")
+    
+    def _find_stok_column(self):
+        """Stok ismi sütununu bul"""
+        for col in self.df.columns:
+            if 'stok' in col.lower() and 'ismi' in col.lower():
+                return col
+        return None
+    
     def _create_error_dashboard(self, error_msg: str):
         """Hata durumunda basit dashboard oluştur"""
         try:
@@ -275,6 +354,99 @@ class AnalyzDashboard:
         except Exception as e:
             self.logger.error(f"Error dashboard creation failed: {e}")
     
+    # ------------------------------------------------------------------
+    # Tembel bölüm kurulumu
+    # ------------------------------------------------------------------
+    
+    def _register_lazy_section(self, key: str, parent, compute, build):
+        """Bölümü yer tutucu ile kaydet; compute arka planda, build UI thread'inde çalışır"""
+        self._lazy_sections[key] = (parent, compute, build)
+        self._show_section_loading(parent)
+    
+    def _show_section_loading(self, parent):
+        """Bölüm hesaplanırken gösterilen yer tutucu"""
+        try:
+            loading_label = tk.Label(
+                parent, text="⏳ Yükleniyor...",
+                font=('Segoe UI', 12), fg=self.colors['text_secondary'],
+                bg=parent.cget('bg')
+            )
+            loading_label.pack(expand=True, pady=40)
+            self._widget_refs.add(loading_label)
+        except Exception as e:
+            self.logger.debug(f"Loading placeholder error: {e}")
+    
+    def _activate_section(self, key: str):
+        """Bölümün verisini (ilk etkinleştirmede) arka planda hesaplamaya başla"""
+        if self._is_destroyed or key not in self._lazy_sections:
+            return
+        if key in self._built_sections or key in self._section_futures:
+            return
+        
+        _, compute, _ = self._lazy_sections[key]
+        
+        def job():
+            self._init_analysis_system()
+            return compute()
+        
+        try:
+            self._section_futures[key] = self._executor.submit(job)
+        except RuntimeError as e:
+            # Executor kapatılmış (cleanup sonrası)
+            self.logger.debug(f"Section submit error: {e}")
+            return
+        
+        self._schedule_section_poll()
+    
+    def _schedule_section_poll(self):
+        """Bekleyen hesaplamalar için kontrol döngüsünü planla"""
+        if self._section_poll_job is not None or not self._check_widget_exists(self.main_container):
+            return
+        self._section_poll_job = self.main_container.after(self.SECTION_POLL_MS, self._poll_sections)
+    
+    def _poll_sections(self):
+        """Tamamlanan hesaplamaların widget'larını UI thread'inde oluştur"""
+        self._section_poll_job = None
+        if self._is_destroyed:
+            return
+        
+        for key, future in list(self._section_futures.items()):
+            if not future.done():
+                continue
+            
+            del self._section_futures[key]
+            self._built_sections.add(key)
+            parent, _, build = self._lazy_sections[key]
+            
+            if not self._check_widget_exists(parent):
+                continue
+            
+            for widget in parent.winfo_children():
+                try:
+                    widget.destroy()
+                except tk.TclError:
+                    pass
+            
+            try:
+                build(parent, future.result())
+            except Exception as e:
+                self.logger.error(f"Section '{key}' build error: {e}")
+                self._create_no_data_label(parent, "Veriler yüklenemedi")
+        
+        if self._section_futures:
+            self._schedule_section_poll()
+    
+    def _on_analysis_tab_changed(self, event=None):
+        """Seçilen analiz sekmesini ilk seçimde oluştur"""
+        try:
+            if not self._check_widget_exists(self.analysis_notebook):
+                return
+            key = self._tab_section_keys.get(str(self.analysis_notebook.select()))
+            if key:
+                self._activate_section(key)
+        except (tk.TclError, AttributeError) as e:
+            self.logger.debug(f"Tab change error: {e}")
+    
     def get_frame(self) -> Optional[tk.Frame]:
         """Dashboard frame'ini güvenli şekilde döndür - ANA DÜZELTME"""
         try:
@@ -438,12 +610,42 @@ class AnalyzDashboard:
             self.logger.error(f"KPI data retrieval error: {e}")
             return self._get_fallback_kpi_data()
     
+    def _get_fallback_miktar_column(self) -> Optional[str]:
+        """Fallback miktar sütunu - ilk 'miktar'/'satis' içeren sütun"""
+        for col in self.df.columns:
+            if 'miktar' in col.lower() or 'satis' in col.lower():
+                return col
+        return None
+    
+    def _get_fallback_analytics(self):
+        """
+        Fallback bölümlerinin ortak analiz sonucu.
+        
+        Sütunlar bir kez sayısala çevrilip tüm metrikler tek geçişte hesaplanır;
+        KPI, liste, dağılım ve istatistik bölümleri aynı sonucu paylaşır.
+        """
+        if not DATA_OPERATIONS_AVAILABLE:
+            return None
+        with self._fallback_analytics_lock:
+            if self._fallback_analytics is None:
+                try:
+                    columns = ['Net Kar', 'Birim Kar', self._get_fallback_miktar_column()]
+                    self._fallback_analytics = AnalyticsKernel.compute(self.df, columns)
+                except Exception as e:
+                    self.logger.warning(f"Fallback analytics error: {e}")
+                    return None
+            return self._fallback_analytics
+    
     def _get_fallback_kpi_data(self) -> Dict[str, Any]:
         """Fallback KPI verisi hesapla"""
         try:
             if self.df.empty:
                 return self._get_empty_kpi_data()
             
+            analytics = self._get_fallback_analytics()
+            if analytics is not None:
+                return self._kpi_data_from_analytics(analytics)
+            
             kpi_data = {
                 'toplam_kar': 0,
                 'en_karli_urun': 'Veri Yok',
@@ -489,6 +691,33 @@ class AnalyzDashboard:
             self.logger.error(f"Fallback KPI data error: {e}")
             return self._get_empty_kpi_data()
     
+    def _kpi_data_from_analytics(self, analytics) -> Dict[str, Any]:
+        """Tek geçişli analiz sonucundan KPI verisi"""
+        kpi_data = self._get_empty_kpi_data()
+        kpi_data['toplam_urun'] = len(self.df)
+        
+        if analytics.has('Net Kar'):
+            kar_stats = analytics.basic_statistics('Net Kar')
+            kpi_data['toplam_kar'] = kar_stats.get('sum', 0.0)
+            kpi_data['ortalama_kar'] = kar_stats.get('mean', 0.0)
+            kpi_data['pozitif_kar_urun'], kpi_data['negatif_kar_urun'] = analytics.sign_counts('Net Kar')
+            
+            en_karli = analytics.top_positions('Net Kar', 1)
+            if len(en_karli):
+                kpi_data['en_karli_urun_kar'] = float(analytics.values('Net Kar')[en_karli[0]])
+                for col in self.df.columns:
+                    if 'stok' in col.lower() and 'ismi' in col.lower():
+                        product_name = self.df[col].iloc[en_karli[0]]
+                        if pd.notna(product_name):
+                            kpi_data['en_karli_urun'] = str(product_name)[:50]
+                        break
+        
+        miktar_col = self._get_fallback_miktar_column()
+        if miktar_col and analytics.has(miktar_col):
+            kpi_data['toplam_satis_miktar'] = analytics.basic_statistics(miktar_col).get('sum', 0.0)
+        
+        return kpi_data
+    
     def _get_empty_kpi_data(self) -> Dict[str, Any]:
         """Boş KPI verisi"""
         return {
@@ -515,14 +744,19 @@ class AnalyzDashboard:
                 "Ana performans metrikleri"
             )
             
-            # KPI verilerini al
-            kpi_data = self._get_kpi_data()
-            
-            # KPI kartları container
+            # KPI kartları container - veriler arka planda hesaplanır
             kpi_container = tk.Frame(self.main_frame, bg=self.colors['bg_primary'])
             kpi_container.pack(fill='x', pady=(0, 40))
             self._widget_refs.add(kpi_container)
             
+            self._register_lazy_section('kpi', kpi_container, self._get_kpi_data, self._build_kpi_cards)
+            
+        except Exception as e:
+            self.logger.error(f"KPI section creation error: {e}")
+    
+    def _build_kpi_cards(self, kpi_container, kpi_data):
+        """KPI kartlarını hesaplanmış veriyle oluştur"""
+        try:
             # İlk satır KPI kartları
             kpi_row1 = tk.Frame(kpi_container, bg=self.colors['bg_primary'])
             kpi_row1.pack(fill='x', pady=(0, 20))
@@ -685,21 +919,52 @@ class AnalyzDashboard:
             self.analysis_notebook.pack(fill='both', expand=True)
             self._widget_refs.add(self.analysis_notebook)
             
-            # Tabs oluştur
-            self._create_performance_tab()
-            self._create_profit_tab()
-            self._create_distribution_tab()
+            # Sekmeler boş eklenir, içerik ilk seçimde oluşturulur
+            self._add_lazy_tab('performance', "🏆 Performans",
+                               self._compute_performance_data, self._build_performance_tab)
+            self._add_lazy_tab('profit', "💰 Kar Analizi",
+                               self._compute_profit_data, self._build_profit_tab)
+            self._add_lazy_tab('distribution', "📊 Dağılım",
+                               self._compute_distribution_data, self._build_distribution_tab)
+            
+            self.analysis_notebook.bind('<<NotebookTabChanged>>', self._on_analysis_tab_changed)
             
         except Exception as e:
             self.logger.error(f"Analysis tabs creation error: {e}")
     
-    def _create_performance_tab(self):
-        """Performans analizi sekmesi"""
+    def _add_lazy_tab(self, key, text, compute, build):
+        """Notebook'a boş sekme ekle ve tembel bölüm olarak kaydet"""
         try:
-            perf_frame = ttk.Frame(self.analysis_notebook)
-            self.analysis_notebook.add(perf_frame, text="🏆 Performans")
-            self._widget_refs.add(perf_frame)
+            tab_frame = ttk.Frame(self.analysis_notebook)
+            self.analysis_notebook.add(tab_frame, text=text)
+            self._widget_refs.add(tab_frame)
             
+            content = tk.Frame(tab_frame, bg=self.colors['bg_secondary'])
+            content.pack(fill='both', expand=True)
+            self._widget_refs.add(content)
+            
+            self._tab_section_keys[str(tab_frame)] = key
+            self._register_lazy_section(key, content, compute, build)
+        except Exception as e:
+            self.logger.error(f"Lazy tab creation error ({key}): {e}")
+    
+    def _compute_performance_data(self):
+        """Performans sekmesi verisi - arka planda çalışır"""
+        if self.analiz:
+            try:
+                return (
+                    self.analiz.get_top_profitable_products(10),
+                    self.analiz.get_top_selling_products(10),
+                    self.analiz.find_miktar_column()
+                )
+            except Exception as e:
+                self.logger.warning(f"Analysis data retrieval error: {e}")
+                return pd.DataFrame(), pd.DataFrame(), None
+        return self._get_fallback_product_lists()
+    
+    def _build_performance_tab(self, perf_frame, data):
+        """Performans analizi sekmesi"""
+        try:
             main_container = tk.Frame(perf_frame, bg=self.colors['bg_secondary'])
             main_container.pack(fill='both', expand=True, padx=20, pady=20)
             self._widget_refs.add(main_container)
@@ -760,28 +1025,15 @@ class AnalyzDashboard:
             self._widget_refs.add(right_title)
             
             # Veri listelerini oluştur
-            self._create_product_lists(left_frame, right_frame)
+            self._create_product_lists(left_frame, right_frame, data)
             
         except Exception as e:
             self.logger.error(f"Performance tab creation error: {e}")
     
-    def _create_product_lists(self, left_frame, right_frame):
-        """Ürün listelerini oluştur"""
+    def _create_product_lists(self, left_frame, right_frame, data):
+        """Ürün listelerini hesaplanmış veriyle oluştur"""
         try:
-            top_profitable = pd.DataFrame()
-            top_selling = pd.DataFrame()
-            miktar_col = None
-            
-            if self.analiz:
-                try:
-                    top_profitable = self.analiz.get_top_profitable_products(10)
-                    top_selling = self.analiz.get_top_selling_products(10)
-                    miktar_col = self.analiz.find_miktar_column()
-                except Exception as e:
-                    self.logger.warning(f"Analysis data retrieval error: {e}")
-            else:
-                # Fallback analiz
-                top_profitable, top_selling, miktar_col = self._get_fallback_product_lists()
+            top_profitable, top_selling, miktar_col = data
             
             # DashboardComponents ile liste oluştur
             if DASHBOARD_COMPONENTS_AVAILABLE:
@@ -808,6 +1060,13 @@ class AnalyzDashboard:
             if self.df.empty:
                 return pd.DataFrame(), pd.DataFrame(), None
             
+            analytics = self._get_fallback_analytics()
+            if analytics is not None:
+                miktar_col = self._get_fallback_miktar_column()
+                top_profitable = analytics.top_frame(self.df, 'Net Kar', 10)
+                top_selling = analytics.top_frame(self.df, miktar_col, 10) if miktar_col else pd.DataFrame()
+                return top_profitable, top_selling, miktar_col
+            
             top_profitable = pd.DataFrame()
             top_selling = pd.DataFrame()
             miktar_col = None
@@ -940,39 +1199,49 @@ class AnalyzDashboard:
         except Exception as e:
             self.logger.error(f"No data label creation error: {e}")
     
-    def _create_profit_tab(self):
+    def _compute_profit_data(self):
+        """Kar analizi sekmesi verisi - arka planda çalışır"""
+        if self.analiz:
+            try:
+                dist_data = self.analiz.get_profit_distribution()
+            except Exception as e:
+                self.logger.warning(f"Analysis profit distribution error: {e}")
+                dist_data = self._get_fallback_profit_distribution()
+        else:
+            dist_data = self._get_fallback_profit_distribution()
+        
+        try:
+            if self.analiz:
+                low_profit_products = self.analiz.get_low_profit_products(10)
+            else:
+                low_profit_products = self._get_fallback_low_profit_products()
+        except Exception as e:
+            self.logger.warning(f"Low performance products error: {e}")
+            low_profit_products = None
+        
+        return dist_data, low_profit_products
+    
+    def _build_profit_tab(self, profit_frame, data):
         """Kar analizi sekmesi"""
         try:
-            profit_frame = ttk.Frame(self.analysis_notebook)
-            self.analysis_notebook.add(profit_frame, text="💰 Kar Analizi")
-            self._widget_refs.add(profit_frame)
+            dist_data, low_profit_products = data
             
             main_container = tk.Frame(profit_frame, bg=self.colors['bg_secondary'])
             main_container.pack(fill='both', expand=True, padx=20, pady=20)
             self._widget_refs.add(main_container)
             
             # Kar dağılımı
-            self._create_profit_distribution_section(main_container)
+            self._create_profit_distribution_section(main_container, dist_data)
             
             # Düşük performanslı ürünler
-            self._create_low_performance_section(main_container)
+            self._create_low_performance_section(main_container, low_profit_products)
             
         except Exception as e:
             self.logger.error(f"Profit tab creation error: {e}")
     
-    def _create_profit_distribution_section(self, parent):
+    def _create_profit_distribution_section(self, parent, dist_data):
         """Kar dağılımı bölümü"""
         try:
-            # Kar dağılımı verilerini al
-            if self.analiz:
-                try:
-                    dist_data = self.analiz.get_profit_distribution()
-                except Exception as e:
-                    self.logger.warning(f"Analysis profit distribution error: {e}")
-                    dist_data = self._get_fallback_profit_distribution()
-            else:
-                dist_data = self._get_fallback_profit_distribution()
-            
             # Başlık
             dist_title = tk.Label(
                 parent, text="📊 Kar Dağılımı",
@@ -997,6 +1266,10 @@ class AnalyzDashboard:
             if self.df.empty or 'Net Kar' not in self.df.columns:
                 return {'cok_karli': 0, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': 0}
             
+            analytics = self._get_fallback_analytics()
+            if analytics is not None:
+                return analytics.profit_distribution('Net Kar')
+            
             kar_series = self.df['Net Kar'].apply(SafeFallbacks.safe_numeric_conversion)
             kar_data = kar_series.dropna()
             
@@ -1109,7 +1382,7 @@ class AnalyzDashboard:
         except Exception as e:
             self.logger.error(f"Fallback profit card creation error: {e}")
     
-    def _create_low_performance_section(self, parent):
+    def _create_low_performance_section(self, parent, low_profit_products):
         """Düşük performans bölümü"""
         try:
             low_perf_container = tk.Frame(parent, bg=self.colors['bg_secondary'])
@@ -1133,12 +1406,10 @@ class AnalyzDashboard:
             header_label.pack(expand=True)
             self._widget_refs.add(header_label)
             
-            # Düşük karlı ürünleri al
+            # Düşük karlı ürünler (arka planda hesaplandı)
             try:
-                if self.analiz:
-                    low_profit_products = self.analiz.get_low_profit_products(10)
-                else:
-                    low_profit_products = self._get_fallback_low_profit_products()
+                if low_profit_products is None:
+                    raise DataValidationError("Low profit products not available")
                 
                 if DASHBOARD_COMPONENTS_AVAILABLE:
                     DashboardComponents.create_modern_product_list(
@@ -1163,6 +1434,10 @@ class AnalyzDashboard:
             if self.df.empty or 'Net Kar' not in self.df.columns:
                 return pd.DataFrame()
             
+            analytics = self._get_fallback_analytics()
+            if analytics is not None:
+                return analytics.top_frame(self.df, 'Net Kar', 10, ascending=True)
+            
             df_copy = self.df.copy()
             df_copy['Net Kar'] = df_copy['Net Kar'].apply(SafeFallbacks.safe_numeric_conversion)
             return df_copy.nsmallest(10, 'Net Kar')
@@ -1171,24 +1446,30 @@ class AnalyzDashboard:
             self.logger.error(f"Fallback low profit products error: {e}")
             return pd.DataFrame()
     
-    def _create_distribution_tab(self):
+    def _compute_distribution_data(self):
+        """Dağılım sekmesi verisi - arka planda çalışır"""
+        try:
+            if self.analiz:
+                return self.analiz.get_summary_stats()
+            return self._get_fallback_summary_stats()
+        except Exception as e:
+            self.logger.warning(f"Summary stats error: {e}")
+            return None
+    
+    def _build_distribution_tab(self, dist_frame, stats):
         """Dağılım analizi sekmesi"""
         try:
-            dist_frame = ttk.Frame(self.analysis_notebook)
-            self.analysis_notebook.add(dist_frame, text="📊 Dağılım")
-            self._widget_refs.add(dist_frame)
-            
             main_container = tk.Frame(dist_frame, bg=self.colors['bg_secondary'])
             main_container.pack(fill='both', expand=True, padx=20, pady=20)
             self._widget_refs.add(main_container)
             
             # İstatistiksel özet
-            self._create_statistical_summary(main_container)
+            self._create_statistical_summary(main_container, stats)
             
         except Exception as e:
             self.logger.error(f"Distribution tab creation error: {e}")
     
-    def _create_statistical_summary(self, parent):
+    def _create_statistical_summary(self, parent, stats):
         """İstatistiksel özet bölümü"""
         try:
             stats_container = tk.Frame(parent, bg=self.colors['bg_secondary'])
@@ -1212,12 +1493,10 @@ class AnalyzDashboard:
             header_label.pack(expand=True)
             self._widget_refs.add(header_label)
             
-            # İstatistik verilerini al
+            # İstatistik verileri (arka planda hesaplandı)
             try:
-                if self.analiz:
-                    stats = self.analiz.get_summary_stats()
-                else:
-                    stats = self._get_fallback_summary_stats()
+                if stats is None:
+                    raise DataValidationError("Summary stats not available")
                 
                 if stats:
                     self._create_stats_content(stats_frame, stats)
@@ -1237,6 +1516,10 @@ class AnalyzDashboard:
             if self.df.empty:
                 return {}
             
+            analytics = self._get_fallback_analytics()
+            if analytics is not None:
+                return self._summary_stats_from_analytics(analytics)
+            
             stats = {}
             
             # Net Kar istatistikleri
@@ -1277,6 +1560,27 @@ class AnalyzDashboard:
             self.logger.error(f"Fallback summary stats error: {e}")
             return {}
     
+    def _summary_stats_from_analytics(self, analytics):
+        """Tek geçişli analiz sonucundan özet istatistikler"""
+        stats = {}
+        kar_stats = analytics.basic_statistics('Net Kar')
+        if kar_stats.get('count'):
+            stats.update({
+                'kar_toplam': kar_stats['sum'],
+                'kar_ortalama': kar_stats['mean'],
+                'kar_medyan': kar_stats['median'],
+                'kar_std': kar_stats['std'],
+                'kar_min': kar_stats['min'],
+                'kar_max': kar_stats['max']
+            })
+        birim_kar_stats = analytics.basic_statistics('Birim Kar')
+        if birim_kar_stats.get('count'):
+            stats.update({
+                'birim_kar_ortalama': birim_kar_stats['mean'],
+                'birim_kar_medyan': birim_kar_stats['median']
+            })
+        return stats
+    
     def _create_stats_content(self, parent, stats):
         """İstatistik içeriği oluştur"""
         try:
@@ -1440,8 +1744,9 @@ class AnalyzDashboard:
             clear_btn = self._create_search_button(button_frame, "🗑️ Temizle", self._clear_search, self.colors['text_secondary'])
             clear_btn.pack(side='left')
             
-            # Enter tuşu ile arama
+            # Enter tuşu ile arama, her tuş vuruşunda canlı filtreleme
             search_entry.bind('<Return>', lambda e: self._search_product())
+            search_entry.bind('<KeyRelease>', self._on_search_key)
             
             # Hızlı filtreler
             self._create_quick_filters(controls_frame)
@@ -1558,6 +1863,34 @@ class AnalyzDashboard:
         except Exception as e:
             self.logger.error(f"Fallback search message creation error: {e}")
     
+    def _on_search_key(self, event=None):
+        """Tuş vuruşunda canlı aramayı kısa gecikmeyle planla"""
+        if event is not None and event.keysym in ('Return', 'KP_Enter'):
+            return
+        
+        try:
+            if self._live_search_job is not None:
+                self.main_container.after_cancel(self._live_search_job)
+            self._live_search_job = self.main_container.after(
+                self.LIVE_SEARCH_DELAY_MS, self._run_live_search
+            )
+        except (tk.TclError, AttributeError):
+            self._live_search_job = None
+    
+    def _run_live_search(self):
+        """Canlı arama - boş sorguda başlangıç mesajına dön"""
+        self._live_search_job = None
+        if self._is_destroyed:
+            return
+        
+        search_var = getattr(self, 'search_var', None)
+        search_term = search_var.get().strip() if search_var is not None else ""
+        if search_term:
+            self._search_product()
+        else:
+            self._clear_search_results()
+            self._show_initial_search_message()
+    
     def _search_product(self):
         """Ürün arama işlemi"""
         try:
@@ -1584,8 +1917,8 @@ class AnalyzDashboard:
                 # Sonuç başlığı
                 self._show_search_results_header(search_term, len(results))
                 
-                # Sonuç tablosu
-                self._display_search_results(results)
+                # Sonuç tablosu (İlk 50 sonuç - canlı aramada widget sayısını sınırlar)
+                self._display_search_results(results.head(50))
                 
             except Exception as e:
                 self.logger.error(f"Search execution error: {e}")
@@ -1601,17 +1934,22 @@ class AnalyzDashboard:
                 return pd.DataFrame()
             
             # Stok sütunu bul
-            stok_col = None
-            for col in self.df.columns:
-                if 'stok' in col.lower() and 'ismi' in col.lower():
-                    stok_col = col
-                    break
+            stok_col = self._find_stok_column()
             
             if not stok_col:
                 return pd.DataFrame()
             
+            # İndeks arka planda hazırsa kullanılır; hazır değilse tek seferlik tarama yapılır
+            future = self._search_index_future
+            if self._fallback_search_index is None and future is not None and future.done():
+                self._search_index_future = None
+                if not future.cancelled() and future.exception() is None:
+                    self._fallback_search_index = future.result()
+            if self._fallback_search_index is not None:
+                return self._fallback_search_index.search_dataframe(self.df, search_term)
+            
             # Arama yap
-            mask = self.df[stok_col].astype(str).str.contains(search_term, case=False, na=False)
+            mask = self.df[stok_col].astype(str).str.contains(search_term, case=False, na=False, regex=False)
             return self.df[mask].copy()
             
         except Exception as e:
@@ -1749,7 +2087,10 @@ class AnalyzDashboard:
             self._clear_search_results()
             
             try:
-                if filter_type == "all":
+                if DATA_OPERATIONS_AVAILABLE:
+                    # Derlenmiş maskeler: yalnızca gösterilecek satırlar oluşturulur
+                    results, total_count = self._run_compiled_quick_filter(filter_type, limit=50)
+                elif filter_type == "all":
                     results = self.df.copy()
                 elif filter_type == "profitable":
                     results = self._filter_profitable_products()
@@ -1764,6 +2105,9 @@ class AnalyzDashboard:
                     self._show_search_error("❌ Bu filtre için sonuç bulunamadı")
                     return
                 
+                if not DATA_OPERATIONS_AVAILABLE:
+                    total_count = len(results)
+                
                 # Sonuç başlığı
                 filter_names = {
                     "all": "Tüm Ürünler",
@@ -1772,7 +2116,7 @@ class AnalyzDashboard:
                     "high_sales": "Yükkes Satışlı Ürünler"
                 }
                 
-                self._show_search_results_header(filter_names.get(filter_type, 'Filtre'), len(results))
+                self._show_search_results_header(filter_names.get(filter_type, 'Filtre'), total_count)
                 
                 # Sonuç tablosu (İlk 50 sonuç)
                 self._display_search_results(results.head(50))
@@ -1784,6 +2128,29 @@ class AnalyzDashboard:
         except Exception as e:
             self.logger.error(f"Quick filter error: {e}")
     
+    def _quick_filter_criteria(self, filter_type):
+        """Hızlı filtre kriterleri - sütun yoksa None"""
+        if filter_type == "all":
+            return {}
+        if filter_type in ("profitable", "loss"):
+            if 'Net Kar' not in self.df.columns:
+                return None
+            return {'Net Kar': {'gt': 0} if filter_type == "profitable" else {'lt': 0}}
+        if filter_type == "high_sales":
+            miktar_col = self._get_fallback_miktar_column()
+            return {miktar_col: {'min_quantile': 0.75}} if miktar_col else None
+        return None
+    
+    def _run_compiled_quick_filter(self, filter_type, limit=None):
+        """Hızlı filtreyi veri setinin önbellekli maskeleriyle uygula - (sonuçlar, toplam sayı)"""
+        criteria = self._quick_filter_criteria(filter_type)
+        if criteria is None:
+            return pd.DataFrame(), 0
+        
+        positions = FilterEngine.for_frame(self.df).indices(criteria)
+        shown = positions[:limit] if limit is not None else positions
+        return self.df.take(shown).reset_index(drop=True), len(positions)
+    
     def _filter_profitable_products(self):
         """Karlı ürünleri filtrele"""
         try:
@@ -1867,6 +2234,26 @@ class AnalyzDashboard:
             
             self._cleanup_functions.clear()
             
+            # Bekleyen bölüm hesaplamalarını bırak
+            if self._section_poll_job is not None:
+                try:
+                    self.main_container.after_cancel(self._section_poll_job)
+                except (tk.TclError, AttributeError):
+                    pass
+                self._section_poll_job = None
+            self._section_futures.clear()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            
+            # Bekleyen canlı aramayı iptal et
+            if self._live_search_job is not None:
+                try:
+                    self.main_container.after_cancel(self._live_search_job)
+                except (tk.TclError, AttributeError):
+                    pass
+                self._live_search_job = None
+            self._fallback_search_index = None
+            self._search_index_future = None
+            
             # Clear widget references
             self._clear_all_widget_references()
             
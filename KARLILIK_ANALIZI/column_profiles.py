@@ -0,0 +1,279 @@
+# column_profiles.py - Başlık Parmak İzine Göre Kalıcı Sütun Eşleme Profilleri
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Union
+
+try:
+    from .search_index import turkce_fold
+except ImportError:
+    try:
+        from KARLILIK_ANALIZI.search_index import turkce_fold
+    except ImportError:
+        from search_index import turkce_fold
+
+
+PROFILE_FILE_NAME = "karlilik_sutun_profilleri.json"
+PROFILE_VERSION = 1
+
+# Çözümlenen sütun rolleri
+ROLE_STOK = 'stok'
+ROLE_FIYAT = 'fiyat'
+ROLE_MIKTAR = 'miktar'
+ROLE_ORT_SATIS_FIYAT = 'ort_satis_fiyat'
+ROLE_TUTAR = 'tutar'
+
+ROLES = (ROLE_STOK, ROLE_FIYAT, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR)
+
+
+def _default_profile_path() -> Path:
+    """Profil dosyasının yolu - uygulama data/ dizini, yoksa modül dizini"""
+    try:
+        from shared.utils import get_data_dir
+        return get_data_dir() / PROFILE_FILE_NAME
+    except Exception:
+        return Path(__file__).parent / PROFILE_FILE_NAME
+
+
+def header_fingerprint(columns: Iterable) -> str:
+    """Başlık satırının parmak izi - aynı ERP düzeni aynı izi üretir"""
+    normalized = "\x1f".join(turkce_fold(col) for col in columns)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+#region Otomatik Sütun Tespiti
+def _has_all(text: str, *parts: str) -> bool:
+    return all(part in text for part in parts)
+
+
+def _detect_stok(folded: Dict[str, str], allow_code: bool = True) -> Optional[str]:
+    for col, text in folded.items():
+        if 'stok' in text and ('ismi' in text or 'isim' in text):
+            return col
+    if allow_code:
+        for col, text in folded.items():
+            if 'stok' in text and 'kodu' in text:
+                return col
+    return None
+
+
+def _detect_fiyat(folded: Dict[str, str]) -> Optional[str]:
+    for col, text in folded.items():
+        if 'fiyat' in text and 'liste' not in text:
+            return col
+    return None
+
+
+def _detect_miktar(folded: Dict[str, str]) -> Optional[str]:
+    for col, text in folded.items():
+        if _has_all(text, 'satis', 'miktar'):
+            return col
+    for col, text in folded.items():
+        if text == 'miktar':
+            return col
+    return None
+
+
+def _detect_ort_satis_fiyat(folded: Dict[str, str]) -> Optional[str]:
+    for col, text in folded.items():
+        if _has_all(text, 'ort', 'satis', 'fiyat'):
+            return col
+    for col, text in folded.items():
+        if text == 'ortalama fiyat':
+            return col
+    return None
+
+
+def _detect_tutar(folded: Dict[str, str]) -> Optional[str]:
+    for col, text in folded.items():
+        if _has_all(text, 'satis', 'tutar'):
+            return col
+    for col, text in folded.items():
+        if text == 'tutar':
+            return col
+    return None
+#endregion
+
+
+class ColumnProfileStore:
+    """
+    Sütun eşleme profillerini JSON dosyasında saklar.
+
+    Anahtar başlık parmak izidir; değer çözümlenmiş rol → sütun eşlemesi.
+    Dosya değiştiğinde (başka pencere/örnek kaydettiğinde) yeniden okunur.
+    """
+
+    def __init__(self, file_path: Optional[Union[str, Path]] = None):
+        self.file_path = Path(file_path) if file_path else _default_profile_path()
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Dict] = {}
+        self._loaded_mtime: Optional[float] = None
+
+    def _load(self) -> None:
+        """Dosya değişmişse profilleri yeniden yükle"""
+        try:
+            mtime = self.file_path.stat().st_mtime
+        except OSError:
+            self._profiles = {}
+            self._loaded_mtime = None
+            return
+
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            profiles = data.get('profiles', {}) if isinstance(data, dict) else {}
+            self._profiles = profiles if isinstance(profiles, dict) else {}
+        except (OSError, ValueError):
+            self._profiles = {}
+        self._loaded_mtime = mtime
+
+    def _write(self) -> bool:
+        """Atomik yazma - aynı dizinde geçici dosya + os.replace"""
+        temp_path = self.file_path.with_suffix(self.file_path.suffix + '.tmp')
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PROFILE_VERSION, 'profiles': self._profiles},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.file_path)
+            self._loaded_mtime = self.file_path.stat().st_mtime
+            return True
+        except OSError:
+            try:
+                if temp_path.exists():
+                    temp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, str]]:
+        """Parmak izine ait rol eşlemesini döndür"""
+        with self._lock:
+            self._load()
+            profile = self._profiles.get(fingerprint)
+            return dict(profile.get('roles', {})) if profile else None
+
+    def save(self, fingerprint: str, columns: List[str], roles: Dict[str, str]) -> bool:
+        """Profili kaydet veya güncelle"""
+        with self._lock:
+            self._load()
+            existing = self._profiles.get(fingerprint, {})
+            if existing.get('roles') == roles:
+                return True  # Değişiklik yok - diske yazma
+            self._profiles[fingerprint] = {
+                'roles': dict(roles),
+                'columns': [str(col) for col in columns],
+                'created': existing.get('created', datetime.now().isoformat()),
+                'updated': datetime.now().isoformat(),
+            }
+            return self._write()
+
+    def delete(self, fingerprint: str) -> bool:
+        """Profili sil (ör. hatalı manuel seçim sonrası)"""
+        with self._lock:
+            self._load()
+            if self._profiles.pop(fingerprint, None) is None:
+                return False
+            return self._write()
+
+
+_default_store: Optional[ColumnProfileStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ColumnProfileStore:
+    """Uygulama genelinde paylaşılan profil deposu"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ColumnProfileStore()
+        return _default_store
+
+
+class ColumnResolver:
+    """
+    Bir dosyanın sütun rollerini tek noktadan çözümler.
+
+    Başlık parmak izi için kayıtlı profil varsa tespit ve manuel seçim
+    atlanır; yoksa başlıklar bir kez normalize edilip roller tespit edilir.
+    Manuel seçimler remember() ile eklenir ve save() ile kalıcı hale gelir.
+    """
+
+    def __init__(self, columns: Iterable, store: Optional[ColumnProfileStore] = None,
+                 allow_stok_code: bool = True):
+        """
+        Args:
+            columns: DataFrame sütunları (başlık satırı)
+            store: Profil deposu (None ise paylaşılan depo kullanılır)
+            allow_stok_code: Stok ismi bulunamazsa stok kodu sütununa düşülsün mü
+        """
+        self.columns = list(columns)
+        self.store = store if store is not None else get_profile_store()
+        self.allow_stok_code = allow_stok_code
+        self.fingerprint = header_fingerprint(self.columns)
+        self._roles: Dict[str, Optional[str]] = {}
+        self._folded: Optional[Dict[str, str]] = None
+        self.from_profile = False
+
+        try:
+            profile = self.store.get(self.fingerprint) if self.store else None
+        except Exception:
+            profile = None
+
+        if profile:
+            by_name = {str(col): col for col in self.columns}
+            for role, col_name in profile.items():
+                if col_name in by_name:
+                    self._roles[role] = by_name[col_name]
+            self.from_profile = bool(self._roles)
+
+    def _folded_columns(self) -> Dict[str, str]:
+        if self._folded is None:
+            self._folded = {col: turkce_fold(col) for col in self.columns}
+        return self._folded
+
+    def _detect(self, role: str) -> Optional[str]:
+        folded = self._folded_columns()
+        if role == ROLE_STOK:
+            return _detect_stok(folded, self.allow_stok_code)
+        if role == ROLE_FIYAT:
+            return _detect_fiyat(folded)
+        if role == ROLE_MIKTAR:
+            return _detect_miktar(folded)
+        if role == ROLE_ORT_SATIS_FIYAT:
+            return _detect_ort_satis_fiyat(folded)
+        if role == ROLE_TUTAR:
+            return _detect_tutar(folded)
+        raise ValueError(f"Bilinmeyen sütun rolü: {role}")
+
+    def resolve(self, role: str) -> Optional[str]:
+        """Rol için sütun adını döndür (profil > önbellek > otomatik tespit)"""
+        if role not in self._roles:
+            self._roles[role] = self._detect(role)
+        return self._roles[role]
+
+    def remember(self, role: str, column: str) -> None:
+        """Manuel seçilen sütunu role ata"""
+        self._roles[role] = column
+
+    @property
+    def roles(self) -> Dict[str, str]:
+        """Çözümlenmiş (None olmayan) roller"""
+        return {role: col for role, col in self._roles.items() if col is not None}
+
+    def save(self) -> bool:
+        """Çözümlenen rolleri profil olarak kalıcı hale getir"""
+        roles = {role: str(col) for role, col in self.roles.items()}
+        if not roles or self.store is None:
+            return False
+        try:
+            return self.store.save(self.fingerprint, self.columns, roles)
+        except Exception:
+            return False
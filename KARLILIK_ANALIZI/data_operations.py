@@ -6,6 +6,8 @@ import json
 import os
 import tempfile
 import gc
+import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Union, Any
@@ -107,6 +109,405 @@ class DataCleaner:
             return df
 
 
+class AnalyticsResult:
+    """
+    AnalyticsKernel çıktısı - sütun başına tek seferde hesaplanmış metrikler.
+
+    Dashboard bölümleri (KPI, performans, kar dağılımı, istatistik) aynı
+    nesneden okur; sayısal dönüşüm ve tarama tekrar edilmez.
+    """
+
+    def __init__(self, 
+                 row_count: int, 
+                 values: Dict[str, np.ndarray], 
+                 column_stats: Dict[str, Dict[str, Any]], 
+                 top_n: int):
+        self.row_count = row_count
+        self._values = values
+        self._stats = column_stats
+        self._top_n = top_n
+
+    def has(self, column_name: str) -> bool:
+        return column_name in self._stats
+
+    def values(self, column_name: str) -> np.ndarray:
+        """Sütunun tipli (float64) değerleri"""
+        return self._values[column_name]
+
+    def basic_statistics(self, column_name: str) -> Dict[str, float]:
+        """DataAnalyzer.calculate_basic_statistics biçiminde istatistikler"""
+        stats = self._stats.get(column_name)
+        if not stats or self.row_count == 0:
+            return {}
+        return {key: stats[key] for key in ('count', 'sum', 'mean', 'median', 'std', 'min', 'max', 'q25', 'q75')}
+
+    def sign_counts(self, column_name: str) -> Tuple[int, int]:
+        """(pozitif, negatif) değer sayıları"""
+        stats = self._stats.get(column_name)
+        if not stats:
+            return 0, 0
+        return stats['positive_count'], stats['negative_count']
+
+    def profit_distribution(self, column_name: str = 'Net Kar') -> Dict[str, int]:
+        """DataAnalyzer.calculate_profit_distribution biçiminde kar dağılımı"""
+        stats = self._stats.get(column_name)
+        if not stats:
+            return {'cok_karli': 0, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': 0}
+        return dict(stats['distribution'])
+
+    def quality(self, column_name: str) -> Dict[str, Any]:
+        """DataValidator.check_data_quality biçiminde kalite raporu"""
+        stats = self._stats.get(column_name)
+        if not stats or self.row_count == 0:
+            return {}
+        return dict(stats['quality'])
+
+    def histogram(self, column_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(sayılar, kova sınırları)"""
+        stats = self._stats.get(column_name)
+        if not stats:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return stats['histogram']
+
+    def top_positions(self, column_name: str, limit: int = 10, ascending: bool = False) -> np.ndarray:
+        """En yüksek/düşük değerlerin satır konumları (nlargest/nsmallest keep='first' sırası)"""
+        stats = self._stats.get(column_name)
+        if not stats:
+            return np.empty(0, dtype=np.int64)
+        key = 'bottom' if ascending else 'top'
+        if limit <= self._top_n:
+            return stats[key][:limit]
+        return AnalyticsKernel.top_positions(self._values[column_name], limit, ascending)
+
+    def top_frame(self, 
+                  df: pd.DataFrame, 
+                  column_name: str, 
+                  limit: int = 10, 
+                  ascending: bool = False) -> pd.DataFrame:
+        """DataAnalyzer.get_top_values biçiminde satırlar (sütun sayısala çevrilmiş)"""
+        if not self.has(column_name) or df.empty:
+            return pd.DataFrame()
+        positions = self.top_positions(column_name, limit, ascending)
+        result = df.iloc[positions].copy()
+        result[column_name] = self._values[column_name][positions]
+        return result.reset_index(drop=True)
+
+
+class AnalyticsKernel:
+    """Seçili sayısal sütunlar için tek geçişli, vektörel analiz çekirdeği"""
+    
+    HISTOGRAM_BINS = 20
+    DEFAULT_TOP_N = 10
+    
+    @staticmethod
+    def top_positions(values: np.ndarray, limit: int, ascending: bool = False) -> np.ndarray:
+        """Kısmi sıralama ile ilk N konum - eşitliklerde önceki satır önce gelir"""
+        n = len(values)
+        if n == 0 or limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        keyed = values if ascending else -values
+        if limit >= n:
+            return np.argsort(keyed, kind='stable')
+        
+        threshold = np.partition(keyed, limit - 1)[limit - 1]
+        strict = np.flatnonzero(keyed < threshold)
+        ties = np.flatnonzero(keyed == threshold)[:limit - len(strict)]
+        candidates = np.concatenate([strict, ties])
+        return candidates[np.argsort(keyed[candidates], kind='stable')]
+    
+    @staticmethod
+    def _distribution(column: np.ndarray) -> Dict[str, int]:
+        """Kar dağılımı - pozitif değerlerin %33/%67 dilimlerine göre"""
+        zararda = int((column < 0).sum())
+        pozitif = column[column >= 0]
+        if pozitif.size == 0:
+            return {'cok_karli': 0, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': zararda}
+        if pozitif.size == 1:
+            return {'cok_karli': 1, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': zararda}
+        
+        q33, q67 = np.quantile(pozitif, [0.33, 0.67])
+        dusuk = int((pozitif < q33).sum())
+        cok = int((pozitif >= q67).sum())
+        return {
+            'cok_karli': cok,
+            'orta_karli': int(pozitif.size - dusuk - cok),
+            'dusuk_karli': dusuk,
+            'zararda': zararda
+        }
+    
+    @classmethod
+    def compute(cls, 
+                df: pd.DataFrame, 
+                columns: List[str], 
+                top_n: int = DEFAULT_TOP_N) -> AnalyticsResult:
+        """
+        Sütunları bir kez sayısala çevirip tüm metrikleri matris üzerinde hesaplar.
+        
+        Args:
+            df: Kaynak DataFrame
+            columns: Analiz edilecek sütunlar (olmayanlar atlanır)
+            top_n: Önceden hesaplanacak ilk/son N satır sayısı
+        """
+        names = [col for col in dict.fromkeys(columns) if col and col in df.columns]
+        n = len(df)
+        if not names or n == 0:
+            return AnalyticsResult(n, {}, {}, top_n)
+        
+        # Tek sayısal dönüşüm - (satır × sütun) matrisi
+        nulls = np.column_stack([df[col].isna().to_numpy() for col in names])
+        matrix = np.column_stack([
+            DataCleaner.safe_numeric_conversion(df[col]).to_numpy(dtype=np.float64, na_value=0.0)
+            for col in names
+        ])
+        
+        # Tüm sütunlar için tek seferde vektörel özetler
+        sums = matrix.sum(axis=0)
+        mins = matrix.min(axis=0)
+        maxs = matrix.max(axis=0)
+        stds = matrix.std(axis=0, ddof=1) if n > 1 else np.zeros(len(names))
+        q25, median, q75 = np.quantile(matrix, [0.25, 0.5, 0.75], axis=0)
+        valid = ~nulls
+        null_counts = nulls.sum(axis=0)
+        zero_counts = ((matrix == 0) & valid).sum(axis=0)
+        negative_counts = (matrix < 0).sum(axis=0)
+        positive_counts = (matrix > 0).sum(axis=0)
+        
+        values = {}
+        column_stats = {}
+        for j, col in enumerate(names):
+            column = matrix[:, j]
+            values[col] = column
+            
+            # Sayısal olmayan metinler çevrimde 0 olur - kalite raporunda ayrıca sayılır
+            raw = df[col]
+            if pd.api.types.is_numeric_dtype(raw):
+                numeric_count = int(n - null_counts[j])
+            else:
+                numeric_count = int(pd.to_numeric(raw, errors='coerce').notna().sum())
+            unique_count = int(np.unique(column[valid[:, j]]).size) if numeric_count == n - null_counts[j] \
+                else int(raw.nunique())
+            
+            column_stats[col] = {
+                'count': n,
+                'sum': float(sums[j]),
+                'mean': float(sums[j] / n),
+                'median': float(median[j]),
+                'std': float(stds[j]),
+                'min': float(mins[j]),
+                'max': float(maxs[j]),
+                'q25': float(q25[j]),
+                'q75': float(q75[j]),
+                'positive_count': int(positive_counts[j]),
+                'negative_count': int(negative_counts[j]),
+                'distribution': cls._distribution(column),
+                'histogram': np.histogram(column, bins=cls.HISTOGRAM_BINS),
+                'top': cls.top_positions(column, top_n),
+                'bottom': cls.top_positions(column, top_n, ascending=True),
+                'quality': {
+                    'total_count': n,
+                    'null_count': int(null_counts[j]),
+                    'null_percentage': float(null_counts[j] / n * 100),
+                    'unique_count': unique_count,
+                    'unique_percentage': float(unique_count / n * 100),
+                    'data_type': str(raw.dtype),
+                },
+            }
+            if numeric_count:
+                column_stats[col]['quality'].update({
+                    'numeric_count': numeric_count,
+                    'zero_count': int(zero_counts[j]),
+                    'negative_count': int(negative_counts[j])
+                })
+        
+        return AnalyticsResult(n, values, column_stats, top_n)
+
+
+class FilterEngine:
+    """
+    Kriter sözlüklerini veri setine bağlı önbellekli boolean maskelere derler.
+    
+    Sayısal dönüşümler ve her kriterin maskesi veri seti sürümü başına bir kez
+    hesaplanır; kriter birleşimleri (AND/OR) önbellekteki maskelerle yapılır.
+    Sonuçlar satır konumları (indeks dizisi) olarak döner, DataFrame yalnızca
+    istenen satırlar için oluşturulur.
+    
+    Koşul biçimleri:
+        {'min': x, 'max': y}: Kapalı aralık (sayısal)
+        {'gt': x, 'lt': y}: Açık aralık (sayısal)
+        {'min_quantile': q}: q yüzdelik değerine eşit/büyük (sayısal)
+        {'contains': metin}: Büyük/küçük harf duyarsız içerme
+        [a, b, ...]: Değerlerden biri
+        değer: Eşitlik
+    """
+    
+    MAX_CACHED_MASKS = 64
+    MODES = ('and', 'or')
+    
+    _engines: Dict[int, Tuple[Any, 'FilterEngine']] = {}
+    _engines_lock = threading.RLock()
+    
+    def __init__(self, df: pd.DataFrame):
+        # Veri setine zayıf referans: motor (ve kayıt defteri) veri setini canlı tutmaz
+        self._df_ref = weakref.ref(df)
+        self.version = 0
+        self._signature = self._frame_signature(df)
+        self._numeric: Dict[Any, np.ndarray] = {}
+        self._masks: Dict[Any, np.ndarray] = {}
+        self._lock = threading.RLock()
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        df = self._df_ref()
+        if df is None:
+            raise ReferenceError("FilterEngine veri seti artık mevcut değil")
+        return df
+    
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame) -> 'FilterEngine':
+        """Veri setine ait paylaşılan motoru döndürür (yoksa oluşturur)"""
+        with cls._engines_lock:
+            key = id(df)
+            entry = cls._engines.get(key)
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+            
+            def _release(ref, key=key):
+                # Veri seti toplandığında motoru kayıt defterinden bırak
+                with cls._engines_lock:
+                    current = cls._engines.get(key)
+                    if current is not None and current[0] is ref:
+                        del cls._engines[key]
+            
+            engine = cls(df)
+            cls._engines[key] = (weakref.ref(df, _release), engine)
+            return engine
+    
+    @staticmethod
+    def _frame_signature(df: pd.DataFrame) -> Tuple:
+        return (df.shape, tuple(df.columns))
+    
+    def invalidate(self) -> None:
+        """Veri yerinde değiştiğinde önbelleği düşür (yeni veri seti sürümü)"""
+        with self._lock:
+            self._numeric.clear()
+            self._masks.clear()
+            self._signature = self._frame_signature(self.df)
+            self.version += 1
+    
+    def _check_version(self) -> None:
+        if self._frame_signature(self.df) != self._signature:
+            self.invalidate()
+    
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        """Koşulu önbellek anahtarına çevirir"""
+        if isinstance(value, dict):
+            return ('dict', tuple(sorted((str(k), FilterEngine._freeze(v)) for k, v in value.items())))
+        if isinstance(value, (list, tuple, set)):
+            return ('list', tuple(sorted(map(repr, value))))
+        return ('value', repr(value))
+    
+    def _numeric_values(self, column: str) -> np.ndarray:
+        values = self._numeric.get(column)
+        if values is None:
+            values = DataCleaner.safe_numeric_conversion(self.df[column]).to_numpy(dtype=np.float64)
+            values.setflags(write=False)
+            self._numeric[column] = values
+        return values
+    
+    def _build_mask(self, column: str, condition: Any) -> np.ndarray:
+        series = self.df[column]
+        
+        if isinstance(condition, dict):
+            mask = np.ones(len(series), dtype=bool)
+            if any(key in condition for key in ('min', 'max', 'gt', 'lt', 'min_quantile')):
+                values = self._numeric_values(column)
+                if 'min' in condition:
+                    mask &= values >= condition['min']
+                if 'max' in condition:
+                    mask &= values <= condition['max']
+                if 'gt' in condition:
+                    mask &= values > condition['gt']
+                if 'lt' in condition:
+                    mask &= values < condition['lt']
+                if 'min_quantile' in condition and len(values):
+                    mask &= values >= np.quantile(values, condition['min_quantile'])
+            if 'contains' in condition:
+                mask &= series.astype(str).str.contains(
+                    condition['contains'], case=False, na=False
+                ).to_numpy(dtype=bool)
+            return mask
+        
+        if isinstance(condition, (list, tuple, set)):
+            return series.isin(list(condition)).to_numpy(dtype=bool)
+        
+        return (series == condition).to_numpy(dtype=bool)
+    
+    def _condition_mask(self, column: str, condition: Any) -> np.ndarray:
+        key = (column, self._freeze(condition))
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._build_mask(column, condition)
+            self._remember(key, mask)
+        return mask
+    
+    def _remember(self, key: Any, mask: np.ndarray) -> None:
+        """Maskeyi salt okunur yapıp önbelleğe ekler (en fazla MAX_CACHED_MASKS, en eski atılır)"""
+        mask.setflags(write=False)
+        while len(self._masks) >= self.MAX_CACHED_MASKS:
+            self._masks.pop(next(iter(self._masks)))
+        self._masks[key] = mask
+    
+    def mask(self, criteria: Dict[str, Any], mode: str = 'and') -> np.ndarray:
+        """
+        Kriterlerin birleşik boolean maskesi (salt okunur).
+        
+        Args:
+            criteria: {sütun: koşul} sözlüğü - olmayan sütunlar yok sayılır
+            mode: 'and' (tüm koşullar) veya 'or' (herhangi bir koşul)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz filtre modu: {mode}")
+        
+        with self._lock:
+            self._check_version()
+            parts = [(column, condition) for column, condition in criteria.items()
+                     if column in self.df.columns]
+            if not parts:
+                full = np.ones(len(self.df), dtype=bool)
+                full.setflags(write=False)
+                return full
+            if len(parts) == 1:
+                return self._condition_mask(*parts[0])
+            
+            key = (mode, frozenset((column, self._freeze(condition)) for column, condition in parts))
+            combined = self._masks.get(key)
+            if combined is None:
+                masks = [self._condition_mask(column, condition) for column, condition in parts]
+                reducer = np.logical_and if mode == 'and' else np.logical_or
+                combined = reducer.reduce(masks)
+                self._remember(key, combined)
+            return combined
+    
+    def indices(self, criteria: Dict[str, Any], mode: str = 'and') -> np.ndarray:
+        """Kriterlere uyan satırların konumları"""
+        return np.flatnonzero(self.mask(criteria, mode))
+    
+    def count(self, criteria: Dict[str, Any], mode: str = 'and') -> int:
+        """Kriterlere uyan satır sayısı"""
+        return int(np.count_nonzero(self.mask(criteria, mode)))
+    
+    def filter(self, 
+               criteria: Dict[str, Any], 
+               mode: str = 'and', 
+               limit: Optional[int] = None) -> pd.DataFrame:
+        """Kriterlere uyan satırlar (yalnızca ilk limit kadarı oluşturulur)"""
+        positions = self.indices(criteria, mode)
+        if limit is not None:
+            positions = positions[:limit]
+        return self.df.take(positions).reset_index(drop=True)
+
+
 class DataAnalyzer:
     """Veri analizi ve istatistik hesaplama işlemleri"""
     
@@ -117,25 +518,7 @@ class DataAnalyzer:
             if column_name not in df.columns:
                 return {}
             
-            series = DataCleaner.safe_numeric_conversion(df[column_name])
-            valid_data = series.dropna()
-            
-            if valid_data.empty:
-                return {}
-            
-            stats = {
-                'count': len(valid_data),
-                'sum': float(valid_data.sum()),
-                'mean': float(valid_data.mean()),
-                'median': float(valid_data.median()),
-                'std': float(valid_data.std()) if len(valid_data) > 1 else 0.0,
-                'min': float(valid_data.min()),
-                'max': float(valid_data.max()),
-                'q25': float(valid_data.quantile(0.25)),
-                'q75': float(valid_data.quantile(0.75))
-            }
-            
-            return stats
+            return AnalyticsKernel.compute(df, [column_name]).basic_statistics(column_name)
             
         except Exception as e:
             logging.error(f"Statistics calculation error: {e}")
@@ -148,47 +531,7 @@ class DataAnalyzer:
             if profit_column not in df.columns:
                 return {'cok_karli': 0, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': 0}
             
-            # Numeric conversion
-            kar_series = DataCleaner.safe_numeric_conversion(df[profit_column])
-            kar_data = kar_series.dropna()
-            
-            if kar_data.empty:
-                return {'cok_karli': 0, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': 0}
-            
-            # Zarardaki ürünler
-            zararda = len(kar_data[kar_data < 0])
-            
-            # Pozitif kar değerleri
-            pozitif_kar = kar_data[kar_data >= 0]
-            
-            if pozitif_kar.empty:
-                return {'cok_karli': 0, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': int(zararda)}
-            
-            if len(pozitif_kar) == 1:
-                return {'cok_karli': 1, 'orta_karli': 0, 'dusuk_karli': 0, 'zararda': int(zararda)}
-            
-            # Quantile hesaplama
-            try:
-                q33 = pozitif_kar.quantile(0.33)
-                q67 = pozitif_kar.quantile(0.67)
-                
-                dusuk_karli = len(pozitif_kar[pozitif_kar < q33])
-                orta_karli = len(pozitif_kar[(pozitif_kar >= q33) & (pozitif_kar < q67)])
-                cok_karli = len(pozitif_kar[pozitif_kar >= q67])
-                
-            except (ValueError, TypeError):
-                # Eşit dağıtım
-                pozitif_count = len(pozitif_kar)
-                cok_karli = pozitif_count // 3
-                orta_karli = pozitif_count // 3
-                dusuk_karli = pozitif_count - cok_karli - orta_karli
-            
-            return {
-                'cok_karli': int(cok_karli),
-                'orta_karli': int(orta_karli),
-                'dusuk_karli': int(dusuk_karli),
-                'zararda': int(zararda)
-            }
+            return AnalyticsKernel.compute(df, [profit_column]).profit_distribution(profit_column)
             
         except Exception as e:
             logging.error(f"Profit distribution calculation error: {e}")
@@ -217,62 +560,23 @@ class DataAnalyzer:
             if sort_column not in df.columns or df.empty:
                 return pd.DataFrame()
             
-            # Numeric conversion
-            df_copy = df.copy()
-            df_copy[sort_column] = DataCleaner.safe_numeric_conversion(df_copy[sort_column])
-            
-            # Geçerli değerleri filtrele
-            valid_df = df_copy.dropna(subset=[sort_column])
-            if valid_df.empty:
-                return pd.DataFrame()
-            
-            # Sırala ve limit uygula
-            if ascending:
-                result = valid_df.nsmallest(limit, sort_column)
-            else:
-                result = valid_df.nlargest(limit, sort_column)
-            
-            return result.reset_index(drop=True)
+            analytics = AnalyticsKernel.compute(df, [sort_column], top_n=limit)
+            return analytics.top_frame(df, sort_column, limit, ascending)
             
         except Exception as e:
             logging.error(f"Top values calculation error: {e}")
             return pd.DataFrame()
     
     @staticmethod
-    def filter_data_by_criteria(df: pd.DataFrame, criteria: Dict[str, Any]) -> pd.DataFrame:
-        """Belirtilen kriterlere göre veriyi filtreler"""
+    def filter_data_by_criteria(df: pd.DataFrame, 
+                                criteria: Dict[str, Any], 
+                                mode: str = 'and') -> pd.DataFrame:
+        """Belirtilen kriterlere göre veriyi filtreler (maskeler veri seti başına önbelleklenir)"""
         try:
             if df.empty:
                 return df
             
-            filtered_df = df.copy()
-            
-            for column, condition in criteria.items():
-                if column not in filtered_df.columns:
-                    continue
-                
-                if isinstance(condition, dict):
-                    if 'min' in condition:
-                        numeric_col = DataCleaner.safe_numeric_conversion(filtered_df[column])
-                        filtered_df = filtered_df[numeric_col >= condition['min']]
-                    
-                    if 'max' in condition:
-                        numeric_col = DataCleaner.safe_numeric_conversion(filtered_df[column])
-                        filtered_df = filtered_df[numeric_col <= condition['max']]
-                    
-                    if 'contains' in condition:
-                        mask = filtered_df[column].astype(str).str.contains(
-                            condition['contains'], case=False, na=False
-                        )
-                        filtered_df = filtered_df[mask]
-                
-                elif isinstance(condition, (list, tuple)):
-                    filtered_df = filtered_df[filtered_df[column].isin(condition)]
-                
-                else:
-                    filtered_df = filtered_df[filtered_df[column] == condition]
-            
-            return filtered_df.reset_index(drop=True)
+            return FilterEngine.for_frame(df).filter(criteria, mode)
             
         except Exception as e:
             logging.error(f"Data filtering error: {e}")
@@ -614,39 +918,7 @@ class DataValidator:
             if column_name not in df.columns:
                 return {}
             
-            series = df[column_name]
-            total_count = len(series)
-            
-            if total_count == 0:
-                return {}
-            
-            null_count = series.isnull().sum()
-            unique_count = series.nunique()
-            
-            quality_report = {
-                'total_count': total_count,
-                'null_count': int(null_count),
-                'null_percentage': float(null_count / total_count * 100),
-                'unique_count': int(unique_count),
-                'unique_percentage': float(unique_count / total_count * 100),
-                'data_type': str(series.dtype)
-            }
-            
-            # Sayısal sütunlar için ek bilgi
-            try:
-                numeric_series = pd.to_numeric(series, errors='coerce')
-                valid_numeric = numeric_series.dropna()
-                
-                if not valid_numeric.empty:
-                    quality_report.update({
-                        'numeric_count': len(valid_numeric),
-                        'zero_count': int((valid_numeric == 0).sum()),
-                        'negative_count': int((valid_numeric < 0).sum())
-                    })
-            except:
-                pass
-            
-            return quality_report
+            return AnalyticsKernel.compute(df, [column_name]).quality(column_name)
             
         except Exception as e:
             logging.error(f"Data quality check error: {e}")
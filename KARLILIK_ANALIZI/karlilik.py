@@ -5,24 +5,65 @@ import numpy as np
 import os
 import tempfile
 import gc
+import hashlib
+import time
 from tkinter import simpledialog, filedialog, messagebox
 from typing import Optional, Tuple, Dict, List, Union, Callable
 from pathlib import Path
 
+try:
+    from .column_profiles import (ColumnResolver, ROLE_STOK, ROLE_FIYAT, ROLE_MIKTAR,
+                                  ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR)
+except ImportError:
+    try:
+        from KARLILIK_ANALIZI.column_profiles import (ColumnResolver, ROLE_STOK, ROLE_FIYAT, ROLE_MIKTAR,
+                                                      ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR)
+    except ImportError:
+        from column_profiles import (ColumnResolver, ROLE_STOK, ROLE_FIYAT, ROLE_MIKTAR,
+                                     ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR)
+
 
 class KarlilikAnalizi:
     """Excel tabanlı karlılık analizleri yapan ana sınıf"""
 
+    # Sonuç tablosundaki standart sütunların alternatif isimleri
+    RESULT_COLUMN_ALTERNATIVES = {
+        'Satış Miktar': ['Satış\nMiktar', 'Satis Miktar', 'Miktar'],
+        'Ort.Satış Fiyat': ['Ort.Satış\nFiyat', 'Ort Satış Fiyat', 'Ortalama Fiyat'],
+        'Satış Tutar': ['Satış\nTutar', 'Satis Tutar', 'Tutar'],
+        'Birim Maliyet': ['Birim\nMaliyet', 'Maliyet'],
+        'Birim Kar': ['Birim\nKar', 'Kar'],
+        'Net Kar': ['Net\nKar', 'Toplam Kar']
+    }
+
+    # Fiyat sözlüğünün iskonto dosyasında kullandığı ek sütunlar
+    ISKONTO_EXTRA_COLUMNS = ('Tarih', 'Depo')
+
+    # Analiz aşamalarının log etiketleri
+    STAGE_LABELS = {
+        'karlilik': 'Karlılık yükleme',
+        'iskonto': 'İskonto/fiyat sözlüğü',
+        'eslestirme': 'Eşleştirme',
+        'kar': 'Kar hesaplama',
+        'kayit': 'Kaydetme',
+    }
+
     def __init__(self, 
                  progress_callback: Optional[Callable[[int, str], None]] = None,
-                 log_callback: Optional[Callable[[str, str], None]] = None):
+                 log_callback: Optional[Callable[[str, str], None]] = None,
+                 compact_loading: bool = True):
         """
         Args:
             progress_callback: (value: int, status: str) -> None
             log_callback: (message: str, msg_type: str) -> None
+            compact_loading: Sadece eşlenen sütunları okuyup kompakt tiplere çevir
         """
         self.progress_callback = progress_callback
         self.log_callback = log_callback
+        self.compact_loading = compact_loading
+        self.memory_report: Dict[str, float] = {}
+        self.stage_timings: Dict[str, Dict] = {}
+        self._stage_cache: Dict[str, Tuple[Tuple[str, bool], Dict]] = {}
         self._temp_files = []
 
     #region Yardımcı Metodlar
@@ -88,6 +129,93 @@ class KarlilikAnalizi:
             return 0.0
             
         return 0.0
+
+    @classmethod
+    def _clean_numeric_column(cls, series: pd.Series) -> pd.Series:
+        """Sütunu _clean_numeric kurallarıyla float64 sütuna çevirir"""
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return series.astype(np.float64).fillna(0.0)
+        return series.map(cls._clean_numeric).astype(np.float64)
+    #endregion
+
+    #region Bellek Dostu Yükleme
+    def _read_excel_header(self, file_path: Union[str, Path], header: int = 0) -> pd.DataFrame:
+        """Sadece başlık satırını okur - sütun tespiti için boş DataFrame"""
+        return pd.read_excel(file_path, header=header, nrows=0)
+
+    def _read_excel_columns(self, 
+                            file_path: Union[str, Path], 
+                            columns: List[str], 
+                            header: int = 0) -> pd.DataFrame:
+        """Excel dosyasından yalnızca istenen sütunları okur"""
+        wanted = {str(col) for col in columns}
+        try:
+            df = pd.read_excel(file_path, header=header, usecols=lambda col: str(col) in wanted)
+            if all(col in df.columns for col in columns):
+                return df
+            self._log_message("Sütun budama uygulanamadı, tüm sütunlar okunuyor...", 'warning')
+        except ValueError as e:
+            self._log_message(f"Sütun budama hatası: {str(e)}", 'warning')
+        
+        df = pd.read_excel(file_path, header=header)
+        return df[[col for col in columns if col in df.columns]]
+
+    def _karlilik_columns(self, 
+                          columns: pd.Index, 
+                          stok_ismi_col: str, 
+                          resolver: ColumnResolver) -> List[str]:
+        """Karlılık dosyasından okunması gereken sütunlar"""
+        istenen = [stok_ismi_col]
+        for role in (ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR):
+            istenen.append(resolver.resolve(role))
+        for standart_isim, alternatifler in self.RESULT_COLUMN_ALTERNATIVES.items():
+            istenen.append(standart_isim)
+            istenen.extend(alternatifler)
+        
+        mevcut = set(columns)
+        return list(dict.fromkeys(col for col in istenen if col is not None and col in mevcut))
+
+    def _iskonto_columns(self, 
+                         columns: pd.Index, 
+                         iskonto_stok_col: str, 
+                         fiyat_col: str) -> List[str]:
+        """İskonto dosyasından okunması gereken sütunlar (fiyat sözlüğü için Tarih/Depo dahil)"""
+        istenen = [iskonto_stok_col, fiyat_col, *self.ISKONTO_EXTRA_COLUMNS]
+        mevcut = set(columns)
+        return list(dict.fromkeys(col for col in istenen if col in mevcut))
+
+    @staticmethod
+    def _to_category(series: pd.Series) -> pd.Series:
+        """Metin sütununu kırpılmış, büyük harfli kategorik sütuna çevirir"""
+        codes, uniques = pd.factorize(series, sort=False)
+        if len(uniques) == 0:
+            return series.astype('category')
+        
+        # Temizlik benzersiz değerler üzerinde yapılır, aynı sonuca düşenler birleşir
+        temiz = pd.Index(uniques.astype(str)).str.strip().str.upper()
+        temiz_kodlar, kategoriler = pd.factorize(temiz, sort=False)
+        yeni_kodlar = np.where(codes >= 0, temiz_kodlar[np.maximum(codes, 0)], -1)
+        return pd.Series(pd.Categorical.from_codes(yeni_kodlar, categories=kategoriler),
+                         index=series.index, name=series.name)
+
+    @staticmethod
+    def _compact_numeric(series: pd.Series) -> pd.Series:
+        """Sayısal sütunu kompakt tipe çevirir; "1.234,56" gibi metinlere dokunmaz"""
+        if not pd.api.types.is_numeric_dtype(series):
+            converted = pd.to_numeric(series, errors='coerce')
+            if converted.notna().sum() != series.notna().sum():
+                return series  # Metin biçimli değerler _clean_numeric ile işlenir
+            series = converted
+        if pd.api.types.is_integer_dtype(series):
+            return pd.to_numeric(series, downcast='integer')
+        return series
+
+    def _report_memory(self, name: str, df: pd.DataFrame) -> None:
+        """Yüklenen tablonun bellek kullanımını raporlar"""
+        mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        self.memory_report[f'{name}_mb'] = mb
+        etiket = 'Karlılık' if name == 'karlilik' else 'İskonto'
+        self._log_message(f"✓ Bellek kullanımı: {etiket} {mb:.1f} MB ({len(df.columns)} sütun, {len(df)} satır)")
     #endregion
 
     #region Dosya İşlemleri
@@ -124,24 +252,12 @@ class KarlilikAnalizi:
         self._log_message("Uygun header bulunamadı, varsayılan olarak header=1 kullanılıyor...")
         return 1  # Varsayılan değer
 
-    def find_stok_column(self, df: pd.DataFrame) -> Optional[str]:
-        """DataFrame'de stok sütununu bulur"""
-        stok_ismi_col = None
-        
-        # Önce "stok ismi" ara
-        for col in df.columns:
-            col_clean = self._turkce_normalize(col)
-            if 'stok' in col_clean and ('ismi' in col_clean or 'isim' in col_clean):
-                stok_ismi_col = col
-                break
-        
-        # Bulamazsa "stok kodu" ara        
-        if not stok_ismi_col:
-            for col in df.columns:
-                col_clean = self._turkce_normalize(col)
-                if 'stok' in col_clean and 'kodu' in col_clean:
-                    stok_ismi_col = col
-                    break
+    def find_stok_column(self, df: pd.DataFrame,
+                         resolver: Optional[ColumnResolver] = None) -> Optional[str]:
+        """DataFrame'de stok sütununu bulur (önce stok ismi, sonra stok kodu)"""
+        if resolver is None:
+            resolver = ColumnResolver(df.columns)
+        stok_ismi_col = resolver.resolve(ROLE_STOK)
         
         # Manuel seçim gerekirse
         if not stok_ismi_col:
@@ -163,6 +279,7 @@ class KarlilikAnalizi:
                 secim_index = int(secim_str)
                 if 0 <= secim_index < len(columns):
                     stok_ismi_col = columns[secim_index]
+                    resolver.remember(ROLE_STOK, stok_ismi_col)
                 else:
                     self._log_message("✗ Geçersiz sütun numarası", 'error')
                     return None
@@ -172,25 +289,16 @@ class KarlilikAnalizi:
         
         return stok_ismi_col
 
-    def find_iskonto_columns(self, df: pd.DataFrame) -> Tuple[Optional[str], Optional[str]]:
+    def find_iskonto_columns(self, df: pd.DataFrame,
+                             resolver: Optional[ColumnResolver] = None) -> Tuple[Optional[str], Optional[str]]:
         """İskonto dosyasından fiyat ve stok sütunlarını bulur"""
         columns = df.columns.tolist()
+        if resolver is None:
+            resolver = ColumnResolver(columns, allow_stok_code=False)
         
-        # Fiyat sütunu bul
-        fiyat_col = None
-        for col in columns:
-            col_str = self._turkce_normalize(col)
-            if 'fiyat' in col_str and 'liste' not in col_str:
-                fiyat_col = col
-                break
-        
-        # İskonto stok sütunu bul
-        iskonto_stok_col = None
-        for col in columns:
-            col_clean = self._turkce_normalize(col)
-            if 'stok' in col_clean and ('isim' in col_clean or 'ismi' in col_clean):
-                iskonto_stok_col = col
-                break
+        # Fiyat ve iskonto stok sütunları (kayıtlı profil veya otomatik tespit)
+        fiyat_col = resolver.resolve(ROLE_FIYAT)
+        iskonto_stok_col = resolver.resolve(ROLE_STOK)
         
         # Manuel seçimler
         if not fiyat_col:
@@ -209,6 +317,7 @@ class KarlilikAnalizi:
                 secim_index = int(secim_str)
                 if 0 <= secim_index < len(columns):
                     fiyat_col = columns[secim_index]
+                    resolver.remember(ROLE_FIYAT, fiyat_col)
             except ValueError:
                 return None, None
         
@@ -228,6 +337,7 @@ class KarlilikAnalizi:
                 secim_index = int(secim_str)
                 if 0 <= secim_index < len(columns):
                     iskonto_stok_col = columns[secim_index]
+                    resolver.remember(ROLE_STOK, iskonto_stok_col)
             except ValueError:
                 return None, None
         
@@ -279,53 +389,36 @@ class KarlilikAnalizi:
                     stok_ismi_col: str, 
                     fiyat_dict: Dict[str, float]) -> Tuple[int, List[str]]:
         """Fiyatları eşleştirir ve sonuçları döndürür"""
-        eslesen_sayisi = 0
-        eslesmeyenler = []
-        
         # Birim Maliyet sütunu yoksa oluştur
         if 'Birim Maliyet' not in karlilik_df.columns:
             karlilik_df['Birim Maliyet'] = 0.0
         
-        for idx, row in karlilik_df.iterrows():
-            stok_adi = row[stok_ismi_col]
-            
-            if pd.isna(stok_adi):
-                continue
-                
-            stok_adi = str(stok_adi).strip().upper()
-            
-            if stok_adi in fiyat_dict:
-                karlilik_df.at[idx, 'Birim Maliyet'] = fiyat_dict[stok_adi]
-                eslesen_sayisi += 1
-            else:
-                eslesmeyenler.append(stok_adi)
+        # Sözlük araması tüm sütun üzerinde tek seferde yapılır
+        stok_adlari = karlilik_df[stok_ismi_col]
+        stok_adlari = stok_adlari[stok_adlari.notna()].astype(str).str.strip().str.upper()
+        fiyatlar = stok_adlari.map(fiyat_dict)
+        eslesen = fiyatlar.notna()
         
-        return eslesen_sayisi, eslesmeyenler
+        if eslesen.any():
+            karlilik_df.loc[fiyatlar.index[eslesen.to_numpy()], 'Birim Maliyet'] = fiyatlar[eslesen].to_numpy()
+        
+        eslesmeyenler = stok_adlari[~eslesen].tolist()
+        return int(eslesen.sum()), eslesmeyenler
     #endregion
 
     #region Kar Hesaplamaları
-    def calculate_profits(self, karlilik_df: pd.DataFrame) -> None:
+    def calculate_profits(self, karlilik_df: pd.DataFrame,
+                          resolver: Optional[ColumnResolver] = None) -> None:
         """Kar hesaplamalarını yapar ve DataFrame'i günceller"""
-        # Birim Kar hesaplama
-        ort_satis_fiyat_col = None
-        for col in karlilik_df.columns:
-            col_str = self._turkce_normalize(col)
-            if 'ort' in col_str and 'satis' in col_str and 'fiyat' in col_str:
-                ort_satis_fiyat_col = col
-                break
+        if resolver is None:
+            resolver = ColumnResolver(karlilik_df.columns)
         
-        # Alternatif sütun isimleri
-        if not ort_satis_fiyat_col:
-            alternatif_fiyat_sutunlari = ['Ort.Satış\nFiyat', 'Ort Satış Fiyat', 'Ortalama Fiyat']
-            for alt_col in alternatif_fiyat_sutunlari:
-                if alt_col in karlilik_df.columns:
-                    ort_satis_fiyat_col = alt_col
-                    break
+        # Birim Kar hesaplama
+        ort_satis_fiyat_col = resolver.resolve(ROLE_ORT_SATIS_FIYAT)
         
         if ort_satis_fiyat_col and ort_satis_fiyat_col in karlilik_df.columns:
             # Numeric conversion
-            for idx in karlilik_df.index:
-                karlilik_df.at[idx, ort_satis_fiyat_col] = self._clean_numeric(karlilik_df.at[idx, ort_satis_fiyat_col])
+            karlilik_df[ort_satis_fiyat_col] = self._clean_numeric_column(karlilik_df[ort_satis_fiyat_col])
             
             karlilik_df['Birim Kar'] = karlilik_df[ort_satis_fiyat_col] - karlilik_df['Birim Maliyet']
             self._log_message("✓ Birim Kar hesaplandı")
@@ -334,24 +427,11 @@ class KarlilikAnalizi:
             self._log_message("Ort.Satış Fiyat sütunu bulunamadı", 'warning')
         
         # Net Kar hesaplama
-        satis_miktar_col = None
-        for col in karlilik_df.columns:
-            col_str = self._turkce_normalize(col)
-            if 'satis' in col_str and 'miktar' in col_str:
-                satis_miktar_col = col
-                break
-        
-        if not satis_miktar_col:
-            alternatif_miktar_sutunlari = ['Satış\nMiktar', 'Satis Miktar', 'Miktar']
-            for alt_col in alternatif_miktar_sutunlari:
-                if alt_col in karlilik_df.columns:
-                    satis_miktar_col = alt_col
-                    break
+        satis_miktar_col = resolver.resolve(ROLE_MIKTAR)
         
         if satis_miktar_col and satis_miktar_col in karlilik_df.columns:
             # Numeric conversion
-            for idx in karlilik_df.index:
-                karlilik_df.at[idx, satis_miktar_col] = self._clean_numeric(karlilik_df.at[idx, satis_miktar_col])
+            karlilik_df[satis_miktar_col] = self._clean_numeric_column(karlilik_df[satis_miktar_col])
             
             karlilik_df['Net Kar'] = karlilik_df['Birim Kar'] * karlilik_df[satis_miktar_col]
             self._log_message("✓ Net Kar hesaplandı")
@@ -363,34 +443,40 @@ class KarlilikAnalizi:
     #region Sonuç Hazırlama
     def prepare_result_dataframe(self, 
                                karlilik_df: pd.DataFrame, 
-                               stok_ismi_col: str) -> pd.DataFrame:
+                               stok_ismi_col: str,
+                               resolver: Optional[ColumnResolver] = None) -> pd.DataFrame:
         """Sonuç DataFrame'ini hazırlar - TÜM ürünleri dahil eder"""
+        if resolver is None:
+            resolver = ColumnResolver(karlilik_df.columns)
+        
         # Sütun seçimi
         istenen_sutunlar = []
         
         if stok_ismi_col and stok_ismi_col in karlilik_df.columns:
             istenen_sutunlar.append(stok_ismi_col)
         
+        # Rolü çözümlenmiş sütunlar standart isimlerin yerine geçer
+        rol_sutunlari = {
+            'Satış Miktar': resolver.resolve(ROLE_MIKTAR),
+            'Ort.Satış Fiyat': resolver.resolve(ROLE_ORT_SATIS_FIYAT),
+            'Satış Tutar': resolver.resolve(ROLE_TUTAR),
+        }
+        
         # Standart sütunlar
         diger_sutunlar = ['Satış Miktar', 'Ort.Satış Fiyat', 'Satış Tutar', 
                          'Birim Maliyet', 'Birim Kar', 'Net Kar']
         
         for sutun in diger_sutunlar:
-            if sutun in karlilik_df.columns:
+            rol_sutunu = rol_sutunlari.get(sutun)
+            if rol_sutunu and rol_sutunu in karlilik_df.columns:
+                if rol_sutunu not in istenen_sutunlar:
+                    istenen_sutunlar.append(rol_sutunu)
+            elif sutun in karlilik_df.columns:
                 istenen_sutunlar.append(sutun)
         
         # Alternatif sütun isimleri
-        alternatif_sutunlar = {
-            'Satış Miktar': ['Satış\nMiktar', 'Satis Miktar', 'Miktar'],
-            'Ort.Satış Fiyat': ['Ort.Satış\nFiyat', 'Ort Satış Fiyat', 'Ortalama Fiyat'],
-            'Satış Tutar': ['Satış\nTutar', 'Satis Tutar', 'Tutar'],
-            'Birim Maliyet': ['Birim\nMaliyet', 'Maliyet'],
-            'Birim Kar': ['Birim\nKar', 'Kar'],
-            'Net Kar': ['Net\nKar', 'Toplam Kar']
-        }
-        
-        for standart_isim, alternatifler in alternatif_sutunlar.items():
-            if standart_isim not in istenen_sutunlar:
+        for standart_isim, alternatifler in self.RESULT_COLUMN_ALTERNATIVES.items():
+            if standart_isim not in istenen_sutunlar and not rol_sutunlari.get(standart_isim):
                 for alt_isim in alternatifler:
                     if alt_isim in karlilik_df.columns:
                         istenen_sutunlar.append(alt_isim)
@@ -405,6 +491,10 @@ class KarlilikAnalizi:
             mevcut_sutunlar = [col for col in istenen_sutunlar if col in karlilik_df.columns]
             sonuc_df = karlilik_df[mevcut_sutunlar].copy() if mevcut_sutunlar else karlilik_df.copy()
         
+        # Kategorik stok sütunu arayüz ve kayıt katmanları için metne döndürülür
+        if stok_ismi_col in sonuc_df.columns and isinstance(sonuc_df[stok_ismi_col].dtype, pd.CategoricalDtype):
+            sonuc_df[stok_ismi_col] = sonuc_df[stok_ismi_col].astype(str)
+        
         # Sıralama
         if 'Net Kar' in sonuc_df.columns and 'Birim Kar' in sonuc_df.columns:
             sonuc_df = sonuc_df.sort_values(['Net Kar', 'Birim Kar'], ascending=[False, False])
@@ -484,26 +574,67 @@ class KarlilikAnalizi:
     #endregion
 
     #region Ana Analiz Fonksiyonu
-    def analyze(self, 
-               karlilik_path: Union[str, Path], 
-               iskonto_path: Union[str, Path]) -> Optional[pd.DataFrame]:
-        """Ana analiz fonksiyonu - DataFrame döndürür"""
-        try:
-            self._update_progress(15, "İskonto raporu yükleniyor...")
-            
-            # İskonto raporunu oku
-            iskonto_df = pd.read_excel(iskonto_path)
-            
-            if iskonto_df.empty:
-                self._log_message("✗ İskonto raporu dosyası boş!", 'error')
-                return None
-                
-            self._log_message(f"✓ İskonto Raporu: {len(iskonto_df)} satır yüklendi")
-            
-            self._update_progress(25, "Karlılık analizi dosyası işleniyor...")
-            
-            # Karlılık Analizi dosyasını oku - header bul
-            header_row = self.find_header_row(karlilik_path)
+    @staticmethod
+    def _file_hash(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+        """Dosya içeriğinin SHA-1 özeti (parça parça okunur)"""
+        sha1 = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def _run_cached_stage(self, 
+                          name: str, 
+                          file_path: Union[str, Path], 
+                          loader: Callable[[Union[str, Path]], Optional[Dict]]) -> Optional[Dict]:
+        """Dosya özeti değişmediyse önceki aşama sonucunu kullanır, aksi halde yükler"""
+        baslangic = time.perf_counter()
+        key = (self._file_hash(file_path), self.compact_loading)
+        
+        cached = self._stage_cache.get(name)
+        if cached is not None and cached[0] == key:
+            self._record_stage(name, baslangic, reused=True)
+            return cached[1]
+        
+        result = loader(file_path)
+        if result is not None:
+            self._stage_cache[name] = (key, result)
+        else:
+            self._stage_cache.pop(name, None)
+        self._record_stage(name, baslangic)
+        return result
+
+    def _record_stage(self, name: str, baslangic: float, reused: bool = False) -> None:
+        """Aşama süresini kaydeder"""
+        self.stage_timings[name] = {
+            'seconds': time.perf_counter() - baslangic,
+            'reused': reused,
+        }
+
+    def _log_stage_timings(self) -> None:
+        """Aşama sürelerini ve yeniden kullanılan aşamaları loglar"""
+        parcalar = []
+        for name, timing in self.stage_timings.items():
+            etiket = self.STAGE_LABELS.get(name, name)
+            durum = " (önbellekten)" if timing['reused'] else ""
+            parcalar.append(f"{etiket} {timing['seconds']:.2f} sn{durum}")
+        if parcalar:
+            self._log_message("⏱ Aşama süreleri: " + " | ".join(parcalar))
+
+    def clear_cache(self) -> None:
+        """Önbelleğe alınmış girdileri temizler (sonraki analiz dosyaları yeniden okur)"""
+        self._stage_cache.clear()
+        gc.collect()
+
+    def _load_karlilik_stage(self, karlilik_path: Union[str, Path]) -> Optional[Dict]:
+        """Karlılık dosyasını okur, stok sütununu bulur ve temizler"""
+        self._update_progress(15, "Karlılık analizi dosyası işleniyor...")
+        
+        # Karlılık Analizi dosyasını oku - header bul (budamalı modda önce yalnızca başlık)
+        header_row = self.find_header_row(karlilik_path)
+        if self.compact_loading:
+            karlilik_df = self._read_excel_header(karlilik_path, header_row)
+        else:
             karlilik_df = pd.read_excel(karlilik_path, header=header_row)
                 
             if karlilik_df.empty:
@@ -511,58 +642,137 @@ class KarlilikAnalizi:
                 return None
                 
             self._log_message("✓ Karlılık Analizi dosyası başarıyla yüklendi")
-            
-            self._update_progress(40, "Sütunlar analiz ediliyor...")
-            
-            # Stok sütunu bul
-            stok_ismi_col = self.find_stok_column(karlilik_df)
-            if not stok_ismi_col:
-                return None
-            
-            self._log_message(f"✓ Stok sütunu: {stok_ismi_col}")
-            
-            # İskonto dosyası sütunları
-            fiyat_col, iskonto_stok_col = self.find_iskonto_columns(iskonto_df)
-            if not fiyat_col or not iskonto_stok_col:
+        
+        self._update_progress(25, "Karlılık sütunları analiz ediliyor...")
+        
+        # Bilinen başlık düzenleri için kayıtlı sütun profili kullanılır
+        karlilik_resolver = ColumnResolver(karlilik_df.columns)
+        if karlilik_resolver.from_profile:
+            self._log_message("✓ Kayıtlı sütun profili kullanılıyor (Karlılık)")
+        
+        # Stok sütunu bul
+        stok_ismi_col = self.find_stok_column(karlilik_df, karlilik_resolver)
+        if not stok_ismi_col:
+            return None
+        
+        self._log_message(f"✓ Stok sütunu: {stok_ismi_col}")
+        
+        if stok_ismi_col not in karlilik_df.columns:
+            self._log_message("✗ Stok sütunu bulunamadı!", 'error')
+            return None
+        
+        if self.compact_loading:
+            karlilik_df = self._read_excel_columns(
+                karlilik_path,
+                self._karlilik_columns(karlilik_df.columns, stok_ismi_col, karlilik_resolver),
+                header_row)
+            if karlilik_df.empty:
+                self._log_message("✗ Karlılık Analizi dosyası boş veya okunamadı!", 'error')
                 return None
+            self._log_message("✓ Karlılık Analizi dosyası başarıyla yüklendi")
             
-            self._log_message(f"✓ Bulunan sütunlar: Stok={stok_ismi_col}, Fiyat={fiyat_col}")
+            for role in (ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR):
+                col = karlilik_resolver.resolve(role)
+                if col in karlilik_df.columns:
+                    karlilik_df[col] = self._compact_numeric(karlilik_df[col])
+        
+        self._update_progress(35, "Karlılık verileri temizleniyor...")
+        
+        # Birim Maliyet sütunu ekle
+        if 'Birim Maliyet' not in karlilik_df.columns:
+            karlilik_df['Birim Maliyet'] = 0.0
+        
+        # Veri temizleme
+        karlilik_df = karlilik_df[karlilik_df[stok_ismi_col].notna()].copy()
+        if karlilik_df.empty:
+            self._log_message("✗ Veriler temizleme sonrası boş kaldı!", 'error')
+            return None
+        
+        # String temizleme (budamalı modda kırpılmış/büyük harf kategorik sütun)
+        if self.compact_loading:
+            karlilik_df[stok_ismi_col] = self._to_category(karlilik_df[stok_ismi_col])
+        else:
+            karlilik_df[stok_ismi_col] = karlilik_df[stok_ismi_col].astype(str).str.strip().str.upper()
+        
+        # TOPLAM satırlarını kaldır
+        karlilik_df = karlilik_df[~karlilik_df[stok_ismi_col].str.contains('TOPLAM|TOTAL|GENEL', case=False, na=False)].copy()
+        
+        if self.compact_loading:
+            self._report_memory('karlilik', karlilik_df)
+        
+        return {
+            'df': karlilik_df,
+            'stok_col': stok_ismi_col,
+            'resolver': karlilik_resolver,
+        }
+
+    def _load_iskonto_stage(self, iskonto_path: Union[str, Path]) -> Optional[Dict]:
+        """İskonto dosyasını okur, sütunlarını bulur ve fiyat sözlüğünü oluşturur"""
+        self._update_progress(45, "İskonto raporu yükleniyor...")
+        
+        # İskonto raporunu oku (budamalı modda önce yalnızca başlık satırı)
+        if self.compact_loading:
+            iskonto_df = self._read_excel_header(iskonto_path)
+        else:
+            iskonto_df = pd.read_excel(iskonto_path)
             
-            # Sütun kontrolleri
-            if stok_ismi_col not in karlilik_df.columns:
-                self._log_message("✗ Stok sütunu bulunamadı!", 'error')
-                return None
-            if iskonto_stok_col not in iskonto_df.columns:
-                self._log_message("✗ İskonto stok sütunu bulunamadı!", 'error')
+            if iskonto_df.empty:
+                self._log_message("✗ İskonto raporu dosyası boş!", 'error')
                 return None
-            if fiyat_col not in iskonto_df.columns:
-                self._log_message("✗ Fiyat sütunu bulunamadı!", 'error')
+                
+            self._log_message(f"✓ İskonto Raporu: {len(iskonto_df)} satır yüklendi")
+        
+        iskonto_resolver = ColumnResolver(iskonto_df.columns, allow_stok_code=False)
+        if iskonto_resolver.from_profile:
+            self._log_message("✓ Kayıtlı sütun profili kullanılıyor (İskonto)")
+        
+        # İskonto dosyası sütunları
+        fiyat_col, iskonto_stok_col = self.find_iskonto_columns(iskonto_df, iskonto_resolver)
+        if not fiyat_col or not iskonto_stok_col:
+            return None
+        
+        self._log_message(f"✓ Bulunan iskonto sütunları: Stok={iskonto_stok_col}, Fiyat={fiyat_col}")
+        
+        # Sütun kontrolleri
+        if iskonto_stok_col not in iskonto_df.columns:
+            self._log_message("✗ İskonto stok sütunu bulunamadı!", 'error')
+            return None
+        if fiyat_col not in iskonto_df.columns:
+            self._log_message("✗ Fiyat sütunu bulunamadı!", 'error')
+            return None
+        
+        self._update_progress(60, "Fiyat bilgileri işleniyor...")
+        
+        if self.compact_loading:
+            iskonto_df = self._read_excel_columns(
+                iskonto_path,
+                self._iskonto_columns(iskonto_df.columns, iskonto_stok_col, fiyat_col))
+            if iskonto_df.empty:
+                self._log_message("✗ İskonto raporu dosyası boş!", 'error')
                 return None
+            self._log_message(f"✓ İskonto Raporu: {len(iskonto_df)} satır yüklendi")
             
-            self._update_progress(60, "Veriler temizleniyor...")
-            
-            # Birim Maliyet sütunu ekle
-            if 'Birim Maliyet' not in karlilik_df.columns:
-                karlilik_df['Birim Maliyet'] = 0.0
+            # İskonto ham satırları fiyat sözlüğü için olduğu gibi kullanılır
+            # (boş stok satırlarındaki Depo değerleri ürün adıdır)
+            if not iskonto_df[iskonto_stok_col].notna().any():
+                self._log_message("✗ Veriler temizleme sonrası boş kaldı!", 'error')
+                return None
             
+            self._report_memory('iskonto', iskonto_df)
+        else:
             # Veri temizleme
-            karlilik_df = karlilik_df[karlilik_df[stok_ismi_col].notna()].copy()
             iskonto_df = iskonto_df[iskonto_df[iskonto_stok_col].notna()].copy()
             
-            if karlilik_df.empty or iskonto_df.empty:
+            if iskonto_df.empty:
                 self._log_message("✗ Veriler temizleme sonrası boş kaldı!", 'error')
                 return None
             
             # String temizleme
-            karlilik_df[stok_ismi_col] = karlilik_df[stok_ismi_col].astype(str).str.strip().str.upper()
             iskonto_df[iskonto_stok_col] = iskonto_df[iskonto_stok_col].astype(str).str.strip().str.upper()
             
             # TOPLAM satırlarını kaldır
-            karlilik_df = karlilik_df[~karlilik_df[stok_ismi_col].str.contains('TOPLAM|TOTAL|GENEL', case=False, na=False)].copy()
             iskonto_df = iskonto_df[~iskonto_df[iskonto_stok_col].str.contains('TOPLAM|TOTAL|GENEL', case=False, na=False)].copy()
             
-            self._update_progress(70, "Fiyat bilgileri işleniyor...")
-            
             # Fiyat sütunu temizleme
             for idx in iskonto_df.index:
                 iskonto_df.at[idx, fiyat_col] = self._clean_numeric(iskonto_df.at[idx, fiyat_col])
@@ -583,36 +793,77 @@ class KarlilikAnalizi:
                 
             except Exception as e:
                 self._log_message(f"CSV çevirme hatası: {str(e)}", 'warning')
+        
+        self._update_progress(75, "Fiyat sözlüğü oluşturuluyor...")
+        
+        # Fiyat dictionary oluştur - sadece sözlük önbellekte tutulur
+        fiyat_dict = self.create_price_dictionary(iskonto_df, iskonto_stok_col, fiyat_col)
+        self._log_message(f"✓ {len(fiyat_dict)} stok için fiyat bilgisi alındı")
+        
+        return {
+            'fiyat_dict': fiyat_dict,
+            'resolver': iskonto_resolver,
+        }
+
+    def analyze(self, 
+               karlilik_path: Union[str, Path], 
+               iskonto_path: Union[str, Path]) -> Optional[pd.DataFrame]:
+        """
+        Ana analiz fonksiyonu - DataFrame döndürür.
+        
+        Okunmuş ve temizlenmiş girdiler dosya özetine göre saklanır; yalnızca
+        iskonto raporu değiştiğinde karlılık dosyası yeniden okunmaz, fiyat
+        sözlüğü ile eşleştirme/kar aşamaları yeniden çalışır.
+        """
+        self.stage_timings = {}
+        try:
+            karlilik = self._run_cached_stage('karlilik', karlilik_path, self._load_karlilik_stage)
+            if karlilik is None:
+                return None
             
-            self._update_progress(80, "Fiyat eşleştirme yapılıyor...")
+            iskonto = self._run_cached_stage('iskonto', iskonto_path, self._load_iskonto_stage)
+            if iskonto is None:
+                return None
             
-            # Fiyat dictionary oluştur
-            fiyat_dict = self.create_price_dictionary(iskonto_df, iskonto_stok_col, fiyat_col)
-            self._log_message(f"✓ {len(fiyat_dict)} stok için fiyat bilgisi alındı")
+            stok_ismi_col = karlilik['stok_col']
+            karlilik_resolver = karlilik['resolver']
+            fiyat_dict = iskonto['fiyat_dict']
             
             self._update_progress(85, "Stok eşleştirme yapılıyor...")
+            baslangic = time.perf_counter()
+            
+            # Önbellekteki temiz veri değiştirilmez - eşleştirme kopya üzerinde yapılır
+            karlilik_df = karlilik['df'].copy()
             
             # Eşleştirme işlemi
             eslesen_sayisi, eslesmeyenler = self.match_prices(karlilik_df, stok_ismi_col, fiyat_dict)
             
             # Birim Maliyet temizleme
-            for idx in karlilik_df.index:
-                karlilik_df.at[idx, 'Birim Maliyet'] = self._clean_numeric(karlilik_df.at[idx, 'Birim Maliyet'])
+            karlilik_df['Birim Maliyet'] = self._clean_numeric_column(karlilik_df['Birim Maliyet'])
+            self._record_stage('eslestirme', baslangic)
             
             self._update_progress(90, "Kar hesaplamaları yapılıyor...")
+            baslangic = time.perf_counter()
             
             # Kar hesaplamalarını yap
-            self.calculate_profits(karlilik_df)
+            self.calculate_profits(karlilik_df, karlilik_resolver)
             
             self._log_message(f"✓ Eşleştirme tamamlandı: {eslesen_sayisi} eşleşen, {len(eslesmeyenler)} eşleşmeyen")
             
-            self._update_progress(95, "Sonuçlar kaydediliyor...")
-            
             # Sonuç dataframe'ini hazırla
-            sonuc_df = self.prepare_result_dataframe(karlilik_df, stok_ismi_col)
+            sonuc_df = self.prepare_result_dataframe(karlilik_df, stok_ismi_col, karlilik_resolver)
+            self._record_stage('kar', baslangic)
+            
+            # Sütun eşlemelerini sonraki analizler için kaydet
+            self._save_column_profiles(karlilik_resolver, iskonto['resolver'], sonuc_df)
+            
+            self._update_progress(95, "Sonuçlar kaydediliyor...")
+            baslangic = time.perf_counter()
             
             # Dosya kaydetme
             save_result = self.save_results(sonuc_df, eslesen_sayisi, eslesmeyenler)
+            self._record_stage('kayit', baslangic)
+            self._log_stage_timings()
             
             # Başarılı kayıt sonrası DataFrame'i döndür
             if save_result:
@@ -628,6 +879,25 @@ class KarlilikAnalizi:
             self._cleanup_temp_files()
             gc.collect()
     
+    
+    def _save_column_profiles(self,
+                              karlilik_resolver: ColumnResolver,
+                              iskonto_resolver: ColumnResolver,
+                              sonuc_df: pd.DataFrame) -> None:
+        """Kaynak dosyaların ve sonuç tablosunun sütun profillerini kaydeder"""
+        try:
+            karlilik_resolver.save()
+            iskonto_resolver.save()
+            
+            # Sonuç tablosu da aynı rollerle kaydedilir (VeriAnalizi tespiti atlar)
+            sonuc_resolver = ColumnResolver(sonuc_df.columns, karlilik_resolver.store)
+            for role, col in karlilik_resolver.roles.items():
+                if col in sonuc_df.columns:
+                    sonuc_resolver.remember(role, col)
+            sonuc_resolver.save()
+        except Exception as e:
+            self._log_message(f"Sütun profili kaydedilemedi: {str(e)}", 'warning')
+    
     def _cleanup_temp_files(self) -> None:
         """Geçici dosyaları temizler"""
         for temp_file in self._temp_files:
@@ -0,0 +1,230 @@
+# rollup_cube.py - Karlılık Sonuçları için OLAP Tarzı Özet Küpü
+
+from itertools import combinations
+from typing import Optional, Dict, List, Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .data_operations import DataCleaner
+    from .column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR
+    from .search_index import turkce_fold
+    from .senaryo_analizi import varsayilan_kategori, MALIYET_SUTUNLARI
+except ImportError:
+    try:
+        from KARLILIK_ANALIZI.data_operations import DataCleaner
+        from KARLILIK_ANALIZI.column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR
+        from KARLILIK_ANALIZI.search_index import turkce_fold
+        from KARLILIK_ANALIZI.senaryo_analizi import varsayilan_kategori, MALIYET_SUTUNLARI
+    except ImportError:
+        from data_operations import DataCleaner
+        from column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT, ROLE_TUTAR
+        from search_index import turkce_fold
+        from senaryo_analizi import varsayilan_kategori, MALIYET_SUTUNLARI
+
+
+BOYUT_AILE = 'Aile'
+BOYUT_SUBE = 'Şube'
+BOYUT_DONEM = 'Dönem'
+BOYUTLAR = (BOYUT_AILE, BOYUT_SUBE, BOYUT_DONEM)
+
+OLCULER = ('Miktar', 'Ciro', 'Maliyet', 'Net Kar', 'Ürün Sayısı')
+
+TUMU = 'Tümü'
+KUP_VERSIYONU = 1
+
+# Şube sütunu tespiti için katlanmış başlık parçaları
+SUBE_ANAHTARLARI = ('sube', 'bolge', 'depo')
+
+
+def _sube_sutunu_bul(columns: Iterable) -> Optional[str]:
+    for col in columns:
+        text = turkce_fold(col)
+        if any(anahtar in text for anahtar in SUBE_ANAHTARLARI):
+            return col
+    return None
+
+
+class RollupCube:
+    """
+    Aile × Şube × Dönem boyutlarında önceden toplanmış karlılık küpü.
+
+    Satırlar bir kez en ince hücrelere (temel küboid) indirgenir ve tüm
+    boyut alt kümeleri (2^3 küboid) bu hücrelerden türetilir. Drill-down,
+    roll-up ve dilimleme sorguları satırları yeniden taramaz; istenen
+    boyutları içeren en küçük küboid üzerinde çalışır.
+    """
+
+    def __init__(self, hucreler: pd.DataFrame):
+        """
+        Args:
+            hucreler: BOYUTLAR + OLCULER sütunlu temel hücre tablosu
+        """
+        hucreler = hucreler.reindex(columns=list(BOYUTLAR) + list(OLCULER))
+        for boyut in BOYUTLAR:
+            hucreler[boyut] = hucreler[boyut].fillna(TUMU).astype(str)
+        for olcu in OLCULER:
+            hucreler[olcu] = pd.to_numeric(hucreler[olcu], errors='coerce').fillna(0.0)
+
+        # Aynı hücreye düşen satırlar (ör. birleştirilmiş dönemler) toplanır
+        self._base = hucreler.groupby(list(BOYUTLAR), sort=True)[list(OLCULER)].sum()
+        self._cuboids: Dict[frozenset, pd.DataFrame] = {frozenset(BOYUTLAR): self._base}
+        self._build_cuboids()
+
+    #region Kurulum
+    @classmethod
+    def from_result(cls,
+                    df: pd.DataFrame,
+                    donem: Optional[str] = None,
+                    aile_sutunu: Optional[str] = None,
+                    sube_sutunu: Optional[str] = None) -> 'RollupCube':
+        """
+        Analiz sonucundan küp kurar.
+
+        Args:
+            df: KarlilikAnalizi.analyze sonucu
+            donem: Dönem adı (yoksa 'Tümü')
+            aile_sutunu: Ürün ailesi sütunu (yoksa stok isminin ilk kelimesi)
+            sube_sutunu: Şube sütunu (yoksa başlıklardan aranır, bulunamazsa 'Tümü')
+        """
+        if df is None or df.empty:
+            return cls(pd.DataFrame(columns=list(BOYUTLAR) + list(OLCULER)))
+
+        resolver = ColumnResolver(df.columns)
+        stok_col = resolver.resolve(ROLE_STOK) or df.columns[0]
+        miktar_col = resolver.resolve(ROLE_MIKTAR)
+        fiyat_col = resolver.resolve(ROLE_ORT_SATIS_FIYAT)
+        tutar_col = resolver.resolve(ROLE_TUTAR)
+        maliyet_col = next((col for col in MALIYET_SUTUNLARI if col in df.columns), None)
+
+        def sayisal(col: Optional[str]) -> np.ndarray:
+            if col is None or col not in df.columns:
+                return np.zeros(len(df), dtype=np.float64)
+            return DataCleaner.safe_numeric_conversion(df[col]).to_numpy(dtype=np.float64)
+
+        miktar = sayisal(miktar_col)
+        ciro = sayisal(tutar_col) if tutar_col else miktar * sayisal(fiyat_col)
+        maliyet = miktar * sayisal(maliyet_col)
+        net_kar = sayisal('Net Kar') if 'Net Kar' in df.columns else ciro - maliyet
+
+        if aile_sutunu and aile_sutunu in df.columns:
+            aile = df[aile_sutunu].fillna(TUMU).astype(str).to_numpy()
+        else:
+            # Aile isim başına bir kez hesaplanır
+            kodlar, isimler = pd.factorize(df[stok_col].astype(str))
+            aile = np.asarray([varsayilan_kategori(isim) for isim in isimler], dtype=object)[kodlar]
+
+        sube_sutunu = sube_sutunu or _sube_sutunu_bul(c for c in df.columns if c != stok_col)
+        if sube_sutunu and sube_sutunu in df.columns:
+            sube = df[sube_sutunu].fillna(TUMU).astype(str).to_numpy()
+        else:
+            sube = TUMU
+
+        hucreler = pd.DataFrame({
+            BOYUT_AILE: aile,
+            BOYUT_SUBE: sube,
+            BOYUT_DONEM: donem or TUMU,
+            'Miktar': miktar,
+            'Ciro': ciro,
+            'Maliyet': maliyet,
+            'Net Kar': net_kar,
+            'Ürün Sayısı': 1.0,
+        })
+        return cls(hucreler)
+
+    def _build_cuboids(self) -> None:
+        """Tüm boyut alt kümelerini temel hücrelerden türetir"""
+        for boyut_sayisi in range(len(BOYUTLAR) - 1, -1, -1):
+            for boyutlar in combinations(BOYUTLAR, boyut_sayisi):
+                self._cuboids[frozenset(boyutlar)] = self._aggregate(self._base, list(boyutlar))
+
+    @staticmethod
+    def _aggregate(cells: pd.DataFrame, boyutlar: List[str]) -> pd.DataFrame:
+        """Hücreleri verilen boyutlara göre toplar"""
+        if not boyutlar:
+            toplam = cells[list(OLCULER)].sum()
+            return pd.DataFrame([toplam.to_numpy()], columns=list(OLCULER), index=pd.Index([TUMU], name='Toplam'))
+        return cells.groupby(level=boyutlar, sort=True)[list(OLCULER)].sum()
+    #endregion
+
+    #region Sorgular
+    @property
+    def boyut_degerleri(self) -> Dict[str, List[str]]:
+        """Her boyutun mevcut değerleri"""
+        return {boyut: self._base.index.get_level_values(boyut).unique().tolist() for boyut in BOYUTLAR}
+
+    def query(self, boyutlar: Sequence[str] = (), filtreler: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Önceden toplanmış hücrelerden sorgu.
+
+        Args:
+            boyutlar: Gruplanacak boyutlar (boş = genel toplam)
+            filtreler: {boyut: değer veya değer listesi} dilim koşulları
+
+        Returns:
+            Boyutlara göre indeksli ölçü tablosu (+ Kar Marjı (%))
+        """
+        boyutlar = [b for b in BOYUTLAR if b in boyutlar]
+        filtreler = {b: v for b, v in (filtreler or {}).items() if b in BOYUTLAR}
+
+        # Gruplama ve filtre boyutlarını içeren en küçük küboid
+        gerekli = frozenset(boyutlar) | frozenset(filtreler)
+        cells = self._cuboids[gerekli]
+
+        if filtreler:
+            maske = np.ones(len(cells), dtype=bool)
+            for boyut, deger in filtreler.items():
+                degerler = deger if isinstance(deger, (list, tuple, set)) else [deger]
+                maske &= cells.index.get_level_values(boyut).isin([str(d) for d in degerler])
+            cells = cells[maske]
+            sonuc = self._aggregate(cells, boyutlar) if gerekli != frozenset(boyutlar) else cells
+        else:
+            sonuc = cells
+
+        sonuc = sonuc.copy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sonuc['Kar Marjı (%)'] = np.where(sonuc['Ciro'] != 0, sonuc['Net Kar'] / sonuc['Ciro'] * 100.0, 0.0)
+        return sonuc
+
+    def roll_up(self, boyutlar: Sequence[str], kaldirilacak: str,
+                filtreler: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Bir boyutu kaldırarak üst seviyeye çıkar"""
+        return self.query([b for b in boyutlar if b != kaldirilacak], filtreler)
+
+    def drill_down(self, boyutlar: Sequence[str], eklenecek: str,
+                   filtreler: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Bir boyut ekleyerek ayrıntıya in"""
+        return self.query(list(boyutlar) + [eklenecek], filtreler)
+
+    def slice(self, boyut: str, deger: Any, boyutlar: Sequence[str] = ()) -> pd.DataFrame:
+        """Tek bir boyut değerine göre dilim"""
+        return self.query(boyutlar, {boyut: deger})
+    #endregion
+
+    #region Kalıcılık
+    def to_dict(self) -> Dict:
+        """Dönem deposunda (JSON) saklanacak temel hücreler"""
+        hucreler = self._base.reset_index()
+        return {
+            'versiyon': KUP_VERSIYONU,
+            'boyutlar': list(BOYUTLAR),
+            'olculer': list(OLCULER),
+            'hucreler': hucreler.to_dict('records'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> Optional['RollupCube']:
+        """to_dict çıktısından küp oluşturur"""
+        if not data or not isinstance(data, dict) or 'hucreler' not in data:
+            return None
+        return cls(pd.DataFrame(data['hucreler']))
+
+    @classmethod
+    def merge(cls, kupler: Iterable[Optional['RollupCube']]) -> 'RollupCube':
+        """Dönem küplerini tek küpte birleştirir (dönemler arası sorgular için)"""
+        parcalar = [k._base.reset_index() for k in kupler if k is not None]
+        if not parcalar:
+            return cls(pd.DataFrame(columns=list(BOYUTLAR) + list(OLCULER)))
+        return cls(pd.concat(parcalar, ignore_index=True))
+    #endregion
@@ -0,0 +1,204 @@
+# search_index.py - Yazarken Arama (Search-as-you-type) Ürün İndeksi
+
+import re
+from typing import Optional, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Türkçe karakter katlama tablosu - büyük/küçük harf ve aksan farkını yok sayar
+_TR_FOLD_TABLE = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's', 'Ç': 'c', 'ç': 'c',
+    'Ğ': 'g', 'ğ': 'g', 'Ü': 'u', 'ü': 'u',
+    'Ö': 'o', 'ö': 'o', 'Â': 'a', 'â': 'a',
+    'Î': 'i', 'î': 'i', 'Û': 'u', 'û': 'u',
+    '\u0307': None,  # birleşik üst nokta (i̇)
+})
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+# Eşleşme türüne göre sıralama puanları (yüksek = daha iyi)
+SCORE_EXACT = 4
+SCORE_PREFIX = 3
+SCORE_TOKEN_PREFIX = 2
+SCORE_SUBSTRING = 1
+
+
+def turkce_fold(text: Union[str, float, None]) -> str:
+    """Metni Türkçe kurallarına göre katlar: küçük harf, ASCII, tek boşluk"""
+    if text is None or (isinstance(text, float) and pd.isna(text)):
+        return ""
+    folded = str(text).translate(_TR_FOLD_TABLE).lower()
+    return _NON_ALNUM.sub(' ', folded).strip()
+
+
+class ProductSearchIndex:
+    """
+    Ürün isimleri için bellek içi n-gram ters indeksi.
+
+    Veri yüklendiğinde bir kez kurulur; her tuş vuruşunda yapılan aramalar
+    tüm sütunu taramak yerine posting listelerinin kesişimini kullanır.
+    Aynı isim birden çok satırda geçebildiği için indeks benzersiz isimler
+    üzerinde tutulur ve sonuçlar satır konumlarına geri açılır.
+    """
+
+    NGRAM = 3
+    SHORT_PREFIX = 2  # NGRAM'dan kısa sorgular için token önek uzunluğu
+
+    def __init__(self, names: Union[pd.Series, List[str]], weights: Optional[Union[pd.Series, np.ndarray]] = None):
+        """
+        Args:
+            names: Ürün isimleri (DataFrame sırasıyla)
+            weights: Aynı puanlı sonuçları sıralamak için opsiyonel ağırlık (ör. Satış Miktar)
+        """
+        names = pd.Series(names).reset_index(drop=True)
+        codes, uniques = pd.factorize(names.astype(str).where(names.notna(), ""), sort=False)
+
+        self._row_codes = codes.astype(np.int32, copy=False)
+        self._names = [turkce_fold(name) for name in uniques]
+        # Vektörel puanlama için sabit genişlikli unicode dizisi
+        self._name_array = np.array(self._names, dtype=str)
+        self._name_lengths = np.fromiter((len(n) for n in self._names), dtype=np.int32, count=len(self._names))
+
+        # Benzersiz isim başına ağırlık (aynı ismin satırları toplanır)
+        self._weights = np.zeros(len(self._names), dtype=np.float64)
+        if weights is not None:
+            row_weights = pd.to_numeric(pd.Series(weights).reset_index(drop=True), errors='coerce').fillna(0.0)
+            valid = self._row_codes >= 0
+            np.add.at(self._weights, self._row_codes[valid], row_weights.to_numpy(dtype=np.float64)[valid])
+
+        self._ngram_postings: Dict[str, np.ndarray] = {}
+        self._prefix_postings: Dict[str, np.ndarray] = {}
+        self._build()
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, name_column: str,
+                       weight_column: Optional[str] = None) -> Optional['ProductSearchIndex']:
+        """DataFrame'den indeks kurar, sütun yoksa None döndürür"""
+        if df is None or df.empty or name_column not in df.columns:
+            return None
+        weights = df[weight_column] if weight_column and weight_column in df.columns else None
+        return cls(df[name_column], weights)
+
+    #region Kurulum
+    def _build(self) -> None:
+        """n-gram ve kısa önek posting listelerini oluşturur"""
+        ngram_lists: Dict[str, List[int]] = {}
+        prefix_lists: Dict[str, List[int]] = {}
+        n = self.NGRAM
+
+        for uid, name in enumerate(self._names):
+            if not name:
+                continue
+            for gram in {name[i:i + n] for i in range(len(name) - n + 1)}:
+                ngram_lists.setdefault(gram, []).append(uid)
+
+            prefixes = set()
+            for token in name.split():
+                for length in range(1, min(self.SHORT_PREFIX, len(token)) + 1):
+                    prefixes.add(token[:length])
+            for prefix in prefixes:
+                prefix_lists.setdefault(prefix, []).append(uid)
+
+        # uid'ler artan sırada eklendiği için diziler zaten sıralı
+        self._ngram_postings = {k: np.asarray(v, dtype=np.int32) for k, v in ngram_lists.items()}
+        self._prefix_postings = {k: np.asarray(v, dtype=np.int32) for k, v in prefix_lists.items()}
+    #endregion
+
+    #region Arama
+    def __len__(self) -> int:
+        return len(self._row_codes)
+
+    def _candidates(self, term: str) -> np.ndarray:
+        """Tek bir terim için aday benzersiz isim kimliklerini döndürür"""
+        empty = np.empty(0, dtype=np.int32)
+        if len(term) < self.NGRAM:
+            return self._prefix_postings.get(term[:self.SHORT_PREFIX], empty)
+
+        grams = {term[i:i + self.NGRAM] for i in range(len(term) - self.NGRAM + 1)}
+        postings = []
+        for gram in grams:
+            posting = self._ngram_postings.get(gram)
+            if posting is None:
+                return empty
+            postings.append(posting)
+
+        # En kısa listeden başlayarak kesişim
+        postings.sort(key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = np.intersect1d(result, posting, assume_unique=True)
+            if result.size == 0:
+                break
+        return result
+
+    def _term_scores(self, names: np.ndarray, term: str) -> np.ndarray:
+        """Aday isimler için terimin eşleşme puanları (0 = eşleşme yok)"""
+        scores = np.zeros(names.size, dtype=np.int8)
+        if len(term) >= self.NGRAM:
+            scores[np.char.find(names, term) >= 0] = SCORE_SUBSTRING
+        scores[np.char.find(names, ' ' + term) >= 0] = SCORE_TOKEN_PREFIX
+        scores[np.char.startswith(names, term)] = SCORE_PREFIX
+        scores[names == term] = SCORE_EXACT
+        return scores
+
+    def search_unique(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """Sorguya uyan benzersiz isim kimliklerini puan sırasıyla döndürür"""
+        folded = turkce_fold(query)
+        if not folded:
+            return np.empty(0, dtype=np.int32)
+
+        terms = folded.split()
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            ids = self._candidates(term)
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+            if candidates.size == 0:
+                return candidates
+
+        # Aday kümesi üzerinde doğrulama ve puanlama (tüm adaylar tek seferde)
+        names = self._name_array[candidates]
+        scores = self._term_scores(names, terms[0])
+        for term in terms[1:]:
+            np.minimum(scores, self._term_scores(names, term), out=scores)
+        if len(terms) > 1:
+            whole = (scores > 0) & np.char.startswith(names, folded)
+            scores[whole] = SCORE_PREFIX
+            scores[whole & (names == folded)] = SCORE_EXACT
+
+        keep = scores > 0
+        if not keep.any():
+            return np.empty(0, dtype=np.int32)
+        matched = candidates[keep].astype(np.int32, copy=False)
+        scores = scores[keep]
+
+        # Puan (azalan) > ağırlık (azalan) > isim uzunluğu (artan)
+        order = np.lexsort((self._name_lengths[matched], -self._weights[matched], -scores))
+        result = matched[order]
+        return result[:limit] if limit else result
+
+    def search(self, query: str, limit: Optional[int] = None) -> np.ndarray:
+        """Sorguya uyan satır konumlarını (iloc) sıralı olarak döndürür"""
+        ranked = self.search_unique(query)
+        if ranked.size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        rank_of = np.full(len(self._names), -1, dtype=np.int64)
+        rank_of[ranked] = np.arange(ranked.size)
+
+        row_ranks = np.where(self._row_codes >= 0, rank_of[self._row_codes], -1)
+        rows = np.flatnonzero(row_ranks >= 0)
+        rows = rows[np.argsort(row_ranks[rows], kind='stable')]
+        return rows[:limit] if limit else rows
+
+    def search_dataframe(self, df: pd.DataFrame, query: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """İndeksin kurulduğu DataFrame üzerinde arama yapar"""
+        if df is None or df.empty or len(df) != len(self):
+            return pd.DataFrame()
+        rows = self.search(query, limit)
+        if rows.size == 0:
+            return pd.DataFrame(columns=df.columns)
+        return df.iloc[rows]
+    #endregion
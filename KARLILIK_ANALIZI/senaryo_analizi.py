@@ -0,0 +1,200 @@
+# senaryo_analizi.py - Vektörel "Ya Olursa" (What-if) Karlılık Senaryoları
+
+from itertools import product
+from typing import Optional, Dict, List, Union, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .data_operations import DataCleaner
+    from .column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT
+except ImportError:
+    try:
+        from KARLILIK_ANALIZI.data_operations import DataCleaner
+        from KARLILIK_ANALIZI.column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT
+    except ImportError:
+        from data_operations import DataCleaner
+        from column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR, ROLE_ORT_SATIS_FIYAT
+
+
+MALIYET_SUTUNLARI = ['Birim Maliyet', 'Birim\nMaliyet', 'Maliyet']
+TUM_KATEGORILER = '*'
+
+# Oran: Sayı tüm kategorilere uygulanır, sözlük kategori bazında ({'*': varsayılan})
+Oran = Union[float, Dict[str, float]]
+
+
+def varsayilan_kategori(stok_ismi: str) -> str:
+    """Stok isminin ilk kelimesini ürün ailesi olarak kullanır (ör. 'PİLİÇ BUT' → 'PİLİÇ')"""
+    parcalar = str(stok_ismi).strip().split()
+    return parcalar[0].upper() if parcalar else ""
+
+
+class SenaryoMotoru:
+    """
+    Eşleştirilmiş karlılık sonucu üzerinde çok sayıda senaryoyu tek seferde değerlendirir.
+
+    Senaryo sözlüğü anahtarları (oranlar kesirli: 0.05 = %5):
+        'ad': Senaryo adı
+        'maliyet_degisimi': Birim maliyet değişimi (sayı veya kategori sözlüğü)
+        'fiyat_degisimi': Satış fiyatı değişimi (sayı veya kategori sözlüğü)
+        'iskonto_orani': Satış fiyatına uygulanan iskonto oranı
+
+    Net kar satış miktarına göre doğrusal olduğu için ürünler kategori
+    toplamlarına indirgenir; tüm senaryolar (senaryo × kategori) boyutunda
+    tek bir yayınlanmış (broadcast) hesapla çözülür. Ürün bazında ayrıntı
+    yalnızca istenen senaryo için hesaplanır.
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 kategori_sutunu: Optional[str] = None,
+                 kategori_fonksiyonu: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            df: KarlilikAnalizi.analyze sonucu (Birim Maliyet eşleşmiş)
+            kategori_sutunu: Kategori olarak kullanılacak sütun (yoksa stok isminden türetilir)
+            kategori_fonksiyonu: Stok isminden kategori üreten fonksiyon
+        """
+        if df is None or df.empty:
+            raise ValueError("Senaryo analizi için veri yok")
+
+        resolver = ColumnResolver(df.columns)
+        self.stok_column = resolver.resolve(ROLE_STOK) or df.columns[0]
+        miktar_col = resolver.resolve(ROLE_MIKTAR)
+        fiyat_col = resolver.resolve(ROLE_ORT_SATIS_FIYAT)
+        maliyet_col = next((col for col in MALIYET_SUTUNLARI if col in df.columns), None)
+
+        eksik = [ad for ad, col in (('Satış Miktar', miktar_col), ('Ort.Satış Fiyat', fiyat_col),
+                                    ('Birim Maliyet', maliyet_col)) if col is None]
+        if eksik:
+            raise ValueError(f"Senaryo analizi için eksik sütunlar: {', '.join(eksik)}")
+
+        self.urunler = df[self.stok_column].astype(str).to_numpy()
+        self.miktar = DataCleaner.safe_numeric_conversion(df[miktar_col]).to_numpy(dtype=np.float64)
+        self.fiyat = DataCleaner.safe_numeric_conversion(df[fiyat_col]).to_numpy(dtype=np.float64)
+        self.maliyet = DataCleaner.safe_numeric_conversion(df[maliyet_col]).to_numpy(dtype=np.float64)
+
+        if kategori_sutunu and kategori_sutunu in df.columns:
+            kategoriler = df[kategori_sutunu].fillna("").astype(str)
+        else:
+            fonksiyon = kategori_fonksiyonu or varsayilan_kategori
+            kategoriler = pd.Series(self.urunler).map(fonksiyon)
+
+        kodlar, benzersiz = pd.factorize(kategoriler, sort=True)
+        self.kategori_kodlari = kodlar.astype(np.int64)
+        self.kategoriler: List[str] = [str(k) for k in benzersiz]
+        self._kategori_index = {k: i for i, k in enumerate(self.kategoriler)}
+
+        # Kategori başına ciro ve maliyet toplamları (senaryolardan bağımsız)
+        k = len(self.kategoriler)
+        self.ciro = np.bincount(self.kategori_kodlari, weights=self.miktar * self.fiyat, minlength=k)
+        self.toplam_maliyet = np.bincount(self.kategori_kodlari, weights=self.miktar * self.maliyet, minlength=k)
+
+    #region Senaryo Girdileri
+    def _oran_vektoru(self, oran: Optional[Oran]) -> np.ndarray:
+        """Oranı kategori uzunluğunda vektöre çevirir"""
+        vektor = np.zeros(len(self.kategoriler), dtype=np.float64)
+        if oran is None:
+            return vektor
+        if isinstance(oran, dict):
+            vektor[:] = float(oran.get(TUM_KATEGORILER, 0.0))
+            for kategori, deger in oran.items():
+                idx = self._kategori_index.get(str(kategori))
+                if idx is not None:
+                    vektor[idx] = float(deger)
+            return vektor
+        vektor[:] = float(oran)
+        return vektor
+
+    def _senaryo_matrisleri(self, senaryolar: List[Dict]):
+        """Senaryo listesini (S × K) maliyet/fiyat ve (S,) iskonto dizilerine çevirir"""
+        maliyet = np.vstack([self._oran_vektoru(s.get('maliyet_degisimi')) for s in senaryolar])
+        fiyat = np.vstack([self._oran_vektoru(s.get('fiyat_degisimi')) for s in senaryolar])
+        iskonto = np.array([float(s.get('iskonto_orani', 0.0) or 0.0) for s in senaryolar])
+        adlar = [str(s.get('ad') or f"Senaryo {i + 1}") for i, s in enumerate(senaryolar)]
+        return adlar, maliyet, fiyat, iskonto
+
+    @staticmethod
+    def senaryo_izgarasi(maliyet_degisimleri: Iterable[Oran] = (0.0,),
+                         iskonto_oranlari: Iterable[float] = (0.0,),
+                         fiyat_degisimleri: Iterable[Oran] = (0.0,)) -> List[Dict]:
+        """Değer listelerinin tüm kombinasyonlarından senaryo listesi üretir"""
+        def etiket(oran: Oran) -> str:
+            if isinstance(oran, dict):
+                return ",".join(f"{k}:{v:+.1%}" for k, v in oran.items())
+            return f"{oran:+.1%}"
+
+        senaryolar = []
+        for maliyet, iskonto, fiyat in product(maliyet_degisimleri, iskonto_oranlari, fiyat_degisimleri):
+            senaryolar.append({
+                'ad': f"Maliyet {etiket(maliyet)} | İskonto {iskonto:.1%} | Fiyat {etiket(fiyat)}",
+                'maliyet_degisimi': maliyet,
+                'iskonto_orani': iskonto,
+                'fiyat_degisimi': fiyat,
+            })
+        return senaryolar
+    #endregion
+
+    #region Hesaplama
+    def kategori_kar_matrisi(self, senaryolar: List[Dict]) -> pd.DataFrame:
+        """Senaryo × kategori net kar tablosu"""
+        adlar, maliyet, fiyat, iskonto = self._senaryo_matrisleri(senaryolar)
+        net_kar = ((1.0 - iskonto)[:, None] * (1.0 + fiyat) * self.ciro
+                   - (1.0 + maliyet) * self.toplam_maliyet)
+        return pd.DataFrame(net_kar, index=pd.Index(adlar, name='Senaryo'), columns=self.kategoriler)
+
+    def degerlendir(self, senaryolar: List[Dict]) -> pd.DataFrame:
+        """
+        Senaryoları değerlendirip toplam net kara göre sıralar.
+
+        Returns:
+            Senaryo, Toplam Ciro, Toplam Maliyet, Toplam Net Kar, Kar Marjı (%),
+            Mevcut Duruma Göre Fark sütunlu, en karlı senaryo başta DataFrame
+        """
+        if not senaryolar:
+            return pd.DataFrame()
+
+        adlar, maliyet, fiyat, iskonto = self._senaryo_matrisleri(senaryolar)
+        ciro = ((1.0 - iskonto)[:, None] * (1.0 + fiyat)) @ self.ciro
+        toplam_maliyet = (1.0 + maliyet) @ self.toplam_maliyet
+        net_kar = ciro - toplam_maliyet
+        mevcut_kar = float(self.ciro.sum() - self.toplam_maliyet.sum())
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            marj = np.where(ciro != 0, net_kar / ciro * 100.0, 0.0)
+
+        sonuc = pd.DataFrame({
+            'Senaryo': adlar,
+            'Toplam Ciro': ciro,
+            'Toplam Maliyet': toplam_maliyet,
+            'Toplam Net Kar': net_kar,
+            'Kar Marjı (%)': marj,
+            'Fark': net_kar - mevcut_kar,
+        })
+        sonuc = sonuc.sort_values('Toplam Net Kar', ascending=False, kind='stable').reset_index(drop=True)
+        sonuc.insert(0, 'Sıra', np.arange(1, len(sonuc) + 1))
+        return sonuc
+
+    def urun_tablosu(self, senaryo: Dict) -> pd.DataFrame:
+        """Tek senaryo için ürün bazında net kar tablosu (net kara göre sıralı)"""
+        _, maliyet, fiyat, iskonto = self._senaryo_matrisleri([senaryo])
+        kodlar = self.kategori_kodlari
+        yeni_fiyat = self.fiyat * (1.0 + fiyat[0][kodlar]) * (1.0 - iskonto[0])
+        yeni_maliyet = self.maliyet * (1.0 + maliyet[0][kodlar])
+        birim_kar = yeni_fiyat - yeni_maliyet
+        net_kar = birim_kar * self.miktar
+
+        tablo = pd.DataFrame({
+            self.stok_column: self.urunler,
+            'Kategori': np.asarray(self.kategoriler, dtype=object)[kodlar] if self.kategoriler else "",
+            'Satış Miktar': self.miktar,
+            'Yeni Satış Fiyat': yeni_fiyat,
+            'Yeni Birim Maliyet': yeni_maliyet,
+            'Yeni Birim Kar': birim_kar,
+            'Yeni Net Kar': net_kar,
+            'Net Kar Farkı': net_kar - (self.fiyat - self.maliyet) * self.miktar,
+        })
+        return tablo.sort_values('Yeni Net Kar', ascending=False, kind='stable').reset_index(drop=True)
+    #endregion
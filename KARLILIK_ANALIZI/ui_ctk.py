@@ -98,6 +98,26 @@ except ImportError:
     MATPLOTLIB_AVAILABLE = False
     logger.warning("Matplotlib yüklenemedi - grafikler devre dışı")
 
+# =============================================================================
+# ARAMA İNDEKSİ
+# =============================================================================
+
+try:
+    from .search_index import ProductSearchIndex
+    SEARCH_INDEX_AVAILABLE = True
+except ImportError:
+    try:
+        from search_index import ProductSearchIndex
+        SEARCH_INDEX_AVAILABLE = True
+    except ImportError:
+        SEARCH_INDEX_AVAILABLE = False
+
+# Canlı aramada tuş vuruşu sonrası bekleme (ms)
+LIVE_SEARCH_DELAY_MS = 120
+
+# Dashboard bölümlerinin arka plan sonuç kontrol aralığı (ms)
+SECTION_POLL_MS = 50
+
 # =============================================================================
 # RENKLER
 # =============================================================================
@@ -322,12 +342,13 @@ class ProductListCard(ctk.CTkFrame):
 # =============================================================================
 
 class SearchWidget(ctk.CTkFrame):
-    """Arama widget'ı"""
+    """Arama widget'ı - live=True ise her tuş vuruşunda callback çağrılır"""
     
-    def __init__(self, parent, search_callback=None):
+    def __init__(self, parent, search_callback=None, live: bool = False):
         super().__init__(parent, fg_color=COLORS['bg_card'], corner_radius=10)
         
         self.search_callback = search_callback
+        self._live_job = None
         
         inner = ctk.CTkFrame(self, fg_color="transparent")
         inner.pack(fill="x", padx=15, pady=12)
@@ -343,6 +364,8 @@ class SearchWidget(ctk.CTkFrame):
         )
         self.search_entry.pack(side="left", padx=(10, 0))
         self.search_entry.bind("<Return>", self._on_search)
+        if live:
+            self.search_entry.bind("<KeyRelease>", self._on_key)
         
         ctk.CTkButton(
             inner, text="Ara", width=70, height=35,
@@ -356,7 +379,16 @@ class SearchWidget(ctk.CTkFrame):
             command=self._clear
         ).pack(side="left", padx=(5, 0))
     
+    def _on_key(self, event=None):
+        """Canlı arama - art arda tuş vuruşlarını tek aramada birleştir"""
+        if event is not None and event.keysym in ("Return", "KP_Enter"):
+            return
+        if self._live_job is not None:
+            self.after_cancel(self._live_job)
+        self._live_job = self.after(LIVE_SEARCH_DELAY_MS, self._on_search)
+    
     def _on_search(self, event=None):
+        self._live_job = None
         if self.search_callback:
             self.search_callback(self.search_entry.get())
     
@@ -371,7 +403,14 @@ class SearchWidget(ctk.CTkFrame):
 # =============================================================================
 
 class DashboardTab(ctk.CTkFrame):
-    """Dashboard sekmesi - Tüm özellikler"""
+    """
+    Dashboard sekmesi - Tüm özellikler
+    
+    Sekme ilk gösterildiğinde yalnızca iskelet (arama + yer tutucular) kurulur;
+    bölüm verileri arka plan thread'inde hesaplanır ve hazır oldukça
+    widget'lar eklenir. Analiz bitiminden dashboard'un görünmesine kadar
+    geçen süre böylece veri boyutundan bağımsız kalır.
+    """
     
     def __init__(self, parent, data=None):
         super().__init__(parent, fg_color=COLORS['bg_light'])
@@ -380,10 +419,24 @@ class DashboardTab(ctk.CTkFrame):
         self.filtered_data = data
         self.selected_filter = "all"  # Seçili filtre: all, cok_karli, orta_karli, dusuk_karli, zararda
         self.product_list_frame = None  # Dinamik ürün listesi frame'i
+        self.performance_frame = None
+        self.search_index = None
+        self._live_search_job = None
+        
+        # Tembel bölüm kurulumu
+        self._section_frames: Dict[str, ctk.CTkFrame] = {}
+        self._pending_sections = set()
+        self._section_queue = queue.Queue()
+        self._generation = 0
+        self._section_poll_job = None
+        self._needs_build = False
+        
         self._build_ui()
     
     def _build_ui(self):
-        """UI oluştur"""
+        """UI iskeletini oluştur - veri bağımlı bölümler arka planda doldurulur"""
+        self._needs_build = False
+        
         # Scroll frame
         self.scroll = ctk.CTkScrollableFrame(self, fg_color="transparent")
         self.scroll.pack(fill="both", expand=True, padx=15, pady=15)
@@ -392,27 +445,126 @@ class DashboardTab(ctk.CTkFrame):
             self._show_empty_state()
             return
         
-        # Arama ve Hızlı Filtreler
+        # Arama ve Hızlı Filtreler (indeks arka planda kurulur)
         self._create_search_section()
         
-        # KPI kartları
-        self._create_kpi_section()
+        # KPI, performans, kar dağılımı, istatistik ve grafikler - yer tutucu ile
+        section_keys = ["kpi", "performance", "profit", "statistics"]
+        if MATPLOTLIB_AVAILABLE:
+            section_keys.append("charts")
         
-        # Performans analizi (En karlı / En çok satan)
-        self._create_performance_section()
+        for key in section_keys:
+            frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+            frame.pack(fill="x")
+            ctk.CTkLabel(
+                frame, text="⏳ Yükleniyor...",
+                font=ctk.CTkFont(family="Segoe UI", size=12),
+                text_color=COLORS['text_muted']
+            ).pack(anchor="w", pady=10)
+            self._section_frames[key] = frame
+        
+        self._start_section_worker(section_keys)
+    
+    def _start_section_worker(self, section_keys: List[str]):
+        """Bölüm verilerini arka plan thread'inde sırayla hesapla"""
+        self._generation += 1
+        generation = self._generation
+        
+        computations = {
+            "index": self._build_search_index,
+            "kpi": self._calculate_kpis,
+            "performance": self._compute_performance_data,
+            "profit": self._compute_profit_data,
+            "statistics": self._calculate_statistics,
+            "charts": self._compute_chart_data,
+        }
+        # Görünür bölümler önce, arama indeksi en son
+        order = section_keys + ["index"]
+        self._pending_sections = set(order)
+        
+        def worker():
+            for key in order:
+                if generation != self._generation:
+                    return
+                try:
+                    result = computations[key]()
+                except Exception as e:
+                    logger.error(f"Dashboard bölüm hesaplama hatası ({key}): {e}")
+                    result = None
+                self._section_queue.put((generation, key, result))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self._schedule_section_poll()
+    
+    def _schedule_section_poll(self):
+        if self._section_poll_job is None:
+            self._section_poll_job = self.after(SECTION_POLL_MS, self._poll_sections)
+    
+    def _poll_sections(self):
+        """Hazır bölümleri UI thread'inde ekle"""
+        self._section_poll_job = None
+        try:
+            while True:
+                generation, key, result = self._section_queue.get_nowait()
+                if generation == self._generation:
+                    self._attach_section(key, result)
+        except queue.Empty:
+            pass
         
-        # Kar Dağılımı Analizi (tıklanabilir kartlar)
-        self._create_profit_analysis_section()
+        if self._pending_sections:
+            self._schedule_section_poll()
+    
+    def _attach_section(self, key: str, result):
+        """Hesaplanan bölüm verisiyle widget'ları oluştur"""
+        self._pending_sections.discard(key)
         
-        # Dinamik Ürün Listesi (kart seçimine göre değişir)
-        self._create_dynamic_product_list()
+        if key == "index":
+            self.search_index = result
+            return
         
-        # İstatistiksel Özet
-        self._create_statistics_section()
+        frame = self._section_frames.get(key)
+        if frame is None or not frame.winfo_exists():
+            return
         
-        # Grafikler
-        if MATPLOTLIB_AVAILABLE:
-            self._create_charts_section()
+        for widget in frame.winfo_children():
+            widget.destroy()
+        
+        builders = {
+            "kpi": self._create_kpi_section,
+            "performance": self._create_performance_section,
+            "profit": self._create_profit_analysis_section,
+            "statistics": self._create_statistics_section,
+            "charts": self._create_charts_section,
+        }
+        
+        try:
+            builders[key](frame, result)
+        except Exception as e:
+            logger.error(f"Dashboard bölüm oluşturma hatası ({key}): {e}")
+            ctk.CTkLabel(
+                frame, text="Bölüm yüklenemedi",
+                text_color=COLORS['text_secondary']
+            ).pack(pady=20)
+    
+    def _build_search_index(self):
+        """Ürün adı sütunu üzerinde yazarken arama indeksi kur"""
+        if not SEARCH_INDEX_AVAILABLE:
+            return None
+        
+        try:
+            name_col = None
+            miktar_col = None
+            for col in self.data.columns:
+                col_lower = str(col).lower()
+                if ('ürün' in col_lower or 'stok' in col_lower or 'ad' in col_lower) and name_col is None:
+                    name_col = col
+                if 'miktar' in col_lower and miktar_col is None:
+                    miktar_col = col
+            
+            return ProductSearchIndex.from_dataframe(self.data, name_col or self.data.columns[0], miktar_col)
+        except Exception as e:
+            logger.error(f"Arama indeksi hatası: {e}")
+            return None
     
     def _show_empty_state(self):
         """Boş durum"""
@@ -458,6 +610,7 @@ class DashboardTab(ctk.CTkFrame):
         )
         self.search_entry.pack(side="left", padx=(10, 0))
         self.search_entry.bind("<Return>", lambda e: self._on_search(self.search_entry.get()))
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
         
         ctk.CTkButton(
             search_row, text="Ara", width=80, height=38,
@@ -536,23 +689,38 @@ class DashboardTab(ctk.CTkFrame):
         
         self._refresh_performance_section()
     
+    def _on_search_key(self, event=None):
+        """Her tuş vuruşunda canlı filtreleme (kısa gecikmeyle birleştirilir)"""
+        if event is not None and event.keysym in ("Return", "KP_Enter"):
+            return
+        if self._live_search_job is not None:
+            self.after_cancel(self._live_search_job)
+        self._live_search_job = self.after(
+            LIVE_SEARCH_DELAY_MS, lambda: self._on_search(self.search_entry.get())
+        )
+    
     def _on_search(self, query: str):
         """Arama callback"""
+        self._live_search_job = None
+        query = query.strip()
         if not query:
             self.filtered_data = self.data
+        elif self.search_index is not None:
+            # İndeksli, Türkçe duyarlı arama - sonuçlar ilgiye göre sıralı
+            self.filtered_data = self.search_index.search_dataframe(self.data, query)
         else:
             # Basit metin araması
             query = query.lower()
-            mask = self.data.astype(str).apply(lambda x: x.str.lower().str.contains(query)).any(axis=1)
+            mask = self.data.astype(str).apply(lambda x: x.str.lower().str.contains(query, regex=False)).any(axis=1)
             self.filtered_data = self.data[mask]
         
         # UI güncelle
         self._refresh_performance_section()
     
-    def _create_kpi_section(self):
+    def _create_kpi_section(self, parent, kpi_data: Dict[str, str]):
         """KPI kartları"""
         # Başlık
-        title_frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+        title_frame = ctk.CTkFrame(parent, fg_color="transparent")
         title_frame.pack(fill="x", pady=(0, 15))
         
         ctk.CTkLabel(
@@ -561,11 +729,8 @@ class DashboardTab(ctk.CTkFrame):
             text_color=COLORS['text_primary']
         ).pack(side="left")
         
-        # KPI hesapla
-        kpi_data = self._calculate_kpis()
-        
         # Kartlar
-        cards_frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+        cards_frame = ctk.CTkFrame(parent, fg_color="transparent")
         cards_frame.pack(fill="x", pady=(0, 20))
         
         for i in range(4):
@@ -636,35 +801,54 @@ class DashboardTab(ctk.CTkFrame):
                 'top_product': "Yok"
             }
     
-    def _create_performance_section(self):
+    def _create_performance_section(self, parent, top_lists):
         """Performans bölümü"""
-        self.performance_frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+        self.performance_frame = ctk.CTkFrame(parent, fg_color="transparent")
         self.performance_frame.pack(fill="x", pady=(0, 20))
         
-        self._refresh_performance_section()
+        # Hesaplama sırasında arama/filtre uygulandıysa güncel veriyle yenile
+        if top_lists is None or self.filtered_data is not self.data:
+            self._refresh_performance_section()
+        else:
+            self._render_performance_section(top_lists)
+    
+    def _compute_performance_data(self):
+        """En karlı / en çok satan listeleri - arka planda da çalışabilir"""
+        df = self.filtered_data if self.filtered_data is not None else self.data
+        if df is None or df.empty:
+            return None
+        return (
+            self._get_top_products(df, 'kar', ascending=False),
+            self._get_top_products(df, 'miktar', ascending=False)
+        )
     
     def _refresh_performance_section(self):
         """Performans bölümünü yenile"""
+        if self.performance_frame is None:
+            # Bölüm henüz yüklenmedi - eklendiğinde filtre uygulanır
+            return
+        self._render_performance_section(self._compute_performance_data())
+    
+    def _render_performance_section(self, top_lists):
+        """Performans kartlarını çiz"""
         for widget in self.performance_frame.winfo_children():
             widget.destroy()
         
-        df = self.filtered_data if self.filtered_data is not None else self.data
-        if df is None or df.empty:
+        if top_lists is None:
             return
+        top_profitable, top_selling = top_lists
         
         # İki sütunlu layout
         self.performance_frame.grid_columnconfigure(0, weight=1)
         self.performance_frame.grid_columnconfigure(1, weight=1)
         
         # En karlı ürünler
-        top_profitable = self._get_top_products(df, 'kar', ascending=False)
         card1 = ProductListCard(
             self.performance_frame, "En Karlı Ürünler", "💰", top_profitable, COLORS['success']
         )
         card1.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
         
         # En çok satan ürünler
-        top_selling = self._get_top_products(df, 'miktar', ascending=False)
         card2 = ProductListCard(
             self.performance_frame, "En Çok Satan Ürünler", "📦", top_selling, COLORS['primary']
         )
@@ -724,64 +908,81 @@ class DashboardTab(ctk.CTkFrame):
             logger.error(f"Top products hatası: {e}")
             return [("Hata", str(e)[:30])]
     
-    def _create_charts_section(self):
+    def _compute_chart_data(self) -> Optional[Dict[str, Any]]:
+        """Grafik verisi - arka planda çalışır, kar sütunu yoksa None"""
+        if self.data is None:
+            return None
+        
+        df = self.data
+        
+        # Kar sütunu
+        kar_col = None
+        name_col = None
+        for col in df.columns:
+            col_lower = col.lower()
+            if 'kar' in col_lower and kar_col is None:
+                kar_col = col
+            if ('ürün' in col_lower or 'stok' in col_lower or 'ad' in col_lower) and name_col is None:
+                name_col = col
+        
+        if not kar_col:
+            return None
+        
+        if not name_col:
+            name_col = df.columns[0]
+        
+        # Sayısal dönüşüm
+        kar = pd.to_numeric(df[kar_col], errors='coerce').fillna(0)
+        top10 = kar.nlargest(10)
+        
+        # Ürün isimlerini al ve kısalt
+        product_names = []
+        for name in df.loc[top10.index, name_col].values:
+            name_str = str(name)
+            if len(name_str) > 20:
+                name_str = name_str[:18] + "..."
+            product_names.append(name_str)
+        
+        return {
+            'names': product_names,
+            'values': top10.values,
+            'positive': int((kar > 0).sum()),
+            'negative': int((kar <= 0).sum()),
+        }
+    
+    def _create_charts_section(self, parent, chart_data: Optional[Dict[str, Any]]):
         """Grafik bölümü - Ürün isimleri ile"""
         if not MATPLOTLIB_AVAILABLE or self.data is None:
             return
         
         # Başlık
         ctk.CTkLabel(
-            self.scroll, text="📊 Görsel Analizler",
+            parent, text="📊 Görsel Analizler",
             font=ctk.CTkFont(family="Segoe UI", size=18, weight="bold"),
             text_color=COLORS['text_primary']
         ).pack(anchor="w", pady=(20, 15))
         
-        chart_container = ctk.CTkFrame(self.scroll, fg_color=COLORS['bg_card'], corner_radius=12)
+        chart_container = ctk.CTkFrame(parent, fg_color=COLORS['bg_card'], corner_radius=12)
         chart_container.pack(fill="x", pady=(0, 20))
         
         try:
-            df = self.data.copy()
-            
-            # Kar sütunu
-            kar_col = None
-            name_col = None
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'kar' in col_lower and kar_col is None:
-                    kar_col = col
-                if ('ürün' in col_lower or 'stok' in col_lower or 'ad' in col_lower) and name_col is None:
-                    name_col = col
-            
-            if not kar_col:
+            if chart_data is None:
                 ctk.CTkLabel(
                     chart_container, text="Kar sütunu bulunamadı",
                     text_color=COLORS['text_secondary']
                 ).pack(pady=30)
                 return
             
-            if not name_col:
-                name_col = df.columns[0]
-            
-            # Sayısal dönüşüm
-            df[kar_col] = pd.to_numeric(df[kar_col], errors='coerce').fillna(0)
-            
             # Figure oluştur - daha geniş
             fig = Figure(figsize=(12, 5), facecolor='#FFFFFF', dpi=100)
             
             # Sol grafik - Bar chart ÜRÜN İSİMLERİ İLE
             ax1 = fig.add_subplot(121)
-            top10 = df.nlargest(10, kar_col)
+            product_names = chart_data['names']
+            top_values = chart_data['values']
             
-            # Ürün isimlerini al ve kısalt
-            product_names = []
-            for name in top10[name_col].values:
-                name_str = str(name)
-                if len(name_str) > 20:
-                    name_str = name_str[:18] + "..."
-                product_names.append(name_str)
-            
-            y_pos = range(len(top10))
-            bars = ax1.barh(y_pos, top10[kar_col].values, color='#10B981', height=0.7)
+            y_pos = range(len(top_values))
+            bars = ax1.barh(y_pos, top_values, color='#10B981', height=0.7)
             
             # Y eksenine ürün isimlerini yaz
             ax1.set_yticks(y_pos)
@@ -792,14 +993,14 @@ class DashboardTab(ctk.CTkFrame):
             ax1.set_xlabel("Kar (₺)")
             
             # Bar değerlerini göster
-            for i, (bar, val) in enumerate(zip(bars, top10[kar_col].values)):
+            for i, (bar, val) in enumerate(zip(bars, top_values)):
                 ax1.text(val + 5, bar.get_y() + bar.get_height()/2, 
                         f'₺{val:,.0f}', va='center', fontsize=7, color='#333')
             
             # Sağ grafik - Pie chart
             ax2 = fig.add_subplot(122)
-            positive = (df[kar_col] > 0).sum()
-            negative = (df[kar_col] <= 0).sum()
+            positive = chart_data['positive']
+            negative = chart_data['negative']
             if positive > 0 or negative > 0:
                 wedges, texts, autotexts = ax2.pie(
                     [positive, negative], 
@@ -844,10 +1045,16 @@ class DashboardTab(ctk.CTkFrame):
                 text_color=COLORS['text_secondary']
             ).pack(pady=30)
     
-    def _create_profit_analysis_section(self):
-        """Kar Analizi bölümü - Tıklanabilir kartlar"""
+    def _compute_profit_data(self):
+        """Kar dağılımı ve seçili kategori ürünleri - arka planda çalışır"""
+        return self._calculate_profit_distribution(), self._get_products_by_category(self.selected_filter)
+    
+    def _create_profit_analysis_section(self, parent, profit_data):
+        """Kar Analizi bölümü - Tıklanabilir kartlar + dinamik ürün listesi"""
+        dist_data, products = profit_data
+        
         # Başlık
-        title_frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+        title_frame = ctk.CTkFrame(parent, fg_color="transparent")
         title_frame.pack(fill="x", pady=(20, 15))
         
         ctk.CTkLabel(
@@ -863,15 +1070,12 @@ class DashboardTab(ctk.CTkFrame):
         ).pack(side="left", padx=(10, 0))
         
         # Kar dağılımı kartları
-        dist_frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+        dist_frame = ctk.CTkFrame(parent, fg_color="transparent")
         dist_frame.pack(fill="x", pady=(0, 10))
         
         for i in range(4):
             dist_frame.grid_columnconfigure(i, weight=1)
         
-        # Kar dağılımını hesapla
-        dist_data = self._calculate_profit_distribution()
-        
         # Tıklanabilir kartlar - her biri bir kategoriyi temsil eder
         categories = [
             ("📈", "Çok Karlı", str(dist_data['cok_karli']), COLORS['success_light'], "cok_karli", COLORS['success']),
@@ -885,6 +1089,9 @@ class DashboardTab(ctk.CTkFrame):
             card = self._create_clickable_profit_card(dist_frame, icon, title, value, bg_color, category, border_color)
             card.grid(row=0, column=i, padx=5, pady=5, sticky="nsew")
             self.profit_cards[category] = card
+        
+        # Dinamik Ürün Listesi (kart seçimine göre değişir)
+        self._create_dynamic_product_list(parent, products)
     
     def _create_clickable_profit_card(self, parent, icon: str, title: str, value: str, 
                                        bg_color: str, category: str, border_color: str) -> ctk.CTkFrame:
@@ -977,24 +1184,24 @@ class DashboardTab(ctk.CTkFrame):
                 # Seçili değilse sadece border_width=0 yap
                 card.configure(border_width=0)
     
-    def _create_dynamic_product_list(self):
+    def _create_dynamic_product_list(self, parent, products=None):
         """Dinamik ürün listesi (seçilen kategoriye göre)"""
         # Başlık
         self.product_list_title = ctk.CTkLabel(
-            self.scroll, text="📋 Seçili Kategori: Tümü",
+            parent, text="📋 Seçili Kategori: Tümü",
             font=ctk.CTkFont(family="Segoe UI", size=16, weight="bold"),
             text_color=COLORS['text_primary']
         )
         self.product_list_title.pack(anchor="w", pady=(10, 10))
         
         # Liste frame
-        self.product_list_frame = ctk.CTkFrame(self.scroll, fg_color="transparent")
+        self.product_list_frame = ctk.CTkFrame(parent, fg_color="transparent")
         self.product_list_frame.pack(fill="x", pady=(0, 20))
         
-        self._update_dynamic_product_list()
+        self._update_dynamic_product_list(products)
     
-    def _update_dynamic_product_list(self):
-        """Dinamik ürün listesini güncelle"""
+    def _update_dynamic_product_list(self, products=None):
+        """Dinamik ürün listesini güncelle (products verilmezse hesaplanır)"""
         if self.product_list_frame is None:
             return
         
@@ -1015,7 +1222,8 @@ class DashboardTab(ctk.CTkFrame):
         )
         
         # Ürünleri filtrele ve göster
-        products = self._get_products_by_category(self.selected_filter)
+        if products is None:
+            products = self._get_products_by_category(self.selected_filter)
         
         # Renk belirle
         colors = {
@@ -1166,24 +1374,21 @@ class DashboardTab(ctk.CTkFrame):
         """Artık kullanılmıyor - dinamik liste ile değiştirildi"""
         pass
     
-    def _create_statistics_section(self):
+    def _create_statistics_section(self, parent, stats: Dict[str, str]):
         """İstatistiksel Özet bölümü"""
         # Başlık
         ctk.CTkLabel(
-            self.scroll, text="📋 İstatistiksel Özet",
+            parent, text="📋 İstatistiksel Özet",
             font=ctk.CTkFont(family="Segoe UI", size=18, weight="bold"),
             text_color=COLORS['text_primary']
         ).pack(anchor="w", pady=(20, 15))
         
-        stats_frame = ctk.CTkFrame(self.scroll, fg_color=COLORS['bg_card'], corner_radius=12)
+        stats_frame = ctk.CTkFrame(parent, fg_color=COLORS['bg_card'], corner_radius=12)
         stats_frame.pack(fill="x", pady=(0, 20))
         
         stats_inner = ctk.CTkFrame(stats_frame, fg_color="transparent")
         stats_inner.pack(fill="x", padx=20, pady=20)
         
-        # İstatistikleri hesapla
-        stats = self._calculate_statistics()
-        
         # İki sütunlu gösterim
         stats_inner.grid_columnconfigure(0, weight=1)
         stats_inner.grid_columnconfigure(1, weight=1)
@@ -1274,11 +1479,34 @@ class DashboardTab(ctk.CTkFrame):
             }
     
     def update_data(self, data):
-        """Veriyi güncelle"""
+        """Veriyi güncelle - sekme görünür değilse kurulum ilk gösterime ertelenir"""
+        if self._live_search_job is not None:
+            self.after_cancel(self._live_search_job)
+            self._live_search_job = None
         self.data = data
         self.filtered_data = data
+        self.search_index = None
+        
+        # Devam eden arka plan hesaplamalarını geçersiz kıl
+        self._generation += 1
+        self._pending_sections = set()
+        self._needs_build = True
+        
+        if self.winfo_ismapped():
+            self._rebuild()
+    
+    def on_show(self):
+        """Sekme gösterildiğinde çağrılır - bekleyen kurulumu yap"""
+        if self._needs_build:
+            self._rebuild()
+    
+    def _rebuild(self):
+        """İskeleti yeniden oluştur"""
         for widget in self.winfo_children():
             widget.destroy()
+        self._section_frames = {}
+        self.performance_frame = None
+        self.product_list_frame = None
         self._build_ui()
 
 
@@ -1977,6 +2205,8 @@ class KarlilikApp(ctk.CTkFrame):
         # Yeni tab'ı göster
         try:
             tabs[self.current_tab].pack(fill="both", expand=True)
+            if self.current_tab == "dashboard":
+                self.dashboard_tab.on_show()
         except Exception as e:
             logger.error(f"Tab gösterme hatası: {e}")
     
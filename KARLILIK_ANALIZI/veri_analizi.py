@@ -1,19 +1,33 @@
 # veri_analizi.py - Düzeltilmiş ve Refactored Versiyon
 
+import threading
+
 import pandas as pd
 import numpy as np
 
 # Frozen mode için import düzeltmesi
 try:
-    from .data_operations import DataCleaner, DataAnalyzer, DataValidator
+    from .data_operations import DataCleaner, DataAnalyzer, DataValidator, AnalyticsKernel
     from .themes import get_colors, get_color
+    from .search_index import ProductSearchIndex
+    from .column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR
+    from .senaryo_analizi import SenaryoMotoru
+    from .rollup_cube import RollupCube
 except ImportError:
     try:
-        from KARLILIK_ANALIZI.data_operations import DataCleaner, DataAnalyzer, DataValidator
+        from KARLILIK_ANALIZI.data_operations import DataCleaner, DataAnalyzer, DataValidator, AnalyticsKernel
         from KARLILIK_ANALIZI.themes import get_colors, get_color
+        from KARLILIK_ANALIZI.search_index import ProductSearchIndex
+        from KARLILIK_ANALIZI.column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR
+        from KARLILIK_ANALIZI.senaryo_analizi import SenaryoMotoru
+        from KARLILIK_ANALIZI.rollup_cube import RollupCube
     except ImportError:
-        from data_operations import DataCleaner, DataAnalyzer, DataValidator
+        from data_operations import DataCleaner, DataAnalyzer, DataValidator, AnalyticsKernel
         from themes import get_colors, get_color
+        from search_index import ProductSearchIndex
+        from column_profiles import ColumnResolver, ROLE_STOK, ROLE_MIKTAR
+        from senaryo_analizi import SenaryoMotoru
+        from rollup_cube import RollupCube
 
 
 class VeriAnalizi:
@@ -35,11 +49,30 @@ class VeriAnalizi:
         # Cache için
         self._stok_column_cache = None
         self._miktar_column_cache = None
+        self._column_resolver = None
+        self._rollup_cubes = {}
+        self._analytics = None
+        self._analytics_lock = threading.Lock()
         
         # Tema renkleri - themes.py'den al
         self.colors = get_colors()
         
         self.clean_data()
+        
+        # Yazarken arama için ürün indeksi - veri yüklenirken bir kez kurulur
+        self.search_index = self._build_search_index()
+    
+    def _build_search_index(self):
+        """Stok sütunu üzerinde arama indeksini kur"""
+        if self.df.empty:
+            return None
+        
+        try:
+            return ProductSearchIndex.from_dataframe(
+                self.df, self.find_stok_column(), self.find_miktar_column()
+            )
+        except Exception:
+            return None
     
     def clean_data(self):
         """Veriyi analiz için temizle - data_operations.py entegreli"""
@@ -69,6 +102,14 @@ class VeriAnalizi:
         except Exception:
             pass
     
+    def get_analytics(self):
+        """Tek geçişli analiz sonucu - tüm KPI/liste/istatistik metodları buradan okur"""
+        with self._analytics_lock:
+            if self._analytics is None:
+                columns = ['Net Kar', 'Birim Kar', self.find_miktar_column(), 'Birim Maliyet']
+                self._analytics = AnalyticsKernel.compute(self.df, columns)
+            return self._analytics
+    
     def get_kpi_summary(self):
         """Temel KPI özetini döndür - data_operations.py entegreli"""
         if self.df.empty:
@@ -85,53 +126,31 @@ class VeriAnalizi:
             if not is_valid:
                 return self._get_empty_kpi()
             
-            # Güvenli kar hesaplama - DataCleaner kullan
-            net_kar_col = 'Net Kar'
-            kar_series = DataCleaner.safe_numeric_conversion(self.df[net_kar_col])
-            valid_kar_series = kar_series.dropna()
+            analytics = self.get_analytics()
+            kar_stats = analytics.basic_statistics('Net Kar')
             
-            # Toplam kar
-            toplam_kar = float(valid_kar_series.sum()) if not valid_kar_series.empty else 0.0
+            toplam_kar = kar_stats.get('sum', 0.0)
+            ortalama_kar = kar_stats.get('mean', 0.0)
             
-            # En karlı ürün - DataAnalyzer kullan
+            # En karlı ürün
             en_karli_urun = 'Veri Yok'
             en_karli_urun_kar = 0.0
             
-            if not valid_kar_series.empty and len(self.df) > 0:
-                try:
-                    max_kar_idx = valid_kar_series.idxmax()
-                    if pd.notna(max_kar_idx) and max_kar_idx in self.df.index:
-                        # Stok ismi sütununu bul - DataAnalyzer kullan
-                        stok_col = self.find_stok_column()
-                        if stok_col and stok_col in self.df.columns:
-                            product_name = self.df.loc[max_kar_idx, stok_col]
-                            en_karli_urun = str(product_name) if pd.notna(product_name) else "Bilinmiyor"
-                            en_karli_urun_kar = float(valid_kar_series.loc[max_kar_idx])
-                except (KeyError, IndexError, ValueError, TypeError):
-                    pass
-            
-            # Ortalama kar
-            ortalama_kar = float(valid_kar_series.mean()) if not valid_kar_series.empty else 0.0
+            en_karli = analytics.top_positions('Net Kar', 1)
+            if len(en_karli):
+                stok_col = self.find_stok_column()
+                if stok_col and stok_col in self.df.columns:
+                    product_name = self.df[stok_col].iloc[en_karli[0]]
+                    en_karli_urun = str(product_name) if pd.notna(product_name) else "Bilinmiyor"
+                    en_karli_urun_kar = float(analytics.values('Net Kar')[en_karli[0]])
             
-            # Ürün sayıları - güvenli hesaplama
+            # Ürün sayıları
             toplam_urun = len(self.df)
-            try:
-                pozitif_kar_urun = len(valid_kar_series[valid_kar_series > 0])
-                negatif_kar_urun = len(valid_kar_series[valid_kar_series < 0])
-            except (KeyError, TypeError):
-                pozitif_kar_urun = 0
-                negatif_kar_urun = 0
-            
-            # Toplam satış miktarı - DataAnalyzer kullan
-            toplam_satis_miktar = 0.0
+            pozitif_kar_urun, negatif_kar_urun = analytics.sign_counts('Net Kar')
+            
+            # Toplam satış miktarı
             miktar_col = self.find_miktar_column()
-            if miktar_col and miktar_col in self.df.columns:
-                try:
-                    miktar_series = DataCleaner.safe_numeric_conversion(self.df[miktar_col])
-                    valid_miktar = miktar_series.dropna()
-                    toplam_satis_miktar = float(valid_miktar.sum()) if not valid_miktar.empty else 0.0
-                except (KeyError, TypeError, ValueError):
-                    toplam_satis_miktar = 0.0
+            toplam_satis_miktar = analytics.basic_statistics(miktar_col).get('sum', 0.0) if miktar_col else 0.0
             
             return {
                 'toplam_kar': round(toplam_kar, 2),
@@ -160,6 +179,12 @@ class VeriAnalizi:
             'toplam_satis_miktar': 0
         }
     
+    def _get_column_resolver(self):
+        """Paylaşılan sütun çözümleyici (kayıtlı profil varsa tespit atlanır)"""
+        if self._column_resolver is None:
+            self._column_resolver = ColumnResolver(self.df.columns)
+        return self._column_resolver
+    
     def find_stok_column(self):
         """Stok ismi sütununu bul - data_operations.py entegreli"""
         if self._stok_column_cache is not None:
@@ -168,6 +193,11 @@ class VeriAnalizi:
         if self.df.empty:
             return None
             
+        stok_col = self._get_column_resolver().resolve(ROLE_STOK)
+        if stok_col in self.df.columns:
+            self._stok_column_cache = stok_col
+            return stok_col
+        
         # DataAnalyzer kullanarak bul
         stok_patterns = [
             'stok ismi', 'stok isim', 'stok kodu', 'stok kod',
@@ -191,6 +221,11 @@ class VeriAnalizi:
         if self.df.empty:
             return None
             
+        miktar_col = self._get_column_resolver().resolve(ROLE_MIKTAR)
+        if miktar_col in self.df.columns:
+            self._miktar_column_cache = miktar_col
+            return miktar_col
+        
         # Önce tam eşleşme ara
         possible_names = ['Satış Miktar', 'Satış\nMiktar', 'Satis Miktar', 'Miktar']
         for col in self.df.columns:
@@ -215,13 +250,8 @@ class VeriAnalizi:
             if not stok_col or stok_col not in self.df.columns:
                 return pd.DataFrame()
             
-            # DataAnalyzer kullanarak en yüksek değerleri al
-            top_df = DataAnalyzer.get_top_values(
-                self.df, 
-                sort_column='Net Kar', 
-                limit=limit, 
-                ascending=False
-            )
+            # En yüksek değerler tek geçişli analiz sonucundan okunur
+            top_df = self.get_analytics().top_frame(self.df, 'Net Kar', limit, ascending=False)
             
             if top_df.empty:
                 return pd.DataFrame()
@@ -257,13 +287,8 @@ class VeriAnalizi:
             if not miktar_col or not stok_col or miktar_col not in self.df.columns or stok_col not in self.df.columns:
                 return pd.DataFrame()
             
-            # DataAnalyzer kullanarak en yüksek değerleri al
-            top_df = DataAnalyzer.get_top_values(
-                self.df, 
-                sort_column=miktar_col, 
-                limit=limit, 
-                ascending=False
-            )
+            # En yüksek değerler tek geçişli analiz sonucundan okunur
+            top_df = self.get_analytics().top_frame(self.df, miktar_col, limit, ascending=False)
             
             if top_df.empty:
                 return pd.DataFrame()
@@ -294,13 +319,8 @@ class VeriAnalizi:
             if not stok_col or stok_col not in self.df.columns:
                 return pd.DataFrame()
             
-            # DataAnalyzer kullanarak en düşük değerleri al
-            low_df = DataAnalyzer.get_top_values(
-                self.df, 
-                sort_column='Net Kar', 
-                limit=limit, 
-                ascending=True
-            )
+            # En düşük değerler tek geçişli analiz sonucundan okunur
+            low_df = self.get_analytics().top_frame(self.df, 'Net Kar', limit, ascending=True)
             
             if low_df.empty:
                 return pd.DataFrame()
@@ -326,8 +346,7 @@ class VeriAnalizi:
     def get_profit_distribution(self):
         """Kar dağılımı analizi - data_operations.py delegasyonu"""
         try:
-            # DataAnalyzer kullanarak kar dağılımını hesapla
-            return DataAnalyzer.calculate_profit_distribution(self.df, 'Net Kar')
+            return self.get_analytics().profit_distribution('Net Kar')
         except Exception:
             return {
                 'cok_karli': 0,
@@ -336,11 +355,18 @@ class VeriAnalizi:
                 'zararda': 0
             }
     
-    def search_product(self, search_term):
-        """Ürün arama - data_operations.py entegreli"""
+    def search_product(self, search_term, limit=None):
+        """Ürün arama - Türkçe duyarlı indeks, yoksa data_operations.py taraması"""
         if self.df.empty or not search_term:
             return pd.DataFrame()
         
+        if self.search_index is not None:
+            try:
+                result = self.search_index.search_dataframe(self.df, search_term, limit)
+                return result.reset_index(drop=True) if not result.empty else pd.DataFrame()
+            except Exception:
+                pass
+        
         try:
             stok_col = self.find_stok_column()
             if not stok_col or stok_col not in self.df.columns:
@@ -349,12 +375,29 @@ class VeriAnalizi:
             # DataAnalyzer kullanarak filtreleme yap
             criteria = {stok_col: {'contains': search_term}}
             result = DataAnalyzer.filter_data_by_criteria(self.df, criteria)
+            if limit:
+                result = result.head(limit)
             
             return result.reset_index(drop=True) if not result.empty else pd.DataFrame()
             
         except Exception:
             return pd.DataFrame()
     
+    def create_scenario_engine(self, kategori_sutunu=None):
+        """What-if senaryo motoru - analiz dosyaları yeniden işlenmeden fiyat/maliyet denemeleri"""
+        if self.df.empty:
+            return None
+        try:
+            return SenaryoMotoru(self.df, kategori_sutunu=kategori_sutunu)
+        except ValueError:
+            return None
+    
+    def get_rollup_cube(self, donem=None):
+        """Aile/şube/dönem özet küpü - analiz başına bir kez kurulur"""
+        if donem not in self._rollup_cubes:
+            self._rollup_cubes[donem] = RollupCube.from_result(self.df, donem=donem)
+        return self._rollup_cubes[donem]
+    
     def get_summary_stats(self):
         """Özet istatistikler - data_operations.py entegreli"""
         if self.df.empty:
@@ -363,10 +406,10 @@ class VeriAnalizi:
         try:
             stats = {}
             
-            # Net Kar istatistikleri - DataAnalyzer kullan
+            # Net Kar istatistikleri - tek geçişli analiz sonucu
             if 'Net Kar' in self.df.columns:
                 try:
-                    net_kar_stats = DataAnalyzer.calculate_basic_statistics(self.df, 'Net Kar')
+                    net_kar_stats = self.get_analytics().basic_statistics('Net Kar')
                     # Anahtar isimlerini uygun şekilde düzenle
                     for key, value in net_kar_stats.items():
                         if key == 'sum':
@@ -380,10 +423,10 @@ class VeriAnalizi:
                 except (ValueError, TypeError):
                     pass
             
-            # Birim Kar istatistikleri - DataAnalyzer kullan
+            # Birim Kar istatistikleri - tek geçişli analiz sonucu
             if 'Birim Kar' in self.df.columns:
                 try:
-                    birim_kar_stats = DataAnalyzer.calculate_basic_statistics(self.df, 'Birim Kar')
+                    birim_kar_stats = self.get_analytics().basic_statistics('Birim Kar')
                     # Anahtar isimlerini uygun şekilde düzenle
                     for key, value in birim_kar_stats.items():
                         if key == 'mean':
@@ -393,11 +436,11 @@ class VeriAnalizi:
                 except (ValueError, TypeError):
                     pass
             
-            # Miktar istatistikleri - DataAnalyzer kullan
+            # Miktar istatistikleri - tek geçişli analiz sonucu
             miktar_col = self.find_miktar_column()
             if miktar_col and miktar_col in self.df.columns:
                 try:
-                    miktar_stats = DataAnalyzer.calculate_basic_statistics(self.df, miktar_col)
+                    miktar_stats = self.get_analytics().basic_statistics(miktar_col)
                     # Anahtar isimlerini uygun şekilde düzenle
                     for key, value in miktar_stats.items():
                         if key == 'sum':
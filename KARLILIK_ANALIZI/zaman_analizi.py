@@ -33,6 +33,12 @@ try:
 except ImportError:
     DATA_OPERATIONS_AVAILABLE = False
 
+try:
+    from rollup_cube import RollupCube
+    ROLLUP_CUBE_AVAILABLE = True
+except ImportError:
+    ROLLUP_CUBE_AVAILABLE = False
+
 # Optional dependencies - Graceful degradation
 try:
     import matplotlib.pyplot as plt
@@ -1062,6 +1068,14 @@ class ZamanAnalizi:
                 except Exception:
                     pass
             
+            # Rollup cube - built once per analysis, stored with the period
+            rollup_kupu = None
+            if ROLLUP_CUBE_AVAILABLE:
+                try:
+                    rollup_kupu = RollupCube.from_result(result_df, donem=period_name).to_dict()
+                except Exception as e:
+                    self.logger.warning(f"Rollup cube build error: {e}")
+            
             # Create new analysis record
             new_analysis = {
                 "id": len(data["analizler"]) + 1,
@@ -1073,7 +1087,8 @@ class ZamanAnalizi:
                 "urun_sayisi": int(urun_sayisi),
                 "karlilik_dosya": karlilik_file,
                 "iskonto_dosya": iskonto_file,
-                "analiz_detayi": result_df.to_dict('records')
+                "analiz_detayi": result_df.to_dict('records'),
+                "rollup_kupu": rollup_kupu
             }
             
             data["analizler"].append(new_analysis)
@@ -1167,6 +1182,31 @@ class ZamanAnalizi:
         except Exception as e:
             self.logger.error(f"Load existing data error: {e}")
     
+    def get_period_cube(self, analiz_idleri=None):
+        """Kayıtlı dönemlerin özet küplerini birleştirir (dönemler arası drill-down için)"""
+        if not ROLLUP_CUBE_AVAILABLE:
+            return None
+        try:
+            if hasattr(self.data_ops, 'JSONOperations'):
+                data = self.data_ops.JSONOperations.read_json_safe(self.data_file)
+            else:
+                data = self.data_ops.read_json_safe(self.data_file)
+            
+            kupler = []
+            for analiz in (data or {}).get("analizler", []):
+                if analiz_idleri is not None and analiz.get("id") not in analiz_idleri:
+                    continue
+                kup = RollupCube.from_dict(analiz.get("rollup_kupu"))
+                if kup is None and analiz.get("analiz_detayi"):
+                    # Küpten önce kaydedilmiş dönemler - bir kez detaydan kurulur
+                    kup = RollupCube.from_result(pd.DataFrame(analiz["analiz_detayi"]),
+                                                 donem=analiz.get("donem_adi"))
+                kupler.append(kup)
+            return RollupCube.merge(kupler)
+        except Exception as e:
+            self.logger.error(f"Period cube error: {e}")
+            return None
+    
     def _update_comparison_combos_safe(self, analizler):
         """Update comparison comboboxes with safety"""
         try:
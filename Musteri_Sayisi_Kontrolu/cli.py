@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Musteri_Sayisi_Kontrolu - Komut Satırı / Zamanlanmış Çalıştırma
+
+Pencere açmadan tek dosya çiftini veya iki klasördeki tüm araçları karşılaştırır,
+çıktıları yazar ve makinece okunabilir JSON özet üretir. ERP çıktıları
+oluştuktan hemen sonra Görev Zamanlayıcı / cron ile çalıştırılabilir:
+
+    python -m Musteri_Sayisi_Kontrolu.cli tek ESKI.xlsx YENI.xlsx -o sonuclar/Arac_01
+    python -m Musteri_Sayisi_Kontrolu.cli toplu eski_klasor yeni_klasor -o sonuclar --json ozet.json
+
+Benzer ünvan eşleşmeleri (--benzer) otomatik kaydedilmez; JSON özet incelendikten
+sonra onaylanır, onay gerekirse geri alınır:
+
+    python -m Musteri_Sayisi_Kontrolu.cli eslesme --onayla ozet.json
+    python -m Musteri_Sayisi_Kontrolu.cli eslesme --kaldir "ESKİ ÜNVAN" "YENİ ÜNVAN"
+
+Çıkış kodları:
+    0: Tüm karşılaştırmalar başarılı
+    1: En az bir karşılaştırma başarısız
+    2: Geçersiz kullanım / girdi (ör. klasör yok, config okunamadı)
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Any
+
+# main.py içe aktarılırken yazılan uyarılar JSON çıktısına karışmasın
+with contextlib.redirect_stdout(sys.stderr):
+    try:
+        from .main import ExcelComparisonLogic, ComparisonOptions
+    except ImportError:
+        try:
+            from Musteri_Sayisi_Kontrolu.main import ExcelComparisonLogic, ComparisonOptions
+        except ImportError:
+            from main import ExcelComparisonLogic, ComparisonOptions
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+class UsageError(Exception):
+    """Komut satırı girdisi kullanılamıyor"""
+
+
+def load_vehicle_drivers(config_path: str) -> Dict[str, str]:
+    """Araç-plasiyer eşleştirmesini verilen config dosyasından okur"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise UsageError(f"Config dosyası okunamadı: {config_path} ({e})")
+
+    vehicle_drivers = config.get('vehicle_drivers', {}) if isinstance(config, dict) else {}
+    if not vehicle_drivers:
+        raise UsageError(f"Config dosyasında 'vehicle_drivers' bulunamadı: {config_path}")
+    return {str(k): str(v) for k, v in vehicle_drivers.items()}
+
+
+def _result_summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Karşılaştırma sonucunun JSON'a uygun özeti (ham müşteri listeleri hariç)"""
+    return {
+        'vehicle_num': result.get('vehicle_num'),
+        'depo_name': result.get('depo_name'),
+        'file1': result.get('file1'),
+        'file2': result.get('file2'),
+        'success': bool(result.get('success')),
+        'error': result.get('error'),
+        'total_count': result.get('total_count', 0),
+        'missing_count': len(result.get('missing') or []),
+        'missing': list(result.get('missing') or []),
+        'fuzzy_matches': list(result.get('fuzzy_matches') or []),
+        'saved_files': list(result.get('saved_files') or []),
+    }
+
+
+def run_single(file1: str, file2: str, output_path: Optional[str], options: ComparisonOptions) -> Dict[str, Any]:
+    """
+    Tek dosya çiftini karşılaştırır.
+
+    Args:
+        output_path: Çıktı yolu (uzantısız); None ise depo/plasiyer adından türetilir
+    """
+    started = time.perf_counter()
+    logic = ExcelComparisonLogic.from_options(options)
+
+    if not output_path:
+        logic.update_output_filename(file1)
+        output_path = str(Path(file2).parent / logic.output_path.get())
+
+    result = logic.run_comparison(file1, file2, output_path,
+                                  save_excel=options.save_excel, save_image=options.save_image)
+    if not result['success']:
+        logging.error(f"Karşılaştırma başarısız: {result['error']}")
+
+    return {
+        'mode': 'single',
+        'success': bool(result['success']),
+        'elapsed': round(time.perf_counter() - started, 3),
+        'results': [_result_summary(result)],
+    }
+
+
+def run_batch(old_dir: str, new_dir: str, output_dir: Optional[str], options: ComparisonOptions) -> Dict[str, Any]:
+    """İki klasördeki araç dosyalarını eşleyip karşılaştırır"""
+    for folder in (old_dir, new_dir):
+        if not Path(folder).is_dir():
+            raise UsageError(f"Klasör bulunamadı: {folder}")
+
+    logic = ExcelComparisonLogic.from_options(options)
+    if not logic.vehicle_drivers:
+        raise UsageError("Araç-plasiyer eşleştirmesi yok (--config veya config.json gerekli)")
+
+    batch = logic.compare_folders(old_dir, new_dir, output_dir,
+                                  max_workers=options.max_workers,
+                                  save_excel=options.save_excel,
+                                  save_image=options.save_image)
+    results = [_result_summary(result) for result in batch['results']]
+
+    return {
+        'mode': 'batch',
+        'success': bool(results) and all(result['success'] for result in results),
+        'elapsed': round(batch['elapsed'], 3),
+        'results': results,
+        'unmatched_old': batch['unmatched_old'],
+        'unmatched_new': batch['unmatched_new'],
+        'summary_path': batch['summary_path'],
+        'output_dir': batch['output_dir'],
+    }
+
+
+def run_aliases(args: argparse.Namespace) -> Dict[str, Any]:
+    """Takma ad önbelleği işlemleri - eşleşmeler yalnızca burada açıkça onaylanır"""
+    logic = ExcelComparisonLogic(headless=True, vehicle_drivers={})
+    summary: Dict[str, Any] = {'mode': 'aliases', 'success': True}
+
+    if args.onayla:
+        try:
+            with open(args.onayla, 'r', encoding='utf-8') as f:
+                results = json.load(f).get('results', [])
+        except (OSError, ValueError, AttributeError) as e:
+            raise UsageError(f"Özet dosyası okunamadı: {args.onayla} ({e})")
+        matches = [match for result in results for match in result.get('fuzzy_matches') or []]
+        summary['confirmed'] = logic.confirm_fuzzy_matches(matches)
+    elif args.kaldir:
+        summary['removed'] = logic.revoke_fuzzy_matches([tuple(args.kaldir)])
+
+    summary['pairs'] = logic.confirmed_fuzzy_matches()
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m Musteri_Sayisi_Kontrolu.cli",
+        description="Müşteri sayısı karşılaştırmasını pencere açmadan çalıştırır."
+    )
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-o', '--output', help="Çıktı yolu (tek) veya çıktı klasörü (toplu)")
+    common.add_argument('--config', help="vehicle_drivers içeren JSON config dosyası")
+    common.add_argument('--json', dest='json_path', help="Özeti ayrıca bu dosyaya yaz")
+    common.add_argument('--excel-yok', dest='save_excel', action='store_false', help="Excel çıktısı yazma")
+    common.add_argument('--resim', dest='save_image', action='store_true', help="PNG çıktısı da yaz")
+    common.add_argument('--buyuk-kucuk', dest='case_sensitive', action='store_true',
+                        help="Büyük/küçük harf duyarlı karşılaştır")
+    common.add_argument('--benzer', dest='fuzzy_matching', action='store_true',
+                        help="Benzer ünvanları eşleştir (LTD. ŞTİ. / LTD STI gibi)")
+    common.add_argument('--kayit-yok', dest='record', action='store_false',
+                        help="Anlık görüntü deposuna yazma")
+    common.add_argument('-v', '--verbose', action='store_true', help="Günlüğü stderr'e de yaz")
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    single = subparsers.add_parser('tek', parents=[common], help="Tek dosya çiftini karşılaştır")
+    single.add_argument('file1', help="Eski tarihli Excel dosyası")
+    single.add_argument('file2', help="Yeni tarihli Excel dosyası")
+
+    batch = subparsers.add_parser('toplu', parents=[common], help="İki klasördeki tüm araçları karşılaştır")
+    batch.add_argument('old_dir', help="Eski tarihli araç dosyaları klasörü")
+    batch.add_argument('new_dir', help="Yeni tarihli araç dosyaları klasörü")
+    batch.add_argument('-j', '--workers', type=int, default=None, help="İşçi süreç sayısı")
+
+    aliases = subparsers.add_parser('eslesme', help="Benzer ünvan eşleşmelerini onayla / listele / kaldır")
+    aliases.add_argument('--json', dest='json_path', help="Özeti ayrıca bu dosyaya yaz")
+    aliases.add_argument('-v', '--verbose', action='store_true', help="Günlüğü stderr'e de yaz")
+    action = aliases.add_mutually_exclusive_group(required=True)
+    action.add_argument('--listele', action='store_true', help="Onaylanmış eşleşmeleri listele")
+    action.add_argument('--onayla', metavar='OZET_JSON',
+                        help="Önceki çalışmanın --json özetindeki benzerlik eşleşmelerini onayla")
+    action.add_argument('--kaldir', nargs=2, metavar=('ESKI', 'YENI'), help="Eşleşmenin onayını kaldır")
+
+    return parser
+
+
+def options_from_args(args: argparse.Namespace) -> ComparisonOptions:
+    return ComparisonOptions(
+        case_sensitive=args.case_sensitive,
+        fuzzy_matching=args.fuzzy_matching,
+        save_excel=args.save_excel,
+        save_image=args.save_image,
+        record_snapshots=args.record,
+        max_workers=getattr(args, 'workers', None),
+        vehicle_drivers=load_vehicle_drivers(args.config) if args.config else None,
+    )
+
+
+def _write_summary(summary: Dict[str, Any], json_path: Optional[str]) -> None:
+    text = json.dumps(summary, ensure_ascii=False, indent=2, default=str)
+    if json_path:
+        path = Path(json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    print(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Komut satırı girişi - çıkış kodunu döndürür"""
+    args = build_parser().parse_args(argv)
+
+    if args.verbose:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        logging.getLogger().addHandler(handler)
+
+    try:
+        if args.command == 'eslesme':
+            _write_summary(run_aliases(args), args.json_path)
+            return EXIT_OK
+        options = options_from_args(args)
+        if args.command == 'tek':
+            summary = run_single(args.file1, args.file2, args.output, options)
+        else:
+            summary = run_batch(args.old_dir, args.new_dir, args.output, options)
+    except UsageError as e:
+        logging.error(str(e))
+        mode = {'tek': 'single', 'toplu': 'batch'}.get(args.command, 'aliases')
+        _write_summary({'mode': mode, 'success': False, 'error': str(e), 'results': []}, args.json_path)
+        return EXIT_USAGE
+
+    _write_summary(summary, args.json_path)
+    return EXIT_OK if summary['success'] else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Musteri_Sayisi_Kontrolu - Cari Ünvan Bulanık Eşleştirme
+
+ERP çıktılarında aynı müşterinin ünvanı farklı yazılabilir ("ABC GIDA LTD. ŞTİ."
+ve "ABC GIDA LTD STI"). Ünvanlar Türkçe kurallarıyla katlanıp şirket türü ekleri
+atılarak anahtara çevrilir; adaylar kelime ve önek bloklarına ayrılır ve
+benzerlik yalnızca aynı bloğa düşen çiftler için hesaplanır. Kullanıcının
+onayladığı eşleşmeler takma ad önbelleğinde saklanır ve sonraki çalışmalarda
+puanlanmadan kullanılır; onay geri alınabilir.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Sequence, Union
+
+DEFAULT_THRESHOLD = 0.88
+MAX_BLOCK_SIZE = 200
+MIN_TOKEN_LENGTH = 3
+PREFIX_LENGTH = 4
+ALIAS_FILE_NAME = "cari_unvan_eslesmeleri.json"
+ALIAS_CACHE_VERSION = 1
+
+# Türkçe büyük/küçük harf: I → ı, İ → i (str.lower bunu bilmez)
+_TR_CASE_TABLE = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+# Eşleştirme anahtarı için ASCII katlama
+_TR_ASCII_TABLE = str.maketrans({
+    'ı': 'i', 'ş': 's', 'ç': 'c', 'ğ': 'g', 'ü': 'u', 'ö': 'o',
+    'â': 'a', 'î': 'i', 'û': 'u', '\u0307': None,
+})
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_DIGITS = re.compile(r'[0-9]+')
+# 'a.ş.' / 'a. ş.' tek kelimeye indirilir; noktasız tek harfler (ör. 'A GIDA') korunur
+_ANONIM_ABBREVIATION = re.compile(r'\ba\s*\.\s*s\b\.?')
+
+# Ünvan sonundaki şirket türü kısaltmaları (katlanmış hâlleriyle).
+# Faaliyet kelimeleri (tic, san, paz ...) ünvanı ayırt ettiği için atılmaz.
+LEGAL_SUFFIX_TOKENS = frozenset({'ltd', 'sti', 'ltdsti', 'as', 'koll', 'kom'})
+
+MatchRecord = Dict[str, Union[str, float]]
+
+
+def turkce_casefold(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir ve boşlukları sadeleştirir"""
+    return " ".join(str(text).translate(_TR_CASE_TABLE).casefold().split())
+
+
+def title_tokens(text: str) -> List[str]:
+    """Ünvanı katlanmış kelimelere böler, sondaki şirket türü eklerini atar"""
+    folded = _ANONIM_ABBREVIATION.sub(' as ', turkce_casefold(text).translate(_TR_ASCII_TABLE))
+    tokens = _NON_ALNUM.sub(' ', folded).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIX_TOKENS:
+        tokens.pop()
+    return tokens
+
+
+def title_key(text: str) -> str:
+    """Eşleştirme anahtarı (ör. 'ABC GIDA LTD. ŞTİ.' → 'abc gida')"""
+    return " ".join(title_tokens(text))
+
+
+def similarity(key1: str, key2: str) -> float:
+    """
+    İki anahtarın benzerliği (0-1) - kelime sırası farkı cezalandırılmaz.
+
+    Sayılar (şube / mağaza numarası) farklıysa ünvanlar farklı müşteridir:
+    'YILMAZ MARKET 1' ile 'YILMAZ MARKET 2' eşleşmez.
+    """
+    if key1 == key2:
+        return 1.0
+    if sorted(_DIGITS.findall(key1)) != sorted(_DIGITS.findall(key2)):
+        return 0.0
+    compact1, compact2 = key1.replace(' ', ''), key2.replace(' ', '')
+    matcher = SequenceMatcher(None, compact1, compact2, autojunk=False)
+    score = matcher.ratio()
+    sorted1 = "".join(sorted(key1.split()))
+    sorted2 = "".join(sorted(key2.split()))
+    if sorted1 != compact1 or sorted2 != compact2:
+        score = max(score, SequenceMatcher(None, sorted1, sorted2, autojunk=False).ratio())
+    return score
+
+
+def _default_alias_path() -> Path:
+    try:
+        from shared.utils import get_data_dir
+        return get_data_dir() / ALIAS_FILE_NAME
+    except Exception:
+        return Path(__file__).parent / ALIAS_FILE_NAME
+
+
+class AliasCache:
+    """
+    Onaylanmış ünvan eşleşmeleri (anahtar → anahtar).
+
+    Eşleşme iki yönlü saklanır; dosya atomik olarak yazılır. Kayıtlar
+    yalnızca kullanıcı onayıyla eklenir ve revoke() ile geri alınabilir.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else _default_alias_path()
+        self._lock = threading.RLock()
+        self._aliases: Dict[str, Dict[str, Dict]] = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                pairs = json.load(f).get('pairs', [])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.error(f"Ünvan eşleşme önbelleği okunamadı: {e}")
+            return
+        for pair in pairs:
+            self._add(pair['a'], pair['b'], pair)
+
+    def _add(self, key1: str, key2: str, meta: Dict) -> None:
+        self._aliases.setdefault(key1, {})[key2] = meta
+        self._aliases.setdefault(key2, {})[key1] = meta
+
+    def aliases(self, key: str) -> List[str]:
+        with self._lock:
+            self._load()
+            return list(self._aliases.get(key, {}))
+
+    def confirm(self, pairs: Iterable[Sequence[str]]) -> int:
+        """
+        (eski ünvan, yeni ünvan) çiftlerini onaylayıp kaydeder.
+
+        Returns:
+            Yeni eklenen çift sayısı
+        """
+        added = 0
+        with self._lock:
+            self._load()
+            for old_title, new_title in pairs:
+                key1, key2 = title_key(old_title), title_key(new_title)
+                if not key1 or not key2 or key1 == key2 or key2 in self._aliases.get(key1, {}):
+                    continue
+                self._add(key1, key2, {
+                    'a': key1,
+                    'b': key2,
+                    'ornek': [str(old_title), str(new_title)],
+                    'tarih': datetime.now().isoformat(timespec='seconds'),
+                })
+                added += 1
+            if added:
+                self._save()
+        return added
+
+    def revoke(self, pairs: Iterable[Sequence[str]]) -> int:
+        """
+        Onaylanmış (ünvan, ünvan) çiftlerini siler; ünvan yerine anahtar da verilebilir.
+
+        Returns:
+            Silinen çift sayısı
+        """
+        removed = 0
+        with self._lock:
+            self._load()
+            for title1, title2 in pairs:
+                key1, key2 = title_key(title1), title_key(title2)
+                if key2 not in self._aliases.get(key1, {}):
+                    continue
+                for source, target in ((key1, key2), (key2, key1)):
+                    targets = self._aliases[source]
+                    del targets[target]
+                    if not targets:
+                        del self._aliases[source]
+                removed += 1
+            if removed:
+                self._save()
+        return removed
+
+    def pairs(self) -> List[Dict]:
+        """Onaylanmış çiftler (a, b, ornek, tarih) - onay sırasıyla"""
+        with self._lock:
+            self._load()
+            return [dict(meta) for meta in self._unique_pairs()]
+
+    def _unique_pairs(self) -> List[Dict]:
+        seen = set()
+        pairs = []
+        for meta in (m for targets in self._aliases.values() for m in targets.values()):
+            if id(meta) not in seen:
+                seen.add(id(meta))
+                pairs.append(meta)
+        return sorted(pairs, key=lambda meta: meta.get('tarih', ''))
+
+    def _save(self) -> None:
+        pairs = self._unique_pairs()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': ALIAS_CACHE_VERSION, 'pairs': pairs}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+
+
+class CustomerTitleMatcher:
+    """
+    Eksik görünen ünvanları yeni listedeki eşleşmemiş ünvanlarla eşleştirir.
+
+    Her aday kelimeleri (en az 3 harf) ve ilk 4 harfi ile bloklara yazılır.
+    Çok kalabalık bloklar (ör. 'market') ayırt edici olmadığı için atlanır.
+    Her ünvan yalnızca kendi bloklarındaki adaylarla puanlanır, böylece iş
+    yükü n × m yerine yaklaşık n × blok boyu olur. Eşleşmeler puana göre
+    bire bir atanır.
+    """
+
+    def __init__(self,
+                 threshold: float = DEFAULT_THRESHOLD,
+                 alias_cache: Optional[AliasCache] = None,
+                 max_block_size: int = MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.alias_cache = alias_cache
+        self.max_block_size = max_block_size
+
+    @staticmethod
+    def _block_keys(key: str) -> List[str]:
+        tokens = key.split()
+        keys = [f"k:{token}" for token in tokens if len(token) >= MIN_TOKEN_LENGTH]
+        compact = key.replace(' ', '')
+        if compact:
+            keys.append(f"o:{compact[:PREFIX_LENGTH]}")
+        return keys
+
+    def match(self, missing: Sequence[str], candidates: Sequence[str]) -> List[MatchRecord]:
+        """
+        Args:
+            missing: Eski listede olup yeni listede bulunamayan ünvanlar
+            candidates: Yeni listede olup eski listede bulunamayan ünvanlar
+
+        Returns:
+            eski, yeni, skor, kaynak ('anahtar' / 'onbellek' / 'benzerlik')
+            anahtarlı eşleşmeler (eski listedeki sırayla)
+        """
+        if not missing or not candidates:
+            return []
+
+        candidate_keys = [title_key(c) for c in candidates]
+        candidate_lengths = [len(key) - key.count(' ') for key in candidate_keys]
+        by_key: Dict[str, List[int]] = defaultdict(list)
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for index, key in enumerate(candidate_keys):
+            if not key:
+                continue
+            by_key[key].append(index)
+            for block in self._block_keys(key):
+                blocks[block].append(index)
+
+        scored = []  # (skor, öncelik, eski sırası, aday sırası, kaynak)
+        for old_index, title in enumerate(missing):
+            key = title_key(title)
+            if not key:
+                continue
+
+            # 1. Normalize anahtar birebir aynı
+            exact = by_key.get(key)
+            if exact:
+                scored.extend((1.0, 2, old_index, c, 'anahtar') for c in exact)
+                continue
+
+            # 2. Daha önce onaylanmış eşleşme
+            if self.alias_cache is not None:
+                cached = [c for alias in self.alias_cache.aliases(key) for c in by_key.get(alias, ())]
+                if cached:
+                    scored.extend((1.0, 1, old_index, c, 'onbellek') for c in cached)
+                    continue
+
+            # 3. Blok içi benzerlik
+            pool = set()
+            for block in self._block_keys(key):
+                members = blocks.get(block, ())
+                if len(members) <= self.max_block_size:
+                    pool.update(members)
+            length = len(key) - key.count(' ')
+            for c in pool:
+                # Uzunluk farkı tek başına eşiği aşamıyorsa puanlama atlanır
+                other = candidate_lengths[c]
+                if 2.0 * min(length, other) / (length + other) < self.threshold:
+                    continue
+                score = similarity(key, candidate_keys[c])
+                if score >= self.threshold:
+                    scored.append((score, 0, old_index, c, 'benzerlik'))
+
+        # Bire bir atama: en yüksek puanlı çiftler önce
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2], item[3]))
+        used_old, used_new = set(), set()
+        matches = []
+        for score, _, old_index, c, source in scored:
+            if old_index in used_old or c in used_new:
+                continue
+            used_old.add(old_index)
+            used_new.add(c)
+            matches.append((old_index, {
+                'eski': missing[old_index],
+                'yeni': candidates[c],
+                'skor': round(float(score), 3),
+                'kaynak': source,
+            }))
+
+        matches.sort(key=lambda item: item[0])
+        return [record for _, record in matches]
+
+
+_default_alias_cache: Optional[AliasCache] = None
+_default_alias_cache_lock = threading.Lock()
+
+
+def get_alias_cache() -> AliasCache:
+    """Uygulama genelinde paylaşılan takma ad önbelleği"""
+    global _default_alias_cache
+    with _default_alias_cache_lock:
+        if _default_alias_cache is None:
+            _default_alias_cache = AliasCache()
+        return _default_alias_cache
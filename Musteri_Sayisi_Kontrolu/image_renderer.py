@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Musteri_Sayisi_Kontrolu - Eksik Müşteri Listesi PNG Çizici
+
+Eksik ünvanlar ve (bulanık eşleştirme açıksa) eşleşen benzer ünvanlar ayrı
+sayfa gruplarına çizilir.
+
+Liste sayfalara bölünür ve her sayfa doğrudan Pillow ile çizilir. Pillow
+yoksa matplotlib'in nesne yönelimli Agg API'si (pyplot olmadan) kullanılır.
+Global durum kullanılmadığı için thread ve süreç havuzlarında güvenlidir.
+"""
+
+import importlib.util
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, List, Sequence, Any
+
+ROWS_PER_PAGE = 40
+PAGE_WIDTH = 1200
+ROW_HEIGHT = 28
+TITLE_HEIGHT = 70
+FOOTER_HEIGHT = 36
+MARGIN = 30
+INDEX_COLUMN_WIDTH = 80
+MAX_TITLE_LENGTH = 95
+
+EMPTY_MESSAGE = "Tüm cari ünvanlar her iki dosyada da mevcut."
+COLUMN_TITLE = "Cari Ünvan"
+FUZZY_COLUMN_TITLE = "Eski Ünvan → Yeni Ünvan (benzerlik)"
+FUZZY_FILE_SUFFIX = "_benzer"
+
+# Türkçe karakterleri içeren yazı tipleri (Windows + matplotlib ile gelen DejaVu)
+FONT_CANDIDATES = ("segoeui.ttf", "arial.ttf", "DejaVuSans.ttf")
+BOLD_FONT_CANDIDATES = ("segoeuib.ttf", "arialbd.ttf", "DejaVuSans-Bold.ttf")
+
+# Tüm renkler gri tonlu - sayfalar tek kanallı (L) çizilir, PNG 3 kat küçük ve hızlı
+COLORS = {
+    'background': 255,
+    'header': 230,
+    'zebra': 249,
+    'border': 200,
+    'text': 0,
+    'muted': 110,
+}
+
+
+def paginate(items: Sequence[str], rows_per_page: int = ROWS_PER_PAGE) -> List[Sequence[str]]:
+    """Listeyi sayfalara böler (boş liste tek boş sayfa)"""
+    if not items:
+        return [[]]
+    return [items[i:i + rows_per_page] for i in range(0, len(items), rows_per_page)]
+
+
+def page_paths(output_path: str, page_count: int) -> List[Path]:
+    """Tek sayfa: verilen yol; çok sayfa: ad_s01.png, ad_s02.png ..."""
+    path = Path(output_path)
+    if path.suffix.lower() != '.png':
+        path = path.with_name(path.name + '.png')
+    if page_count == 1:
+        return [path]
+    return [path.with_name(f"{path.stem}_s{i:02d}{path.suffix}") for i in range(1, page_count + 1)]
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+#region Pillow
+@lru_cache(maxsize=8)
+def _pillow_font(size: int, bold: bool = False):
+    from PIL import ImageFont
+
+    candidates = list(BOLD_FONT_CANDIDATES if bold else FONT_CANDIDATES)
+    try:
+        import matplotlib
+        font_dir = Path(matplotlib.get_data_path()) / "fonts" / "ttf"
+        candidates.append(str(font_dir / ("DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf")))
+    except Exception:
+        pass
+
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def _render_page_pillow(rows: Sequence[str], start_index: int, title: str,
+                        page_no: int, page_count: int, path: Path,
+                        column_title: str = COLUMN_TITLE) -> None:
+    from PIL import Image, ImageDraw
+
+    row_count = max(len(rows), 1)
+    height = TITLE_HEIGHT + ROW_HEIGHT * (row_count + 1) + FOOTER_HEIGHT + MARGIN
+    image = Image.new('L', (PAGE_WIDTH, height), COLORS['background'])
+    draw = ImageDraw.Draw(image)
+
+    title_font = _pillow_font(24, bold=True)
+    header_font = _pillow_font(15, bold=True)
+    body_font = _pillow_font(15)
+    footer_font = _pillow_font(12)
+
+    draw.text((PAGE_WIDTH // 2, TITLE_HEIGHT // 2 + 5), _shorten(title, MAX_TITLE_LENGTH),
+              font=title_font, fill=COLORS['text'], anchor='mm')
+
+    left, right = MARGIN, PAGE_WIDTH - MARGIN
+    divider = left + INDEX_COLUMN_WIDTH
+    top = TITLE_HEIGHT
+
+    # Tablo başlığı
+    draw.rectangle((left, top, right, top + ROW_HEIGHT), fill=COLORS['header'], outline=COLORS['border'])
+    middle = top + ROW_HEIGHT // 2
+    draw.text(((left + divider) // 2, middle), "#", font=header_font, fill=COLORS['text'], anchor='mm')
+    draw.text((divider + 10, middle), column_title, font=header_font, fill=COLORS['text'], anchor='lm')
+
+    if rows:
+        for offset, unvan in enumerate(rows):
+            y = top + ROW_HEIGHT * (offset + 1)
+            fill = COLORS['zebra'] if offset % 2 else COLORS['background']
+            draw.rectangle((left, y, right, y + ROW_HEIGHT), fill=fill, outline=COLORS['border'])
+            middle = y + ROW_HEIGHT // 2
+            draw.text(((left + divider) // 2, middle), str(start_index + offset),
+                      font=body_font, fill=COLORS['text'], anchor='mm')
+            draw.text((divider + 10, middle), _shorten(unvan, 110),
+                      font=body_font, fill=COLORS['text'], anchor='lm')
+        table_bottom = top + ROW_HEIGHT * (len(rows) + 1)
+    else:
+        y = top + ROW_HEIGHT
+        draw.rectangle((left, y, right, y + ROW_HEIGHT), outline=COLORS['border'])
+        draw.text((divider + 10, y + ROW_HEIGHT // 2), EMPTY_MESSAGE,
+                  font=body_font, fill=COLORS['text'], anchor='lm')
+        table_bottom = y + ROW_HEIGHT
+
+    draw.line((divider, top, divider, table_bottom), fill=COLORS['border'])
+
+    if page_count > 1:
+        draw.text((right, table_bottom + FOOTER_HEIGHT // 2), f"Sayfa {page_no}/{page_count}",
+                  font=footer_font, fill=COLORS['muted'], anchor='rm')
+
+    image.save(path, format='PNG', compress_level=1)
+#endregion
+
+
+#region Matplotlib (OO Agg)
+def _render_page_agg(rows: Sequence[str], start_index: int, title: str,
+                     page_no: int, page_count: int, path: Path,
+                     column_title: str = COLUMN_TITLE) -> None:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    row_count = max(len(rows), 1)
+    fig = Figure(figsize=(12, 0.3 * (row_count + 4)), dpi=100)
+    FigureCanvasAgg(fig)
+    fig.suptitle(_shorten(title, MAX_TITLE_LENGTH), fontsize=16, fontweight='bold')
+
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+
+    if rows:
+        cell_text = [[start_index + i, _shorten(unvan, 80)] for i, unvan in enumerate(rows)]
+    else:
+        cell_text = [["", EMPTY_MESSAGE]]
+
+    table = ax.table(cellText=cell_text, colLabels=["#", column_title],
+                     loc='center', cellLoc='left', colWidths=[0.1, 0.9])
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    for (i, _), cell in table.get_celld().items():
+        if i == 0:
+            cell.set_text_props(fontweight='bold')
+            cell.set_facecolor('#e6e6e6')
+        elif i % 2 == 0:
+            cell.set_facecolor('#f9f9f9')
+
+    if page_count > 1:
+        fig.text(0.98, 0.01, f"Sayfa {page_no}/{page_count}", ha='right', fontsize=8, color='#6e6e6e')
+
+    fig.savefig(path, facecolor='white', edgecolor='none')
+#endregion
+
+
+def _select_renderer():
+    if importlib.util.find_spec("PIL") is not None:
+        return _render_page_pillow
+    logging.warning("Pillow bulunamadı, matplotlib Agg ile çiziliyor")
+    return _render_page_agg
+
+
+def _render_pages(rows: Sequence[str], output_path: str, title: str,
+                  column_title: str, rows_per_page: int) -> List[str]:
+    pages = paginate(list(rows), rows_per_page)
+    paths = page_paths(output_path, len(pages))
+    paths[0].parent.mkdir(parents=True, exist_ok=True)
+
+    render_page = _select_renderer()
+    for page_no, (page_rows, path) in enumerate(zip(pages, paths), 1):
+        render_page(page_rows, (page_no - 1) * rows_per_page + 1, title, page_no, len(pages), path,
+                    column_title=column_title)
+
+    return [str(path.resolve()) for path in paths]
+
+
+def render_missing_customers(unvanlar: Sequence[str],
+                             output_path: str,
+                             title: Optional[str] = None,
+                             rows_per_page: int = ROWS_PER_PAGE) -> List[str]:
+    """
+    Eksik müşteri listesini sayfalı PNG dosyalarına çizer.
+
+    Args:
+        unvanlar: Cari ünvan listesi
+        output_path: Çıktı yolu (çok sayfada _s01, _s02 ... eki alır)
+        title: Sayfa başlığı
+        rows_per_page: Sayfa başına satır
+
+    Returns:
+        Oluşturulan PNG dosyalarının yolları
+    """
+    return _render_pages(unvanlar, output_path, title or "Eksik Cari Ünvanlar", COLUMN_TITLE, rows_per_page)
+
+
+def format_fuzzy_match(match: Dict[str, Any]) -> str:
+    """Eşleşme satırı: 'ESKİ → YENİ (%93)'"""
+    return f"{match['eski']} → {match['yeni']} (%{float(match['skor']) * 100:.0f})"
+
+
+def render_fuzzy_matches(matches: Sequence[Dict[str, Any]],
+                         output_path: str,
+                         title: Optional[str] = None,
+                         rows_per_page: int = ROWS_PER_PAGE) -> List[str]:
+    """
+    Eksik listesinden benzer yazımla eşleşip çıkarılan ünvanları çizer.
+
+    Çıktı, eksik listesinin yanına '_benzer' ekiyle yazılır
+    (ör. Arac_01.png → Arac_01_benzer.png). Eşleşme yoksa dosya oluşturulmaz.
+
+    Returns:
+        Oluşturulan PNG dosyalarının yolları
+    """
+    if not matches:
+        return []
+    path = Path(output_path)
+    stem = path.stem if path.suffix.lower() == '.png' else path.name
+    fuzzy_path = path.with_name(f"{stem}{FUZZY_FILE_SUFFIX}.png")
+    title = f"{title} - Eşleşen Benzer Ünvanlar" if title else "Eşleşen Benzer Ünvanlar"
+    rows = [format_fuzzy_match(match) for match in matches]
+    return _render_pages(rows, str(fuzzy_path), title, FUZZY_COLUMN_TITLE, rows_per_page)
@@ -27,7 +27,8 @@ REQUIRED_PACKAGES = [
     "pandas>=2.0.0,<3.0.0",
     "openpyxl>=3.0.9,<4.0.0", 
     "xlrd>=2.0.1,<3.0.0",
-    "matplotlib>=3.5.0,<4.0.0"
+    "matplotlib>=3.5.0,<4.0.0",
+    "Pillow>=10.0.0"
 ]
 
 OPTIONAL_PACKAGES = [
@@ -280,6 +281,7 @@ class InstallationManager:
             ("openpyxl", "Excel dosya desteği"),
             ("xlrd", "Eski Excel formatları"),
             ("matplotlib", "Grafik oluşturma"),
+            ("PIL", "PNG liste çizimi"),
             ("tkinter", "Kullanıcı arayüzü")
         ]
         
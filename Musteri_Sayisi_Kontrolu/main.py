@@ -20,19 +20,28 @@ import re
 import json
 import logging
 from datetime import datetime
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 import threading
-from typing import Optional, Dict, List, Tuple, Any
+import time
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, List, Tuple, Any, Callable, Iterator
 
 # Constants
 MAX_FILE_SIZE_MB = 100
 EXCEL_CHUNK_SIZE = 1000
+HEADER_SEARCH_ROWS = 15
+DEPO_SEARCH_ROWS = 10
+HEADER_KEYWORD = "Cari Ünvan"
+DEPO_KEYWORD = "Cari Kategori 3"
+DEPO_PATTERN = re.compile(r'\[(.*?)\]\s*(.*?)(?:\n|\r\n|$)')
 SUPPORTED_EXTENSIONS = {'.xlsx', '.xls'}
 CONFIG_FILES = ['config.json', 'vehicle_config.json', 'drivers.json']
 DEFAULT_OUTPUT_NAME = "karşılaştırma_sonucu"
+BATCH_SUMMARY_NAME = "Toplu_Karsilastirma_Ozeti"
+BATCH_OUTPUT_DIR_NAME = "karsilastirma_sonuclari"
+FUZZY_SHEET_NAME = "Benzer Ünvanlar"
+FUZZY_COLUMNS = ["#", "Eski Ünvan", "Yeni Ünvan", "Benzerlik", "Kaynak"]
 
 # UI import kontrolü
 try:
@@ -47,6 +56,39 @@ except ImportError as e:
     print(f"HATA: ui.py import edilemedi: {e}")
     ModernExcelComparisonUI = None
 
+# Sayfalı PNG çizici (pyplot kullanmaz - süreç/thread güvenli)
+try:
+    from .image_renderer import render_missing_customers, render_fuzzy_matches, format_fuzzy_match
+except ImportError:
+    try:
+        from Musteri_Sayisi_Kontrolu.image_renderer import render_missing_customers, render_fuzzy_matches, format_fuzzy_match
+    except ImportError:
+        from image_renderer import render_missing_customers, render_fuzzy_matches, format_fuzzy_match
+
+# Müşteri anlık görüntü deposu
+try:
+    try:
+        from .presence_store import get_presence_store
+    except ImportError:
+        try:
+            from Musteri_Sayisi_Kontrolu.presence_store import get_presence_store
+        except ImportError:
+            from presence_store import get_presence_store
+    PRESENCE_STORE_AVAILABLE = True
+except ImportError as e:
+    print(f"UYARI: presence_store.py import edilemedi: {e}")
+    get_presence_store = None
+    PRESENCE_STORE_AVAILABLE = False
+
+# Cari ünvan bulanık eşleştirme (Türkçe katlama + şirket eki temizleme)
+try:
+    from .fuzzy_matcher import CustomerTitleMatcher, get_alias_cache, turkce_casefold
+except ImportError:
+    try:
+        from Musteri_Sayisi_Kontrolu.fuzzy_matcher import CustomerTitleMatcher, get_alias_cache, turkce_casefold
+    except ImportError:
+        from fuzzy_matcher import CustomerTitleMatcher, get_alias_cache, turkce_casefold
+
 # Logging sistemi kurulumu
 def setup_logging() -> None:
     """Logging sistemini kur"""
@@ -67,6 +109,32 @@ def setup_logging() -> None:
 setup_logging()
 
 
+class _HeadlessVar:
+    """tk.Variable yerine geçen değer tutucu (Tk kökü olmayan işçi süreçleri için)"""
+    
+    def __init__(self, value: Any = None):
+        self._value = value
+    
+    def get(self) -> Any:
+        return self._value
+    
+    def set(self, value: Any) -> None:
+        self._value = value
+
+
+@dataclass
+class ComparisonOptions:
+    """Arayüzden bağımsız karşılaştırma seçenekleri (komut satırı / zamanlanmış görev)"""
+    
+    case_sensitive: bool = False
+    fuzzy_matching: bool = False
+    save_excel: bool = True
+    save_image: bool = False
+    record_snapshots: bool = True
+    max_workers: Optional[int] = None
+    vehicle_drivers: Optional[Dict[str, str]] = None
+
+
 class VehicleDriverSetupDialog:
     """Araç-Plasiyer Eşleştirme Dialog'u"""
     
@@ -268,19 +336,155 @@ class VehicleDriverSetupDialog:
         self.dialog.destroy()
 
 
+class FuzzyMatchReviewDialog:
+    """
+    Benzer ünvan eşleşmeleri onay dialog'u.
+    
+    Üstte son karşılaştırmanın onay bekleyen eşleşmeleri, altta takma ad
+    önbelleğindeki onaylanmış eşleşmeler listelenir. Seçilenler onaylanır
+    veya onayları kaldırılır.
+    """
+    
+    def __init__(self, parent: tk.Tk, logic: 'ExcelComparisonLogic'):
+        self.parent = parent
+        self.logic = logic
+        self.dialog: Optional[tk.Toplevel] = None
+        self.pending_list: Optional[tk.Listbox] = None
+        self.confirmed_list: Optional[tk.Listbox] = None
+        self._confirmed: List[Dict[str, Any]] = []
+    
+    def show(self) -> None:
+        """Dialog'u modal olarak göster"""
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title("Benzer Ünvan Eşleşmeleri")
+        self.dialog.geometry("700x560")
+        self.dialog.transient(self.parent)
+        self.dialog.grab_set()
+        
+        main_frame = tk.Frame(self.dialog, padx=20, pady=15)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(
+            main_frame,
+            text="Onay bekleyen eşleşmeler (onaylananlar sonraki karşılaştırmalarda kullanılır)",
+            font=('Segoe UI', 10, 'bold'),
+            anchor='w'
+        ).pack(fill=tk.X)
+        self.pending_list = self._create_listbox(main_frame)
+        
+        pending_buttons = tk.Frame(main_frame)
+        pending_buttons.pack(fill=tk.X, pady=(4, 12))
+        tk.Button(pending_buttons, text="Seçilenleri Onayla", command=self._confirm_selected,
+                  bg="#4CAF50", fg="white", font=('Segoe UI', 9, 'bold'), padx=12).pack(side=tk.LEFT)
+        tk.Button(pending_buttons, text="Tümünü Onayla", command=self._confirm_all,
+                  font=('Segoe UI', 9), padx=12).pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(
+            main_frame,
+            text="Onaylanmış eşleşmeler",
+            font=('Segoe UI', 10, 'bold'),
+            anchor='w'
+        ).pack(fill=tk.X)
+        self.confirmed_list = self._create_listbox(main_frame)
+        
+        confirmed_buttons = tk.Frame(main_frame)
+        confirmed_buttons.pack(fill=tk.X, pady=(4, 0))
+        tk.Button(confirmed_buttons, text="Seçilenlerin Onayını Kaldır", command=self._revoke_selected,
+                  bg="#f44336", fg="white", font=('Segoe UI', 9), padx=12).pack(side=tk.LEFT)
+        tk.Button(confirmed_buttons, text="Kapat", command=self.dialog.destroy,
+                  font=('Segoe UI', 9), padx=20).pack(side=tk.RIGHT)
+        
+        self._refresh()
+        self.dialog.wait_window()
+    
+    @staticmethod
+    def _create_listbox(parent: tk.Frame) -> tk.Listbox:
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(frame, orient="vertical")
+        listbox = tk.Listbox(frame, selectmode=tk.EXTENDED, font=('Segoe UI', 9),
+                             yscrollcommand=scrollbar.set, height=8)
+        scrollbar.config(command=listbox.yview)
+        listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        return listbox
+    
+    def _refresh(self) -> None:
+        self.pending_list.delete(0, tk.END)
+        for match in self.logic.pending_fuzzy_matches:
+            self.pending_list.insert(tk.END, format_fuzzy_match(match))
+        
+        self._confirmed = self.logic.confirmed_fuzzy_matches()
+        self.confirmed_list.delete(0, tk.END)
+        for pair in self._confirmed:
+            old_title, new_title = pair.get('ornek') or (pair['a'], pair['b'])
+            self.confirmed_list.insert(tk.END, f"{old_title} → {new_title}  ({pair.get('tarih', '')})")
+    
+    def _confirm_selected(self) -> None:
+        pending = self.logic.pending_fuzzy_matches
+        selected = [pending[i] for i in self.pending_list.curselection()]
+        if not selected:
+            messagebox.showwarning("Uyarı", "Lütfen onaylanacak eşleşmeleri seçin.", parent=self.dialog)
+            return
+        self.logic.confirm_fuzzy_matches(selected)
+        self._refresh()
+    
+    def _confirm_all(self) -> None:
+        if not self.logic.pending_fuzzy_matches:
+            return
+        count = len(self.logic.pending_fuzzy_matches)
+        if messagebox.askyesno("Onay", f"{count} eşleşmenin tümü onaylansın mı?", parent=self.dialog):
+            self.logic.confirm_fuzzy_matches()
+            self._refresh()
+    
+    def _revoke_selected(self) -> None:
+        selected = [self._confirmed[i] for i in self.confirmed_list.curselection()]
+        if not selected:
+            messagebox.showwarning("Uyarı", "Lütfen onayı kaldırılacak eşleşmeleri seçin.", parent=self.dialog)
+            return
+        self.logic.revoke_fuzzy_matches([(pair['a'], pair['b']) for pair in selected])
+        self._refresh()
+
+
 class ExcelComparisonLogic:
     """Excel karşılaştırma iş mantığı"""
     
-    def __init__(self):
-        self.file1_path = tk.StringVar()
-        self.file2_path = tk.StringVar()
-        self.output_path = tk.StringVar()
-        self.case_sensitive = tk.BooleanVar(value=False)
-        self.output_path.set("")
+    def __init__(self, headless: bool = False, vehicle_drivers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            headless: Tk değişkenleri olmadan çalış (toplu karşılaştırma işçileri)
+            vehicle_drivers: Araç-plasiyer eşleştirmesi (None ise config'den yüklenir)
+        """
+        string_var = _HeadlessVar if headless else tk.StringVar
+        bool_var = _HeadlessVar if headless else tk.BooleanVar
+        
+        self.file1_path = string_var(value="")
+        self.file2_path = string_var(value="")
+        self.output_path = string_var(value="")
+        self.case_sensitive = bool_var(value=False)
+        # Eksik görünen ünvanlar yeni listedeki benzer ünvanlarla eşleştirilir
+        self.fuzzy_matching = bool_var(value=False)
+        self.last_fuzzy_matches: List[Dict[str, Any]] = []
+        # Benzerlik eşleşmeleri takma ad önbelleğine yalnızca kullanıcı onayıyla yazılır
+        self.pending_fuzzy_matches: List[Dict[str, Any]] = []
         self.ui: Optional[ModernExcelComparisonUI] = None
+        # İşlenen müşteri listeleri araç + tarih anlık görüntüsü olarak saklanır
+        self.record_snapshots = PRESENCE_STORE_AVAILABLE
         self.vehicle_drivers: Dict[str, str] = {}
-        self._load_vehicle_drivers()
+        if vehicle_drivers is not None:
+            self.vehicle_drivers = dict(vehicle_drivers)
+        else:
+            self._load_vehicle_drivers()
         
+    @classmethod
+    def from_options(cls, options: ComparisonOptions) -> 'ExcelComparisonLogic':
+        """Tk olmadan, seçenek nesnesiyle yapılandırılmış mantık nesnesi oluşturur"""
+        logic = cls(headless=True, vehicle_drivers=options.vehicle_drivers)
+        logic.case_sensitive.set(options.case_sensitive)
+        logic.fuzzy_matching.set(options.fuzzy_matching)
+        logic.record_snapshots = options.record_snapshots and PRESENCE_STORE_AVAILABLE
+        return logic
+    
     def _load_vehicle_drivers(self) -> None:
         """Araç-plasiyer eşleştirmesini dosyadan yükler"""
         try:
@@ -413,8 +617,13 @@ class ExcelComparisonLogic:
         except Exception as e:
             return False, f"Dosya boyutu kontrol edilemedi: {e}"
     
-    def validate_excel_file(self, file_path: str) -> Tuple[bool, str]:
-        """Excel dosyasının geçerli olup olmadığını kontrol eder"""
+    def validate_excel_file(self, file_path: str, check_content: bool = True) -> Tuple[bool, str]:
+        """
+        Excel dosyasının geçerli olup olmadığını kontrol eder.
+        
+        check_content=False ise yalnızca yol/format/boyut kontrol edilir; içerik
+        zaten okunacaksa (karşılaştırma) çalışma kitabı burada ayrıca açılmaz.
+        """
         try:
             path = Path(file_path)
             
@@ -429,7 +638,8 @@ class ExcelComparisonLogic:
                 return False, error_msg
                 
             # Basit Excel okuma testi
-            pd.read_excel(file_path, nrows=1)
+            if check_content:
+                pd.read_excel(file_path, nrows=1)
             return True, ""
             
         except PermissionError:
@@ -439,28 +649,6 @@ class ExcelComparisonLogic:
         except Exception as e:
             return False, f"Geçersiz Excel dosyası: {e}"
     
-    def _find_header_row(self, df: pd.DataFrame) -> int:
-        """DataFrame içinde başlık satırını bulur"""
-        try:
-            # String'e çevir ve 'Cari Ünvan' ara
-            df_str = df.astype(str)
-            mask = df_str.apply(
-                lambda row: row.str.contains("Cari Ünvan", case=False, na=False).any(), 
-                axis=1
-            )
-            
-            if mask.any():
-                return mask.idxmax()
-            return -1
-        except Exception as e:
-            logging.error(f"Başlık satırı bulma hatası: {e}")
-            # Alternatif yöntem
-            for i, row in df.iterrows():
-                for value in row.values:
-                    if isinstance(value, str) and "Cari Ünvan" in value:
-                        return i
-            return -1
-    
     def _extract_vehicle_number(self, depo_text: str) -> Optional[str]:
         """Depo kartı metninden araç numarasını çıkarır"""
         if not isinstance(depo_text, str):
@@ -538,25 +726,9 @@ class ExcelComparisonLogic:
                 self.output_path.set(default_name)
                 return
             
-            # Sadece ilk 10 satırı oku
-            df = pd.read_excel(file_path, header=None, nrows=10)
-            logging.debug(f"Excel dosyası okundu, {len(df)} satır")
-            
-            depo_name = None
-            for i in range(min(10, len(df))):
-                if len(df.columns) == 0:
-                    continue
-                    
-                row_str = str(df.iloc[i, 0])
-                logging.debug(f"Satır {i}: '{row_str[:100]}...'")
-                
-                if "Cari Kategori 3" in row_str:
-                    logging.debug(f"CARİ KATEGORİ 3 BULUNDU: {row_str[:100]}...")
-                    match = re.search(r'\[(.*?)\]\s*(.*?)(?:\n|\r\n|$)', row_str)
-                    if match and match.group(2):
-                        depo_name = match.group(2).strip()
-                        logging.debug(f"Araç adı çıkarıldı: '{depo_name}'")
-                        break
+            # Sadece ilk satırları oku
+            depo_name = self._sniff_depo_name(file_path)
+            logging.debug(f"Araç adı çıkarıldı: '{depo_name}'")
             
             if depo_name:
                 filename_with_driver = self._create_filename_with_driver(depo_name)
@@ -574,12 +746,13 @@ class ExcelComparisonLogic:
             if self.ui:
                 self.ui.show_warning("Uyarı", f"Dosya adı güncellenemedi: {default_name}")
     
-    def _save_results_as_image(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str] = None) -> Tuple[bool, str]:
-        """Sonuçları resim dosyası olarak kaydeder"""
+    def _save_results_as_image(self,
+                               unique_cari_unvan_list: List[str],
+                               output_path: str,
+                               depo_name: Optional[str] = None,
+                               fuzzy_matches: Optional[List[Dict[str, Any]]] = None) -> Tuple[bool, str]:
+        """Sonuçları (ve eşleşen benzer ünvanları) sayfalı resim dosyaları olarak kaydeder"""
         try:
-            fig, ax = plt.subplots(figsize=(12, 8), dpi=150)
-            plt.rcParams['font.family'] = 'DejaVu Sans'
-            
             if depo_name:
                 vehicle_num = self._extract_vehicle_number(depo_name)
                 if vehicle_num and vehicle_num in self.vehicle_drivers:
@@ -587,51 +760,12 @@ class ExcelComparisonLogic:
                     title = f"Araç {vehicle_num} - {driver_name}"
                 else:
                     title = depo_name
-                plt.suptitle(title, fontsize=16, fontweight='bold')
             else:
-                plt.suptitle("Eksik Cari Ünvanlar", fontsize=16, fontweight='bold')
-                
-            cell_text = []
-            for i, unvan in enumerate(unique_cari_unvan_list, 1):
-                display_unvan = unvan if len(str(unvan)) <= 80 else str(unvan)[:77] + "..."
-                cell_text.append([i, display_unvan])
-                
-            if not cell_text:
-                cell_text = [["", "Tüm cari ünvanlar her iki dosyada da mevcut."]]
-                
-            plt.axis('off')
-            table = plt.table(
-                cellText=cell_text,
-                colLabels=["#", "Cari Ünvan"],
-                loc='center',
-                cellLoc='left',
-                colWidths=[0.1, 0.9]
-            )
+                title = "Eksik Cari Ünvanlar"
             
-            table.auto_set_font_size(False)
-            table.set_fontsize(9)
-            table.scale(1, 1.5)
-            
-            # Tablo styling
-            for (i, j), cell in table.get_celld().items():
-                if i == 0:
-                    cell.set_text_props(fontweight='bold')
-                    cell.set_facecolor('#e6e6e6')
-                else:
-                    if i % 2 == 0:
-                        cell.set_facecolor('#f9f9f9')
-            
-            full_output_path = str(Path(output_path).resolve())
-            
-            # Dizin oluştur
-            output_dir = Path(full_output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            plt.savefig(full_output_path, bbox_inches='tight', dpi=150, 
-                       facecolor='white', edgecolor='none')
-            plt.close(fig)  # Memory leak önleme
-            
-            return True, full_output_path
+            image_paths = render_missing_customers(unique_cari_unvan_list, output_path, title)
+            image_paths += render_fuzzy_matches(fuzzy_matches or [], output_path, title)
+            return True, ", ".join(image_paths)
             
         except PermissionError as e:
             error_msg = f"Resim kaydetme izin hatası: {output_path} - {e}"
@@ -641,8 +775,6 @@ class ExcelComparisonLogic:
             error_msg = f"Resim kaydetme hatası: {e}"
             logging.error(error_msg)
             return False, error_msg
-        finally:
-            plt.close('all')  # Tüm figürleri temizle
     
     def compare_files_thread(self) -> None:
         """Dosya karşılaştırmasını ayrı thread'de çalıştır"""
@@ -675,51 +807,83 @@ class ExcelComparisonLogic:
                 self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Lütfen her iki Excel dosyasını da seçin!"))
             return
         
-        # File validation
+        self.clear_results()
+        
+        result = self.run_comparison(file1_path, file2_path, output_path)
+        
+        if not result['success']:
+            if self.ui:
+                self.ui.root.after(0, lambda msg=result['error']: self.ui.show_error("Hata", msg))
+            return
+        
+        if self.ui:
+            self.ui.update_results(result['missing'], result['status_text'], result['fuzzy_matches'])
+    
+    def run_comparison(self, 
+                       file1_path: str, 
+                       file2_path: str, 
+                       output_path: str,
+                       save_excel: Optional[bool] = None,
+                       save_image: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Tek dosya çiftini karşılaştırır ve sonuçları kaydeder (UI'dan bağımsız).
+        
+        Returns:
+            success, error, depo_name, vehicle_num, total_count, missing,
+            fuzzy_matches, status_text, saved_files anahtarlı sonuç sözlüğü
+        """
+        result: Dict[str, Any] = {
+            'success': False,
+            'error': None,
+            'file1': str(file1_path),
+            'file2': str(file2_path),
+            'depo_name': None,
+            'vehicle_num': None,
+            'total_count': 0,
+            'missing': [],
+            'fuzzy_matches': [],
+            'status_text': "",
+            'saved_files': [],
+        }
+        
+        # File validation (içerik tek okumada doğrulanır)
         for file_path, file_desc in [(file1_path, "Eski tarihli"), (file2_path, "Yeni tarihli")]:
-            is_valid, error_msg = self.validate_excel_file(file_path)
+            is_valid, error_msg = self.validate_excel_file(file_path, check_content=False)
             if not is_valid:
-                if self.ui:
-                    self.ui.root.after(0, lambda e=error_msg, d=file_desc: self.ui.show_error("Hata", f"{d} dosya hatası: {e}"))
-                return
-        
-        self.clear_results()
+                result['error'] = f"{file_desc} dosya hatası: {error_msg}"
+                return result
         
         try:
             logging.info(f"Dosyalar okunuyor: {file1_path}, {file2_path}")
             
-            # İlk 15 satırı oku (header detection için)
-            df1_header_search = pd.read_excel(file1_path, header=None, nrows=15)
-            df2_header_search = pd.read_excel(file2_path, header=None, nrows=15)
+            # Her dosya tek geçişte okunur: depo + başlık ilk satırlardan, ardından veri
+            frames = []
+            for file_path, file_desc in [(file1_path, "Eski tarihli"), (file2_path, "Yeni tarihli")]:
+                try:
+                    frames.append(self._read_customer_file(file_path))
+                except (PermissionError, MemoryError):
+                    raise
+                except Exception as e:
+                    result['error'] = f"{file_desc} dosya hatası: Geçersiz Excel dosyası: {e}"
+                    return result
             
-            # Depo adını bul
-            depo_name = self._extract_depo_name(df1_header_search)
+            (depo_name, header_row1, df1), (_, header_row2, df2) = frames
             
-            # Header satırlarını bul
-            header_row1 = self._find_header_row(df1_header_search)
-            header_row2 = self._find_header_row(df2_header_search)
+            # Depo adı eski dosyadan
+            result['depo_name'] = depo_name
+            result['vehicle_num'] = self._extract_vehicle_number(depo_name) if depo_name else None
             
             if header_row1 == -1 or header_row2 == -1:
-                if self.ui:
-                    self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Excel dosyalarında 'Cari Ünvan' başlığı bulunamadı!"))
-                return
-            
-            # Tam dosyaları oku
-            df1 = pd.read_excel(file1_path, header=header_row1)
-            df2 = pd.read_excel(file2_path, header=header_row2)
-            
-            # Sütun adlarını temizle
-            df1.columns = [col.strip() if isinstance(col, str) else col for col in df1.columns]
-            df2.columns = [col.strip() if isinstance(col, str) else col for col in df2.columns]
+                result['error'] = "Excel dosyalarında 'Cari Ünvan' başlığı bulunamadı!"
+                return result
             
             # Cari Ünvan sütunlarını bul
             cari_unvan_col1 = self._find_cari_unvan_column(df1.columns)
             cari_unvan_col2 = self._find_cari_unvan_column(df2.columns)
             
             if not cari_unvan_col1 or not cari_unvan_col2:
-                if self.ui:
-                    self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Bir veya daha fazla Excel dosyasında 'Cari Ünvan' sütunu bulunamadı."))
-                return
+                result['error'] = "Bir veya daha fazla Excel dosyasında 'Cari Ünvan' sütunu bulunamadı."
+                return result
             
             # Veri işleme ve karşılaştırma
             cari_unvan_list1 = self._extract_cari_unvan_list(df1, cari_unvan_col1)
@@ -728,47 +892,140 @@ class ExcelComparisonLogic:
             # Karşılaştırma yap
             unique_cari_unvan_list = self._perform_comparison(cari_unvan_list1, cari_unvan_list2)
             
-            # Sonuçları göster
-            status_text = f"Toplam {len(cari_unvan_list1)} cari ünvandan {len(unique_cari_unvan_list)} tanesi yeni dosyada bulunmuyor."
-            if self.ui:
-                self.ui.update_results(unique_cari_unvan_list, status_text)
+            result['total_count'] = len(cari_unvan_list1)
+            result['missing'] = unique_cari_unvan_list
+            result['customers_old'] = cari_unvan_list1
+            result['customers_new'] = cari_unvan_list2
+            result['fuzzy_matches'] = self.last_fuzzy_matches
+            
+            if self.record_snapshots:
+                self.record_presence_snapshots(result)
+            self.pending_fuzzy_matches = self._similarity_matches(self.last_fuzzy_matches)
+            result['status_text'] = f"Toplam {len(cari_unvan_list1)} cari ünvandan {len(unique_cari_unvan_list)} tanesi yeni dosyada bulunmuyor."
+            if self.last_fuzzy_matches:
+                result['status_text'] += f" ({len(self.last_fuzzy_matches)} ünvan benzer yazımla eşleştirildi)"
+            if self.pending_fuzzy_matches:
+                result['status_text'] += f" {len(self.pending_fuzzy_matches)} eşleşme onay bekliyor."
             
             logging.info(f"Karşılaştırma tamamlandı. {len(unique_cari_unvan_list)} farklılık bulundu.")
             
             # Sonuçları kaydet
-            self._save_results(unique_cari_unvan_list, output_path, depo_name)
+            result['saved_files'] = self._save_results(unique_cari_unvan_list, output_path, depo_name,
+                                                       save_excel=save_excel, save_image=save_image,
+                                                       fuzzy_matches=self.last_fuzzy_matches)
+            result['success'] = True
         
         except MemoryError:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Dosyalar çok büyük, bellek yetersiz!"))
+            result['error'] = "Dosyalar çok büyük, bellek yetersiz!"
         except pd.errors.EmptyDataError:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Excel dosyalarından biri boş veya bozuk!"))
+            result['error'] = "Excel dosyalarından biri boş veya bozuk!"
         except PermissionError:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Dosyalara erişim izni yok!"))
+            result['error'] = "Dosyalara erişim izni yok!"
         except Exception as e:
             logging.error(f"Karşılaştırma hatası: {e}")
-            if self.ui:
-                error_message = f"İşlem sırasında bir hata oluştu: {e}"
-                self.ui.root.after(0, lambda msg=error_message: self.ui.show_error("Hata", msg))
+            result['error'] = f"İşlem sırasında bir hata oluştu: {e}"
+        
+        return result
     
-    def _extract_depo_name(self, df: pd.DataFrame) -> Optional[str]:
-        """DataFrame'den depo adını çıkar"""
+    @staticmethod
+    def _iter_sheet_rows(file_path: str) -> Iterator[tuple]:
+        """
+        İlk çalışma sayfasının satırlarını sırayla üretir.
+        
+        .xlsx dosyaları openpyxl read_only modunda akış olarak okunur; çağıran
+        erken durursa kalan satırlar hiç ayrıştırılmaz. .xls için xlrd
+        üzerinden tek okuma yapılır.
+        """
+        if Path(file_path).suffix.lower() == '.xlsx':
+            from openpyxl import load_workbook
+            
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                worksheet = workbook.worksheets[0]
+                # ERP çıktılarında boyut bilgisi hatalı olabilir (pandas ile aynı)
+                if hasattr(worksheet, 'reset_dimensions'):
+                    worksheet.reset_dimensions()
+                yield from worksheet.iter_rows(values_only=True)
+            finally:
+                workbook.close()
+        else:
+            df = pd.read_excel(file_path, header=None)
+            df = df.astype(object).where(df.notna(), None)
+            yield from df.itertuples(index=False, name=None)
+    
+    @staticmethod
+    def _parse_depo_cell(value: Any) -> Optional[str]:
+        """'Cari Kategori 3 ... [kod] DEPO ADI' hücresinden depo adını çıkar"""
+        row_str = str(value)
+        if DEPO_KEYWORD in row_str:
+            match = DEPO_PATTERN.search(row_str)
+            if match and match.group(2):
+                return match.group(2).strip()
+        return None
+    
+    @staticmethod
+    def _is_header_row(row: tuple) -> bool:
+        keyword = HEADER_KEYWORD.lower()
+        return any(value is not None and keyword in str(value).lower() for value in row)
+    
+    def _sniff_depo_name(self, file_path: str) -> Optional[str]:
+        """Yalnızca ilk satırları okuyarak depo adını bulur"""
+        rows = self._iter_sheet_rows(file_path)
         try:
-            for i in range(min(10, len(df))):
-                if len(df.columns) == 0:
-                    continue
-                    
-                row_str = str(df.iloc[i, 0])
-                if "Cari Kategori 3" in row_str:
-                    match = re.search(r'\[(.*?)\]\s*(.*?)(?:\n|\r\n|$)', row_str)
-                    if match and match.group(2):
-                        return match.group(2).strip()
-            return None
-        except Exception as e:
-            logging.error(f"Depo adı çıkarma hatası: {e}")
+            for i, row in enumerate(rows):
+                if i >= DEPO_SEARCH_ROWS:
+                    break
+                if row:
+                    depo_name = self._parse_depo_cell(row[0])
+                    if depo_name:
+                        return depo_name
             return None
+        finally:
+            rows.close()
+    
+    def _read_customer_file(self, file_path: str) -> Tuple[Optional[str], int, Optional[pd.DataFrame]]:
+        """
+        Müşteri dosyasını tek geçişte okur.
+        
+        İlk satırlarda depo adı ve 'Cari Ünvan' başlığı aranır; başlık bulunduğunda
+        aynı akıştan veri satırlarına devam edilir.
+        
+        Returns:
+            (depo adı, başlık satırı veya -1, veri DataFrame'i veya None)
+        """
+        rows = self._iter_sheet_rows(file_path)
+        depo_name = None
+        header_row = -1
+        header = None
+        
+        try:
+            for i, row in enumerate(rows):
+                if depo_name is None and i < DEPO_SEARCH_ROWS and row:
+                    depo_name = self._parse_depo_cell(row[0])
+                if self._is_header_row(row):
+                    header_row, header = i, row
+                    break
+                if i + 1 >= HEADER_SEARCH_ROWS:
+                    break
+            
+            if header is None:
+                return depo_name, -1, None
+            
+            # Başlıktan sonraki satırlar aynı akıştan okunur
+            width = len(header)
+            data = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+        finally:
+            rows.close()
+        
+        # Sondaki boş satırları at (pandas read_excel ile aynı)
+        while data and all(value is None for value in data[-1]):
+            data.pop()
+        
+        columns = [
+            value.strip() if isinstance(value, str) else (f"Unnamed: {j}" if value is None else value)
+            for j, value in enumerate(header)
+        ]
+        return depo_name, header_row, pd.DataFrame(data, columns=columns)
     
     def _find_cari_unvan_column(self, columns) -> Optional[str]:
         """Cari Ünvan sütununu bul"""
@@ -788,24 +1045,154 @@ class ExcelComparisonLogic:
     
     def _perform_comparison(self, list1: List[str], list2: List[str]) -> List[str]:
         """İki liste arasında karşılaştırma yap"""
+        self.last_fuzzy_matches = []
+        
         if not self.case_sensitive.get():
-            # Case-insensitive karşılaştırma
-            list2_upper_set = {unvan.upper() for unvan in list2}
-            unique_list = [
-                unvan for unvan in list1 
-                if unvan.upper() not in list2_upper_set
-            ]
+            # Case-insensitive karşılaştırma (Türkçe I/ı, İ/i kuralları ile)
+            compare_key = turkce_casefold
         else:
             # Case-sensitive karşılaştırma
-            list2_set = set(list2)
-            unique_list = [unvan for unvan in list1 if unvan not in list2_set]
+            compare_key = str
+        
+        list2_set = {compare_key(unvan) for unvan in list2}
+        unique_list = [unvan for unvan in list1 if compare_key(unvan) not in list2_set]
         
         # Duplicate'leri kaldır (sırayı koruyarak)
         seen = set()
-        return [x for x in unique_list if not (x in seen or seen.add(x))]
+        unique_list = [x for x in unique_list if not (x in seen or seen.add(x))]
+        
+        if self.fuzzy_matching.get() and unique_list:
+            unique_list = self._apply_fuzzy_matching(unique_list, list1, list2, compare_key)
+        
+        return unique_list
+    
+    def _apply_fuzzy_matching(self,
+                              unique_list: List[str],
+                              list1: List[str],
+                              list2: List[str],
+                              compare_key: Callable[[str], str]) -> List[str]:
+        """Eksik ünvanları yeni listede eşleşmemiş benzer ünvanlarla eşleştirip listeden çıkarır"""
+        list1_set = {compare_key(unvan) for unvan in list1}
+        seen = set()
+        candidates = [
+            unvan for unvan in list2
+            if compare_key(unvan) not in list1_set and not (unvan in seen or seen.add(unvan))
+        ]
+        
+        try:
+            matcher = CustomerTitleMatcher(alias_cache=get_alias_cache())
+            matches = matcher.match(unique_list, candidates)
+        except Exception as e:
+            logging.warning(f"Bulanık eşleştirme yapılamadı: {e}")
+            return unique_list
+        
+        self.last_fuzzy_matches = matches
+        for match in matches:
+            logging.info(f"Benzer ünvan eşleşti ({match['skor']:.2f}, {match['kaynak']}): "
+                         f"{match['eski']} -> {match['yeni']}")
+        
+        matched = {match['eski'] for match in matches}
+        return [unvan for unvan in unique_list if unvan not in matched]
+    
+    @staticmethod
+    def _similarity_matches(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Onay gerektiren eşleşmeler (anahtar / önbellek eşleşmeleri zaten kesin)"""
+        return [match for match in matches if match['kaynak'] == 'benzerlik']
+    
+    def confirm_fuzzy_matches(self, matches: Optional[List[Dict[str, Any]]] = None) -> int:
+        """
+        Kullanıcının onayladığı benzerlik eşleşmelerini takma ad önbelleğine yazar.
+        
+        Args:
+            matches: Onaylanan eşleşmeler (None ise onay bekleyenlerin tümü)
+        
+        Returns:
+            Yeni kaydedilen çift sayısı
+        """
+        matches = self.pending_fuzzy_matches if matches is None else self._similarity_matches(matches)
+        if not matches:
+            return 0
+        try:
+            added = get_alias_cache().confirm((match['eski'], match['yeni']) for match in matches)
+        except Exception as e:
+            logging.warning(f"Ünvan eşleşmeleri kaydedilemedi: {e}")
+            return 0
+        
+        confirmed = {(match['eski'], match['yeni']) for match in matches}
+        self.pending_fuzzy_matches = [
+            match for match in self.pending_fuzzy_matches
+            if (match['eski'], match['yeni']) not in confirmed
+        ]
+        logging.info(f"{added} ünvan eşleşmesi onaylandı")
+        return added
+    
+    def revoke_fuzzy_matches(self, pairs: List[Tuple[str, str]]) -> int:
+        """Onaylanmış (ünvan, ünvan) eşleşmelerini önbellekten siler"""
+        if not pairs:
+            return 0
+        try:
+            removed = get_alias_cache().revoke(pairs)
+        except Exception as e:
+            logging.warning(f"Ünvan eşleşmeleri silinemedi: {e}")
+            return 0
+        logging.info(f"{removed} ünvan eşleşmesinin onayı kaldırıldı")
+        return removed
+    
+    def confirmed_fuzzy_matches(self) -> List[Dict[str, Any]]:
+        """Takma ad önbelleğindeki onaylanmış eşleşmeler"""
+        try:
+            return get_alias_cache().pairs()
+        except Exception as e:
+            logging.warning(f"Ünvan eşleşmeleri okunamadı: {e}")
+            return []
+    
+    def review_fuzzy_matches(self) -> None:
+        """Onay bekleyen / onaylanmış benzer ünvan eşleşmelerini düzenle"""
+        if not self.ui:
+            return
+        FuzzyMatchReviewDialog(self.ui.root, self).show()
+    
+    @staticmethod
+    def _snapshot_date(file_path: str) -> datetime:
+        """Anlık görüntü tarihi - dosyanın (ERP çıktısının) değiştirilme tarihi"""
+        try:
+            return datetime.fromtimestamp(Path(file_path).stat().st_mtime)
+        except OSError:
+            return datetime.now()
+    
+    def record_presence_snapshots(self, result: Dict[str, Any]) -> List[str]:
+        """Karşılaştırmadaki eski/yeni müşteri listelerini anlık görüntü deposuna yazar"""
+        if not PRESENCE_STORE_AVAILABLE or not result.get('customers_new'):
+            return []
+        
+        vehicle = result.get('vehicle_num') or result.get('depo_name') or "Bilinmeyen"
+        old_date = self._snapshot_date(result['file1']).date()
+        new_date = self._snapshot_date(result['file2']).date()
+        
+        snapshot_ids = []
+        try:
+            store = get_presence_store()
+            # Aynı güne düşen eski liste, yeni listenin üzerine yazılmasın
+            if old_date != new_date and result.get('customers_old'):
+                snapshot_ids.append(store.add_snapshot(vehicle, old_date, result['customers_old'], result['file1']))
+            snapshot_ids.append(store.add_snapshot(vehicle, new_date, result['customers_new'], result['file2']))
+        except Exception as e:
+            logging.warning(f"Müşteri anlık görüntüsü kaydedilemedi: {e}")
+        return snapshot_ids
     
-    def _save_results(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str]) -> None:
-        """Sonuçları kaydet"""
+    def _save_results(self, 
+                      unique_cari_unvan_list: List[str], 
+                      output_path: str, 
+                      depo_name: Optional[str],
+                      save_excel: Optional[bool] = None,
+                      save_image: Optional[bool] = None,
+                      fuzzy_matches: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Sonuçları kaydet - kaydedilen dosyaların listesini döndürür.
+        
+        Eksik listesinden benzer yazımla çıkarılan ünvanlar (fuzzy_matches)
+        ayrı bir bölüm olarak yazılır; eşleşme sessizce kaybolmaz.
+        """
         if not output_path or output_path.strip() == "":
             output_path = f"{DEFAULT_OUTPUT_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             logging.warning(f"Output path boş, varsayılan oluşturuldu: {output_path}")
@@ -814,17 +1201,19 @@ class ExcelComparisonLogic:
         logging.info(f"Çalışma dizini: {current_dir}")
         logging.info(f"Output path: {output_path}")
         logging.info(f"Sonuç listesi uzunluğu: {len(unique_cari_unvan_list)}")
-            
+        
+        saved_files = []
         try:
-            save_excel = self.ui.save_excel.get() if self.ui else True
-            save_image = self.ui.save_image.get() if self.ui else False
+            if save_excel is None:
+                save_excel = self.ui.save_excel.get() if self.ui else True
+            if save_image is None:
+                save_image = self.ui.save_image.get() if self.ui else False
             
             logging.info(f"Save Excel: {save_excel}, Save Image: {save_image}")
             
-            saved_files = []
-            
             if save_excel:
-                success, result_path = self._save_as_excel(unique_cari_unvan_list, output_path, depo_name)
+                success, result_path = self._save_as_excel(unique_cari_unvan_list, output_path, depo_name,
+                                                           fuzzy_matches)
                 if success:
                     saved_files.append(f"Excel: {result_path}")
                 elif self.ui:
@@ -833,7 +1222,8 @@ class ExcelComparisonLogic:
             
             if save_image:
                 image_path = str(current_dir / f"{output_path}.png")
-                success, result_msg = self._save_results_as_image(unique_cari_unvan_list, image_path, depo_name)
+                success, result_msg = self._save_results_as_image(unique_cari_unvan_list, image_path, depo_name,
+                                                                  fuzzy_matches)
                 if success:
                     saved_files.append(f"Resim: {result_msg}")
                 elif self.ui:
@@ -848,8 +1238,25 @@ class ExcelComparisonLogic:
             logging.error(error_msg)
             if self.ui:
                 self.ui.root.after(0, lambda m=error_msg: self.ui.show_error("Hata", m))
+        
+        return saved_files
+    
+    @staticmethod
+    def _fuzzy_match_frame(fuzzy_matches: Optional[List[Dict[str, Any]]]) -> Optional[pd.DataFrame]:
+        """Eşleşen benzer ünvanlar tablosu (eşleşme yoksa None)"""
+        if not fuzzy_matches:
+            return None
+        rows = [
+            [i, match['eski'], match['yeni'], match['skor'], match['kaynak']]
+            for i, match in enumerate(fuzzy_matches, 1)
+        ]
+        return pd.DataFrame(rows, columns=FUZZY_COLUMNS)
     
-    def _save_as_excel(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str]) -> Tuple[bool, str]:
+    def _save_as_excel(self,
+                       unique_cari_unvan_list: List[str],
+                       output_path: str,
+                       depo_name: Optional[str],
+                       fuzzy_matches: Optional[List[Dict[str, Any]]] = None) -> Tuple[bool, str]:
         """Excel olarak kaydet"""
         try:
             excel_path = Path.cwd() / f"{output_path}.xlsx"
@@ -861,14 +1268,18 @@ class ExcelComparisonLogic:
             # Tablo verisi oluştur
             table_data = [[i, unvan] for i, unvan in enumerate(unique_cari_unvan_list, 1)]
             result_df = pd.DataFrame(table_data, columns=["#", "Cari Ünvan"])
+            match_df = self._fuzzy_match_frame(fuzzy_matches)
             
             try:
                 # Gelişmiş Excel formatı ile kaydet
-                self._save_excel_with_formatting(result_df, excel_path, depo_name)
+                self._save_excel_with_formatting(result_df, excel_path, depo_name, match_df)
             except ImportError:
                 # Basit format ile kaydet
                 logging.warning("openpyxl.styles import edilemedi, basit format kullanılıyor")
-                result_df.to_excel(excel_path, index=False)
+                with pd.ExcelWriter(excel_path) as writer:
+                    result_df.to_excel(writer, index=False)
+                    if match_df is not None:
+                        match_df.to_excel(writer, sheet_name=FUZZY_SHEET_NAME, index=False)
             
             logging.info(f"Excel dosyası başarıyla kaydedildi: {excel_path}")
             return True, str(excel_path)
@@ -882,7 +1293,11 @@ class ExcelComparisonLogic:
             logging.error(error_msg)
             return False, error_msg
     
-    def _save_excel_with_formatting(self, result_df: pd.DataFrame, excel_path: Path, depo_name: Optional[str]) -> None:
+    def _save_excel_with_formatting(self,
+                                    result_df: pd.DataFrame,
+                                    excel_path: Path,
+                                    depo_name: Optional[str],
+                                    match_df: Optional[pd.DataFrame] = None) -> None:
         """Formatlanmış Excel kaydet"""
         from openpyxl.styles import Font, Border, Side, Alignment
         
@@ -904,6 +1319,16 @@ class ExcelComparisonLogic:
                 self._apply_excel_styling(writer, header_text, len(result_df))
             else:
                 result_df.to_excel(writer, sheet_name='Sheet1', index=False)
+            
+            # Eksik listesinden çıkarılan benzer ünvanlar ayrı sayfada
+            if match_df is not None:
+                match_df.to_excel(writer, sheet_name=FUZZY_SHEET_NAME, index=False)
+                worksheet = writer.sheets[FUZZY_SHEET_NAME]
+                for cell in worksheet[1]:
+                    cell.font = Font(bold=True, size=10)
+                    cell.alignment = Alignment(horizontal='center', vertical='center')
+                for column, width in zip("ABCDE", (8, 50, 50, 12, 12)):
+                    worksheet.column_dimensions[column].width = width
     
     def _apply_excel_styling(self, writer, header_text: str, data_rows: int) -> None:
         """Excel styling uygula"""
@@ -977,6 +1402,305 @@ class ExcelComparisonLogic:
         """Sonuç listesini temizler"""
         if self.ui:
             self.ui.clear_results()
+    
+    # =========================================================================
+    # TOPLU KARŞILAŞTIRMA (ARAÇ BAŞINA DOSYA KLASÖRLERİ)
+    # =========================================================================
+    
+    def find_vehicle_for_file(self, file_path: str) -> Optional[str]:
+        """Dosyanın araç numarasını bulur - önce depo kartı, sonra dosya adı"""
+        try:
+            depo_name = self._sniff_depo_name(file_path)
+            if depo_name:
+                vehicle_num = self._extract_vehicle_number(depo_name)
+                if vehicle_num:
+                    return vehicle_num
+        except Exception as e:
+            logging.warning(f"Araç numarası için dosya okunamadı {file_path}: {e}")
+        
+        return self._extract_vehicle_number(Path(file_path).stem)
+    
+    @staticmethod
+    def _list_excel_files(folder: str) -> List[str]:
+        """Klasördeki Excel dosyaları (Excel kilit dosyaları hariç)"""
+        return sorted(
+            str(p) for p in Path(folder).iterdir()
+            if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS and not p.name.startswith('~$')
+        )
+    
+    @staticmethod
+    def _group_by_vehicle(vehicle_map: Dict[str, Optional[str]]) -> Tuple[Dict[str, str], List[str]]:
+        """Dosya → araç eşlemesini araç → dosya eşlemesine çevirir (aynı araçta en yeni dosya)"""
+        by_vehicle: Dict[str, str] = {}
+        unmatched: List[str] = []
+        for file_path, vehicle_num in vehicle_map.items():
+            if not vehicle_num:
+                unmatched.append(file_path)
+                continue
+            current = by_vehicle.get(vehicle_num)
+            if current is None:
+                by_vehicle[vehicle_num] = file_path
+                continue
+            logging.warning(f"Araç {vehicle_num} için birden fazla dosya: {current}, {file_path}")
+            if Path(file_path).stat().st_mtime > Path(current).stat().st_mtime:
+                unmatched.append(current)
+                by_vehicle[vehicle_num] = file_path
+            else:
+                unmatched.append(file_path)
+        return by_vehicle, unmatched
+    
+    def compare_folders(self,
+                        old_dir: str,
+                        new_dir: str,
+                        output_dir: Optional[str] = None,
+                        max_workers: Optional[int] = None,
+                        save_excel: bool = True,
+                        save_image: bool = False,
+                        progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        İki klasördeki araç dosyalarını araç numarasına göre eşleyip paralel karşılaştırır.
+        
+        Her araç için Excel/PNG çıktısı ve tüm araçlar için tek özet dosyası yazılır.
+        Karşılaştırmalar ayrı süreçlerde çalışır; toplam süre en yavaş çifte yakındır.
+        
+        Args:
+            old_dir: Eski tarihli araç dosyaları klasörü
+            new_dir: Yeni tarihli araç dosyaları klasörü
+            output_dir: Çıktı klasörü (None ise yeni klasör altında karsilastirma_sonuclari)
+            max_workers: İşçi süreç sayısı (None ise çift sayısı / CPU sayısı)
+            save_excel, save_image: Araç başına kaydedilecek formatlar
+            progress_callback: (tamamlanan, toplam) ile çağrılır
+        
+        Returns:
+            results, unmatched_old, unmatched_new, summary_path, elapsed anahtarlı sözlük
+        """
+        started = time.perf_counter()
+        output_dir = Path(output_dir) if output_dir else Path(new_dir) / BATCH_OUTPUT_DIR_NAME
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        old_files = self._list_excel_files(old_dir)
+        new_files = self._list_excel_files(new_dir)
+        
+        # 1. Aşama: araç numaralarını paralel bul
+        sniff_jobs = [(path, self.vehicle_drivers) for path in old_files + new_files]
+        vehicle_map = dict(_run_batch_jobs(_batch_sniff_job, sniff_jobs, max_workers))
+        
+        old_by_vehicle, unmatched_old = self._group_by_vehicle({p: vehicle_map.get(p) for p in old_files})
+        new_by_vehicle, unmatched_new = self._group_by_vehicle({p: vehicle_map.get(p) for p in new_files})
+        
+        unmatched_old += [old_by_vehicle[v] for v in old_by_vehicle if v not in new_by_vehicle]
+        unmatched_new += [new_by_vehicle[v] for v in new_by_vehicle if v not in old_by_vehicle]
+        
+        # 2. Aşama: eşleşen çiftleri paralel karşılaştır
+        compare_jobs = []
+        for vehicle_num in sorted(set(old_by_vehicle) & set(new_by_vehicle)):
+            driver_name = self.vehicle_drivers.get(vehicle_num, "")
+            file_stem = self._sanitize_filename(f"Arac_{vehicle_num}_{driver_name}" if driver_name else f"Arac_{vehicle_num}")
+            compare_jobs.append({
+                'vehicle_num': vehicle_num,
+                'file1': old_by_vehicle[vehicle_num],
+                'file2': new_by_vehicle[vehicle_num],
+                'output_path': str(output_dir / file_stem),
+                'vehicle_drivers': self.vehicle_drivers,
+                'case_sensitive': bool(self.case_sensitive.get()),
+                'fuzzy_matching': bool(self.fuzzy_matching.get()),
+                'save_excel': save_excel,
+                'save_image': save_image,
+            })
+        
+        logging.info(f"Toplu karşılaştırma: {len(compare_jobs)} araç çifti, "
+                     f"{len(unmatched_old)} + {len(unmatched_new)} eşleşmeyen dosya")
+        
+        results = _run_batch_jobs(_batch_compare_job, compare_jobs, max_workers, progress_callback)
+        results.sort(key=lambda r: r['vehicle_num'])
+        
+        self.pending_fuzzy_matches = []
+        for result in results:
+            if not result['success']:
+                continue
+            if self.record_snapshots:
+                self.record_presence_snapshots(result)
+            self.pending_fuzzy_matches.extend(self._similarity_matches(result.get('fuzzy_matches') or []))
+        
+        summary_path = self._save_batch_summary(results, unmatched_old, unmatched_new, output_dir)
+        elapsed = time.perf_counter() - started
+        logging.info(f"Toplu karşılaştırma tamamlandı: {len(results)} araç, {elapsed:.1f} sn")
+        
+        return {
+            'results': results,
+            'unmatched_old': unmatched_old,
+            'unmatched_new': unmatched_new,
+            'summary_path': summary_path,
+            'output_dir': str(output_dir),
+            'elapsed': elapsed,
+        }
+    
+    def _save_batch_summary(self, 
+                            results: List[Dict[str, Any]], 
+                            unmatched_old: List[str], 
+                            unmatched_new: List[str],
+                            output_dir: Path) -> Optional[str]:
+        """Tüm araçların özetini tek Excel dosyasına yazar"""
+        summary_rows = []
+        detail_rows = []
+        match_rows = []
+        for result in results:
+            vehicle_num = result['vehicle_num']
+            driver_name = self.vehicle_drivers.get(vehicle_num, "")
+            summary_rows.append({
+                'Araç': vehicle_num,
+                'Plasiyer': driver_name,
+                'Eski Dosya': Path(result['file1']).name,
+                'Yeni Dosya': Path(result['file2']).name,
+                'Eski Müşteri Sayısı': result['total_count'],
+                'Eksik Müşteri Sayısı': len(result['missing']),
+                'Benzer Eşleşme': len(result.get('fuzzy_matches') or []),
+                'Durum': 'Tamamlandı' if result['success'] else f"Hata: {result['error']}",
+                'Çıktılar': "; ".join(result['saved_files']),
+            })
+            detail_rows.extend(
+                {'Araç': vehicle_num, 'Plasiyer': driver_name, 'Cari Ünvan': unvan}
+                for unvan in result['missing']
+            )
+            match_rows.extend(
+                {'Araç': vehicle_num, 'Plasiyer': driver_name, 'Eski Ünvan': match['eski'],
+                 'Yeni Ünvan': match['yeni'], 'Benzerlik': match['skor'], 'Kaynak': match['kaynak']}
+                for match in result.get('fuzzy_matches') or []
+            )
+        
+        for file_path in unmatched_old:
+            summary_rows.append({'Eski Dosya': Path(file_path).name, 'Durum': 'Eşleşen yeni dosya yok'})
+        for file_path in unmatched_new:
+            summary_rows.append({'Yeni Dosya': Path(file_path).name, 'Durum': 'Eşleşen eski dosya yok'})
+        
+        summary_columns = ['Araç', 'Plasiyer', 'Eski Dosya', 'Yeni Dosya', 'Eski Müşteri Sayısı',
+                           'Eksik Müşteri Sayısı', 'Benzer Eşleşme', 'Durum', 'Çıktılar']
+        summary_path = output_dir / f"{BATCH_SUMMARY_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        
+        try:
+            with pd.ExcelWriter(summary_path, engine='openpyxl') as writer:
+                pd.DataFrame(summary_rows, columns=summary_columns).to_excel(writer, sheet_name='Özet', index=False)
+                pd.DataFrame(detail_rows, columns=['Araç', 'Plasiyer', 'Cari Ünvan']).to_excel(
+                    writer, sheet_name='Eksik Müşteriler', index=False
+                )
+                if match_rows:
+                    pd.DataFrame(match_rows).to_excel(writer, sheet_name=FUZZY_SHEET_NAME, index=False)
+            logging.info(f"Toplu karşılaştırma özeti kaydedildi: {summary_path}")
+            return str(summary_path)
+        except Exception as e:
+            logging.error(f"Toplu karşılaştırma özeti kaydedilemedi: {e}")
+            return None
+    
+    def compare_folders_thread(self, old_dir: str, new_dir: str, output_dir: Optional[str] = None) -> None:
+        """Toplu karşılaştırmayı ayrı thread'de çalıştır ve sonucu UI'a yansıt"""
+        try:
+            self.clear_results()
+            
+            save_excel = self.ui.save_excel.get() if self.ui else True
+            save_image = self.ui.save_image.get() if self.ui else False
+            progress = getattr(self.ui, 'update_batch_progress', None) if self.ui else None
+            
+            batch = self.compare_folders(old_dir, new_dir, output_dir,
+                                         save_excel=save_excel, save_image=save_image,
+                                         progress_callback=progress)
+            
+            lines = []
+            for result in batch['results']:
+                driver_name = self.vehicle_drivers.get(result['vehicle_num'], "")
+                label = f"Araç {result['vehicle_num']} - {driver_name}" if driver_name else f"Araç {result['vehicle_num']}"
+                if result['success']:
+                    lines.append(f"{label}: {len(result['missing'])} / {result['total_count']} eksik müşteri")
+                else:
+                    lines.append(f"{label}: HATA - {result['error']}")
+            for file_path in batch['unmatched_old'] + batch['unmatched_new']:
+                lines.append(f"Eşleşmedi: {Path(file_path).name}")
+            
+            status_text = (f"{len(batch['results'])} araç karşılaştırıldı "
+                           f"({batch['elapsed']:.1f} sn). Özet: {batch['summary_path'] or 'kaydedilemedi'}")
+            if self.pending_fuzzy_matches:
+                status_text += f" {len(self.pending_fuzzy_matches)} benzer ünvan eşleşmesi onay bekliyor."
+            if self.ui:
+                self.ui.update_results(lines, status_text)
+                message = f"Toplu karşılaştırma tamamlandı.\n\nÇıktı klasörü:\n{batch['output_dir']}"
+                self.ui.root.after(0, lambda m=message: self.ui.show_info("Başarılı", m))
+        except Exception as e:
+            logging.error(f"Toplu karşılaştırma hatası: {e}")
+            if self.ui:
+                error_message = f"Toplu karşılaştırma sırasında hata oluştu: {e}"
+                self.ui.root.after(0, lambda msg=error_message: self.ui.show_error("Hata", msg))
+        finally:
+            if self.ui:
+                self.ui.root.after(0, self.ui.reset_ui)
+    
+    def compare_folders_async(self, old_dir: str, new_dir: str, output_dir: Optional[str] = None) -> None:
+        """Toplu karşılaştırmayı arka planda başlat"""
+        thread = threading.Thread(target=self.compare_folders_thread, 
+                                  args=(old_dir, new_dir, output_dir), daemon=True)
+        thread.start()
+
+
+# =============================================================================
+# TOPLU KARŞILAŞTIRMA İŞÇİLERİ (süreç havuzunda çalışır, Tk kullanmaz)
+# =============================================================================
+
+def _batch_sniff_job(job: Tuple[str, Dict[str, str]]) -> Tuple[str, Optional[str]]:
+    """Dosyanın araç numarasını bulur"""
+    file_path, vehicle_drivers = job
+    logic = ExcelComparisonLogic(headless=True, vehicle_drivers=vehicle_drivers)
+    return file_path, logic.find_vehicle_for_file(file_path)
+
+
+def _batch_compare_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Tek araç çiftini karşılaştırır"""
+    logic = ExcelComparisonLogic(headless=True, vehicle_drivers=job['vehicle_drivers'])
+    logic.case_sensitive.set(job['case_sensitive'])
+    logic.fuzzy_matching.set(job['fuzzy_matching'])
+    # Depolara eşzamanlı yazılmasın - ana süreç kaydeder
+    logic.record_snapshots = False
+    result = logic.run_comparison(job['file1'], job['file2'], job['output_path'],
+                                  save_excel=job['save_excel'], save_image=job['save_image'])
+    result['vehicle_num'] = job['vehicle_num']
+    return result
+
+
+def _run_batch_jobs(func: Callable[[Any], Any],
+                    jobs: List[Any],
+                    max_workers: Optional[int] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None) -> List[Any]:
+    """
+    İşleri süreç havuzunda çalıştırır; havuz kullanılamazsa sırayla çalıştırır.
+    
+    Excel okuma ve grafik çizimi GIL'e bağlı olduğundan thread yerine süreç kullanılır.
+    """
+    if not jobs:
+        return []
+    
+    workers = max(1, min(len(jobs), max_workers or os.cpu_count() or 1))
+    
+    def report(done: int) -> None:
+        if progress_callback:
+            try:
+                progress_callback(done, len(jobs))
+            except Exception:
+                pass
+    
+    if workers > 1:
+        try:
+            results: List[Any] = [None] * len(jobs)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(func, job): i for i, job in enumerate(jobs)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    report(done)
+            return results
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            logging.warning(f"Süreç havuzu kullanılamadı, sıralı çalışılıyor: {e}")
+    
+    results = []
+    for job in jobs:
+        results.append(func(job))
+        report(len(results))
+    return results
 
 
 class ExcelComparisonApp:
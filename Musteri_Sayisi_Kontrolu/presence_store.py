@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Musteri_Sayisi_Kontrolu - Müşteri Varlık Anlık Görüntü Deposu
+
+Her işlenen müşteri listesi araç + tarih bazında anlık görüntü olarak saklanır.
+Cari ünvanlar sözlükle tamsayı kimliklere çevrilir; her anlık görüntü
+sıkıştırılmış bit dizisi (np.packbits) olarak tutulur. Kaybedilen, yeni, geri
+dönen ve sürekli müşteriler N anlık görüntü üzerinde bit işlemleriyle bulunur.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .fuzzy_matcher import turkce_casefold
+except ImportError:
+    try:
+        from Musteri_Sayisi_Kontrolu.fuzzy_matcher import turkce_casefold
+    except ImportError:
+        from fuzzy_matcher import turkce_casefold
+
+STORE_DIR_NAME = "musteri_anlik_goruntuleri"
+DICTIONARY_FILE = "sozluk.json"
+INDEX_FILE = "anlik_goruntuler.json"
+STORE_VERSION = 1
+
+DateLike = Union[str, date, datetime]
+
+
+def _default_store_dir() -> Path:
+    """Depo dizini - uygulama data/ dizini, yoksa modül dizini"""
+    try:
+        from shared.utils import get_data_dir
+        return get_data_dir() / STORE_DIR_NAME
+    except Exception:
+        return Path(__file__).parent / STORE_DIR_NAME
+
+
+def normalize_customer(name: str) -> str:
+    """Karşılaştırma anahtarı - boşluklar sadeleşir, Türkçe büyük/küçük harf duyarsız"""
+    return turkce_casefold(name)
+
+
+def _to_iso_date(value: DateLike) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return pd.Timestamp(value).date().isoformat()
+
+
+def _atomic_write_json(path: Path, data: Dict) -> None:
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(temp_path, path)
+
+
+class CustomerPresenceStore:
+    """
+    Araç × tarih müşteri varlık anlık görüntüleri.
+
+    Sözlük yalnızca büyür; eski anlık görüntüler yüklenirken yeni kimlikler
+    için sıfırla doldurulur. Tüm sorgular (anlık görüntü × müşteri) boolean
+    matrisi üzerinde vektörel çalışır.
+    """
+
+    def __init__(self, root_dir: Optional[Union[str, Path]] = None):
+        self.root_dir = Path(root_dir) if root_dir else _default_store_dir()
+        self._lock = threading.RLock()
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._snapshots: Dict[str, Dict] = {}
+        self._bitmaps: Dict[str, np.ndarray] = {}
+        self._loaded = False
+
+    #region Kalıcılık
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        try:
+            with open(self.root_dir / DICTIONARY_FILE, 'r', encoding='utf-8') as f:
+                self._names = list(json.load(f).get('names', []))
+            with open(self.root_dir / INDEX_FILE, 'r', encoding='utf-8') as f:
+                self._snapshots = dict(json.load(f).get('snapshots', {}))
+        except FileNotFoundError:
+            self._names, self._snapshots = [], {}
+        except (OSError, ValueError) as e:
+            logging.error(f"Anlık görüntü deposu okunamadı: {e}")
+            self._names, self._snapshots = [], {}
+
+        # Eski sürümde ayrı kaydedilmiş ünvanlar aynı anahtara düşerse ilk kimlik kullanılır
+        self._ids = {}
+        for i, name in enumerate(self._names):
+            self._ids.setdefault(normalize_customer(name), i)
+
+    def _save_index(self, dictionary_changed: bool = False) -> None:
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        if dictionary_changed:
+            _atomic_write_json(self.root_dir / DICTIONARY_FILE, {'version': STORE_VERSION, 'names': self._names})
+        _atomic_write_json(self.root_dir / INDEX_FILE, {'version': STORE_VERSION, 'snapshots': self._snapshots})
+
+    @staticmethod
+    def snapshot_id(vehicle: str, snapshot_date: DateLike) -> str:
+        return f"{vehicle}_{_to_iso_date(snapshot_date)}"
+    #endregion
+
+    #region Kayıt
+    def _encode(self, names: Iterable[str]) -> np.ndarray:
+        """Ünvanları kimliklere çevirir (yeni ünvanlar sözlüğe eklenir)"""
+        ids = []
+        for name in names:
+            if name is None:
+                continue
+            key = normalize_customer(name)
+            if not key:
+                continue
+            customer_id = self._ids.get(key)
+            if customer_id is None:
+                customer_id = len(self._names)
+                self._ids[key] = customer_id
+                self._names.append(" ".join(str(name).split()))
+            ids.append(customer_id)
+        return np.asarray(ids, dtype=np.int64)
+
+    def add_snapshot(self,
+                     vehicle: str,
+                     snapshot_date: DateLike,
+                     names: Iterable[str],
+                     source: Optional[str] = None) -> str:
+        """
+        Müşteri listesini anlık görüntü olarak kaydeder (aynı araç + tarih güncellenir).
+
+        Returns:
+            Anlık görüntü kimliği
+        """
+        vehicle = str(vehicle)
+        iso_date = _to_iso_date(snapshot_date)
+        snapshot_id = self.snapshot_id(vehicle, iso_date)
+
+        with self._lock:
+            self._load()
+            dictionary_size = len(self._names)
+            ids = self._encode(names)
+            bitmap = np.zeros(len(self._names), dtype=bool)
+            bitmap[ids] = True
+
+            self.root_dir.mkdir(parents=True, exist_ok=True)
+            bitmap_file = f"{snapshot_id}.npy"
+            np.save(self.root_dir / bitmap_file, np.packbits(bitmap))
+
+            self._snapshots[snapshot_id] = {
+                'vehicle': vehicle,
+                'date': iso_date,
+                'size': int(len(bitmap)),
+                'count': int(bitmap.sum()),
+                'file': bitmap_file,
+                'source': str(source) if source else None,
+                'updated': datetime.now().isoformat(),
+            }
+            self._bitmaps[snapshot_id] = bitmap
+            self._save_index(dictionary_changed=len(self._names) != dictionary_size)
+
+        logging.info(f"Müşteri anlık görüntüsü kaydedildi: {snapshot_id} ({int(bitmap.sum())} müşteri)")
+        return snapshot_id
+
+    def delete_snapshot(self, snapshot_id: str) -> bool:
+        with self._lock:
+            self._load()
+            meta = self._snapshots.pop(snapshot_id, None)
+            if meta is None:
+                return False
+            self._bitmaps.pop(snapshot_id, None)
+            try:
+                (self.root_dir / meta['file']).unlink()
+            except OSError:
+                pass
+            self._save_index()
+            return True
+    #endregion
+
+    #region Sorgular
+    def snapshots(self,
+                  vehicle: Optional[str] = None,
+                  start: Optional[DateLike] = None,
+                  end: Optional[DateLike] = None) -> List[Dict]:
+        """Anlık görüntü kayıtları (tarihe göre sıralı)"""
+        start_iso = _to_iso_date(start) if start is not None else None
+        end_iso = _to_iso_date(end) if end is not None else None
+
+        with self._lock:
+            self._load()
+            items = [dict(meta, id=snapshot_id) for snapshot_id, meta in self._snapshots.items()]
+
+        items = [
+            item for item in items
+            if (vehicle is None or item['vehicle'] == str(vehicle))
+            and (start_iso is None or item['date'] >= start_iso)
+            and (end_iso is None or item['date'] <= end_iso)
+        ]
+        return sorted(items, key=lambda item: (item['date'], item['vehicle']))
+
+    def vehicles(self) -> List[str]:
+        with self._lock:
+            self._load()
+            return sorted({meta['vehicle'] for meta in self._snapshots.values()})
+
+    def _bitmap(self, snapshot_id: str) -> np.ndarray:
+        bitmap = self._bitmaps.get(snapshot_id)
+        if bitmap is None:
+            meta = self._snapshots[snapshot_id]
+            packed = np.load(self.root_dir / meta['file'])
+            bitmap = np.unpackbits(packed, count=meta['size']).astype(bool)
+            self._bitmaps[snapshot_id] = bitmap
+        return bitmap
+
+    def matrix(self, snapshot_ids: List[str]) -> np.ndarray:
+        """(anlık görüntü × müşteri) boolean varlık matrisi"""
+        with self._lock:
+            self._load()
+            result = np.zeros((len(snapshot_ids), len(self._names)), dtype=bool)
+            for row, snapshot_id in enumerate(snapshot_ids):
+                bitmap = self._bitmap(snapshot_id)
+                result[row, :len(bitmap)] = bitmap
+            return result
+
+    def names(self, mask: np.ndarray) -> List[str]:
+        """Maskedeki müşteri ünvanları (sözlük sırasıyla)"""
+        with self._lock:
+            return [self._names[i] for i in np.flatnonzero(mask)]
+
+    def compare(self, old_id: str, new_id: str) -> Dict[str, List[str]]:
+        """İki anlık görüntü arasında kaybedilen / yeni / ortak müşteriler"""
+        old, new = self.matrix([old_id, new_id])
+        return {
+            'kaybedilen': self.names(old & ~new),
+            'yeni': self.names(new & ~old),
+            'ortak': self.names(old & new),
+        }
+
+    def presence_summary(self,
+                         vehicle: Optional[str] = None,
+                         start: Optional[DateLike] = None,
+                         end: Optional[DateLike] = None,
+                         snapshot_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        Bir aracın N anlık görüntüsü üzerinde müşteri kümeleri.
+
+        Farklı araçların görüntüleri tek zaman çizgisine karıştırılmaz:
+        snapshot_ids verilmezse vehicle zorunludur, verilirse hepsi aynı
+        araca ait olmalıdır.
+
+        Raises:
+            ValueError: Araç belirtilmemiş veya görüntüler birden çok araca ait
+
+        Returns:
+            surekli: Tüm anlık görüntülerde var
+            kaybedilen: İlk anlık görüntüde var, sonuncuda yok
+            yeni: İlk anlık görüntüde yok, sonuncuda var
+            geri_donen: Bir süre yokken tekrar görülen
+            hic_gorulen: En az bir anlık görüntüde var
+        """
+        if snapshot_ids is None:
+            if vehicle is None:
+                raise ValueError("Araç belirtilmeden anlık görüntü özeti çıkarılamaz")
+            snapshot_ids = [item['id'] for item in self.snapshots(vehicle, start, end)]
+        else:
+            with self._lock:
+                self._load()
+                vehicles = {self._snapshots[snapshot_id]['vehicle'] for snapshot_id in snapshot_ids}
+            if len(vehicles) > 1:
+                raise ValueError(f"Anlık görüntüler birden çok araca ait: {', '.join(sorted(vehicles))}")
+        if not snapshot_ids:
+            return {key: [] for key in ('surekli', 'kaybedilen', 'yeni', 'geri_donen', 'hic_gorulen')}
+
+        presence = self.matrix(snapshot_ids)
+        first, last = presence[0], presence[-1]
+
+        # Geri dönen: önceden görülmüş, bir önceki anlık görüntüde yok, şimdi var
+        seen_before = np.logical_or.accumulate(presence, axis=0)[:-1]
+        returning = (presence[1:] & ~presence[:-1] & seen_before).any(axis=0)
+
+        return {
+            'surekli': self.names(presence.all(axis=0)),
+            'kaybedilen': self.names(first & ~last),
+            'yeni': self.names(last & ~first),
+            'geri_donen': self.names(returning),
+            'hic_gorulen': self.names(presence.any(axis=0)),
+        }
+
+    def transitions(self, vehicle: str,
+                    start: Optional[DateLike] = None,
+                    end: Optional[DateLike] = None) -> pd.DataFrame:
+        """Ardışık anlık görüntüler arasındaki müşteri hareketleri"""
+        items = self.snapshots(vehicle, start, end)
+        if not items:
+            return pd.DataFrame(columns=['Tarih', 'Müşteri Sayısı', 'Kaybedilen', 'Yeni', 'Geri Dönen'])
+
+        presence = self.matrix([item['id'] for item in items])
+        previous = np.vstack([np.zeros((1, presence.shape[1]), dtype=bool), presence[:-1]])
+        seen_before = np.vstack([np.zeros((1, presence.shape[1]), dtype=bool),
+                                 np.logical_or.accumulate(presence, axis=0)[:-1]])
+
+        return pd.DataFrame({
+            'Tarih': [item['date'] for item in items],
+            'Müşteri Sayısı': presence.sum(axis=1),
+            'Kaybedilen': (previous & ~presence).sum(axis=1),
+            'Yeni': (presence & ~seen_before).sum(axis=1),
+            'Geri Dönen': (presence & ~previous & seen_before).sum(axis=1),
+        })
+    #endregion
+
+
+_default_store: Optional[CustomerPresenceStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_presence_store() -> CustomerPresenceStore:
+    """Uygulama genelinde paylaşılan anlık görüntü deposu"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CustomerPresenceStore()
+        return _default_store
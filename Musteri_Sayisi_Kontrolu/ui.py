@@ -14,7 +14,15 @@ import sys
 import platform
 import logging
 from pathlib import Path
-from typing import Optional, Dict, List, Callable, TYPE_CHECKING
+from typing import Optional, Dict, List, Any, Callable, TYPE_CHECKING
+
+try:
+    from .image_renderer import format_fuzzy_match
+except ImportError:
+    try:
+        from Musteri_Sayisi_Kontrolu.image_renderer import format_fuzzy_match
+    except ImportError:
+        from image_renderer import format_fuzzy_match
 
 if TYPE_CHECKING:
     from main import ExcelComparisonLogic
@@ -504,6 +512,15 @@ class ModernExcelComparisonUI:
         )
         case_check.pack(anchor=tk.W, pady=2)
         
+        # Benzer ünvan eşleştirme seçeneği
+        fuzzy_check = ttk.Checkbutton(
+            content_frame,
+            text="Benzer Ünvanları Eşleştir",
+            variable=self.app_logic.fuzzy_matching,
+            style='Small.TCheckbutton'
+        )
+        fuzzy_check.pack(anchor=tk.W, pady=2)
+        
         # Kaydetme formatı
         tk.Label(
             content_frame,
@@ -563,6 +580,15 @@ class ModernExcelComparisonUI:
         )
         settings_btn.pack(fill=tk.X, pady=(0, 6))
         
+        # Benzer ünvan eşleşmelerini onayla / onayı kaldır
+        fuzzy_btn = ttk.Button(
+            button_frame,
+            text="🔗 Benzer Eşleşmeler",
+            command=self._review_fuzzy_matches,
+            style='Small.TButton'
+        )
+        fuzzy_btn.pack(fill=tk.X, pady=(0, 6))
+        
         # Temizle butonu
         clear_btn = ttk.Button(
             button_frame,
@@ -580,6 +606,14 @@ class ModernExcelComparisonUI:
             logging.error(f"Vehicle settings error: {e}")
             self.show_error("Hata", f"Ayarlar açılamadı: {e}")
         
+    def _review_fuzzy_matches(self) -> None:
+        """Benzer ünvan eşleşmeleri onay dialog'u"""
+        try:
+            self.app_logic.review_fuzzy_matches()
+        except Exception as e:
+            logging.error(f"Fuzzy match review error: {e}")
+            self.show_error("Hata", f"Eşleşmeler açılamadı: {e}")
+        
     def _safe_compare_files(self) -> None:
         """Güvenli dosya karşılaştırma"""
         try:
@@ -770,8 +804,9 @@ class ModernExcelComparisonUI:
             logging.error(f"File2 browse error: {e}")
             self.show_error("Hata", f"Dosya seçim hatası: {e}")
             
-    def update_results(self, results: List[str], status_text: str) -> None:
-        """Sonuçları güncelle - Thread-safe"""
+    def update_results(self, results: List[str], status_text: str,
+                       fuzzy_matches: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Sonuçları güncelle - Thread-safe (eşleşen benzer ünvanlar ayrı bölümde)"""
         def _update():
             try:
                 if self.result_tree:
@@ -784,6 +819,12 @@ class ModernExcelComparisonUI:
                         # Çok uzun ünvanları kısalt
                         display_unvan = unvan if len(str(unvan)) <= 50 else str(unvan)[:47] + "..."
                         self.result_tree.insert("", tk.END, values=(i, display_unvan))
+                    
+                    # Eksik listesinden çıkarılan benzer ünvanlar
+                    if fuzzy_matches:
+                        self.result_tree.insert("", tk.END, values=("", "── Eşleşen benzer ünvanlar ──"))
+                        for i, match in enumerate(fuzzy_matches, 1):
+                            self.result_tree.insert("", tk.END, values=(f"≈{i}", format_fuzzy_match(match)))
                         
                     # Durum metnini güncelle
                     if self.status_var:
@@ -45,7 +45,7 @@ import tkinter as tk
 import json
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from main import ExcelComparisonLogic
@@ -62,6 +62,14 @@ if str(_current_dir) not in sys.path:
 if str(_parent_dir) not in sys.path:
     sys.path.insert(0, str(_parent_dir))
 
+try:
+    from .image_renderer import format_fuzzy_match
+except ImportError:
+    try:
+        from Musteri_Sayisi_Kontrolu.image_renderer import format_fuzzy_match
+    except ImportError:
+        from image_renderer import format_fuzzy_match
+
 # =============================================================================
 # RENKLER VE SABITLER - YERLEŞIK TANIMLAR (HATA ÖNLEME)
 # =============================================================================
@@ -391,6 +399,7 @@ class MusteriTakipApp(ctk.CTkFrame):
         self.result_tree: Optional[ttk.Treeview] = None
         self.status_var: Optional[tk.StringVar] = None
         self.compare_btn: Optional[ctk.CTkButton] = None
+        self.batch_btn: Optional[ctk.CTkButton] = None
         self.progress_bar: Optional[ctk.CTkProgressBar] = None
         self.progress_label: Optional[ctk.CTkLabel] = None
         self.result_count_label: Optional[ctk.CTkLabel] = None
@@ -584,6 +593,19 @@ class MusteriTakipApp(ctk.CTkFrame):
             hover_color=ACCENT_HOVER
         ).pack(anchor="w", pady=(0, 8))
         
+        # Benzer ünvan eşleştirme (LTD. ŞTİ. / LTD STI gibi farklar)
+        ctk.CTkCheckBox(
+            content,
+            text="Benzer Ünvanları Eşleştir",
+            variable=self.app_logic.fuzzy_matching,
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            checkbox_width=20,
+            checkbox_height=20,
+            corner_radius=4,
+            fg_color=ACCENT,
+            hover_color=ACCENT_HOVER
+        ).pack(anchor="w", pady=(0, 8))
+        
         # Kaydetme formatı başlık
         ctk.CTkLabel(
             content,
@@ -636,6 +658,22 @@ class MusteriTakipApp(ctk.CTkFrame):
         )
         self.compare_btn.pack(fill="x", pady=(0, 8))
         
+        # Toplu karşılaştırma - araç başına dosya klasörleri
+        self.batch_btn = ctk.CTkButton(
+            frame,
+            text="📁 Toplu Karşılaştır (Klasör)",
+            height=38,
+            corner_radius=8,
+            fg_color="transparent",
+            border_width=1,
+            border_color=ACCENT,
+            text_color=ACCENT,
+            hover_color=COLORS['hover_light'],
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            command=self._on_batch_compare
+        )
+        self.batch_btn.pack(fill="x", pady=(0, 8))
+        
         # Araç-Plasiyer Ayarları
         ctk.CTkButton(
             frame,
@@ -651,6 +689,21 @@ class MusteriTakipApp(ctk.CTkFrame):
             command=self._on_settings
         ).pack(fill="x", pady=(0, 8))
         
+        # Benzer ünvan eşleşmelerini onayla / onayı kaldır
+        ctk.CTkButton(
+            frame,
+            text="🔗 Benzer Eşleşmeler",
+            height=38,
+            corner_radius=8,
+            fg_color="transparent",
+            border_width=1,
+            border_color=ACCENT,
+            text_color=ACCENT,
+            hover_color=COLORS['hover_light'],
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            command=self._on_fuzzy_matches
+        ).pack(fill="x", pady=(0, 8))
+        
         # Temizle
         ctk.CTkButton(
             frame,
@@ -850,6 +903,28 @@ class MusteriTakipApp(ctk.CTkFrame):
         # İşlemi başlat
         self.app_logic.compare_files()
     
+    def _on_batch_compare(self):
+        """Toplu karşılaştır butonu - eski/yeni araç dosyası klasörleri"""
+        old_dir = filedialog.askdirectory(title="Eski Tarihli Araç Dosyaları Klasörünü Seç")
+        if not old_dir:
+            return
+        
+        new_dir = filedialog.askdirectory(title="Yeni Tarihli Araç Dosyaları Klasörünü Seç")
+        if not new_dir:
+            return
+        
+        if not self.save_excel.get() and not self.save_image.get():
+            messagebox.showwarning("Uyarı", "Lütfen en az bir kaydetme formatı seçin!")
+            return
+        
+        # UI güncelle
+        self.compare_btn.configure(state="disabled", text="⏳ İşleniyor...")
+        self.batch_btn.configure(state="disabled")
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="Araç dosyaları eşleştiriliyor...")
+        
+        self.app_logic.compare_folders_async(old_dir, new_dir)
+    
     def _on_settings(self):
         """Araç-Plasiyer ayarları"""
         try:
@@ -863,6 +938,14 @@ class MusteriTakipApp(ctk.CTkFrame):
             logger.error(f"Settings dialog error: {e}")
             messagebox.showerror("Hata", f"Ayarlar açılamadı: {e}")
     
+    def _on_fuzzy_matches(self):
+        """Benzer ünvan eşleşmeleri onay dialog'u"""
+        try:
+            self.app_logic.review_fuzzy_matches()
+        except Exception as e:
+            logger.error(f"Fuzzy match review error: {e}")
+            messagebox.showerror("Hata", f"Eşleşmeler açılamadı: {e}")
+    
     def _on_clear(self):
         """Temizle butonu"""
         # Dosya yollarını temizle
@@ -906,8 +989,9 @@ class MusteriTakipApp(ctk.CTkFrame):
         
         self.after(0, _do)
     
-    def update_results(self, results: List[str], status_text: str):
-        """Sonuçları güncelle (Logic çağırır)"""
+    def update_results(self, results: List[str], status_text: str,
+                       fuzzy_matches: Optional[List[Dict[str, Any]]] = None):
+        """Sonuçları güncelle (Logic çağırır) - eşleşen benzer ünvanlar ayrı bölümde"""
         def _do():
             try:
                 # Temizle
@@ -919,6 +1003,12 @@ class MusteriTakipApp(ctk.CTkFrame):
                     for i, unvan in enumerate(results, 1):
                         display = str(unvan)[:67] + "..." if len(str(unvan)) > 70 else str(unvan)
                         self.result_tree.insert("", "end", values=(i, display))
+                    
+                    # Eksik listesinden çıkarılan benzer ünvanlar
+                    if fuzzy_matches:
+                        self.result_tree.insert("", "end", values=("", "── Eşleşen benzer ünvanlar ──"))
+                        for i, match in enumerate(fuzzy_matches, 1):
+                            self.result_tree.insert("", "end", values=(f"≈{i}", format_fuzzy_match(match)))
                 
                 # Güncelle
                 if self.result_count_label:
@@ -934,6 +1024,19 @@ class MusteriTakipApp(ctk.CTkFrame):
         
         self.after(0, _do)
     
+    def update_batch_progress(self, done: int, total: int):
+        """Toplu karşılaştırma ilerlemesi (Logic işçi thread'inden çağırır)"""
+        def _do():
+            try:
+                if self.progress_bar and total:
+                    self.progress_bar.set(done / total)
+                if self.progress_label:
+                    self.progress_label.configure(text=f"{done}/{total} araç karşılaştırıldı")
+            except Exception as e:
+                logger.error(f"update_batch_progress error: {e}")
+        
+        self.after(0, _do)
+    
     def reset_ui(self):
         """UI'ı normal duruma getir (Logic çağırır)"""
         try:
@@ -943,6 +1046,8 @@ class MusteriTakipApp(ctk.CTkFrame):
                 self.progress_label.configure(text="Tamamlandı")
             if self.compare_btn:
                 self.compare_btn.configure(state="normal", text="▶ Karşılaştır")
+            if self.batch_btn:
+                self.batch_btn.configure(state="normal")
         except Exception as e:
             logger.error(f"reset_ui error: {e}")
     
@@ -16,20 +16,64 @@ from copy import deepcopy
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# parse_number ile aynı temizlik: rakam, nokta ve eksi dışındaki karakterler
+_NON_NUMERIC_CHARS = r'[^\d.-]'
+
+# Tutar sütunları (hesap/gün/bakiye); kod, ünvan ve kategori sütunları metin kalır
+AMOUNT_KEYWORDS = ('hesap', 'gün', 'bakiye')
+IDENTIFIER_KEYWORDS = ('kod', 'ünvan', 'unvan', 'kategori')
+
+# Dışa aktarılan Excel'de tutar sütunlarının sayı biçimi (binlik ayraçlı, tam sayı)
+EXCEL_AMOUNT_FORMAT = '#,##0'
+
+# Akış (parça parça) işleme: bu boyutun üzerindeki .xlsx dosyaları otomatik akışla işlenir
+STREAMING_FILE_SIZE_MB = 20
+DEFAULT_MEMORY_BUDGET_MB = 512
+MIN_CHUNK_ROWS = 1000
+MAX_CHUNK_ROWS = 50000
+# Ham satırda hücre başına tahmini bellek (Python nesnesi + işaretçi)
+_BYTES_PER_RAW_CELL = 64
+
+# pandas 3'te copy-on-write her zaman açık; 2.x'te ayara bağlı
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
 class ExcelProcessorError(Exception):
     """Excel işleme için özel hata sınıfı"""
     pass
 
 class ExcelProcessor:
-    def __init__(self):
-        self.original_df = None
+    def __init__(self, memory_budget_mb=None):
+        # Ham sayfa tek kopya olarak tutulur ve değiştirilmez; yedek bu kaynağa referanstır
+        self._source_df = None
+        self._source_path = None
         self.processed_df = None
-        self._backup_df = None
+        self.memory_budget_mb = memory_budget_mb or DEFAULT_MEMORY_BUDGET_MB
+    
+    @property
+    def original_df(self):
+        """Okunan ham sayfa (salt okunur kaynak; akış modunda None)"""
+        return self._source_df
+
+    @property
+    def source_path(self):
+        """Son işlenen Excel dosyasının yolu (henüz işlenmediyse None)"""
+        return self._source_path
         
-    def process_excel(self, file_path, progress_callback=None):
+    def process_excel(self, file_path, progress_callback=None, streaming=None):
         """
         Excel dosyasını işle
+        
+        Args:
+            streaming: True ise satırlar parça parça okunur (bkz. process_excel_streaming);
+                None ise STREAMING_FILE_SIZE_MB üzerindeki .xlsx dosyaları için otomatik
         """
+        if streaming is None:
+            path = Path(file_path)
+            streaming = (path.suffix.lower() == '.xlsx' and path.exists()
+                         and path.stat().st_size > STREAMING_FILE_SIZE_MB * 1024 * 1024)
+        if streaming:
+            return self.process_excel_streaming(file_path, progress_callback)
+        
         try:
             # 1. Dosyayı oku ve validate et
             if progress_callback:
@@ -50,9 +94,9 @@ class ExcelProcessor:
             if df.empty:
                 raise ExcelProcessorError("Dosya boş")
             
-            # Orijinal veriyi sakla
-            self.original_df = df.copy()
-            self._backup_df = df.copy()
+            # Orijinal veriyi sakla - kopya yok; sonraki adımlar yeni nesneler üretir
+            self._source_df = df
+            self._source_path = Path(file_path)
             
             # 2. İlk 2 satırı sil
             if progress_callback:
@@ -71,13 +115,7 @@ class ExcelProcessor:
             df = df[1:].reset_index(drop=True)
             
             # Boş sütun adlarını düzelt
-            new_columns = []
-            for i, col in enumerate(df.columns):
-                if pd.isna(col) or str(col).strip() == '':
-                    new_columns.append(f"Sütun_{i+1}")
-                else:
-                    new_columns.append(str(col).strip())
-            df.columns = new_columns
+            df.columns = self._clean_column_names(df.columns)
             
             # 4. Cari Ünvan boş olanları sil
             if progress_callback:
@@ -89,25 +127,28 @@ class ExcelProcessor:
                 progress_callback(0.4, "Kategoriler işleniyor...")
             df = self.process_categories(df)
             
+            # Gün sütunları bir kez float matrisine çevrilir; sonraki adımlar bunu kullanır
+            numeric = self.parse_numeric_columns(df, self._gun_columns(df))
+            
             # 6. 0-7 Gün sonrası boş satırları sil
             if progress_callback:
                 progress_callback(0.5, "Veri olmayan satırlar temizleniyor...")
-            df = self.remove_empty_rows_after_07(df)
+            df, numeric = self._drop_rows_without_aging(df, numeric)
             
             # 7. Tamamen boş sütunları kaldır
             if progress_callback:
                 progress_callback(0.6, "Boş sütunlar kaldırılıyor...")
-            df = self.remove_empty_columns(df)
+            df = self.remove_empty_columns(df, numeric)
             
-            # 8. Diğer Bakiye hesapla - FORMATLAMA YAPMADAN ÖNCE!
+            # 8. Diğer Bakiye hesapla
             if progress_callback:
                 progress_callback(0.7, "Diğer bakiye hesaplanıyor...")
-            df = self.calculate_diger_bakiye(df)
+            df = self.calculate_diger_bakiye(df, numeric)
             
-            # 9. Sayı formatlarını düzenle - EN SON YAPILACAK
+            # 9. Tutar sütunlarını float'a çevir (metin biçimi yalnızca görünümde)
             if progress_callback:
-                progress_callback(0.9, "Sayı formatları düzenleniyor...")
-            df = self.format_all_numbers(df)
+                progress_callback(0.9, "Tutar sütunları sayıya çevriliyor...")
+            df = self.convert_amount_columns(df, numeric)
             
             if progress_callback:
                 progress_callback(1.0, "İşlem tamamlandı!")
@@ -123,6 +164,194 @@ class ExcelProcessor:
             logger.error(f"Beklenmeyen hata: {str(e)}")
             raise ExcelProcessorError(f"İşleme hatası: {str(e)}")
     
+    def process_excel_streaming(self, file_path, progress_callback=None, memory_budget_mb=None):
+        """
+        Büyük dosyalar için sınırlı bellekle işleme.
+        
+        Satırlar openpyxl read_only modunda parça parça okunur; her parçada
+        satır bazlı adımlar (boş ünvan, kategori, yaşlandırma verisi olmayan
+        satırlar, Diğer Bakiye, tutar dönüşümü) uygulanır ve yalnızca kalan
+        satırlar tutulur. Sütun doluluğu parçalar boyunca biriktirilir; boş
+        sütun kaldırma ve kategori sıralaması sonda kalan satırlara uygulanır.
+        Ham sayfanın tamamı hiçbir zaman bellekte bulunmaz.
+        
+        Args:
+            memory_budget_mb: Bellek bütçesi (None ise self.memory_budget_mb)
+        
+        Raises:
+            ExcelProcessorError: Kalan satırlar bütçenin yarısını aşarsa
+                (sondaki birleştirme ikinci bir kopya gerektirir)
+        """
+        budget_bytes = (memory_budget_mb or self.memory_budget_mb) * 1024 * 1024
+        path = Path(file_path)
+        
+        try:
+            if not path.exists():
+                raise ExcelProcessorError("Dosya bulunamadı")
+            if path.suffix.lower() != '.xlsx':
+                raise ExcelProcessorError("Akış modu yalnızca .xlsx dosyalarını destekler")
+            
+            if progress_callback:
+                progress_callback(0.1, "Dosya parça parça okunuyor...")
+            
+            # Akış modunda ham sayfa bellekte tutulmaz; yedek gerektiğinde dosyadan okunur
+            self._source_df = None
+            self._source_path = path
+            
+            retained = []
+            retained_bytes = 0
+            column_flags = {}
+            columns = None
+            total_rows = 0
+            
+            for chunk, expected_rows in self._iter_sheet_chunks(path, budget_bytes):
+                if columns is None:
+                    columns = list(chunk.columns)
+                total_rows += len(chunk)
+                
+                chunk, flags = self._process_chunk(chunk)
+                for col, has_data in flags.items():
+                    column_flags[col] = column_flags.get(col, False) or has_data
+                if chunk.empty:
+                    continue
+                
+                retained.append(chunk)
+                retained_bytes += int(chunk.memory_usage(deep=True).sum())
+                if retained_bytes > budget_bytes / 2:
+                    raise ExcelProcessorError(
+                        f"Bellek bütçesi aşıldı: kalan satırlar {retained_bytes / 1024 / 1024:.0f} MB "
+                        f"(bütçe {budget_bytes / 1024 / 1024:.0f} MB)"
+                    )
+                
+                if progress_callback:
+                    fraction = min(1.0, total_rows / expected_rows) if expected_rows else 0.5
+                    progress_callback(0.1 + 0.7 * fraction, f"{total_rows:,} satır okundu...".replace(',', '.'))
+            
+            if columns is None:
+                raise ExcelProcessorError("Dosyada yeterli satır yok")
+            if not retained:
+                raise ExcelProcessorError("Yaşlandırma verisi olan satır bulunamadı")
+            
+            if progress_callback:
+                progress_callback(0.85, "Parçalar birleştiriliyor...")
+            df = pd.concat(retained, ignore_index=True)
+            del retained
+            
+            # Boş sütunlar (tüm parçalar boyunca) ve kategori sıralaması
+            keep = [col for col in df.columns if column_flags.get(col, True)]
+            if len(keep) < len(df.columns):
+                logger.info(f"{len(df.columns) - len(keep)} boş sütun kaldırıldı")
+                df = df[keep]
+            df = self.sort_by_category(df)
+            
+            if progress_callback:
+                progress_callback(1.0, "İşlem tamamlandı!")
+            
+            self.processed_df = df
+            logger.info(f"Akış modunda işlem tamamlandı: {total_rows} satırdan {len(df)} satır kaldı")
+            return df
+            
+        except ExcelProcessorError:
+            raise
+        except Exception as e:
+            logger.error(f"Beklenmeyen hata: {str(e)}")
+            raise ExcelProcessorError(f"İşleme hatası: {str(e)}")
+    
+    def _iter_sheet_chunks(self, path, budget_bytes):
+        """
+        İlk sayfayı read_only modda okuyup başlıklı DataFrame parçaları üretir.
+        
+        İlk 2 satır atlanır, 3. satır başlıktır (process_excel ile aynı).
+        Parça boyu bütçeye göre seçilir.
+        
+        ERP çıktılarındaki <dimension> bilgisi hatalı olabildiği için sayfa
+        boyutuna güvenilmez: genişlik başlık satırından alınır, toplam satır
+        sayısı bilinmez.
+        
+        Yields:
+            (parça, tahmini toplam veri satırı - bilinmiyorsa None)
+        """
+        from openpyxl import load_workbook
+        
+        try:
+            workbook = load_workbook(path, read_only=True, data_only=True)
+        except Exception as e:
+            raise ExcelProcessorError(f"Dosya okuma hatası: {str(e)}")
+        
+        try:
+            worksheet = workbook.worksheets[0]
+            # Hatalı boyut bilgisi satırları kesmesin (pandas ile aynı)
+            if hasattr(worksheet, 'reset_dimensions'):
+                worksheet.reset_dimensions()
+            rows = worksheet.iter_rows(values_only=True)
+            
+            header = None
+            for index, row in enumerate(rows):
+                if index == 2:
+                    header = list(row)
+                    break
+            if header is None:
+                return
+            
+            width = len(header)
+            if width == 0:
+                return
+            columns = self._clean_column_names(header)
+            
+            expected_rows = None  # max_row <dimension> bilgisinden gelir, güvenilmez
+            chunk_rows = int(budget_bytes * 0.1 / (width * _BYTES_PER_RAW_CELL))
+            chunk_rows = max(MIN_CHUNK_ROWS, min(MAX_CHUNK_ROWS, chunk_rows))
+            
+            buffer = []
+            for row in rows:
+                values = [self._convert_cell(value) for value in row[:width]]
+                if len(values) < width:
+                    values += [None] * (width - len(values))
+                buffer.append(values)
+                if len(buffer) >= chunk_rows:
+                    yield pd.DataFrame(buffer, columns=columns), expected_rows
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=columns), expected_rows
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _convert_cell(value):
+        """pd.read_excel ile aynı: tam sayı değerli float hücreler int olur"""
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+    
+    def _process_chunk(self, chunk):
+        """
+        Bir parçaya satır bazlı temizlik adımlarını uygular.
+        
+        Returns:
+            (kalan satırlar, {sütun: veri var mı}) - doluluk bilgisi tutar
+            dönüşümünden önce, process_excel'deki kurallarla hesaplanır
+        """
+        chunk = self.clean_empty_cari_unvan(chunk)
+        chunk = self.map_categories(chunk)
+        
+        numeric = self.parse_numeric_columns(chunk, self._gun_columns(chunk))
+        chunk, numeric = self._drop_rows_without_aging(chunk, numeric, keep_all_if_empty=False)
+        
+        flags = self._column_has_data(chunk, numeric)
+        chunk = self.calculate_diger_bakiye(chunk, numeric)
+        chunk = self.convert_amount_columns(chunk, numeric)
+        return chunk, flags
+    
+    def _clean_column_names(self, columns):
+        """Boş başlıkları Sütun_N yapar, diğerlerini kırpar"""
+        new_columns = []
+        for i, col in enumerate(columns):
+            if col is None or pd.isna(col) or str(col).strip() == '':
+                new_columns.append(f"Sütun_{i+1}")
+            else:
+                new_columns.append(str(col).strip())
+        return new_columns
+    
     def find_column(self, pattern, columns):
         """Sütun adını güvenli şekilde bul"""
         pattern_lower = pattern.lower()
@@ -163,63 +392,47 @@ class ExcelProcessor:
             logger.error(f"Cari ünvan temizleme hatası: {e}")
             return df
     
-    def process_categories(self, df):
-        """Kategori sütununu işle - DÜZELTİLMİŞ VERSİYON"""
-        # Kategori sütununu bul
-        kategori_col = None
+    def _find_kategori_column(self, df):
+        """İlk kategori sütunu"""
         for col in df.columns:
             if 'kategori' in str(col).lower():
-                kategori_col = col
-                break
+                return col
+        return None
+    
+    def process_categories(self, df):
+        """Kategori sütununu işle - DÜZELTİLMİŞ VERSİYON"""
+        if not self._find_kategori_column(df):
+            logger.warning("Kategori sütunu bulunamadı")
+            return df
         
+        df = self.map_categories(df)
+        df = self.sort_by_category(df)
+        logger.info("Kategori işleme tamamlandı")
+        return df
+    
+    def map_categories(self, df):
+        """Kategori değerlerini ARAÇ numarasına çevir (satır sırası değişmez)"""
+        kategori_col = self._find_kategori_column(df)
         if not kategori_col:
-            logger.warning("Kategori sütunu bulunamadı")
             return df
         
+        # Orijinal değerleri backup'la
+        original_values = df[kategori_col].copy()
+        
         try:
-            # Orijinal değerleri backup'la
-            original_values = df[kategori_col].copy()
-            
-            # Yeni değerler listesi
-            new_values = []
-            for val in df[kategori_col]:
-                if pd.isna(val):
-                    new_values.append(val)
+            # Dönüşüm benzersiz değerler üzerinden yapılıp sütuna eşlenir
+            # (binlerce satırda yalnızca birkaç düzine farklı kategori vardır)
+            mapping = {}
+            for val in original_values.dropna().unique():
+                val_str = str(val)
+                # ARAÇ kelimesi var mı? Varsa numarası, yoksa olduğu gibi
+                if 'ARAÇ' in val_str.upper():
+                    mapping[val] = self.extract_arac_number_safe(val_str)
                 else:
-                    val_str = str(val)
-                    # ARAÇ kelimesi var mı?
-                    if 'ARAÇ' in val_str.upper():
-                        # DÜZELTME: ARAÇ numarasını güvenli şekilde çıkar
-                        arac_num = self.extract_arac_number_safe(val_str)
-                        new_values.append(arac_num)
-                    else:
-                        # ARAÇ yoksa olduğu gibi bırak
-                        new_values.append(val_str)
-            
-            df[kategori_col] = new_values
-            
-            # Sayısal ve sayısal olmayanları ayır ve sırala
-            try:
-                # DÜZELTME: Sayısal dönüşümde daha güvenli yöntem
-                df['_is_numeric'] = pd.to_numeric(df[kategori_col], errors='coerce').notna()
-                df['_numeric_val'] = pd.to_numeric(df[kategori_col], errors='coerce')
-                
-                # Önce sayısallar (küçükten büyüğe), sonra diğerleri
-                df = df.sort_values(
-                    by=['_is_numeric', '_numeric_val', kategori_col],
-                    ascending=[False, True, True],
-                    na_position='last'
-                )
-                
-                # Yardımcı sütunları sil
-                df = df.drop(columns=['_is_numeric', '_numeric_val'])
-                
-            except Exception as sort_error:
-                logger.error(f"Kategori sıralama hatası: {sort_error}")
-                # Sıralama başarısız olursa orijinal sıralamayı koru
-                
-            logger.info("Kategori işleme tamamlandı")
-            return df.reset_index(drop=True)
+                    mapping[val] = val_str
+            
+            df[kategori_col] = original_values.map(mapping)
+            return df
             
         except Exception as e:
             logger.error(f"Kategori işleme hatası: {e}")
@@ -229,6 +442,32 @@ class ExcelProcessor:
             except:
                 pass
             return df
+    
+    def sort_by_category(self, df):
+        """Önce sayısal kategoriler (küçükten büyüğe), sonra diğerleri"""
+        kategori_col = self._find_kategori_column(df)
+        if not kategori_col:
+            return df
+        
+        try:
+            numeric_val = pd.to_numeric(df[kategori_col], errors='coerce')
+            df = df.assign(_is_numeric=numeric_val.notna(), _numeric_val=numeric_val)
+            
+            # Çok sütunlu sıralama kararlıdır: eşit kategoriler dosya sırasını korur
+            df = df.sort_values(
+                by=['_is_numeric', '_numeric_val', kategori_col],
+                ascending=[False, True, True],
+                na_position='last'
+            )
+            
+            # Yardımcı sütunları sil
+            df = df.drop(columns=['_is_numeric', '_numeric_val'])
+            
+        except Exception as sort_error:
+            logger.error(f"Kategori sıralama hatası: {sort_error}")
+            # Sıralama başarısız olursa orijinal sıralamayı koru
+        
+        return df.reset_index(drop=True)
 
     def extract_arac_number_safe(self, text):
         """
@@ -271,6 +510,10 @@ class ExcelProcessor:
         if pd.isna(val) or val == '':
             return 0
         
+        # Excel'den sayı olarak gelen hücreler metne çevrilmeden kullanılır
+        if isinstance(val, (int, float, np.number)) and not isinstance(val, bool):
+            return float(val)
+        
         val_str = str(val).strip()
         if not val_str:
             return 0
@@ -288,89 +531,131 @@ class ExcelProcessor:
             logger.debug(f"Sayı parse edilemedi: {val}")
             return 0
     
-    def remove_empty_rows_after_07(self, df):
+    def parse_number_series(self, series):
+        """
+        parse_number'ın sütun bazlı (vektörel) karşılığı.
+        
+        Metin hücreler pandas string işlemleriyle, sayı hücreler doğrudan
+        dönüştürülür. Boş veya çözülemeyen değerler 0 olur.
+        
+        Returns:
+            float64 numpy dizisi
+        """
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            return pd.to_numeric(series, errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        
+        # Metin olmayan hücreler .str işlemlerinde NaN olur
+        text = series.str.strip() if series.dtype == object or pd.api.types.is_string_dtype(series.dtype) else None
+        if text is None:
+            return np.array([self.parse_number(v) for v in series], dtype=np.float64)
+        
+        is_text = text.notna().to_numpy()
+        cleaned = (text.str.replace('.', '', regex=False)
+                       .str.replace(',', '.', regex=False)
+                       .str.replace(_NON_NUMERIC_CHARS, '', regex=True))
+        result = pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        if not is_text.all():
+            native = pd.to_numeric(series.where(~is_text), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            result = np.where(is_text, result, native)
+        
+        return np.nan_to_num(result, nan=0.0)
+    
+    def parse_numeric_columns(self, df, columns):
+        """Verilen sütunları tek seferde float matrisine çevirir (indeks korunur)"""
+        return pd.DataFrame(
+            {col: self.parse_number_series(df[col]) for col in columns},
+            index=df.index,
+            columns=list(columns)
+        )
+    
+    def _gun_columns(self, df):
+        """Gün (yaşlandırma) sütunları"""
+        return [col for col in df.columns if 'gün' in str(col).lower()]
+    
+    def _numeric_for(self, df, numeric, columns):
+        """Önceden hesaplanmış matristen sütunları al; eksik olanları parse et"""
+        missing = [col for col in columns if numeric is None or col not in numeric.columns]
+        parsed = self.parse_numeric_columns(df, missing)
+        if numeric is None:
+            return parsed
+        present = [col for col in columns if col in numeric.columns]
+        return pd.concat([numeric[present], parsed], axis=1)[list(columns)]
+    
+    def _drop_rows_without_aging(self, df, numeric=None, keep_all_if_empty=True):
+        """
+        0-7 Gün sonrası verisi olmayan satırları df ve sayı matrisinden birlikte siler.
+        
+        Args:
+            keep_all_if_empty: Hiçbir satırda veri yoksa tümünü koru (tüm dosya
+                işlenirken); akış modunda parça bazında False verilir
+        """
+        # Gün sütunlarını bul
+        gun_columns = [col for col in self._gun_columns(df) if '0-7' not in str(col).lower()]
+        
+        if not gun_columns:
+            logger.warning("Gün sütunları bulunamadı")
+            return df, numeric
+        
+        values = self._numeric_for(df, numeric, gun_columns).to_numpy()
+        keep = (values != 0).any(axis=1)
+        
+        if not keep.any() and keep_all_if_empty:
+            return df, numeric
+        
+        removed_count = len(df) - int(keep.sum())
+        if removed_count > 0:
+            logger.info(f"{removed_count} veri olmayan satır silindi")
+        
+        df = df[keep].reset_index(drop=True)
+        if numeric is not None:
+            numeric = numeric[keep].reset_index(drop=True)
+        return df, numeric
+    
+    def remove_empty_rows_after_07(self, df, numeric=None):
         """0-7 Gün sonrası veri olmayan satırları sil"""
         try:
-            rows_to_keep = []
-            
-            # Gün sütunlarını bul
-            gun_columns = []
-            for col in df.columns:
-                col_str = str(col)
-                if 'gün' in col_str.lower() and '0-7' not in col_str.lower():
-                    gun_columns.append(col)
-            
-            if not gun_columns:
-                logger.warning("Gün sütunları bulunamadı")
-                return df
-            
-            initial_count = len(df)
-            
-            for idx, row in df.iterrows():
-                # 0-7 Gün'den sonra veri var mı?
-                has_data = False
-                for col in gun_columns:
-                    val = self.parse_number(row[col])
-                    if val != 0:
-                        has_data = True
-                        break
-                
-                if has_data:
-                    rows_to_keep.append(idx)
-            
-            if rows_to_keep:
-                result_df = df.loc[rows_to_keep].reset_index(drop=True)
-                removed_count = initial_count - len(result_df)
-                if removed_count > 0:
-                    logger.info(f"{removed_count} veri olmayan satır silindi")
-                return result_df
-            
-            return df
-            
+            return self._drop_rows_without_aging(df, numeric)[0]
         except Exception as e:
             logger.error(f"Boş satır silme hatası: {e}")
             return df
     
-    def remove_empty_columns(self, df):
+    def _column_has_data(self, df, numeric=None):
+        """
+        Sütun bazında 'veri var mı' bilgisi (remove_empty_columns kuralları).
+        
+        Returns:
+            {sütun: bool} - Diğer Bakiye ve kritik sütunlar her zaman True
+        """
+        critical_keywords = ['cari', 'ünvan', 'kategori']
+        
+        gun_columns = self._gun_columns(df)
+        gun_has_data = {}
+        if gun_columns:
+            values = self._numeric_for(df, numeric, gun_columns).to_numpy()
+            gun_has_data = dict(zip(gun_columns, (values != 0).any(axis=0)))
+        
+        flags = {}
+        for col in df.columns:
+            col_lower = str(col).lower()
+            
+            # Diğer Bakiye ve kritik sütunlar (cari, ünvan, kategori) her zaman kalsın
+            if 'diğer bakiye' in col_lower or any(keyword in col_lower for keyword in critical_keywords):
+                flags[col] = True
+            elif 'gün' in col_lower:
+                # Gün sütunları: sıfırdan farklı en az bir değer
+                flags[col] = bool(gun_has_data.get(col, False))
+            else:
+                # Diğer sütunlar: boş ve '0' dışında en az bir değer
+                non_empty = df[col].dropna()
+                flags[col] = bool(len(non_empty) > 0 and (~non_empty.astype(str).str.strip().isin(['', '0'])).any())
+        return flags
+    
+    def remove_empty_columns(self, df, numeric=None):
         """Tamamen boş sütunları güvenli şekilde kaldır"""
         try:
-            cols_to_keep = []
-            
-            for col in df.columns:
-                # Diğer Bakiye her zaman kalsın
-                if 'diğer bakiye' in str(col).lower():
-                    cols_to_keep.append(col)
-                    continue
-                
-                # Kritik sütunlar (cari, ünvan, kategori) her zaman kalsın
-                critical_keywords = ['cari', 'ünvan', 'kategori']
-                if any(keyword in str(col).lower() for keyword in critical_keywords):
-                    cols_to_keep.append(col)
-                    continue
-                
-                # Gün sütunları için kontrol
-                if 'gün' in str(col).lower():
-                    has_data = False
-                    for val in df[col]:
-                        if self.parse_number(val) != 0:
-                            has_data = True
-                            break
-                    if has_data:
-                        cols_to_keep.append(col)
-                else:
-                    # Diğer sütunlar
-                    if df[col].notna().any():
-                        non_empty = df[col].dropna()
-                        if len(non_empty) > 0:
-                            # En az bir veri var mı kontrol et
-                            has_real_data = False
-                            for val in non_empty:
-                                val_str = str(val).strip()
-                                if val_str and val_str != '0':
-                                    has_real_data = True
-                                    break
-                            if has_real_data:
-                                cols_to_keep.append(col)
+            flags = self._column_has_data(df, numeric)
+            cols_to_keep = [col for col in df.columns if flags[col]]
             
             removed_count = len(df.columns) - len(cols_to_keep)
             if removed_count > 0:
@@ -382,7 +667,7 @@ class ExcelProcessor:
             logger.error(f"Boş sütun kaldırma hatası: {e}")
             return df
 
-    def calculate_diger_bakiye(self, df):
+    def calculate_diger_bakiye(self, df, numeric=None):
         """Diğer Bakiye hesapla"""
         try:
             # Diğer Bakiye sütunu
@@ -413,20 +698,8 @@ class ExcelProcessor:
                 logger.warning("Toplanacak gün sütunu bulunamadı")
                 return df
             
-            # Her satır için topla
-            diger_values = []
-            for idx in df.index:
-                total = 0
-                for col in sum_cols:
-                    val = df.loc[idx, col]
-                    # Eğer değer var ve boş değilse
-                    if pd.notna(val) and str(val).strip() != '':
-                        num_val = self.parse_number(val)
-                        total += num_val
-                diger_values.append(total)
-            
-            # Diğer Bakiye sütununa yaz - FORMATLANMAMIŞ HALİYLE
-            df[diger_col] = diger_values
+            # Satır toplamları tek matris işlemiyle - FORMATLANMAMIŞ HALİYLE
+            df[diger_col] = self._numeric_for(df, numeric, sum_cols).to_numpy().sum(axis=1)
             
             logger.info(f"Diğer Bakiye {len(sum_cols)} sütundan hesaplandı")
             return df
@@ -435,25 +708,57 @@ class ExcelProcessor:
             logger.error(f"Diğer Bakiye hesaplama hatası: {e}")
             return df
 
-    def format_all_numbers(self, df):
-        """Tüm sayısal sütunları güvenli şekilde formatla"""
+    def is_amount_column(self, col):
+        """Sütun tutar (hesap/gün/bakiye) sütunu mu?"""
+        col_str = str(col).lower()
+        return (any(x in col_str for x in AMOUNT_KEYWORDS)
+                and not any(x in col_str for x in IDENTIFIER_KEYWORDS))
+    
+    def convert_amount_columns(self, df, numeric=None):
+        """
+        Tutar sütunlarını float64'e çevirir.
+        
+        Orijinali boş hücreler NaN kalır (görünümde boş, Excel'de boş hücre);
+        diğer tüm hücreler sayıdır, analiz ve toplama doğrudan kullanabilir.
+        """
+        try:
+            amount_cols = [col for col in df.columns if self.is_amount_column(col)]
+            if not amount_cols:
+                return df
+            
+            values = self._numeric_for(df, numeric, amount_cols).to_numpy(dtype=np.float64, copy=True)
+            values[df[amount_cols].isna().to_numpy()] = np.nan
+            
+            df = df.copy()
+            for i, col in enumerate(amount_cols):
+                df[col] = values[:, i]
+            return df
+            
+        except Exception as e:
+            logger.error(f"Tutar sütunu dönüştürme hatası: {e}")
+            return df
+
+    def format_all_numbers(self, df, numeric=None):
+        """
+        Görünüm katmanı: tutar sütunları Türkçe metne çevrilmiş kopya döndürür.
+        
+        Treeview ve rapor önizlemeleri içindir; işlenmiş veri (processed_df)
+        sayısal kalır.
+        """
         try:
             # DataFrame kopyası oluştur
             formatted_df = df.copy()
             
             for col in formatted_df.columns:
-                col_str = str(col).lower()
-                # Sayısal sütunlar - DİĞER BAKİYE HARİÇ
-                if any(x in col_str for x in ['hesap', 'gün', 'bakiye']) and 'diğer' not in col_str:
-                    try:
-                        formatted_vals = []
-                        for val in formatted_df[col]:
-                            formatted_vals.append(self.format_turkish_number(val))
-                        formatted_df[col] = formatted_vals
-                    except Exception as col_error:
-                        logger.error(f"Sütun {col} formatlanırken hata: {col_error}")
-                        # Hata durumunda orijinal değerleri koru
-                        continue
+                if not self.is_amount_column(col):
+                    continue
+                try:
+                    values = self._numeric_for(df, numeric, [col])[col].to_numpy()
+                    formatted_df[col] = self.format_turkish_numbers(values, df[col].isna().to_numpy())
+                except Exception as col_error:
+                    logger.error(f"Sütun {col} formatlanırken hata: {col_error}")
+                    # Hata durumunda orijinal değerleri koru
+                    continue
             
             return formatted_df
             
@@ -461,6 +766,26 @@ class ExcelProcessor:
             logger.error(f"Sayı formatlama hatası: {e}")
             return df
     
+    def export_excel(self, df, file_path):
+        """
+        İşlenmiş veriyi Excel'e yazar; tutarlar sayı olarak kalır ve
+        binlik ayraçlı sayı biçimiyle gösterilir (Excel'de toplanabilir).
+        """
+        from openpyxl.utils import get_column_letter
+        
+        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False)
+            worksheet = writer.sheets[next(iter(writer.sheets))]
+            
+            for i, col in enumerate(df.columns, start=1):
+                if not self.is_amount_column(col):
+                    continue
+                for (cell,) in worksheet.iter_rows(min_row=2, max_row=len(df) + 1, min_col=i, max_col=i):
+                    cell.number_format = EXCEL_AMOUNT_FORMAT
+                worksheet.column_dimensions[get_column_letter(i)].width = max(12, len(str(col)) + 2)
+        
+        logger.info(f"İşlenmiş veri kaydedildi: {file_path}")
+    
     def format_turkish_number(self, val):
         """Sayıyı güvenli şekilde Türkçe formata çevir"""
         if pd.isna(val):
@@ -483,14 +808,50 @@ class ExcelProcessor:
             logger.debug(f"Sayı formatlama hatası {val}: {e}")
             return str(val)  # Hata durumunda orijinal değeri döndür
     
+    def format_turkish_numbers(self, values, empty_mask=None):
+        """
+        format_turkish_number'ın dizi karşılığı.
+        
+        Yuvarlama vektörel yapılır (round ile aynı: yarımlar çift sayıya);
+        binlik ayraçlı metin yalnızca benzersiz değerler için üretilir.
+        
+        Args:
+            values: float dizisi
+            empty_mask: '' yazılacak (orijinali boş) hücreler
+        """
+        rounded = np.round(np.asarray(values, dtype=np.float64))
+        uniques, inverse = np.unique(rounded, return_inverse=True)
+        labels = np.array([f"{int(v):,}".replace(',', '.') for v in uniques] or [''], dtype=object)
+        result = labels[inverse] if len(uniques) else np.empty(0, dtype=object)
+        
+        result[np.asarray(values) == 0] = '0'
+        if empty_mask is not None:
+            result[empty_mask] = ''
+        return result
+    
     def get_backup_data(self):
-        """Backup verisini döndür"""
-        return self._backup_df
+        """
+        Backup verisini (ham sayfa) döndür.
+        
+        Kaynağın copy-on-write görünümü döner: değiştirilene kadar veri
+        paylaşılır, değişiklikler kaynağa yansımaz. Akış modunda kaynak
+        bellekte olmadığından dosyadan yeniden okunur (önbelleğe alınmaz).
+        """
+        if self._source_df is not None:
+            return self._source_df.copy(deep=not _COPY_ON_WRITE)
+        
+        if self._source_path is not None and self._source_path.exists():
+            try:
+                return pd.read_excel(self._source_path, header=None)
+            except Exception as e:
+                logger.error(f"Backup kaynağı okunamadı: {e}")
+        return None
     
     def restore_from_backup(self):
         """Backup'tan geri yükle"""
-        if self._backup_df is not None:
-            self.processed_df = self._backup_df.copy()
+        backup = self.get_backup_data()
+        if backup is not None:
+            self.processed_df = backup
             logger.info("Veriler backup'tan geri yüklendi")
             return True
         return False
\ No newline at end of file
@@ -62,20 +62,19 @@ class AnalysisOperations:
                     if total_aracs == 0:
                         raise Exception("Analiz edilecek ARAÇ bulunamadı")
                     
-                    # Adım 3: Her ARAÇ için analiz (20% - 80%)
-                    self.current_analysis_results = {}
-                    
-                    for i, arac_no in enumerate(arac_list):
-                        progress = 0.2 + (0.6 * (i / total_aracs))
-                        self.update_progress(progress, f"ARAÇ {arac_no} analiz ediliyor... ({i+1}/{total_aracs})")
-                        
-                        # Tek ARAÇ analizi
-                        analysis_result = self.analysis_engine.analyze_single_arac(arac_no)
-                        if analysis_result:
-                            self.current_analysis_results[str(arac_no)] = analysis_result
-                    
+                    # Adım 3: Tüm ARAÇ'lar tek geçişte analiz edilir (20% - 80%)
+                    self.update_progress(0.3, f"{total_aracs} ARAÇ analiz ediliyor...")
+                    results = self.analysis_engine.analyze_all_aracs()
+                    if not results:
+                        raise Exception("ARAÇ analizi sonuç üretmedi")
+                    self.current_analysis_results = results
+                    total_aracs = len(results)
+
                     # Adım 4: Sonuçları kaydetme (90%)
                     self.update_progress(0.9, "Sonuçlar kaydediliyor...")
+                    if hasattr(self, 'data_manager'):
+                        self.data_manager.record_aging_snapshot(self.current_analysis_results,
+                                                                source=getattr(self, 'file_path', None))
                     
                     # UI güncelleme
                     self.update_progress(0.95, "Arayüz güncelleniyor...")
@@ -206,7 +206,7 @@ class FileOperations:
             
             if save_path:
                 try:
-                    self.processed_df.to_excel(save_path, index=False)
+                    self.processor.export_excel(self.processed_df, save_path)
                     
                     success_msg = f"Dosya kaydedildi:\n{save_path}"
                     if hasattr(self, 'analyze_btn'):
@@ -229,7 +229,7 @@ class FileOperations:
         """Backup'tan geri yükle"""
         try:
             if self.processor.restore_from_backup():
-                self.processed_df = self.processor.get_backup_data()
+                self.processed_df = self.processor.processed_df
                 if self.processed_df is not None:
                     self.display_dataframe(self.processed_df)
                     self.update_stats(self.processed_df, "Geri Yüklenen")
@@ -513,7 +513,8 @@ def create_charts_tab(notebook, gui_instance):
                 "ARAÇ Özet Grafiği",
                 "Yaşlandırma Analizi",
                 "ARAÇ Karşılaştırma", 
-                "İş Yükü Dağılımı"
+                "İş Yükü Dağılımı",
+                "Trend Analizi"
             ],
             variable=gui_instance.chart_type_var,
             command=gui_instance.on_chart_type_change
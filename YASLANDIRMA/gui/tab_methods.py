@@ -614,11 +614,13 @@ class TabMethods:
             return
             
         try:
-            if not self.current_analysis_results:
+            chart_type = self.chart_type_var.get()
+            
+            # Trend grafiği yaşlandırma geçmişinden çizilir, güncel analiz gerekmez
+            if not self.current_analysis_results and chart_type != "Trend Analizi":
                 messagebox.showwarning("Uyarı", "Önce analiz yapılmalıdır")
                 return
             
-            chart_type = self.chart_type_var.get()
             selected_arac = self.chart_arac_dropdown.get()
             
             # Mevcut grafik widget'larını temizle
@@ -652,6 +654,18 @@ class TabMethods:
                 figure = self.visualization_engine.create_workload_distribution_chart(
                     self.current_assignments
                 )
+                
+            elif chart_type == "Trend Analizi":
+                if not hasattr(self, 'data_manager'):
+                    messagebox.showerror("Hata", "Veri yönetimi modülü mevcut değil")
+                    return
+                
+                series = self.data_manager.get_trend_engine().overall_series()
+                if len(series) < 2:
+                    messagebox.showwarning("Uyarı", "Trend için en az iki kayıtlı analiz gerekir")
+                    return
+                
+                figure = self.visualization_engine.create_trend_analysis_chart(series)
             
             if figure is not None:
                 # Grafik gösterimini güncelle
@@ -725,7 +739,8 @@ class TabMethods:
                 "ARAÇ Özet Grafiği": "ARAÇ_Özet",
                 "Yaşlandırma Analizi": "Yaşlandırma_Analizi",
                 "ARAÇ Karşılaştırma": "ARAÇ_Karşılaştırma",
-                "İş Yükü Dağılımı": "İş_Yükü_Dağılımı"
+                "İş Yükü Dağılımı": "İş_Yükü_Dağılımı",
+                "Trend Analizi": "Trend_Analizi"
             }
             
             chart_name = chart_type_names.get(self.chart_type_var.get(), "Grafik")
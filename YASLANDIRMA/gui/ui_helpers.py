@@ -205,23 +205,19 @@ class ThreadedAnalysis:
             if not arac_list:
                 raise Exception("Geçerli ARAÇ numarası bulunamadı")
                 
-            # 3. ARAÇ'ları tek tek analiz et
-            total_aracs = len(arac_list)
-            
-            for i, arac_no in enumerate(arac_list):
-                progress = 20 + (i * 60 / total_aracs)
-                self._send_progress(progress, f"ARAÇ {arac_no} analiz ediliyor...")
-                
-                # Analiz yap
-                result = self.gui.analysis_engine._analyze_single_arac_internal(arac_no)
-                if result:
-                    self.gui.current_analysis_results[str(arac_no)] = result
-                    
-                time.sleep(0.05)  # Progress görünürlüğü için
-                
+            # 3. Tüm ARAÇ'ları tek geçişte analiz et (engine.analysis_results da ayarlanır)
+            self._send_progress(30, f"{len(arac_list)} ARAÇ analiz ediliyor...")
+            results = self.gui.analysis_engine.analyze_all_aracs()
+            if not results:
+                raise Exception("ARAÇ analizi sonuç üretmedi")
+            self.gui.current_analysis_results = results
+            total_aracs = len(results)
+
             # 4. Sonuçları tamamla
             self._send_progress(85, "Sonuçlar hazırlanıyor...")
-            self.gui.analysis_engine.analysis_results = self.gui.current_analysis_results
+            if hasattr(self.gui, 'data_manager'):
+                self.gui.data_manager.record_aging_snapshot(self.gui.current_analysis_results,
+                                                            source=getattr(self.gui, 'file_path', None))
             
             # 5. UI güncellemesi için sinyal gönder
             self._send_progress(95, "Arayüz güncelleniyor...")
@@ -11,8 +11,13 @@ __version__ = "1.0.0"
 # Ana modülleri import et
 try:
     from .analysis import AnalysisEngine
+    from .aging_results import AgingResults
+    from .aging_history import AgingHistoryStore, AgingTrendEngine
+    from .roll_rates import RollRateEngine
     from .assignment import AssignmentManager
     from .data_manager import DataManager
+    from .data_store import ContentStore
+    from .file_cache import FileCache
     from .reports import ReportGenerator
     from .visualization import VisualizationEngine
     from .analysis_gui import AnalysisGUI, create_analysis_gui
@@ -20,8 +25,14 @@ try:
     # Import edilebilen modüller
     __all__ = [
         'AnalysisEngine',
+        'AgingResults',
+        'AgingHistoryStore',
+        'AgingTrendEngine',
+        'RollRateEngine',
         'AssignmentManager', 
         'DataManager',
+        'ContentStore',
+        'FileCache',
         'ReportGenerator',
         'VisualizationEngine',
         'AnalysisGUI',
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel İşleme Uygulaması - Yaşlandırma Geçmişi ve Trend Motoru
+Tarihli ARAÇ / müşteri × yaşlandırma dilimi tutarlarının ekleme-yalnız sütunlu deposu
+"""
+
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Frozen mode için import düzeltmesi
+try:
+    from .aging_results import AgingResults
+except ImportError:
+    try:
+        from YASLANDIRMA.modules.aging_results import AgingResults
+    except ImportError:
+        from aging_results import AgingResults
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE_NAME = "yaslandirma_gecmisi.sqlite"
+
+# AnalysisEngine._get_yaslanding_category kategorileri, yaşlandırma sırasıyla
+BUCKET_ORDER = [
+    'Açık Hesap',
+    '0-7 Gün', '8-14 Gün', '15-21 Gün', '22-28 Gün', '29-35 Gün',
+    '36-42 Gün', '43-49 Gün', '50-56 Gün', '57-63 Gün', '64-70 Gün',
+    '71-77 Gün', '77+ Gün',
+    'Diğer Bakiye', 'Toplam', 'Genel Toplam'
+]
+# Gün dilimleri (vadesi geçmiş bakiyenin yaşı)
+AGED_BUCKETS = [bucket for bucket in BUCKET_ORDER if bucket.endswith(' Gün')]
+DEFAULT_LATE_BUCKET = '29-35 Gün'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_date TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    source TEXT,
+    checksum TEXT NOT NULL,
+    info TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    snapshot_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (snapshot_id, name)
+);
+CREATE INDEX IF NOT EXISTS snapshots_date ON snapshots(snapshot_date, id);
+"""
+
+
+def bucket_sort_key(bucket: str) -> int:
+    try:
+        return BUCKET_ORDER.index(bucket)
+    except ValueError:
+        return len(BUCKET_ORDER)
+
+
+def _encode_array(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return zlib.compress(buffer.getvalue())
+
+
+def _decode_array(data: bytes) -> np.ndarray:
+    return np.load(io.BytesIO(zlib.decompress(data)), allow_pickle=False)
+
+
+def _encode_strings(values: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Metin sütununu sözlükle kodlar: satır kodları, benzersiz değerlerin
+    art arda UTF-8 baytları ve bayt uzunlukları.
+
+    Sabit genişlikli unicode dizisi (<U) her satırı en uzun ünvan kadar
+    4 bayt/karakter tutar; burada her benzersiz ünvan bir kez saklanır.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str), sort=False)
+    encoded = [str(value).encode('utf-8') for value in uniques]
+    lengths = np.fromiter((len(value) for value in encoded), dtype=np.int32, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return codes.astype(np.int32), data, lengths
+
+
+def _decode_strings(codes: np.ndarray, data: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """_encode_strings çıktısından nesne dizisi (satır sırasıyla)"""
+    raw = data.tobytes()
+    offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+    uniques = np.empty(len(lengths), dtype=object)
+    uniques[:] = [raw[start:stop].decode('utf-8') for start, stop in zip(offsets[:-1], offsets[1:])]
+    return uniques[codes]
+
+
+def customer_bucket_matrix(results: AgingResults) -> Tuple[List[str], np.ndarray]:
+    """
+    Müşteri × yaşlandırma dilimi matrisi.
+
+    Değer sütunları AnalysisEngine kategorilerine göre birleştirilir (aynı
+    dilime düşen sütunlar toplanır); dilimler yaşlandırma sırasındadır.
+    """
+    buckets = sorted(dict.fromkeys(results.categories), key=bucket_sort_key)
+    codes = np.array([buckets.index(category) for category in results.categories], dtype=np.intp)
+
+    onehot = np.zeros((len(codes), len(buckets)))
+    onehot[np.arange(len(codes)), codes] = 1.0
+    return buckets, results.values @ onehot
+
+
+def snapshot_columns(results: AgingResults) -> Dict[str, Any]:
+    """
+    AgingResults'tan ARAÇ, ARAÇ × dilim ve müşteri × dilim sütunlarını çıkarır.
+
+    Dilim başına müşteri sayısı o dilimde sıfırdan farklı bakiyesi olan
+    müşterilerdir.
+    """
+    buckets, customer_buckets = customer_bucket_matrix(results)
+    name_codes, name_data, name_lengths = _encode_strings(results.names)
+
+    keys, starts = np.unique(results.arac_numbers, return_index=True)
+    if len(keys):
+        amounts = np.add.reduceat(customer_buckets, starts, axis=0) if len(buckets) else np.zeros((len(keys), 0))
+        counts = np.add.reduceat((customer_buckets != 0).astype(np.int32), starts, axis=0) if len(buckets) \
+            else np.zeros((len(keys), 0), dtype=np.int32)
+        totals = np.add.reduceat(results.totals, starts)
+    else:
+        amounts = np.zeros((0, len(buckets)))
+        counts = np.zeros((0, len(buckets)), dtype=np.int32)
+        totals = np.zeros(0)
+
+    return {
+        'buckets': buckets,
+        'v_arac_no': keys.astype(np.int16),
+        'v_toplam_bakiye': totals.astype(np.float64),
+        'v_musteri_sayisi': np.diff(np.append(starts, len(results.arac_numbers))).astype(np.int32),
+        'b_arac_no': np.repeat(keys, len(buckets)).astype(np.int16),
+        'b_bucket': np.tile(np.arange(len(buckets)), len(keys)).astype(np.int16),
+        'b_amount': amounts.ravel().astype(np.float64),
+        'b_customers': counts.ravel().astype(np.int32),
+        'c_arac_no': results.arac_numbers.astype(np.int16),
+        'c_cari_unvan_codes': name_codes,
+        'c_cari_unvan_utf8': name_data,
+        'c_cari_unvan_lengths': name_lengths,
+        'c_amounts': np.ascontiguousarray(customer_buckets, dtype=np.float64),
+    }
+
+
+class AgingHistoryStore:
+    """
+    Her işlenen yaşlandırma yüklemesinin tarihli özetini saklar.
+
+    Bir anlık görüntü; ARAÇ toplamları, ARAÇ × dilim toplamları ve müşteri ×
+    dilim tutarlarının sütun parçalarıdır (sıkıştırılmış .npy). Kayıtlar
+    yalnızca eklenir; okuma tüm anlık görüntülerin sütunlarını tek sorguda
+    birleştirir.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    #region Yazma
+    def append(self,
+               analysis_results: Any,
+               snapshot_date: Optional[Union[datetime, date, str]] = None,
+               source: Optional[str] = None,
+               skip_duplicate: bool = True) -> Optional[int]:
+        """
+        Analiz sonuçlarının özetini yeni anlık görüntü olarak ekler.
+
+        Args:
+            analysis_results: AgingResults veya eski biçimdeki sonuç sözlüğü
+            snapshot_date: Görüntü tarihi (varsayılan: şimdi)
+            source: Kaynak dosya yolu
+            skip_duplicate: Son görüntüyle aynı içerik ve kaynaksa ekleme
+
+        Returns:
+            Görüntü id'si (atlandıysa son görüntünün id'si), sonuç boşsa None
+        """
+        results = AgingResults.coerce(analysis_results)
+        if len(results.totals) == 0:
+            logger.info("Boş analiz sonucu, geçmişe eklenmedi")
+            return None
+
+        columns = snapshot_columns(results)
+        buckets = columns.pop('buckets')
+        segments = {name: _encode_array(array) for name, array in columns.items()}
+
+        digest = hashlib.sha256(json.dumps(buckets, ensure_ascii=False).encode('utf-8'))
+        for name in sorted(segments):
+            digest.update(columns[name].tobytes())
+        checksum = digest.hexdigest()
+
+        if snapshot_date is None:
+            snapshot_date = datetime.now()
+        if isinstance(snapshot_date, (datetime, date)):
+            snapshot_date = snapshot_date.isoformat(timespec='seconds') if isinstance(snapshot_date, datetime) \
+                else snapshot_date.isoformat()
+        source = str(source) if source else None
+
+        info = {
+            'buckets': buckets,
+            'arac_sayisi': int(len(columns['v_arac_no'])),
+            'musteri_sayisi': int(columns['v_musteri_sayisi'].sum()),
+            'toplam_bakiye': float(columns['v_toplam_bakiye'].sum()),
+        }
+
+        with self._lock, self._connect() as conn:
+            if skip_duplicate:
+                last = conn.execute("SELECT id, checksum, source FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+                if last is not None and last[1] == checksum and last[2] == source:
+                    logger.info("Aynı yaşlandırma verisi zaten geçmişte, yeni görüntü eklenmedi")
+                    return last[0]
+
+            cursor = conn.execute(
+                "INSERT INTO snapshots (snapshot_date, saved_at, source, checksum, info) VALUES (?, ?, ?, ?, ?)",
+                (snapshot_date, datetime.now().isoformat(), source, checksum, json.dumps(info, ensure_ascii=False))
+            )
+            snapshot_id = cursor.lastrowid
+            conn.executemany("INSERT INTO segments (snapshot_id, name, data) VALUES (?, ?, ?)",
+                             [(snapshot_id, name, data) for name, data in segments.items()])
+
+        logger.info(f"Yaşlandırma geçmişine eklendi: #{snapshot_id} ({snapshot_date}, {info['arac_sayisi']} ARAÇ)")
+        return snapshot_id
+    #endregion
+
+    #region Okuma
+    def list_snapshots(self) -> pd.DataFrame:
+        """Görüntü listesi (id, tarih, kaynak, ARAÇ/müşteri sayısı, toplam bakiye)"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, snapshot_date, source, info FROM snapshots "
+                                "ORDER BY snapshot_date, id").fetchall()
+        records = []
+        for snapshot_id, snapshot_date, source, info in rows:
+            info = json.loads(info)
+            records.append({
+                'snapshot_id': snapshot_id,
+                'snapshot_date': pd.Timestamp(snapshot_date),
+                'source': source,
+                'arac_sayisi': info['arac_sayisi'],
+                'musteri_sayisi': info['musteri_sayisi'],
+                'toplam_bakiye': info['toplam_bakiye'],
+            })
+        return pd.DataFrame(records, columns=['snapshot_id', 'snapshot_date', 'source', 'arac_sayisi',
+                                              'musteri_sayisi', 'toplam_bakiye'])
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def _load_segments(self, prefix: str, since: Optional[str], until: Optional[str]):
+        query = ("SELECT s.id, s.snapshot_date, s.info, g.name, g.data FROM snapshots s "
+                 "JOIN segments g ON g.snapshot_id = s.id WHERE substr(g.name, 1, ?) = ?")
+        params: List[Any] = [len(prefix), prefix]
+        if since is not None:
+            query += " AND s.snapshot_date >= ?"
+            params.append(str(since))
+        if until is not None:
+            query += " AND s.snapshot_date <= ?"
+            params.append(str(until))
+        query += " ORDER BY s.snapshot_date, s.id"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        snapshots: Dict[int, Dict] = {}
+        for snapshot_id, snapshot_date, info, name, data in rows:
+            entry = snapshots.setdefault(snapshot_id, {'date': snapshot_date, 'info': json.loads(info)})
+            entry[name[len(prefix):]] = _decode_array(data)
+        return snapshots
+
+    def load_customers(self, snapshot_id: int) -> Optional[pd.DataFrame]:
+        """
+        Tek görüntünün müşteri tablosu: arac_no, cari_unvan + dilim sütunları
+
+        Returns:
+            Tablo veya görüntüde müşteri parçaları yoksa None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT info FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+            segments = dict(conn.execute("SELECT name, data FROM segments WHERE snapshot_id = ? "
+                                         "AND substr(name, 1, 2) = 'c_'", (snapshot_id,)).fetchall())
+        if row is None or not segments:
+            return None
+
+        buckets = json.loads(row[0])['buckets']
+        table = pd.DataFrame(_decode_array(segments['c_amounts']).reshape(-1, len(buckets)), columns=buckets)
+        table.insert(0, 'arac_no', _decode_array(segments['c_arac_no']))
+        if 'c_cari_unvan_codes' in segments:
+            names = _decode_strings(_decode_array(segments['c_cari_unvan_codes']),
+                                    _decode_array(segments['c_cari_unvan_utf8']),
+                                    _decode_array(segments['c_cari_unvan_lengths']))
+        else:
+            # Eski görüntüler: sabit genişlikli unicode dizisi
+            names = _decode_array(segments['c_cari_unvan']).astype(object)
+        table.insert(1, 'cari_unvan', names)
+        return table
+
+    def load_vehicle_totals(self, since: Optional[str] = None, until: Optional[str] = None) -> pd.DataFrame:
+        """Uzun tablo: snapshot_id, snapshot_date, arac_no, toplam_bakiye, musteri_sayisi"""
+        snapshots = self._load_segments('v_', since, until)
+        if not snapshots:
+            return pd.DataFrame(columns=['snapshot_id', 'snapshot_date', 'arac_no', 'toplam_bakiye', 'musteri_sayisi'])
+
+        lengths = [len(entry['arac_no']) for entry in snapshots.values()]
+        return pd.DataFrame({
+            'snapshot_id': np.repeat(list(snapshots), lengths),
+            'snapshot_date': pd.to_datetime(np.repeat([entry['date'] for entry in snapshots.values()], lengths)),
+            'arac_no': np.concatenate([entry['arac_no'] for entry in snapshots.values()]),
+            'toplam_bakiye': np.concatenate([entry['toplam_bakiye'] for entry in snapshots.values()]),
+            'musteri_sayisi': np.concatenate([entry['musteri_sayisi'] for entry in snapshots.values()]),
+        })
+
+    def load_bucket_totals(self, since: Optional[str] = None, until: Optional[str] = None) -> pd.DataFrame:
+        """Uzun tablo: snapshot_id, snapshot_date, arac_no, bucket, amount, customers"""
+        snapshots = self._load_segments('b_', since, until)
+        if not snapshots:
+            return pd.DataFrame(columns=['snapshot_id', 'snapshot_date', 'arac_no', 'bucket', 'amount', 'customers'])
+
+        # Görüntü bazlı dilim kodları ortak bir kategori listesine çevrilir
+        all_buckets = sorted({bucket for entry in snapshots.values() for bucket in entry['info']['buckets']},
+                             key=bucket_sort_key)
+        positions = {bucket: i for i, bucket in enumerate(all_buckets)}
+        codes = [
+            np.array([positions[bucket] for bucket in entry['info']['buckets']], dtype=np.intp)[entry['bucket']]
+            for entry in snapshots.values()
+        ]
+        lengths = [len(entry['arac_no']) for entry in snapshots.values()]
+
+        return pd.DataFrame({
+            'snapshot_id': np.repeat(list(snapshots), lengths),
+            'snapshot_date': pd.to_datetime(np.repeat([entry['date'] for entry in snapshots.values()], lengths)),
+            'arac_no': np.concatenate([entry['arac_no'] for entry in snapshots.values()]),
+            'bucket': pd.Categorical.from_codes(np.concatenate(codes), categories=all_buckets, ordered=True),
+            'amount': np.concatenate([entry['amount'] for entry in snapshots.values()]),
+            'customers': np.concatenate([entry['customers'] for entry in snapshots.values()]),
+        })
+    #endregion
+
+
+class AgingTrendEngine:
+    """
+    Yaşlandırma geçmişinden zaman serileri, dönemsel değişimler ve
+    kötüleşme sıralaması üretir. Tüm hesaplar pivot/groupby ile yapılır.
+    """
+
+    def __init__(self, store: AgingHistoryStore, since: Optional[str] = None, until: Optional[str] = None):
+        self.store = store
+        self.since = since
+        self.until = until
+        self._vehicles: Optional[pd.DataFrame] = None
+        self._buckets: Optional[pd.DataFrame] = None
+
+    def refresh(self) -> None:
+        """Depodan yeniden oku (yeni görüntü eklendikten sonra)"""
+        self._vehicles = None
+        self._buckets = None
+
+    @property
+    def vehicles(self) -> pd.DataFrame:
+        if self._vehicles is None:
+            self._vehicles = self.store.load_vehicle_totals(self.since, self.until)
+        return self._vehicles
+
+    @property
+    def buckets(self) -> pd.DataFrame:
+        if self._buckets is None:
+            self._buckets = self.store.load_bucket_totals(self.since, self.until)
+        return self._buckets
+
+    #region Zaman serileri
+    def overall_series(self) -> pd.DataFrame:
+        """Görüntü tarihi → toplam_bakiye, musteri_sayisi, arac_sayisi"""
+        vehicles = self.vehicles
+        if vehicles.empty:
+            return pd.DataFrame(columns=['toplam_bakiye', 'musteri_sayisi', 'arac_sayisi'])
+        series = vehicles.groupby(['snapshot_date', 'snapshot_id'], sort=True).agg(
+            toplam_bakiye=('toplam_bakiye', 'sum'),
+            musteri_sayisi=('musteri_sayisi', 'sum'),
+            arac_sayisi=('arac_no', 'size'),
+        )
+        return series.droplevel('snapshot_id')
+
+    def vehicle_series(self, value: str = 'toplam_bakiye') -> pd.DataFrame:
+        """Görüntü tarihi × ARAÇ tablosu (value: toplam_bakiye veya musteri_sayisi)"""
+        vehicles = self.vehicles
+        if vehicles.empty:
+            return pd.DataFrame()
+        table = vehicles.pivot_table(index=['snapshot_date', 'snapshot_id'], columns='arac_no',
+                                     values=value, aggfunc='sum', fill_value=0)
+        return table.droplevel('snapshot_id')
+
+    def bucket_series(self, arac_no: Optional[Any] = None, value: str = 'amount') -> pd.DataFrame:
+        """Görüntü tarihi × yaşlandırma dilimi tablosu (tek ARAÇ veya tümü)"""
+        buckets = self.buckets
+        if arac_no is not None:
+            buckets = buckets[buckets['arac_no'] == int(arac_no)]
+        if buckets.empty:
+            return pd.DataFrame()
+        table = buckets.pivot_table(index=['snapshot_date', 'snapshot_id'], columns='bucket',
+                                    values=value, aggfunc='sum', fill_value=0, observed=True)
+        return table.droplevel('snapshot_id')
+    #endregion
+
+    #region Değişimler
+    def rolling_changes(self, periods: int = 1, window: Optional[int] = None,
+                        value: str = 'toplam_bakiye') -> pd.DataFrame:
+        """
+        ARAÇ bazında dönemsel değişim.
+
+        Args:
+            periods: Kaç görüntü öncesiyle karşılaştırılacağı
+            window: Verilirse değerin kayan ortalaması da hesaplanır
+
+        Returns:
+            Uzun tablo: snapshot_date, arac_no, değer, change, pct_change[, rolling_mean]
+        """
+        table = self.vehicle_series(value)
+        if table.empty:
+            return pd.DataFrame(columns=['snapshot_date', 'arac_no', value, 'change', 'pct_change'])
+
+        frames = {
+            value: table,
+            'change': table.diff(periods),
+            'pct_change': table.pct_change(periods, fill_method=None).replace([np.inf, -np.inf], np.nan),
+        }
+        if window:
+            frames['rolling_mean'] = table.rolling(window, min_periods=1).mean()
+
+        stacked = pd.concat({name: frame.stack() for name, frame in frames.items()}, axis=1)
+        stacked.index.names = ['snapshot_date', 'arac_no']
+        return stacked.reset_index()
+
+    def deterioration_ranking(self, periods: int = 1, late_from: str = DEFAULT_LATE_BUCKET,
+                              top: Optional[int] = None) -> pd.DataFrame:
+        """
+        Son görüntüyü ``periods`` görüntü öncesiyle karşılaştırıp ARAÇ'ları
+        geç dilimlerdeki (late_from ve sonrası) bakiye payının artışına göre sıralar.
+
+        Returns:
+            ARAÇ başına geç bakiye / pay (önce, sonra, değişim) ve sıra
+        """
+        columns = ['arac_no', 'gec_bakiye_once', 'gec_bakiye_simdi', 'gec_bakiye_degisim',
+                   'gec_pay_once', 'gec_pay_simdi', 'gec_pay_degisim', 'sira']
+        buckets = self.buckets
+        snapshot_ids = list(dict.fromkeys(buckets['snapshot_id'])) if not buckets.empty else []
+        if len(snapshot_ids) <= periods:
+            return pd.DataFrame(columns=columns)
+
+        late = AGED_BUCKETS[AGED_BUCKETS.index(late_from):] if late_from in AGED_BUCKETS else AGED_BUCKETS[-1:]
+        selected = buckets[buckets['snapshot_id'].isin([snapshot_ids[-1 - periods], snapshot_ids[-1]])]
+        aged = selected[selected['bucket'].isin(AGED_BUCKETS)]
+        is_late = aged['bucket'].isin(late).to_numpy()
+
+        totals = aged.assign(gec=np.where(is_late, aged['amount'], 0.0)).groupby(
+            ['arac_no', 'snapshot_id'], observed=True)[['amount', 'gec']].sum().unstack('snapshot_id', fill_value=0.0)
+
+        before, now = snapshot_ids[-1 - periods], snapshot_ids[-1]
+        late_before = totals['gec'].get(before, 0.0)
+        late_now = totals['gec'].get(now, 0.0)
+        share_before = (late_before / totals['amount'].get(before, 0.0)).replace([np.inf, -np.inf], np.nan).fillna(0.0)
+        share_now = (late_now / totals['amount'].get(now, 0.0)).replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+        ranking = pd.DataFrame({
+            'gec_bakiye_once': late_before,
+            'gec_bakiye_simdi': late_now,
+            'gec_bakiye_degisim': late_now - late_before,
+            'gec_pay_once': share_before,
+            'gec_pay_simdi': share_now,
+            'gec_pay_degisim': share_now - share_before,
+        }).reset_index()
+        ranking = ranking.sort_values(['gec_pay_degisim', 'gec_bakiye_degisim'], ascending=False, kind='stable')
+        ranking['sira'] = np.arange(1, len(ranking) + 1)
+        ranking = ranking.reset_index(drop=True)[columns]
+        return ranking.head(top) if top else ranking
+    #endregion
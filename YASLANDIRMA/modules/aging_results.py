@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel İşleme Uygulaması - Sütunlu Yaşlandırma Sonuçları
+Müşteri × bakiye sütunu sayısal tablo + ARAÇ bazında küçük özetler
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_FORMAT = 'columnar'
+PAYLOAD_VERSION = 1
+
+
+class LazyCustomerDetails(list):
+    """
+    İlk erişimde oluşturulan müşteri detay listesi.
+
+    Bir ARAÇ'ın müşteri satırları ancak ARAÇ açıldığında (liste okunduğunda)
+    sözlüklere çevrilir. Kopyalama ve pickle düz liste üretir.
+    """
+
+    def __init__(self, builder: Callable[[], List[Dict]]):
+        super().__init__()
+        self._builder = builder
+
+    def _materialize(self) -> None:
+        if self._builder is not None:
+            builder, self._builder = self._builder, None
+            super().extend(builder())
+
+    def __reduce_ex__(self, protocol):
+        self._materialize()
+        return (list, (list(super().__iter__()),))
+
+    def __repr__(self) -> str:
+        if self._builder is not None:
+            return "LazyCustomerDetails(<oluşturulmadı>)"
+        return super().__repr__()
+
+
+def _materializing(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._materialize()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ('__len__', '__iter__', '__reversed__', '__getitem__', '__contains__', '__eq__', '__ne__',
+              '__add__', '__iadd__', '__mul__', '__setitem__', '__delitem__', 'append', 'extend',
+              'insert', 'pop', 'remove', 'index', 'count', 'copy', 'sort', 'reverse', 'clear'):
+    setattr(LazyCustomerDetails, _name, _materializing(_name))
+del _name
+
+
+class AgingResults(Mapping):
+    """
+    ARAÇ analiz sonuçlarının sütunlu gösterimi.
+
+    Müşteriler tek bir (müşteri × bakiye sütunu) float64 matrisinde, ARAÇ
+    numarasına göre sıralı tutulur; ARAÇ başına yalnızca toplamlar,
+    yaşlandırma ve istatistikler sözlük olarak saklanır. Sözlük gibi
+    okunur: ``results['3']`` eski biçimdeki analiz sözlüğünü döndürür ve
+    ``musteri_detaylari`` ilk erişimde tablodan oluşturulur.
+    """
+
+    def __init__(self,
+                 aggregates: Dict[str, Dict],
+                 arac_numbers: np.ndarray,
+                 names: np.ndarray,
+                 totals: np.ndarray,
+                 values: np.ndarray,
+                 value_columns: List[str],
+                 categories: Optional[List[str]] = None):
+        """
+        Args:
+            aggregates: ARAÇ no (str) → musteri_detaylari hariç analiz sözlüğü
+            arac_numbers: Satır bazında ARAÇ numarası
+            names: Satır bazında cari ünvan
+            totals: Satır bazında müşteri toplam bakiyesi
+            values: (müşteri × bakiye sütunu) tutar matrisi
+            value_columns: Matris sütun adları
+            categories: Sütunların yaşlandırma kategorileri (bakiye_detay anahtarları)
+        """
+        order = np.argsort(np.asarray(arac_numbers), kind='stable')
+        self.arac_numbers = np.asarray(arac_numbers, dtype=np.int16)[order]
+        self.names = np.asarray(names, dtype=object)[order]
+        self.totals = np.asarray(totals, dtype=np.float64)[order]
+        self.value_columns = [str(col) for col in value_columns]
+        values = np.asarray(values, dtype=np.float64).reshape(len(order), len(self.value_columns))
+        self.values = np.ascontiguousarray(values[order])
+        self.categories = list(categories) if categories is not None else list(self.value_columns)
+        self._aggregates = aggregates
+        self._views: Dict[str, Dict] = {}
+
+        # ARAÇ → [başlangıç, bitiş) satır aralığı
+        keys, starts = np.unique(self.arac_numbers, return_index=True)
+        stops = list(starts[1:]) + [len(self.arac_numbers)]
+        self._slices = {str(int(key)): (int(start), int(stop)) for key, start, stop in zip(keys, starts, stops)}
+
+    #region Mapping arayüzü
+    def __getitem__(self, arac_no: Any) -> Dict:
+        key = str(arac_no)
+        view = self._views.get(key)
+        if view is None:
+            view = dict(self._aggregates[key])
+            view['musteri_detaylari'] = LazyCustomerDetails(lambda: self._build_details(key))
+            self._views[key] = view
+        return view
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._aggregates)
+
+    def __len__(self) -> int:
+        return len(self._aggregates)
+
+    def __repr__(self) -> str:
+        return f"AgingResults({len(self)} ARAÇ, {len(self.totals)} müşteri)"
+
+    def _build_details(self, key: str) -> List[Dict]:
+        start, stop = self._slices.get(key, (0, 0))
+        categories = self.categories
+        return [
+            {
+                'cari_unvan': name,
+                'bakiye_detay': dict(zip(categories, amounts)),
+                'toplam_bakiye': total,
+            }
+            for name, amounts, total in zip(self.names[start:stop].tolist(),
+                                            self.values[start:stop].tolist(),
+                                            self.totals[start:stop].tolist())
+        ]
+    #endregion
+
+    #region Tablo erişimi
+    def customer_table(self, arac_no: Optional[Any] = None) -> pd.DataFrame:
+        """Müşteri × bakiye sütunu tablosu (isteğe bağlı tek ARAÇ)"""
+        start, stop = (0, len(self.totals)) if arac_no is None else self._slices.get(str(arac_no), (0, 0))
+        table = pd.DataFrame(self.values[start:stop], columns=self.value_columns)
+        table.insert(0, 'ARAÇ No', self.arac_numbers[start:stop].astype(str))
+        table.insert(1, 'Cari Ünvan', self.names[start:stop])
+        table.insert(2, 'Toplam Bakiye', self.totals[start:stop])
+        return table
+
+    @property
+    def nbytes(self) -> int:
+        """Sayısal tabloların bellek kullanımı (bayt)"""
+        return int(self.arac_numbers.nbytes + self.totals.nbytes + self.values.nbytes + self.names.nbytes)
+    #endregion
+
+    #region Serileştirme
+    def to_payload(self) -> Dict:
+        """JSON'a yazılabilir sütunlu gösterim"""
+        return {
+            'format': PAYLOAD_FORMAT,
+            'version': PAYLOAD_VERSION,
+            'value_columns': self.value_columns,
+            'categories': self.categories,
+            'aggregates': self._aggregates,
+            'customers': {
+                'arac_no': self.arac_numbers.tolist(),
+                'cari_unvan': self.names.tolist(),
+                'toplam_bakiye': self.totals.tolist(),
+                'values': self.values.T.tolist(),
+            },
+        }
+
+    def to_parts(self) -> Dict[str, Any]:
+        """İkili depo için parçalar: sayısal tablolar numpy dizisi olarak kalır"""
+        return {
+            'meta': {
+                'format': PAYLOAD_FORMAT,
+                'version': PAYLOAD_VERSION,
+                'value_columns': self.value_columns,
+                'categories': self.categories,
+            },
+            'aggregates': self._aggregates,
+            'arac_no': self.arac_numbers,
+            'cari_unvan': self.names.tolist(),
+            'toplam_bakiye': self.totals,
+            'values': self.values,
+        }
+
+    @classmethod
+    def from_parts(cls, parts: Dict[str, Any]) -> 'AgingResults':
+        meta = parts['meta']
+        return cls(
+            aggregates=parts['aggregates'],
+            arac_numbers=parts['arac_no'],
+            names=np.array(parts['cari_unvan'], dtype=object),
+            totals=parts['toplam_bakiye'],
+            values=parts['values'],
+            value_columns=meta['value_columns'],
+            categories=meta.get('categories'),
+        )
+
+    @staticmethod
+    def is_payload(data: Any) -> bool:
+        return isinstance(data, dict) and data.get('format') == PAYLOAD_FORMAT and 'customers' in data
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> 'AgingResults':
+        customers = payload['customers']
+        columns = customers.get('values') or []
+        count = len(customers['toplam_bakiye'])
+        values = np.array(columns, dtype=np.float64).T if columns else np.zeros((count, 0))
+        return cls(
+            aggregates=payload['aggregates'],
+            arac_numbers=np.array(customers['arac_no'], dtype=np.int16),
+            names=np.array(customers['cari_unvan'], dtype=object),
+            totals=np.array(customers['toplam_bakiye'], dtype=np.float64),
+            values=values,
+            value_columns=payload['value_columns'],
+            categories=payload.get('categories'),
+        )
+
+    @classmethod
+    def from_dict(cls, results: Mapping) -> 'AgingResults':
+        """Eski biçimdeki (ARAÇ → musteri_detaylari listeli sözlük) sonuçları çevirir"""
+        aggregates = {}
+        categories: Dict[str, None] = {}
+        rows = []
+        for arac_no, result in results.items():
+            result = dict(result)
+            details = result.pop('musteri_detaylari', None) or []
+            aggregates[str(arac_no)] = result
+            for musteri in details:
+                bakiye_detay = musteri.get('bakiye_detay', {})
+                categories.update(dict.fromkeys(bakiye_detay))
+                rows.append((arac_no, musteri.get('cari_unvan', ''), musteri.get('toplam_bakiye', 0.0), bakiye_detay))
+
+        columns = list(categories)
+        values = np.zeros((len(rows), len(columns)), dtype=np.float64)
+        positions = {category: i for i, category in enumerate(columns)}
+        for row, (_, _, _, bakiye_detay) in enumerate(rows):
+            for category, amount in bakiye_detay.items():
+                values[row, positions[category]] = float(amount or 0.0)
+
+        return cls(
+            aggregates=aggregates,
+            arac_numbers=np.array([int(row[0]) for row in rows], dtype=np.int16),
+            names=np.array([str(row[1]) for row in rows], dtype=object),
+            totals=np.array([float(row[2] or 0.0) for row in rows], dtype=np.float64),
+            values=values,
+            value_columns=columns,
+        )
+
+    @classmethod
+    def coerce(cls, data: Any) -> 'AgingResults':
+        """AgingResults, sütunlu payload veya eski biçimdeki sözlüğü AgingResults'a çevirir"""
+        if isinstance(data, cls):
+            return data
+        if cls.is_payload(data):
+            return cls.from_payload(data)
+        return cls.from_dict(data)
+
+    def checksum(self) -> str:
+        """Tablo baytları ve özetler üzerinden MD5 (ikinci bir JSON dökümü olmadan)"""
+        digest = hashlib.md5()
+        digest.update(self.arac_numbers.tobytes())
+        digest.update(self.totals.tobytes())
+        digest.update(self.values.tobytes())
+        digest.update("\x1f".join(self.names.tolist()).encode('utf-8'))
+        digest.update(json.dumps([self.value_columns, self.categories, self._aggregates],
+                                 sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    #endregion
@@ -21,8 +21,41 @@ except ImportError:
     except ImportError:
         from utils import parse_turkish_number
 
+try:
+    from .aging_results import AgingResults
+except ImportError:
+    try:
+        from YASLANDIRMA.modules.aging_results import AgingResults
+    except ImportError:
+        from aging_results import AgingResults
+
 logger = logging.getLogger(__name__)
 
+# ARAÇ numarası: "01", "[İZMİR ARAÇ 06]", "ARAÇ 6", "06 ARAÇ"
+ARAC_NUMBER_PATTERN = re.compile(r'^(\d+)$|\bARAÇ[\s\-_.:]*(\d+)\b|\b(\d+)[\s\-]*ARAÇ\b')
+ARAC_SKIP_KEYWORDS = ('İZMİR ŞUBE DEPO', 'DEPO', 'MERKEZ', 'GENEL', 'KESİMHANE')
+
+BAKIYE_RANGE_BINS = [-np.inf, 100, 500, 1000, 5000, 10000, np.inf]
+BAKIYE_RANGE_LABELS = ['0-100', '100-500', '500-1000', '1000-5000', '5000-10000', '10000+']
+
+
+def parse_arac_number(value: Any) -> Optional[int]:
+    """Kategori değerinden ARAÇ numarasını çıkar (1-99), bulunamazsa None"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    
+    str_value = str(value).strip().upper()
+    if not str_value or any(keyword in str_value for keyword in ARAC_SKIP_KEYWORDS):
+        return None
+    
+    match = ARAC_NUMBER_PATTERN.search(str_value)
+    if not match:
+        return None
+    
+    arac_no = int(next(group for group in match.groups() if group))
+    return arac_no if 0 < arac_no < 100 else None
+
+
 class AnalysisEngine:
     def __init__(self):
         self.current_data = None
@@ -31,6 +64,7 @@ class AnalysisEngine:
         self.arac_column_name = None
         self.cari_column_name = None
         self.bakiye_columns = []
+        self.arac_numbers = None
         self._validation_cache = {}
     
     def set_data(self, df: pd.DataFrame) -> bool:
@@ -42,6 +76,7 @@ class AnalysisEngine:
             
             self.current_data = self._optimize_dataframe(df.copy())
             self.last_analysis_date = datetime.now()
+            self.arac_numbers = None
             
             # Sütun adlarını tespit et
             self.arac_column_name = self._find_arac_column()
@@ -63,6 +98,9 @@ class AnalysisEngine:
                 logger.error("Bakiye sütunları bulunamadı")
                 return False
             
+            self._coerce_bakiye_columns()
+            self.arac_numbers = self._build_arac_numbers()
+            
             logger.info(f"Analiz veri seti ayarlandı: {len(df)} satır")
             logger.info(f"ARAÇ sütunu: {self.arac_column_name}")
             logger.info(f"Cari sütunu: {self.cari_column_name}")
@@ -90,8 +128,23 @@ class AnalysisEngine:
             logger.warning(f"DataFrame optimizasyon hatası: {e}")
             return df
     
-    def analyze_all_aracs(self) -> Dict:
-        """Tüm ARAÇ'ları analiz et"""
+    def _coerce_bakiye_columns(self) -> None:
+        """
+        Bakiye sütunlarını float'a çevirir.
+        
+        ExcelProcessor çıktısı zaten sayısaldır; metin sütunlar (eski kayıtlar,
+        ham dosyalar) benzersiz değerleri üzerinden bir kez çözülür.
+        """
+        for col in self.bakiye_columns:
+            series = self.current_data[col]
+            if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                self.current_data[col] = pd.to_numeric(series, errors='coerce').fillna(0.0).astype(np.float64)
+            else:
+                parsed = {value: parse_turkish_number(value) for value in series.dropna().unique()}
+                self.current_data[col] = series.map(parsed).astype(np.float64).fillna(0.0)
+    
+    def analyze_all_aracs(self) -> Union[AgingResults, Dict]:
+        """Tüm ARAÇ'ları analiz et (tek groupby geçişi, sütunlu sonuç)"""
         try:
             if self.current_data is None:
                 raise ValueError("Analiz için veri seti ayarlanmamış")
@@ -105,22 +158,9 @@ class AnalysisEngine:
                 logger.warning("Geçerli ARAÇ numarası bulunamadı")
                 return {}
             
-            logger.info(f"Analiz edilecek ARAÇ numaraları: {sorted(arac_numbers)}")
+            logger.info(f"Analiz edilecek ARAÇ numaraları: {arac_numbers}")
             
-            results = {}
-            total_aracs = len(arac_numbers)
-            
-            for i, arac_no in enumerate(arac_numbers):
-                try:
-                    arac_analysis = self._analyze_single_arac_internal(arac_no)
-                    if arac_analysis:
-                        results[str(arac_no)] = arac_analysis
-                        logger.info(f"ARAÇ {arac_no} analizi tamamlandı ({i+1}/{total_aracs}): {arac_analysis['musteri_sayisi']} müşteri")
-                    else:
-                        logger.warning(f"ARAÇ {arac_no} analizi başarısız")
-                except Exception as arac_error:
-                    logger.error(f"ARAÇ {arac_no} analiz hatası: {arac_error}")
-                    continue
+            results = self._analyze_groups()
             
             self.analysis_results = results
             logger.info(f"Toplam {len(results)} ARAÇ analiz edildi")
@@ -293,72 +333,26 @@ class AnalysisEngine:
         except Exception:
             return 999
     
+    def _build_arac_numbers(self) -> pd.Series:
+        """
+        Satır bazında ARAÇ numarası sütununu oluştur (0 = ARAÇ yok).
+        
+        Kategori değerleri benzersizleri üzerinden bir kez çözülür; tüm
+        filtreleme ve gruplama bu sütun üzerinden yapılır.
+        """
+        codes, uniques = pd.factorize(self.current_data[self.arac_column_name])
+        parsed = np.array([parse_arac_number(value) or 0 for value in uniques] + [0], dtype=np.int16)
+        # factorize NaN için -1 döndürür → son eleman (0)
+        return pd.Series(parsed[codes], index=self.current_data.index, name='ARAÇ No')
+    
     def _extract_arac_numbers(self) -> List[int]:
-        """ARAÇ numaralarını çıkar - TAM DÜZELTİLMİŞ"""
+        """Veri setindeki ARAÇ numaraları (sıralı)"""
         try:
-            if not self.arac_column_name:
+            if self.arac_numbers is None:
                 return []
             
-            arac_column = self.current_data[self.arac_column_name]
-            arac_numbers = set()
-            
-            unique_values = arac_column.unique()
-            logger.info(f"ARAÇ sütunundaki unique değerler: {[str(v) for v in unique_values if pd.notna(v)]}")
-            
-            # Geliştirilmiş regex pattern'ler
-            patterns = [
-                r'\[İZMİR ARAÇ (\d+)\]',        # [İZMİR ARAÇ 06] formatı
-                r'İZMİR ARAÇ (\d+)',            # İZMİR ARAÇ 06 formatı
-                r'ARAÇ (\d+)',                  # ARAÇ 06 formatı
-                r'(\d+)\s*ARAÇ',                # 06 ARAÇ formatı
-                r'^(\d+)$',                     # Sadece sayı formatı
-                r'(\d+)(?:\s|$)',               # Sayı + boşluk veya satır sonu
-            ]
-            
-            for value in unique_values:
-                if pd.isna(value):
-                    continue
-                    
-                str_value = str(value).strip().upper()
-                
-                # Özel kategorileri atla
-                skip_keywords = ['İZMİR ŞUBE DEPO', 'DEPO', 'MERKEZ', 'GENEL', 'KESİMHANE']
-                if any(keyword in str_value for keyword in skip_keywords):
-                    logger.debug(f"Özel kategori atlandı: {str_value}")
-                    continue
-                
-                # Önce doğrudan sayı olup olmadığını kontrol et
-                try:
-                    direct_num = int(str_value)
-                    if 0 < direct_num < 100:
-                        arac_numbers.add(direct_num)
-                        logger.debug(f"Doğrudan ARAÇ numarası bulundu: {str_value} → {direct_num}")
-                        continue
-                except ValueError:
-                    pass
-                
-                # Regex pattern'ler ile eşleştirme
-                found = False
-                for pattern in patterns:
-                    try:
-                        matches = re.findall(pattern, str_value)
-                        for match in matches:
-                            try:
-                                arac_num = int(match)
-                                if 0 < arac_num < 100:
-                                    arac_numbers.add(arac_num)
-                                    logger.debug(f"ARAÇ numarası bulundu: {str_value} → {arac_num}")
-                                    found = True
-                                    break
-                            except ValueError:
-                                continue
-                        if found:
-                            break
-                    except Exception as pattern_error:
-                        logger.debug(f"Pattern hatası {pattern}: {pattern_error}")
-                        continue
-            
-            result = sorted(list(arac_numbers))
+            values = np.unique(self.arac_numbers.to_numpy())
+            result = [int(value) for value in values if value > 0]
             logger.info(f"Çıkarılan ARAÇ numaraları: {result}")
             return result
             
@@ -367,65 +361,18 @@ class AnalysisEngine:
             return []
     
     def _get_arac_data(self, arac_no: int) -> pd.DataFrame:
-        """Belirli ARAÇ numarasına ait verileri filtrele - DÜZELTME"""
+        """Belirli ARAÇ numarasına ait verileri filtrele"""
         try:
-            if not self.arac_column_name:
+            if self.arac_numbers is None:
                 logger.error("ARAÇ sütunu belirlenmemiş")
                 return pd.DataFrame()
             
-            arac_column = self.current_data[self.arac_column_name]
-            
-            # ARAÇ numarasını string olarak hazırla (01, 04 vs formatında)
-            arac_str_padded = f"{arac_no:02d}"  # 1 -> "01", 11 -> "11"
-            arac_str_normal = str(arac_no)      # 1 -> "1", 11 -> "11"
-            
-            # Doğrudan eşleşme için mask oluştur
-            mask = pd.Series([False] * len(arac_column))
-            
-            for idx, value in enumerate(arac_column):
-                if pd.notna(value):
-                    value_str = str(value).strip()
-                    
-                    # TAM EŞLEŞTİRME kontrolü - sadece bu ARAÇ numarası olmalı
-                    # Örnek: "01" == "01" ✓, "11" != "01" ✓
-                    if value_str == arac_str_padded or value_str == arac_str_normal:
-                        mask.iloc[idx] = True
-                        continue
-                    
-                    # Format içinde tam eşleştirme (köşeli parantez veya ARAÇ kelimesi ile)
-                    # Daha katı kontrol: sayıdan önce ve sonra sayı olmamalı
-                    import re
-                    
-                    # Patterns - word boundary (\b) kullanarak kesin eşleştirme
-                    patterns = [
-                        rf'\[İZMİR ARAÇ {arac_str_padded}\]',     # [İZMİR ARAÇ 01]
-                        rf'\[İZMİR ARAÇ {arac_str_normal}\]',     # [İZMİR ARAÇ 1]
-                        rf'\bİZMİR ARAÇ {arac_str_padded}\b',     # İZMİR ARAÇ 01
-                        rf'\bİZMİR ARAÇ {arac_str_normal}\b',     # İZMİR ARAÇ 1
-                        rf'\bARAÇ {arac_str_padded}\b',           # ARAÇ 01
-                        rf'\bARAÇ {arac_str_normal}\b',           # ARAÇ 1
-                        rf'^{arac_str_padded}$',                  # Sadece 01
-                        rf'^{arac_str_normal}$',                  # Sadece 1
-                    ]
-                    
-                    value_upper = value_str.upper()
-                    for pattern in patterns:
-                        if re.search(pattern, value_upper):
-                            mask.iloc[idx] = True
-                            break
-            
-            filtered_data = self.current_data[mask].copy()
+            filtered_data = self.current_data[self.arac_numbers == int(arac_no)].copy()
             
             if not filtered_data.empty:
                 logger.info(f"ARAÇ {arac_no} için {len(filtered_data)} kayıt bulundu")
-                # Debug: hangi değerler eşleşti
-                matched_values = arac_column[mask].unique()
-                logger.debug(f"ARAÇ {arac_no} için eşleşen değerler: {matched_values}")
             else:
                 logger.warning(f"ARAÇ {arac_no} için kayıt bulunamadı")
-                # Debug: tüm değerleri logla
-                all_values = arac_column.unique()
-                logger.debug(f"Mevcut tüm ARAÇ değerleri: {[str(v) for v in all_values if pd.notna(v)]}")
             
             return filtered_data
             
@@ -434,94 +381,118 @@ class AnalysisEngine:
             return pd.DataFrame()
     
     def _analyze_single_arac_internal(self, arac_no: int) -> Optional[Dict]:
-        """Tek ARAÇ için detaylı analiz - DÜZELTİLMİŞ"""
+        """Tek ARAÇ için detaylı analiz"""
         try:
-            arac_data = self._get_arac_data(arac_no)
+            analysis = self._analyze_groups([int(arac_no)]).get(str(arac_no))
             
-            if arac_data.empty:
+            if analysis is None:
                 logger.warning(f"ARAÇ {arac_no} için veri bulunamadı")
                 return None
             
-            logger.info(f"ARAÇ {arac_no} analizi başlatıldı: {len(arac_data)} kayıt")
-            
-            analysis = {
-                'arac_no': str(arac_no),
-                'analiz_tarihi': self.last_analysis_date.isoformat(),
-                'musteri_sayisi': len(arac_data),
-                'toplam_bakiye': 0.0,
-                'acik_hesap': 0.0,
-                'yaslanding_analizi': {},
-                'musteri_detaylari': [],
-                'istatistikler': {}
-            }
-            
-            toplam_bakiye = 0.0
-            acik_hesap = 0.0
-            yaslanding_data = {}
-            bakiye_list = []
-            
-            for idx, row in arac_data.iterrows():
-                try:
-                    musteri_unvan = str(row[self.cari_column_name]) if pd.notna(row[self.cari_column_name]) else f"Müşteri_{idx}"
-                    musteri_info = {
-                        'cari_unvan': musteri_unvan,
-                        'bakiye_detay': {},
-                        'toplam_bakiye': 0.0
-                    }
-                    
-                    musteri_toplam = 0.0
-                    musteri_acik = 0.0
-                    
-                    for col in self.bakiye_columns:
-                        try:
-                            raw_value = row[col]
-                            bakiye_value = 0.0
-                            
-                            if pd.notna(raw_value):
-                                bakiye_value = parse_turkish_number(raw_value)
-                            
-                            yaslanding_kategori = self._get_yaslanding_category(col)
-                            musteri_info['bakiye_detay'][yaslanding_kategori] = bakiye_value
-                            
-                            if yaslanding_kategori not in yaslanding_data:
-                                yaslanding_data[yaslanding_kategori] = 0.0
-                            yaslanding_data[yaslanding_kategori] += bakiye_value
-                            
-                            col_lower = str(col).lower()
-                            if 'açık hesap' in col_lower or 'acik hesap' in col_lower:
-                                musteri_acik += bakiye_value
-                                acik_hesap += bakiye_value
-                            
-                            musteri_toplam += bakiye_value
-                                
-                        except Exception as bakiye_error:
-                            logger.debug(f"Bakiye hesaplama hatası {col}: {bakiye_error}")
-                            continue
-                    
-                    musteri_info['toplam_bakiye'] = musteri_toplam
-                    analysis['musteri_detaylari'].append(musteri_info)
-                    
-                    toplam_bakiye += musteri_toplam
-                    bakiye_list.append(musteri_toplam)
-                    
-                except Exception as musteri_error:
-                    logger.debug(f"Müşteri analiz hatası (satır {idx}): {musteri_error}")
-                    continue
-            
-            analysis['toplam_bakiye'] = toplam_bakiye
-            analysis['acik_hesap'] = acik_hesap
-            analysis['yaslanding_analizi'] = yaslanding_data
-            
-            if bakiye_list:
-                analysis['istatistikler'] = self._calculate_statistics(bakiye_list, toplam_bakiye)
-            
-            logger.info(f"ARAÇ {arac_no} analizi tamamlandı: {len(arac_data)} müşteri, Toplam bakiye = {toplam_bakiye:.2f}")
+            logger.info(f"ARAÇ {arac_no} analizi tamamlandı: {analysis['musteri_sayisi']} müşteri, "
+                        f"Toplam bakiye = {analysis['toplam_bakiye']:.2f}")
             return analysis
             
         except Exception as e:
             logger.error(f"ARAÇ {arac_no} detay analizi hatası: {e}")
             return None
     
+    def _analyze_groups(self, arac_list: Optional[List[int]] = None) -> AgingResults:
+        """
+        ARAÇ bazında toplamlar, yaşlandırma ve istatistikler - tek groupby.
+        
+        Args:
+            arac_list: Sadece bu ARAÇ'lar (None ise tümü)
+        
+        Returns:
+            Sütunlu sonuçlar (ARAÇ no → analiz sözlüğü gibi okunur)
+        """
+        data = self.current_data
+        keys = self.arac_numbers
+        mask = keys.to_numpy() > 0
+        if arac_list is not None:
+            mask &= keys.isin(arac_list).to_numpy()
+        if not mask.any():
+            return AgingResults.from_dict({})
+        
+        values = data.loc[mask, self.bakiye_columns].astype(np.float64)
+        values.columns = range(len(self.bakiye_columns))
+        keys = keys[mask]
+        
+        categories = [self._get_yaslanding_category(col) for col in self.bakiye_columns]
+        acik_positions = [
+            i for i, col in enumerate(self.bakiye_columns)
+            if 'açık hesap' in str(col).lower() or 'acik hesap' in str(col).lower()
+        ]
+        
+        # Müşteri toplamı: tüm bakiye sütunlarının toplamı
+        row_totals = pd.Series(values.to_numpy().sum(axis=1), index=values.index)
+        
+        column_sums = values.groupby(keys, sort=True).sum()
+        acik_sums = column_sums[acik_positions].sum(axis=1) if acik_positions else None
+        
+        grouped = row_totals.groupby(keys, sort=True)
+        summary = grouped.agg(['size', 'sum', 'mean', 'max', 'min', 'median'])
+        summary['std'] = grouped.std(ddof=0)
+        summary['var'] = grouped.var(ddof=0)
+        summary['zero'] = (row_totals == 0).groupby(keys).sum()
+        summary['positive'] = (row_totals > 0).groupby(keys).sum()
+        summary['negative'] = (row_totals < 0).groupby(keys).sum()
+        percentiles = grouped.quantile([0.25, 0.5, 0.75, 0.9, 0.95]).unstack()
+        ranges = pd.crosstab(keys, pd.cut(row_totals, BAKIYE_RANGE_BINS, labels=BAKIYE_RANGE_LABELS))
+        ranges = ranges.reindex(columns=BAKIYE_RANGE_LABELS, fill_value=0)
+        
+        aggregates = {}
+        analiz_tarihi = self.last_analysis_date.isoformat()
+        for arac_no, row in summary.iterrows():
+            arac_no = int(arac_no)
+            
+            yaslanding_data = {}
+            for position, category in enumerate(categories):
+                yaslanding_data[category] = yaslanding_data.get(category, 0.0) + float(column_sums.at[arac_no, position])
+            
+            stats = {
+                'ortalama_bakiye': float(row['mean']),
+                'en_yuksek_bakiye': float(row['max']),
+                'en_dusuk_bakiye': float(row['min']),
+                'medyan_bakiye': float(row['median']),
+                'standart_sapma': float(row['std']),
+                'bakiye_0_olan': int(row['zero']),
+                'bakiye_pozitif_olan': int(row['positive']),
+                'bakiye_negatif_olan': int(row['negative']),
+                'varyans': float(row['var']),
+                'bakiye_araliklari': {label: int(ranges.at[arac_no, label]) for label in BAKIYE_RANGE_LABELS},
+            }
+            if row['size'] > 1:
+                for percentile in (25, 50, 75, 90, 95):
+                    stats[f'percentile_{percentile}'] = float(percentiles.at[arac_no, percentile / 100])
+            
+            aggregates[str(arac_no)] = {
+                'arac_no': str(arac_no),
+                'analiz_tarihi': analiz_tarihi,
+                'musteri_sayisi': int(row['size']),
+                'toplam_bakiye': float(row['sum']),
+                'acik_hesap': float(acik_sums.at[arac_no]) if acik_sums is not None else 0.0,
+                'yaslanding_analizi': yaslanding_data,
+                'istatistikler': stats,
+            }
+        
+        # Müşteri tablosu: cari ünvanı boş satırlar için eski biçimdeki yer tutucu
+        names = data.loc[mask, self.cari_column_name].to_numpy(dtype=object)
+        missing = pd.isna(names)
+        names[~missing] = [str(name) for name in names[~missing]]
+        names[missing] = [f"Müşteri_{label}" for label in values.index[missing]]
+        
+        return AgingResults(
+            aggregates=aggregates,
+            arac_numbers=keys.to_numpy(),
+            names=names,
+            totals=row_totals.to_numpy(),
+            values=values.to_numpy(),
+            value_columns=self.bakiye_columns,
+            categories=categories,
+        )
+    
     def _get_yaslanding_category(self, column_name: str) -> str:
         """Sütun adından yaşlandırma kategorisini çıkar"""
         try:
@@ -558,72 +529,6 @@ class AnalysisEngine:
             logger.debug(f"Yaşlandırma kategorisi belirleme hatası: {e}")
             return 'Diğer'
     
-    def _calculate_statistics(self, bakiye_list: List[float], toplam_bakiye: float) -> Dict:
-        """İstatistikleri hesapla"""
-        try:
-            if not bakiye_list:
-                return {}
-            
-            bakiyeler = np.array(bakiye_list)
-            
-            stats = {
-                'ortalama_bakiye': float(np.mean(bakiyeler)),
-                'en_yuksek_bakiye': float(np.max(bakiyeler)),
-                'en_dusuk_bakiye': float(np.min(bakiyeler)),
-                'medyan_bakiye': float(np.median(bakiyeler)),
-                'standart_sapma': float(np.std(bakiyeler)),
-                'bakiye_0_olan': int(np.sum(bakiyeler == 0)),
-                'bakiye_pozitif_olan': int(np.sum(bakiyeler > 0)),
-                'bakiye_negatif_olan': int(np.sum(bakiyeler < 0)),
-                'varyans': float(np.var(bakiyeler)),
-                'bakiye_araliklari': self._calculate_bakiye_ranges(bakiyeler)
-            }
-            
-            if len(bakiyeler) > 1:
-                for percentile in [25, 50, 75, 90, 95]:
-                    stats[f'percentile_{percentile}'] = float(np.percentile(bakiyeler, percentile))
-            
-            return stats
-            
-        except Exception as e:
-            logger.error(f"İstatistik hesaplama hatası: {e}")
-            return {}
-    
-    def _calculate_bakiye_ranges(self, bakiyeler: np.array) -> Dict:
-        """Bakiye aralıklarını hesapla"""
-        try:
-            if len(bakiyeler) == 0:
-                return {}
-            
-            ranges = {
-                '0-100': 0,
-                '100-500': 0,
-                '500-1000': 0,
-                '1000-5000': 0,
-                '5000-10000': 0,
-                '10000+': 0
-            }
-            
-            for bakiye in bakiyeler:
-                if bakiye <= 100:
-                    ranges['0-100'] += 1
-                elif bakiye <= 500:
-                    ranges['100-500'] += 1
-                elif bakiye <= 1000:
-                    ranges['500-1000'] += 1
-                elif bakiye <= 5000:
-                    ranges['1000-5000'] += 1
-                elif bakiye <= 10000:
-                    ranges['5000-10000'] += 1
-                else:
-                    ranges['10000+'] += 1
-            
-            return ranges
-            
-        except Exception as e:
-            logger.debug(f"Bakiye aralığı hesaplama hatası: {e}")
-            return {}
-    
     def get_arac_list(self) -> List[str]:
         """Mevcut ARAÇ listesini döndür"""
         try:
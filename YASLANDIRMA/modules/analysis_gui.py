@@ -373,6 +373,10 @@ class AnalysisGUI:
                     if not self.current_analysis_results:
                         raise Exception("Analiz sonucu alınamadı")
                     
+                    # Yaşlandırma geçmişine tarihli özet ekle
+                    self.data_manager.record_aging_snapshot(self.current_analysis_results,
+                                                            source=self.excel_processor.source_path)
+                    
                     self.window.after(0, lambda: self.progress_bar.set(0.8))
                     self.window.after(0, lambda: self.status_label.configure(text="Sonuçlar güncelleniyor..."))
                     
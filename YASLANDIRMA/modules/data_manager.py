@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 """
 Excel İşleme Uygulaması - Veri Yönetim Modülü
-JSON veri kaydetme, yükleme ve yönetim sistemi
+İçerik adresli SQLite deposu ile veri kaydetme, yükleme ve yönetim sistemi
 """
 
 import json
@@ -10,26 +10,58 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-import shutil
-import os
+from collections.abc import Mapping
+
+# Frozen mode için import düzeltmesi
+try:
+    from .aging_results import AgingResults
+    from .data_store import ContentStore, STORE_FILE_NAME
+    from .file_cache import FileCache, file_stamp, DEFAULT_CACHE_BUDGET_MB
+    from .aging_history import AgingHistoryStore, AgingTrendEngine, HISTORY_FILE_NAME
+    from .roll_rates import RollRateEngine
+except ImportError:
+    try:
+        from YASLANDIRMA.modules.aging_results import AgingResults
+        from YASLANDIRMA.modules.data_store import ContentStore, STORE_FILE_NAME
+        from YASLANDIRMA.modules.file_cache import FileCache, file_stamp, DEFAULT_CACHE_BUDGET_MB
+        from YASLANDIRMA.modules.aging_history import AgingHistoryStore, AgingTrendEngine, HISTORY_FILE_NAME
+        from YASLANDIRMA.modules.roll_rates import RollRateEngine
+    except ImportError:
+        from aging_results import AgingResults
+        from data_store import ContentStore, STORE_FILE_NAME
+        from file_cache import FileCache, file_stamp, DEFAULT_CACHE_BUDGET_MB
+        from aging_history import AgingHistoryStore, AgingTrendEngine, HISTORY_FILE_NAME
+        from roll_rates import RollRateEngine
 
 logger = logging.getLogger(__name__)
 
 class DataManager:
-    def __init__(self, data_directory: str = "data"):
+    def __init__(self, data_directory: str = "data", cache_budget_mb: Optional[float] = None):
+        """
+        Args:
+            data_directory: Veri klasörü
+            cache_budget_mb: Önbellek bütçesi; None ise kayıtlı ayarlardaki
+                'cache_budget_mb' kullanılır ve ayar kaydedilince güncellenir
+        """
         self.data_dir = Path(data_directory)
         self.data_dir.mkdir(exist_ok=True)
         
-        # Dosya yolları
+        # Veri deposu (analiz, atama, ayarlar + yedek geçmişi tek dosyada)
+        self.store = ContentStore(self.data_dir / STORE_FILE_NAME)
+        
+        # Yaşlandırma geçmişi (her işlenen yüklemenin tarihli özeti, yalnız ekleme)
+        self.history = AgingHistoryStore(self.data_dir / HISTORY_FILE_NAME)
+        
+        # Eski JSON dosyaları (ilk yüklemede depoya taşınır)
         self.analysis_file = self.data_dir / "analysis_data.json"
         self.assignments_file = self.data_dir / "assignments_data.json"
         self.settings_file = self.data_dir / "settings.json"
-        self.backup_dir = self.data_dir / "backups"
-        self.backup_dir.mkdir(exist_ok=True)
         
-        # Cache
-        self._cache = {}
-        self._cache_timeout = 300  # 5 dakika
+        # Cache: depo dosyasının mtime/boyutu ile doğrulanır, bütçe aşılınca LRU ile boşaltılır
+        self._cache_budget_fixed = cache_budget_mb is not None
+        if cache_budget_mb is None:
+            cache_budget_mb = self._stored_cache_budget()
+        self.cache = FileCache(cache_budget_mb)
         
     def save_analysis_data(self, analysis_results: Dict, metadata: Dict = None) -> bool:
         """
@@ -43,32 +75,28 @@ class DataManager:
             Boolean: Başarılı/başarısız
         """
         try:
-            if not isinstance(analysis_results, dict):
+            if not isinstance(analysis_results, Mapping):
                 logger.error("Geçersiz analiz veri formatı")
                 return False
             
-            # Backup oluştur
-            if self.analysis_file.exists():
-                self._create_backup(self.analysis_file)
+            # Müşteri × bakiye tablosu + ARAÇ özetleri olarak sakla
+            results = AgingResults.coerce(analysis_results)
             
-            # Kayıt verisi hazırla
-            save_data = {
-                'version': '1.0',
+            info = {
+                'version': '3.0',
                 'save_date': datetime.now().isoformat(),
-                'analysis_results': analysis_results,
-                'metadata': metadata or {},
-                'data_checksum': self._calculate_checksum(analysis_results)
+                'metadata': metadata or {}
             }
             
-            # JSON'a kaydet
-            success = self._save_json(self.analysis_file, save_data)
+            # Değişmeyen parçalar yeniden yazılmaz; önceki sürüm geçmişe referans olarak eklenir
+            checksum = self.store.save_document('analysis_data', results.to_parts(), info)
+            save_data = dict(info, analysis_results=results, data_checksum=checksum)
             
-            if success:
-                # Cache'i güncelle
-                self._update_cache('analysis_data', save_data)
-                logger.info(f"Analiz verileri kaydedildi: {len(analysis_results)} ARAÇ")
+            # Cache'i güncelle
+            self._update_cache('analysis_data', save_data, tag=checksum)
+            logger.info(f"Analiz verileri kaydedildi: {len(results)} ARAÇ")
             
-            return success
+            return True
             
         except Exception as e:
             logger.error(f"Analiz veri kaydetme hatası: {e}")
@@ -87,22 +115,17 @@ class DataManager:
             if cached_data:
                 return cached_data
             
-            if not self.analysis_file.exists():
-                logger.info("Analiz veri dosyası bulunamadı")
-                return None
-            
-            # JSON'dan yükle
-            data = self._load_json(self.analysis_file)
-            if not data:
-                return None
+            # Depodan yükle (parçalar okunurken SHA-256 ile doğrulanır)
+            stamp = file_stamp(self.store.db_path)
+            stored = self.store.load_document('analysis_data')
+            if stored is None:
+                return self._migrate_legacy_analysis()
             
-            # Veri bütünlüğü kontrolü
-            if not self._validate_analysis_data(data):
-                logger.error("Analiz veri bütünlüğü hatası")
-                return None
+            info, parts, checksum = stored
+            data = dict(info, analysis_results=AgingResults.from_parts(parts), data_checksum=checksum)
             
             # Cache'e kaydet
-            self._update_cache('analysis_data', data)
+            self._update_cache('analysis_data', data, tag=checksum, stamp=stamp)
             
             logger.info(f"Analiz verileri yüklendi: {len(data.get('analysis_results', {}))} ARAÇ")
             return data
@@ -111,6 +134,40 @@ class DataManager:
             logger.error(f"Analiz veri yükleme hatası: {e}")
             return None
     
+    def record_aging_snapshot(self, analysis_results: Mapping, source: Optional[str] = None,
+                              snapshot_date: Optional[Any] = None) -> Optional[int]:
+        """
+        Analiz sonuçlarının ARAÇ / yaşlandırma dilimi toplamlarını geçmişe ekle
+        
+        Args:
+            analysis_results: Analiz sonuçları
+            source: İşlenen Excel dosyasının yolu
+            snapshot_date: Görüntü tarihi (varsayılan: şimdi)
+            
+        Returns:
+            int: Görüntü id'si veya None
+        """
+        try:
+            if not analysis_results:
+                return None
+            return self.history.append(analysis_results, snapshot_date=snapshot_date, source=source)
+        except Exception as e:
+            logger.error(f"Yaşlandırma geçmişi kaydetme hatası: {e}")
+            return None
+    
+    def get_trend_engine(self, since: Optional[str] = None, until: Optional[str] = None) -> AgingTrendEngine:
+        """Yaşlandırma geçmişi üzerinde trend motoru (overall_series() trend grafiğini besler)"""
+        return AgingTrendEngine(self.history, since=since, until=until)
+    
+    def get_roll_rate_engine(self, snapshot_ids: Optional[List[int]] = None, last: int = 2) -> RollRateEngine:
+        """
+        Yaşlandırma geçmişindeki görüntüler arasında müşteri bazında geçiş analizi
+        
+        Raises:
+            ValueError: Müşteri verisi olan en az iki görüntü yoksa
+        """
+        return RollRateEngine.from_history(self.history, snapshot_ids=snapshot_ids, last=last)
+    
     def save_assignments_data(self, assignments: Dict, assignment_history: List = None) -> bool:
         """
         Atama verilerini kaydet
@@ -127,29 +184,25 @@ class DataManager:
                 logger.error("Geçersiz atama veri formatı")
                 return False
             
-            # Backup oluştur
-            if self.assignments_file.exists():
-                self._create_backup(self.assignments_file)
-            
-            # Kayıt verisi hazırla
-            save_data = {
-                'version': '1.0',
+            info = {
+                'version': '2.0',
                 'save_date': datetime.now().isoformat(),
+                'total_assignments': len(assignments)
+            }
+            parts = {
                 'assignments': assignments,
-                'assignment_history': assignment_history or [],
-                'total_assignments': len(assignments),
-                'data_checksum': self._calculate_checksum(assignments)
+                'assignment_history': assignment_history or []
             }
             
-            # JSON'a kaydet
-            success = self._save_json(self.assignments_file, save_data)
+            # Geçmiş ayrı parça: yalnızca atamalar değiştiğinde geçmiş yeniden yazılmaz
+            checksum = self.store.save_document('assignments_data', parts, info)
+            save_data = dict(info, data_checksum=checksum, **parts)
             
-            if success:
-                # Cache'i güncelle
-                self._update_cache('assignments_data', save_data)
-                logger.info(f"Atama verileri kaydedildi: {len(assignments)} atama")
+            # Cache'i güncelle
+            self._update_cache('assignments_data', save_data, tag=checksum)
+            logger.info(f"Atama verileri kaydedildi: {len(assignments)} atama")
             
-            return success
+            return True
             
         except Exception as e:
             logger.error(f"Atama veri kaydetme hatası: {e}")
@@ -168,22 +221,17 @@ class DataManager:
             if cached_data:
                 return cached_data
             
-            if not self.assignments_file.exists():
-                logger.info("Atama veri dosyası bulunamadı")
-                return None
-            
-            # JSON'dan yükle
-            data = self._load_json(self.assignments_file)
-            if not data:
-                return None
+            # Depodan yükle
+            stamp = file_stamp(self.store.db_path)
+            stored = self.store.load_document('assignments_data')
+            if stored is None:
+                return self._migrate_legacy_assignments()
             
-            # Veri bütünlüğü kontrolü
-            if not self._validate_assignments_data(data):
-                logger.error("Atama veri bütünlüğü hatası")
-                return None
+            info, parts, checksum = stored
+            data = dict(info, data_checksum=checksum, **parts)
             
             # Cache'e kaydet
-            self._update_cache('assignments_data', data)
+            self._update_cache('assignments_data', data, tag=checksum, stamp=stamp)
             
             logger.info(f"Atama verileri yüklendi: {len(data.get('assignments', {}))} atama")
             return data
@@ -207,22 +255,20 @@ class DataManager:
                 logger.error("Geçersiz ayar veri formatı")
                 return False
             
-            # Kayıt verisi hazırla
-            save_data = {
+            info = {
                 'version': '1.0',
-                'save_date': datetime.now().isoformat(),
-                'settings': settings
+                'save_date': datetime.now().isoformat()
             }
+            checksum = self.store.save_document('settings', {'settings': settings}, info)
+            save_data = dict(info, settings=settings)
             
-            # JSON'a kaydet
-            success = self._save_json(self.settings_file, save_data)
-            
-            if success:
-                # Cache'i güncelle
-                self._update_cache('settings', save_data)
-                logger.info("Ayarlar kaydedildi")
+            # Cache'i güncelle
+            self._update_cache('settings', save_data, tag=checksum)
+            if not self._cache_budget_fixed:
+                self.cache.set_budget(self._cache_budget_from(settings))
+            logger.info("Ayarlar kaydedildi")
             
-            return success
+            return True
             
         except Exception as e:
             logger.error(f"Ayar kaydetme hatası: {e}")
@@ -241,19 +287,22 @@ class DataManager:
             if cached_data:
                 return cached_data.get('settings', {})
             
-            if not self.settings_file.exists():
-                # Varsayılan ayarlar
-                default_settings = self._get_default_settings()
-                self.save_settings(default_settings)
-                return default_settings
+            stamp = file_stamp(self.store.db_path)
+            stored = self.store.load_document('settings')
+            if stored is None:
+                # Eski ayar dosyası veya varsayılan ayarlar
+                legacy = self._load_json(self.settings_file) if self.settings_file.exists() else None
+                # Eski kayıt {'settings': {...}}, setup.py örneği düz sözlük
+                legacy = (legacy.get('settings', legacy) if isinstance(legacy, dict) else None)
+                settings = legacy or self._get_default_settings()
+                self.save_settings(settings)
+                return settings
             
-            # JSON'dan yükle
-            data = self._load_json(self.settings_file)
-            if not data:
-                return self._get_default_settings()
+            info, parts, checksum = stored
+            data = dict(info, **parts)
             
             # Cache'e kaydet
-            self._update_cache('settings', data)
+            self._update_cache('settings', data, tag=checksum, stamp=stamp)
             
             return data.get('settings', {})
             
@@ -272,13 +321,17 @@ class DataManager:
             Boolean: Başarılı/başarısız
         """
         try:
+            analysis_data = self.load_analysis_data()
+            if analysis_data and isinstance(analysis_data.get('analysis_results'), AgingResults):
+                analysis_data = dict(analysis_data, analysis_results=analysis_data['analysis_results'].to_payload())
+            
             export_data = {
                 'export_info': {
                     'export_date': datetime.now().isoformat(),
                     'application': 'Excel İşleme Uygulaması',
                     'version': '1.0'
                 },
-                'analysis_data': self.load_analysis_data(),
+                'analysis_data': analysis_data,
                 'assignments_data': self.load_assignments_data(),
                 'settings': self.load_settings()
             }
@@ -318,8 +371,8 @@ class DataManager:
             if not import_data:
                 return False
             
-            # Mevcut verileri backup'la
-            self._create_full_backup()
+            # Mevcut verilerin güncel hâllerini geçmişe ekle (veri kopyalanmaz)
+            self.store.snapshot()
             
             success_count = 0
             
@@ -355,14 +408,17 @@ class DataManager:
             logger.error(f"Veri import hatası: {e}")
             return False
     
-    def _save_json(self, file_path: Path, data: Any) -> bool:
-        """JSON dosyası kaydet"""
+    def _save_json(self, file_path: Path, data: Any, compact: bool = False) -> bool:
+        """JSON dosyası kaydet (compact: girintisiz, C kodlayıcı ile tek geçiş)"""
         try:
             # Geçici dosyaya yaz
             temp_file = file_path.with_suffix('.tmp')
             
             with temp_file.open('w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+                if compact:
+                    f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str))
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
             
             # Atomik dosya değiştirme
             if file_path.exists():
@@ -392,64 +448,37 @@ class DataManager:
             logger.error(f"JSON yükleme hatası {file_path}: {e}")
             return None
     
-    def _create_backup(self, file_path: Path):
-        """Dosya backup'ı oluştur"""
-        try:
-            if not file_path.exists():
-                return
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{file_path.stem}_backup_{timestamp}.json"
-            backup_path = self.backup_dir / backup_name
-            
-            shutil.copy2(file_path, backup_path)
-            
-            # Eski backup'ları temizle (son 10 tanesini tut)
-            self._cleanup_old_backups(file_path.stem)
-            
-        except Exception as e:
-            logger.debug(f"Backup oluşturma hatası: {e}")
-    
-    def _create_full_backup(self):
-        """Tüm verilerin backup'ını oluştur"""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            full_backup_dir = self.backup_dir / f"full_backup_{timestamp}"
-            full_backup_dir.mkdir(exist_ok=True)
-            
-            # Tüm veri dosyalarını backup'la
-            for file_path in [self.analysis_file, self.assignments_file, self.settings_file]:
-                if file_path.exists():
-                    shutil.copy2(file_path, full_backup_dir / file_path.name)
-            
-        except Exception as e:
-            logger.debug(f"Full backup oluşturma hatası: {e}")
-    
-    def _cleanup_old_backups(self, file_stem: str, keep_count: int = 10):
-        """Eski backup'ları temizle"""
-        try:
-            pattern = f"{file_stem}_backup_*.json"
-            backup_files = list(self.backup_dir.glob(pattern))
-            
-            if len(backup_files) > keep_count:
-                # Tarihe göre sırala (eski olanlar önce)
-                backup_files.sort(key=lambda x: x.stat().st_mtime)
-                
-                # Fazla olanları sil
-                for old_backup in backup_files[:-keep_count]:
-                    old_backup.unlink()
-                    
-        except Exception as e:
-            logger.debug(f"Backup temizleme hatası: {e}")
+    def _migrate_legacy_analysis(self) -> Optional[Dict]:
+        """Eski analysis_data.json kaydını depoya taşı"""
+        if not self.analysis_file.exists():
+            logger.info("Analiz verisi bulunamadı")
+            return None
+        
+        data = self._load_json(self.analysis_file)
+        if not data or not self._validate_analysis_data(data):
+            logger.error("Analiz veri bütünlüğü hatası")
+            return None
+        
+        if not self.save_analysis_data(data['analysis_results'], data.get('metadata', {})):
+            return None
+        logger.info(f"Eski analiz dosyası depoya taşındı: {self.analysis_file}")
+        return self._get_from_cache('analysis_data')
     
-    def _calculate_checksum(self, data: Any) -> str:
-        """Veri checksum'ı hesapla"""
-        try:
-            import hashlib
-            json_str = json.dumps(data, sort_keys=True, default=str)
-            return hashlib.md5(json_str.encode()).hexdigest()
-        except Exception:
-            return ""
+    def _migrate_legacy_assignments(self) -> Optional[Dict]:
+        """Eski assignments_data.json kaydını depoya taşı"""
+        if not self.assignments_file.exists():
+            logger.info("Atama verisi bulunamadı")
+            return None
+        
+        data = self._load_json(self.assignments_file)
+        if not data or not self._validate_assignments_data(data):
+            logger.error("Atama veri bütünlüğü hatası")
+            return None
+        
+        if not self.save_assignments_data(data['assignments'], data.get('assignment_history', [])):
+            return None
+        logger.info(f"Eski atama dosyası depoya taşındı: {self.assignments_file}")
+        return self._get_from_cache('assignments_data')
     
     def _validate_analysis_data(self, data: Dict) -> bool:
         """Analiz veri bütünlüğünü kontrol et"""
@@ -475,37 +504,54 @@ class DataManager:
             'auto_save_interval': 300,  # 5 dakika
             'backup_enabled': True,
             'max_backup_count': 10,
-            'analysis_cache_timeout': 300,
+            'cache_budget_mb': DEFAULT_CACHE_BUDGET_MB,
             'default_export_format': 'json',
             'notifications_enabled': True
         }
     
-    def _update_cache(self, key: str, data: Any):
-        """Cache güncelle"""
+    @staticmethod
+    def _cache_budget_from(settings: Mapping) -> float:
+        """Ayarlardaki önbellek bütçesi (geçersizse varsayılan)"""
+        value = settings.get('cache_budget_mb', DEFAULT_CACHE_BUDGET_MB)
         try:
-            self._cache[key] = {
-                'data': data,
-                'timestamp': datetime.now().timestamp()
-            }
+            budget = float(value)
+        except (TypeError, ValueError):
+            budget = 0.0
+        if budget <= 0:
+            logger.warning(f"Geçersiz cache_budget_mb ayarı: {value!r}, varsayılan kullanılıyor")
+            return DEFAULT_CACHE_BUDGET_MB
+        return budget
+    
+    def _stored_cache_budget(self) -> float:
+        """Kayıtlı ayarlardan önbellek bütçesi (ayar yoksa varsayılan; depoya yazmaz)"""
+        try:
+            stored = self.store.load_document('settings')
+        except Exception as e:
+            logger.debug(f"Ayarlar okunamadı, varsayılan önbellek bütçesi kullanılıyor: {e}")
+            return DEFAULT_CACHE_BUDGET_MB
+        if stored is None:
+            return DEFAULT_CACHE_BUDGET_MB
+        return self._cache_budget_from(stored[1].get('settings') or {})
+    
+    def _update_cache(self, key: str, data: Any, tag: Optional[str] = None, stamp=None):
+        """
+        Cache güncelle
+        
+        Args:
+            tag: Belgenin sürüm anahtarı - manifest + info (depo dosyası başka bir
+                belge yüzünden değiştiğinde veriyi yeniden okumadan doğrulamak için)
+            stamp: Okuma öncesi alınan depo dosyası damgası
+        """
+        try:
+            self.cache.put(key, self.store.db_path, data, tag=tag, stamp=stamp)
         except Exception as e:
             logger.debug(f"Cache güncelleme hatası: {e}")
     
     def _get_from_cache(self, key: str) -> Optional[Any]:
-        """Cache'den veri al"""
+        """Cache'den veri al (depo dosyası dışarıdan değiştiyse None)"""
         try:
-            if key not in self._cache:
-                return None
-            
-            cache_entry = self._cache[key]
-            cache_age = datetime.now().timestamp() - cache_entry['timestamp']
-            
-            if cache_age > self._cache_timeout:
-                # Cache süresi dolmuş
-                del self._cache[key]
-                return None
-            
-            return cache_entry['data']
-            
+            return self.cache.get(key, self.store.db_path,
+                                  current_tag=lambda: self.store.document_key(key))
         except Exception as e:
             logger.debug(f"Cache okuma hatası: {e}")
             return None
@@ -513,34 +559,37 @@ class DataManager:
     def clear_cache(self):
         """Cache'i temizle"""
         try:
-            self._cache.clear()
+            self.cache.clear()
             logger.info("Cache temizlendi")
         except Exception as e:
             logger.debug(f"Cache temizleme hatası: {e}")
     
+    def get_cache_stats(self) -> Dict:
+        """Cache isabet/ıskalama sayaçları ve bellek kullanımı"""
+        return self.cache.stats()
+    
     def get_data_info(self) -> Dict:
         """Veri bilgilerini getir"""
         try:
+            # Belge başına (sıkıştırılmamış) parça boyutları
+            document_sizes = self.store.document_sizes()
+            
             info = {
                 'data_directory': str(self.data_dir),
-                'analysis_file_exists': self.analysis_file.exists(),
-                'assignments_file_exists': self.assignments_file.exists(),
-                'settings_file_exists': self.settings_file.exists(),
-                'backup_count': len(list(self.backup_dir.glob('*.json'))),
-                'cache_size': len(self._cache)
+                'store_file': str(self.store.db_path),
+                'store_size': self.store.storage_size(),
+                'analysis_file_exists': 'analysis_data' in document_sizes,
+                'assignments_file_exists': 'assignments_data' in document_sizes,
+                'settings_file_exists': 'settings' in document_sizes,
+                'backup_count': self.store.history_count_total(),
+                'history_snapshot_count': len(self.history),
+                'cache_size': len(self.cache),
+                'cache_stats': self.cache.stats(),
+                'analysis_file_size': document_sizes.get('analysis_data', 0),
+                'assignments_file_size': document_sizes.get('assignments_data', 0),
+                'settings_file_size': document_sizes.get('settings', 0)
             }
             
-            # Dosya boyutları
-            for file_name, file_path in [
-                ('analysis_file_size', self.analysis_file),
-                ('assignments_file_size', self.assignments_file),
-                ('settings_file_size', self.settings_file)
-            ]:
-                if file_path.exists():
-                    info[file_name] = file_path.stat().st_size
-                else:
-                    info[file_name] = 0
-            
             return info
             
         except Exception as e:
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel İşleme Uygulaması - İçerik Adresli Veri Deposu
+SQLite üzerinde sıkıştırılmış, SHA-256 ile adreslenen parçalar
+"""
+
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORE_FILE_NAME = "veri_deposu.sqlite"
+CHUNK_SIZE = 1024 * 1024
+COMPRESSION_LEVEL = 6
+DEFAULT_HISTORY_COUNT = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    manifest TEXT NOT NULL,
+    info TEXT NOT NULL,
+    saved_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    manifest TEXT NOT NULL,
+    info TEXT NOT NULL,
+    saved_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_name ON history(name, id);
+"""
+
+
+class DataStoreError(Exception):
+    """Depo bütünlük / erişim hatası"""
+    pass
+
+
+def _iter_chunks(data: bytes) -> Iterator[memoryview]:
+    view = memoryview(data)
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield view[start:start + CHUNK_SIZE]
+
+
+def content_hash(data: bytes) -> str:
+    """Parça parça (akış) SHA-256"""
+    digest = hashlib.sha256()
+    for chunk in _iter_chunks(data):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def document_revision(manifest_key: str, info_text: str) -> str:
+    """Belge sürüm anahtarı: parçalar (manifest) veya meta veri (info) değişince değişir"""
+    return content_hash(f"{manifest_key}\n{info_text}".encode('utf-8'))
+
+
+def encode_part(value: Any) -> Tuple[str, bytes]:
+    """Parçayı (tür, bayt) olarak kodlar: numpy dizileri .npy, diğerleri JSON"""
+    if isinstance(value, np.ndarray):
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return 'npy', buffer.getvalue()
+    # Anahtar sırası korunur (atamalar ekleme sırasıyla okunur); aynı içerik aynı baytları üretir
+    text = json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+    return 'json', text.encode('utf-8')
+
+
+def decode_part(kind: str, data: bytes) -> Any:
+    if kind == 'npy':
+        return np.load(io.BytesIO(data), allow_pickle=False)
+    return json.loads(data.decode('utf-8'))
+
+
+class ContentStore:
+    """
+    Belgeler (analiz, atama, ayarlar) parçalara bölünüp saklanır.
+
+    Her parça sıkıştırılmış olarak içeriğinin SHA-256'sı ile bir kez yazılır;
+    belge yalnızca parça adreslerinden oluşan bir manifesttir. Değişmeyen
+    parçalar yeniden yazılmaz, yedekler (geçmiş) yalnızca manifest
+    referanslarıdır. Okurken her parça akış halinde açılıp adresine karşı
+    doğrulanır.
+    """
+
+    def __init__(self, db_path: Path, history_count: int = DEFAULT_HISTORY_COUNT):
+        self.db_path = Path(db_path)
+        self.history_count = history_count
+        self._lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    #region Parçalar
+    def _put_blob(self, conn: sqlite3.Connection, data: bytes) -> str:
+        """Parçayı yazar (zaten varsa sıkıştırmadan atlar); adresini döndürür"""
+        key = content_hash(data)
+        if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (key,)).fetchone():
+            return key
+
+        compressor = zlib.compressobj(COMPRESSION_LEVEL)
+        compressed = bytearray()
+        for chunk in _iter_chunks(data):
+            compressed += compressor.compress(chunk)
+        compressed += compressor.flush()
+
+        conn.execute("INSERT OR IGNORE INTO blobs (hash, size, data) VALUES (?, ?, ?)",
+                     (key, len(data), bytes(compressed)))
+        return key
+
+    def _get_blob(self, conn: sqlite3.Connection, key: str) -> bytes:
+        """Parçayı açar ve akış halinde SHA-256 ile doğrular"""
+        row = conn.execute("SELECT data, size FROM blobs WHERE hash = ?", (key,)).fetchone()
+        if row is None:
+            raise DataStoreError(f"Parça bulunamadı: {key}")
+
+        decompressor = zlib.decompressobj()
+        digest = hashlib.sha256()
+        data = bytearray()
+        for chunk in _iter_chunks(row[0]):
+            plain = decompressor.decompress(chunk)
+            digest.update(plain)
+            data += plain
+        tail = decompressor.flush()
+        digest.update(tail)
+        data += tail
+
+        if digest.hexdigest() != key or len(data) != row[1]:
+            raise DataStoreError(f"Parça bütünlük hatası: {key}")
+        return bytes(data)
+    #endregion
+
+    #region Belgeler
+    def save_document(self, name: str, parts: Dict[str, Any], info: Optional[Dict] = None) -> str:
+        """
+        Belgeyi kaydeder; önceki sürüm geçmişe referans olarak eklenir.
+
+        Args:
+            parts: Parça adı → değer (numpy dizisi veya JSON'a çevrilebilir)
+            info: Manifestle birlikte tutulan küçük meta veri
+
+        Returns:
+            Belge sürüm anahtarı (manifest adresi + info özeti)
+        """
+        info_text = json.dumps(info or {}, ensure_ascii=False, sort_keys=True, default=str)
+        saved_at = datetime.now().isoformat()
+
+        with self._lock, self._connect() as conn:
+            manifest = {}
+            for part_name, value in parts.items():
+                kind, data = encode_part(value)
+                manifest[part_name] = [kind, self._put_blob(conn, data)]
+            manifest_key = self._put_blob(conn, encode_part(manifest)[1])
+            revision = document_revision(manifest_key, info_text)
+
+            previous = conn.execute("SELECT manifest, info, saved_at FROM documents WHERE name = ?",
+                                    (name,)).fetchone()
+            if previous is not None:
+                if previous[0] == manifest_key and previous[1] == info_text:
+                    return revision
+                conn.execute("INSERT INTO history (name, manifest, info, saved_at) VALUES (?, ?, ?, ?)",
+                             (name,) + tuple(previous))
+
+            conn.execute("INSERT OR REPLACE INTO documents (name, manifest, info, saved_at) VALUES (?, ?, ?, ?)",
+                         (name, manifest_key, info_text, saved_at))
+            self._prune(conn, name)
+
+        return revision
+
+    def load_document(self, name: str) -> Optional[Tuple[Dict, Dict[str, Any], str]]:
+        """
+        Returns:
+            (info, parçalar, sürüm anahtarı) veya belge yoksa None
+
+        Raises:
+            DataStoreError: Parça eksik veya bozuk
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT manifest, info FROM documents WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            manifest = decode_part('json', self._get_blob(conn, row[0]))
+            parts = {
+                part_name: decode_part(kind, self._get_blob(conn, key))
+                for part_name, (kind, key) in manifest.items()
+            }
+            return json.loads(row[1]), parts, document_revision(row[0], row[1])
+
+    def document_key(self, name: str) -> Optional[str]:
+        """Belgenin güncel sürüm anahtarı (parçalar okunmadan; info değişikliği dahil)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT manifest, info FROM documents WHERE name = ?", (name,)).fetchone()
+            return document_revision(row[0], row[1]) if row else None
+
+    def document_names(self) -> List[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT name FROM documents ORDER BY name")]
+    #endregion
+
+    #region Geçmiş (yedekler)
+    def snapshot(self, names: Optional[List[str]] = None) -> int:
+        """Belgelerin güncel hâllerini geçmişe ekler (veri kopyalanmaz)"""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("SELECT name, manifest, info, saved_at FROM documents").fetchall()
+            rows = [row for row in rows if names is None or row[0] in names]
+            conn.executemany("INSERT INTO history (name, manifest, info, saved_at) VALUES (?, ?, ?, ?)", rows)
+            for name in {row[0] for row in rows}:
+                self._prune(conn, name)
+            return len(rows)
+
+    def history(self, name: str) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, manifest, saved_at FROM history WHERE name = ? ORDER BY id",
+                                (name,)).fetchall()
+        return [{'id': row[0], 'manifest': row[1], 'saved_at': row[2]} for row in rows]
+
+    def history_count_total(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def _prune(self, conn: sqlite3.Connection, name: str) -> None:
+        """Belge başına son history_count geçmiş kaydını tutar, sahipsiz parçaları siler"""
+        stale = conn.execute(
+            "SELECT id FROM history WHERE name = ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+            (name, self.history_count)
+        ).fetchall()
+        if not stale:
+            return
+        conn.executemany("DELETE FROM history WHERE id = ?", stale)
+        self._collect_garbage(conn)
+
+    def _collect_garbage(self, conn: sqlite3.Connection) -> int:
+        manifests = {row[0] for row in conn.execute("SELECT manifest FROM documents UNION SELECT manifest FROM history")}
+        live = set(manifests)
+        for manifest_key in manifests:
+            try:
+                manifest = decode_part('json', self._get_blob(conn, manifest_key))
+            except DataStoreError as e:
+                logger.warning(f"Manifest okunamadı, parçaları korunuyor: {e}")
+                return 0
+            live.update(key for _, key in manifest.values())
+
+        dead = [(key,) for (key,) in conn.execute("SELECT hash FROM blobs") if key not in live]
+        conn.executemany("DELETE FROM blobs WHERE hash = ?", dead)
+        if dead:
+            logger.debug(f"{len(dead)} sahipsiz parça silindi")
+        return len(dead)
+    #endregion
+
+    def storage_size(self) -> int:
+        """Depo dosyasının disk boyutu (bayt)"""
+        return self.db_path.stat().st_size if self.db_path.exists() else 0
+
+    def document_sizes(self) -> Dict[str, int]:
+        """Belge başına sıkıştırılmamış parça boyutları toplamı"""
+        sizes = {}
+        with self._connect() as conn:
+            for name, manifest_key in conn.execute("SELECT name, manifest FROM documents").fetchall():
+                manifest = decode_part('json', self._get_blob(conn, manifest_key))
+                keys = [key for _, key in manifest.values()]
+                placeholders = ",".join("?" * len(keys))
+                total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM blobs WHERE hash IN ({placeholders})",
+                                     keys).fetchone()[0] if keys else 0
+                sizes[name] = int(total)
+        return sizes
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel İşleme Uygulaması - Dosya Doğrulamalı LRU Önbellek
+Dosya yolu + mtime/boyut ile doğrulanan, bellek bütçeli önbellek
+"""
+
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BUDGET_MB = 256
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Yaklaşık bellek kullanımı (numpy/AgingResults için nbytes, kapsayıcılar için toplam)"""
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, boyut) veya dosya yoksa None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileCache:
+    """
+    Dosyadan okunan verileri tutan LRU önbellek.
+
+    Her kayıt, okunduğu dosyanın (mtime_ns, boyut) damgası ve isteğe bağlı
+    bir içerik etiketi ile saklanır. Damga değişmişse (başka bir pencere
+    veya uygulama dosyaya yazmış) kayıt geçersizdir; etiket hâlâ aynıysa
+    (dosyanın başka bir bölümü değişmiş) veri yeniden okunmadan damga
+    güncellenir. Toplam boyut bütçeyi aşınca en uzun süredir kullanılmayan
+    kayıtlar atılır.
+    """
+
+    def __init__(self, budget_mb: float = DEFAULT_CACHE_BUDGET_MB):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: str, path: Path, current_tag: Optional[Callable[[], Any]] = None) -> Optional[Any]:
+        """
+        Args:
+            key: Kayıt anahtarı
+            path: Verinin okunduğu dosya
+            current_tag: Damga değiştiğinde güncel içerik etiketini döndüren fonksiyon
+
+        Returns:
+            Geçerli kayıt verisi veya None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stamp = file_stamp(path)
+            if stamp != entry['stamp']:
+                tag = current_tag() if current_tag is not None and entry['tag'] is not None else None
+                if stamp is None or tag is None or tag != entry['tag']:
+                    self._remove(key)
+                    self.invalidations += 1
+                    self.misses += 1
+                    return None
+                entry['stamp'] = stamp
+                self.revalidations += 1
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['data']
+
+    def put(self, key: str, path: Path, data: Any, tag: Any = None,
+            stamp: Optional[Tuple[int, int]] = None, nbytes: Optional[int] = None) -> None:
+        """
+        Kaydı ekler; bütçe aşılırsa eski kayıtları atar.
+
+        Args:
+            stamp: Okuma öncesi alınan damga (verilmezse dosyanın güncel damgası).
+                Okuma sırasında dosya değişirse sonraki get() bunu fark eder.
+        """
+        with self._lock:
+            self._remove(key)
+            size = estimate_nbytes(data) if nbytes is None else int(nbytes)
+            stamp = file_stamp(path) if stamp is None else stamp
+            self._entries[key] = {'stamp': stamp, 'tag': tag, 'data': data, 'nbytes': size}
+            self.total_bytes += size
+            self._evict_over_budget()
+
+    def set_budget(self, budget_mb: float) -> None:
+        """Bellek bütçesini değiştirir; küçüldüyse eski kayıtları hemen atar"""
+        with self._lock:
+            self.budget_bytes = int(budget_mb * 1024 * 1024)
+            self._evict_over_budget()
+
+    def _evict_over_budget(self) -> None:
+        # Son eklenen kayıt, tek başına bütçeyi aşsa bile tutulur
+        while self.total_bytes > self.budget_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+            logger.debug(f"Önbellekten atıldı: {oldest}")
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if self._remove(key):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_bytes -= entry['nbytes']
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet/ıskalama sayaçları ve bellek kullanımı"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'revalidations': self.revalidations,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel İşleme Uygulaması - Yaşlandırma Geçiş (Roll-Rate) Analizi
+Müşteri bazında yaşlandırma dilimleri arası geçiş matrisleri, iyileşme ve kötüleşme oranları
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Frozen mode için import düzeltmesi
+try:
+    from .aging_results import AgingResults
+    from .aging_history import AgingHistoryStore, AGED_BUCKETS, customer_bucket_matrix
+except ImportError:
+    try:
+        from YASLANDIRMA.modules.aging_results import AgingResults
+        from YASLANDIRMA.modules.aging_history import AgingHistoryStore, AGED_BUCKETS, customer_bucket_matrix
+    except ImportError:
+        from aging_results import AgingResults
+        from aging_history import AgingHistoryStore, AGED_BUCKETS, customer_bucket_matrix
+
+logger = logging.getLogger(__name__)
+
+# Vadesi geçmiş bakiyesi olmayan (veya listeden çıkmış) müşteri
+STATE_CLEAR = 'Bakiye Yok'
+# Önceki görüntüde olmayan müşteri
+STATE_NEW = 'Yeni'
+# Bu tutarın altındaki dilim bakiyeleri yok sayılır (kuruş artıkları)
+MIN_BALANCE = 0.01
+
+# utils.normalize_text ile aynı kurallar (Türkçe karakter → ASCII, küçük harf, noktalama yok)
+_TURKISH_ASCII = str.maketrans({
+    'ç': 'c', 'Ç': 'C', 'ğ': 'g', 'Ğ': 'G', 'ı': 'i', 'İ': 'I',
+    'ö': 'o', 'Ö': 'O', 'ş': 's', 'Ş': 'S', 'ü': 'u', 'Ü': 'U'
+})
+_NON_KEY_CHARS = re.compile(r'[^a-z0-9\s]')
+
+
+def normalize_cari_unvan(names: Sequence[Any]) -> np.ndarray:
+    """
+    Cari ünvanları eşleştirme anahtarına çevirir (utils.normalize_text kuralları).
+
+    Her farklı ünvan bir kez normalleştirilir; sonuç kodlarla geri dağıtılır.
+    """
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object).fillna('').astype(str))
+    keys = np.array([' '.join(_NON_KEY_CHARS.sub('', name.translate(_TURKISH_ASCII).lower()).split())
+                     for name in uniques], dtype=object)
+    return keys[codes] if len(keys) else np.array([], dtype=object)
+
+
+def results_customer_table(results: Any) -> pd.DataFrame:
+    """AgingResults'tan müşteri tablosu: arac_no, cari_unvan + yaşlandırma dilimi sütunları"""
+    results = AgingResults.coerce(results)
+    buckets, amounts = customer_bucket_matrix(results)
+    table = pd.DataFrame(amounts, columns=buckets)
+    table.insert(0, 'arac_no', results.arac_numbers)
+    table.insert(1, 'cari_unvan', results.names)
+    return table
+
+
+class RollRateEngine:
+    """
+    İki veya daha fazla yaşlandırma görüntüsünü müşteri bazında eşleştirir.
+
+    Her müşterinin durumu, sıfırdan büyük bakiyesi olan en eski gün
+    dilimidir (yoksa "Bakiye Yok"). Ardışık görüntüler normalleştirilmiş
+    cari ünvan üzerinden tek bir birleştirme ile eşleştirilir; geçiş
+    matrisleri önceki görüntünün vadesi geçmiş bakiyesi (veya müşteri
+    sayısı) ile ağırlıklandırılır.
+    """
+
+    def __init__(self, snapshots: List[pd.DataFrame], dates: Optional[List[Any]] = None):
+        """
+        Args:
+            snapshots: Eskiden yeniye müşteri tabloları (arac_no, cari_unvan + dilim sütunları)
+            dates: Görüntü tarihleri (isteğe bağlı)
+        """
+        if len(snapshots) < 2:
+            raise ValueError("Geçiş analizi için en az iki yaşlandırma görüntüsü gerekli")
+
+        present = set().union(*(table.columns for table in snapshots))
+        self.buckets = [bucket for bucket in AGED_BUCKETS if bucket in present]
+        self.dates = list(dates) if dates is not None else list(range(len(snapshots)))
+        self.from_states = self.buckets + [STATE_CLEAR, STATE_NEW]
+        self.to_states = self.buckets + [STATE_CLEAR]
+        # Ünvanlar tüm görüntüler için tek seferde normalleştirilir (müşteriler görüntüler arasında tekrar eder)
+        keys = normalize_cari_unvan(np.concatenate([table['cari_unvan'].to_numpy(dtype=object) for table in snapshots]))
+        bounds = np.cumsum([0] + [len(table) for table in snapshots])
+        self._states = [self._customer_states(table, keys[start:stop])
+                        for table, start, stop in zip(snapshots, bounds, bounds[1:])]
+        self._transitions: Optional[pd.DataFrame] = None
+
+    #region Kurulum
+    @classmethod
+    def from_results(cls, results_list: List[Any], dates: Optional[List[Any]] = None) -> 'RollRateEngine':
+        """Eskiden yeniye AgingResults (veya sonuç sözlükleri) listesinden"""
+        return cls([results_customer_table(results) for results in results_list], dates)
+
+    @classmethod
+    def from_history(cls, store: AgingHistoryStore, snapshot_ids: Optional[List[int]] = None,
+                     last: int = 2) -> 'RollRateEngine':
+        """
+        Yaşlandırma geçmişinden.
+
+        Args:
+            snapshot_ids: Kullanılacak görüntüler (verilmezse müşteri verisi olan son ``last`` görüntü)
+        """
+        snapshots = store.list_snapshots()
+        if snapshot_ids is not None:
+            snapshots = snapshots[snapshots['snapshot_id'].isin(snapshot_ids)]
+
+        tables, dates = [], []
+        for snapshot_id, snapshot_date in zip(snapshots['snapshot_id'][::-1], snapshots['snapshot_date'][::-1]):
+            table = store.load_customers(int(snapshot_id))
+            if table is None:
+                logger.debug(f"Görüntü #{snapshot_id} müşteri verisi içermiyor, atlandı")
+                continue
+            tables.append(table)
+            dates.append(snapshot_date)
+            if snapshot_ids is None and len(tables) >= last:
+                break
+
+        return cls(tables[::-1], dates[::-1])
+
+    def _customer_states(self, table: pd.DataFrame, keys: np.ndarray) -> pd.DataFrame:
+        """Müşteri anahtarı → arac_no, durum kodu, vadesi geçmiş bakiye"""
+        aged = table.reindex(columns=self.buckets, fill_value=0.0).to_numpy(dtype=np.float64)
+        frame = pd.DataFrame(aged)
+        frame['arac_no'] = table['arac_no'].to_numpy()
+        frame['anahtar'] = keys
+        frame = frame[frame['anahtar'] != '']
+
+        # Aynı ünvanın birden fazla satırı (veya ARAÇ'ı) tek müşteri sayılır
+        grouped = frame.groupby('anahtar', sort=False)
+        amounts = grouped[list(range(len(self.buckets)))].sum().to_numpy()
+        arac_no = grouped['arac_no'].first()
+
+        positive = amounts > MIN_BALANCE
+        has_balance = positive.any(axis=1)
+        oldest = len(self.buckets) - 1 - np.argmax(positive[:, ::-1], axis=1) if len(self.buckets) \
+            else np.zeros(len(amounts), dtype=np.intp)
+        state = np.where(has_balance, oldest, self.from_states.index(STATE_CLEAR))
+
+        return pd.DataFrame({
+            'arac_no': arac_no.to_numpy(),
+            'durum': state.astype(np.int16),
+            'bakiye': np.where(positive, amounts, 0.0).sum(axis=1),
+        }, index=arac_no.index)
+    #endregion
+
+    #region Geçişler
+    @property
+    def transitions(self) -> pd.DataFrame:
+        """
+        Müşteri bazında geçişler (tüm ardışık görüntü çiftleri).
+
+        Sütunlar: donem, anahtar, arac_no, onceki_durum, sonraki_durum,
+        onceki_bakiye, sonraki_bakiye
+        """
+        if self._transitions is None:
+            clear = self.from_states.index(STATE_CLEAR)
+            new = self.from_states.index(STATE_NEW)
+            frames = []
+            for period, (before, after) in enumerate(zip(self._states, self._states[1:])):
+                merged = before.join(after, how='outer', lsuffix='_once', rsuffix='_sonra')
+                frames.append(pd.DataFrame({
+                    'donem': period,
+                    'anahtar': merged.index,
+                    # Yeni müşteriler güncel ARAÇ'ına yazılır
+                    'arac_no': merged['arac_no_once'].fillna(merged['arac_no_sonra']).astype(np.int16).to_numpy(),
+                    'onceki_durum': merged['durum_once'].fillna(new).astype(np.int16).to_numpy(),
+                    'sonraki_durum': merged['durum_sonra'].fillna(clear).astype(np.int16).to_numpy(),
+                    'onceki_bakiye': merged['bakiye_once'].fillna(0.0).to_numpy(),
+                    'sonraki_bakiye': merged['bakiye_sonra'].fillna(0.0).to_numpy(),
+                }))
+            self._transitions = pd.concat(frames, ignore_index=True)
+        return self._transitions
+
+    def _selected(self, arac_no: Optional[Any], period: Optional[int]) -> pd.DataFrame:
+        data = self.transitions
+        if period is not None:
+            data = data[data['donem'] == period]
+        if arac_no is not None:
+            data = data[data['arac_no'] == int(arac_no)]
+        return data
+
+    def _weights(self, data: pd.DataFrame, weight: str) -> np.ndarray:
+        if weight == 'count':
+            return np.ones(len(data))
+        if weight != 'amount':
+            raise ValueError(f"Geçersiz ağırlık: {weight} (amount veya count)")
+        # Önceden vadesi geçmiş bakiyesi olmayanlar güncel bakiyeleriyle ağırlıklanır
+        from_clear = data['onceki_durum'].to_numpy() >= len(self.buckets)
+        return np.where(from_clear, data['sonraki_bakiye'].to_numpy(), data['onceki_bakiye'].to_numpy())
+
+    def _matrix(self, data: pd.DataFrame, weight: str, by_vehicle: bool) -> pd.DataFrame:
+        keys = ['arac_no', 'onceki_durum', 'sonraki_durum'] if by_vehicle else ['onceki_durum', 'sonraki_durum']
+        totals = pd.Series(self._weights(data, weight), index=data.index).groupby(
+            [data[key] for key in keys]).sum()
+        matrix = totals.unstack('sonraki_durum', fill_value=0.0)
+
+        rows = pd.MultiIndex.from_product([matrix.index.get_level_values('arac_no').unique(),
+                                           range(len(self.from_states))], names=['arac_no', 'onceki_durum']) \
+            if by_vehicle else pd.Index(range(len(self.from_states)), name='onceki_durum')
+        matrix = matrix.reindex(index=rows, columns=range(len(self.to_states)), fill_value=0.0)
+        if by_vehicle:
+            matrix.index = matrix.index.set_levels(self.from_states, level='onceki_durum', verify_integrity=False)
+        else:
+            matrix.index = pd.Index(self.from_states, name='onceki_durum')
+        matrix.columns = pd.Index(self.to_states, name='sonraki_durum')
+        return matrix
+
+    @staticmethod
+    def _row_normalize(matrix: pd.DataFrame) -> pd.DataFrame:
+        totals = matrix.sum(axis=1).to_numpy()[:, None]
+        return pd.DataFrame(np.divide(matrix.to_numpy(), totals, out=np.zeros(matrix.shape), where=totals > 0),
+                            index=matrix.index, columns=matrix.columns)
+
+    def migration_matrix(self, arac_no: Optional[Any] = None, weight: str = 'amount',
+                         normalize: bool = False, period: Optional[int] = None) -> pd.DataFrame:
+        """
+        Dilimden dilime geçiş matrisi (satır: önceki durum, sütun: sonraki durum).
+
+        Args:
+            arac_no: Tek ARAÇ (None ise tümü)
+            weight: 'amount' (vadesi geçmiş bakiye) veya 'count' (müşteri sayısı)
+            normalize: Satırları orana çevir
+            period: Tek görüntü çifti (None ise tüm ardışık çiftler toplanır)
+        """
+        matrix = self._matrix(self._selected(arac_no, period), weight, by_vehicle=False)
+        return self._row_normalize(matrix) if normalize else matrix
+
+    def vehicle_matrices(self, weight: str = 'amount', normalize: bool = False,
+                         period: Optional[int] = None) -> Dict[int, pd.DataFrame]:
+        """ARAÇ no → geçiş matrisi (tek groupby ile)"""
+        matrix = self._matrix(self._selected(None, period), weight, by_vehicle=True)
+        if normalize:
+            matrix = self._row_normalize(matrix)
+        return {int(arac_no): table.droplevel('arac_no') for arac_no, table in matrix.groupby(level='arac_no')}
+    #endregion
+
+    #region Oranlar
+    def rates(self, arac_no: Optional[Any] = None, weight: str = 'amount', by_vehicle: bool = False,
+              period: Optional[int] = None) -> pd.DataFrame:
+        """
+        Dilim başına iyileşme / ödeme / aynı dilim / kötüleşme oranları.
+
+        İyileşme: daha genç dilime geçen veya bakiyesi kapanan pay (ödeme dahil).
+        Kötüleşme: daha eski dilime ilerleyen pay.
+
+        Returns:
+            Satırlar: önceki gün dilimi (by_vehicle ise ARAÇ × dilim);
+            sütunlar: tutar, iyilesme_orani, odeme_orani, ayni_dilim_orani, kotulesme_orani
+        """
+        matrix = self._matrix(self._selected(arac_no, period), weight, by_vehicle=by_vehicle)
+        aged = matrix.index.get_level_values('onceki_durum').isin(self.buckets)
+        matrix = matrix[aged]
+
+        count = len(self.buckets)
+        values = matrix.to_numpy()
+        row_state = np.array([self.buckets.index(state) for state in matrix.index.get_level_values('onceki_durum')],
+                             dtype=np.intp)
+        column_state = np.arange(count)
+
+        aged_values = values[:, :count]
+        younger = np.where(column_state[None, :] < row_state[:, None], aged_values, 0.0).sum(axis=1)
+        same = np.where(column_state[None, :] == row_state[:, None], aged_values, 0.0).sum(axis=1)
+        older = np.where(column_state[None, :] > row_state[:, None], aged_values, 0.0).sum(axis=1)
+        paid = values[:, count]
+        total = values.sum(axis=1)
+
+        def share(part: np.ndarray) -> np.ndarray:
+            return np.divide(part, total, out=np.zeros(len(total)), where=total > 0)
+
+        return pd.DataFrame({
+            'tutar': total,
+            'iyilesme_orani': share(younger + paid),
+            'odeme_orani': share(paid),
+            'ayni_dilim_orani': share(same),
+            'kotulesme_orani': share(older),
+        }, index=matrix.index)
+    #endregion
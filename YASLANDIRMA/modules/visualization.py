@@ -7,7 +7,7 @@ Analiz sonuçları için grafik ve chart oluşturma sistemi
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -330,48 +330,31 @@ class VisualizationEngine:
             logger.error(f"İş yükü dağılımı grafiği oluşturma hatası: {e}")
             return None
     
-    def create_trend_analysis_chart(self, historical_data: List[Dict]) -> Optional[plt.Figure]:
+    def create_trend_analysis_chart(self, historical_data: Union[List[Dict], pd.DataFrame]) -> Optional[plt.Figure]:
         """
         Trend analizi grafiği oluştur
         
         Args:
-            historical_data: Geçmiş analiz verileri
+            historical_data: AgingTrendEngine.overall_series() tablosu
+                (tarih → toplam_bakiye, musteri_sayisi) veya geçmiş analiz verileri listesi
             
         Returns:
             matplotlib.Figure: Grafik figürü
         """
         try:
-            if not historical_data or len(historical_data) < 2:
-                logger.error("Trend analizi için yeterli geçmiş veri yok")
-                return None
+            if isinstance(historical_data, pd.DataFrame):
+                series = historical_data
+            else:
+                series = self._historical_series(historical_data or [])
             
-            # Veri hazırlama
-            dates = []
-            total_balances = []
-            total_customers = []
-            
-            for data in historical_data:
-                try:
-                    date_str = data.get('analiz_tarihi', '')
-                    if date_str:
-                        date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                        dates.append(date)
-                        
-                        # Toplam değerleri hesapla
-                        analysis_results = data.get('analysis_results', {})
-                        total_balance = sum(analysis.get('toplam_bakiye', 0) for analysis in analysis_results.values())
-                        total_customer = sum(analysis.get('musteri_sayisi', 0) for analysis in analysis_results.values())
-                        
-                        total_balances.append(total_balance)
-                        total_customers.append(total_customer)
-                except Exception as e:
-                    logger.debug(f"Trend veri işleme hatası: {e}")
-                    continue
-            
-            if len(dates) < 2:
-                logger.warning("Trend analizi için yeterli geçerli veri yok")
+            if len(series) < 2:
+                logger.warning("Trend analizi için yeterli geçmiş veri yok")
                 return None
             
+            dates = pd.to_datetime(series.index)
+            total_balances = series['toplam_bakiye'].to_numpy()
+            total_customers = series['musteri_sayisi'].to_numpy()
+            
             # Figure oluştur
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=self.figure_size)
             fig.suptitle('Trend Analizi', fontsize=16, fontweight='bold')
@@ -403,6 +386,25 @@ class VisualizationEngine:
             logger.error(f"Trend analizi grafiği oluşturma hatası: {e}")
             return None
     
+    def _historical_series(self, historical_data: List[Dict]) -> pd.DataFrame:
+        """Eski biçimdeki geçmiş analiz listesini tarih → toplamlar tablosuna çevir"""
+        records = []
+        for data in historical_data:
+            try:
+                date_str = data.get('analiz_tarihi', '')
+                if date_str:
+                    analysis_results = data.get('analysis_results', {})
+                    records.append({
+                        'tarih': datetime.fromisoformat(date_str.replace('Z', '+00:00')),
+                        'toplam_bakiye': sum(analysis.get('toplam_bakiye', 0) for analysis in analysis_results.values()),
+                        'musteri_sayisi': sum(analysis.get('musteri_sayisi', 0) for analysis in analysis_results.values())
+                    })
+            except Exception as e:
+                logger.debug(f"Trend veri işleme hatası: {e}")
+                continue
+        
+        return pd.DataFrame(records, columns=['tarih', 'toplam_bakiye', 'musteri_sayisi']).set_index('tarih')
+    
     def create_performance_heatmap(self, analysis_results: Dict) -> Optional[plt.Figure]:
         """
         Performans heatmap'i oluştur
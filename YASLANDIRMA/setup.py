@@ -156,7 +156,7 @@ def create_sample_config():
     "auto_save_interval": 300,
     "backup_enabled": true,
     "max_backup_count": 10,
-    "analysis_cache_timeout": 300,
+    "cache_budget_mb": 256,
     "default_export_format": "xlsx",
     "notifications_enabled": true,
     "chart_dpi": 300
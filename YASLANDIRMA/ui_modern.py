@@ -827,7 +827,9 @@ class YaslandirmaApp(ctk.CTkFrame):
             self.tree.heading(col, text=str(col)[:15])
             self.tree.column(col, width=100, anchor="w")
         
-        for _, row in self.processed_df.head(100).iterrows():
+        # Tutarlar sayısal tutulur; Türkçe metin biçimi yalnızca görünümde
+        view_df = self.processor.format_all_numbers(self.processed_df.head(100))
+        for _, row in view_df.iterrows():
             values = [str(v)[:20] if v is not None else "" for v in [row.get(c, "") for c in columns]]
             self.tree.insert("", "end", values=values)
     
@@ -837,7 +839,7 @@ class YaslandirmaApp(ctk.CTkFrame):
             messagebox.showinfo("Bilgi", "Önce dosyayı işleyin!")
             return
         
-        PreviewWindow(self.master, self.processed_df, "İşlenmiş Veri Önizlemesi")
+        PreviewWindow(self.master, self.processor.format_all_numbers(self.processed_df), "İşlenmiş Veri Önizlemesi")
     
     def _start_analysis(self):
         """Analiz başlat"""
@@ -866,6 +868,10 @@ class YaslandirmaApp(ctk.CTkFrame):
                 results = self.analysis_engine.analyze_all_aracs()
                 self.current_analysis_results = results if results else {}
                 
+                # 3. Yaşlandırma geçmişine tarihli özet ekle
+                if self.data_manager and results:
+                    self.data_manager.record_aging_snapshot(results, source=self.file_path)
+                
                 self.after(0, self._on_analysis_complete)
                 
             except Exception as e:
@@ -985,7 +991,7 @@ class YaslandirmaApp(ctk.CTkFrame):
         
         if path:
             try:
-                self.processed_df.to_excel(path, index=False)
+                self.processor.export_excel(self.processed_df, path)
                 self._set_status(f"✓ Kaydedildi: {Path(path).name}")
                 messagebox.showinfo("Başarılı", f"Dosya kaydedildi:\n{path}")
             except Exception as e:
@@ -999,7 +1005,7 @@ class YaslandirmaApp(ctk.CTkFrame):
         try:
             backup = self.processor.get_backup_data()
             if backup is not None:
-                self.processed_df = backup.copy()
+                self.processed_df = backup
                 self._update_tree_view()
                 self._set_status("✓ Orijinal veri geri yüklendi")
                 messagebox.showinfo("Başarılı", "Orijinal veri geri yüklendi!")
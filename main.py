@@ -1249,4 +1249,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Paketlenmiş (PyInstaller) uygulamada süreç havuzu işçileri için gerekli
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()